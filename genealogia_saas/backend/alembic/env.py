@@ -0,0 +1,67 @@
+import re
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.core.config import settings
+from app.db.base import Base
+
+config = context.config
+config.set_main_option("sqlalchemy.url", str(settings.SQLALCHEMY_DATABASE_URI).replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+_PARTICAO = re.compile(r"^(animal|ancestralidadeanimal)_(o\d+|padrao)$")
+
+# Índices que existem apenas nas migrações (expressões específicas do PostgreSQL)
+_INDICES_MIGRACOES = {"ix_animal_busca_trgm"}
+
+
+def incluir_objeto(objeto, nome, tipo, refletido, comparado_com) -> bool:
+    # As partições por organização são criadas pela aplicação (app/db/particoes.py),
+    # não pelos modelos: o autogenerate não deve tentar removê-las
+    if refletido and comparado_com is None:
+        if tipo == "table" and _PARTICAO.match(nome or ""):
+            return False
+        if tipo == "index" and nome in _INDICES_MIGRACOES:
+            return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar ao banco."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=incluir_objeto,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica as migrações conectado ao banco."""
+    conectavel = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with conectavel.connect() as conexao:
+        context.configure(connection=conexao, target_metadata=target_metadata, include_object=incluir_objeto)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
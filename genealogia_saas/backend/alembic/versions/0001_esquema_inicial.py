@@ -0,0 +1,86 @@
+"""Esquema inicial
+
+Esquema criado pelo `Base.metadata.create_all` da aplicação antes das
+migrações: planos, organizações, administradores e animais. Bancos criados
+por ele devem ser marcados com `alembic stamp 0001` e atualizados com
+`alembic upgrade head`, que aplica as revisões seguintes e seus backfills.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('planoassinatura',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('preco', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('limite_animais', sa.Integer(), nullable=False),
+    sa.Column('descricao', sa.Text(), nullable=True),
+    sa.Column('funcionalidades', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_planoassinatura_id'), 'planoassinatura', ['id'], unique=False)
+    op.create_index(op.f('ix_planoassinatura_nome'), 'planoassinatura', ['nome'], unique=True)
+
+    op.create_table('organizacao',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('cnpj', sa.String(), nullable=True),
+    sa.Column('plano_assinatura_id', sa.Integer(), nullable=True),
+    sa.Column('data_assinatura', sa.Date(), nullable=True),
+    sa.Column('status_assinatura', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['plano_assinatura_id'], ['planoassinatura.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cnpj')
+    )
+    op.create_index(op.f('ix_organizacao_email'), 'organizacao', ['email'], unique=True)
+    op.create_index(op.f('ix_organizacao_id'), 'organizacao', ['id'], unique=False)
+    op.create_index(op.f('ix_organizacao_nome'), 'organizacao', ['nome'], unique=False)
+
+    op.create_table('usuarioadminsaas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('senha_hash', sa.String(), nullable=False),
+    sa.Column('permissoes', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_usuarioadminsaas_email'), 'usuarioadminsaas', ['email'], unique=True)
+    op.create_index(op.f('ix_usuarioadminsaas_id'), 'usuarioadminsaas', ['id'], unique=False)
+
+    op.create_table('animal',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('especie', sa.String(), nullable=False),
+    sa.Column('raca', sa.String(), nullable=True),
+    sa.Column('data_nascimento', sa.Date(), nullable=True),
+    sa.Column('sexo', sa.String(), nullable=True),
+    sa.Column('caracteristicas_fisicas', sa.Text(), nullable=True),
+    sa.Column('imagem_url', sa.String(), nullable=True),
+    sa.Column('pai_id', sa.Integer(), nullable=True),
+    sa.Column('mae_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['mae_id'], ['animal.id'], ),
+    sa.ForeignKeyConstraint(['organizacao_id'], ['organizacao.id'], ),
+    sa.ForeignKeyConstraint(['pai_id'], ['animal.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_animal_id'), 'animal', ['id'], unique=False)
+    op.create_index(op.f('ix_animal_nome'), 'animal', ['nome'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('animal')
+    op.drop_table('usuarioadminsaas')
+    op.drop_table('organizacao')
+    op.drop_table('planoassinatura')
@@ -0,0 +1,59 @@
+"""Índice de ancestralidade
+
+Cria a tabela de fechamento transitivo da genealogia, usada na validação de
+pai e mãe (ver app/services/ancestralidade.py), e a preenche para os animais
+existentes, organização por organização. Organizações cuja genealogia já
+contém um ciclo ficam sem índice e são informadas no log: corrija-as e
+execute `python -m app.cli reconstruir-indice --organizacao <id>`. No modo
+offline (--sql) o preenchimento não é gerado; execute o comando após aplicar
+o SQL.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+import logging
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    op.create_table('ancestralidadeanimal',
+    sa.Column('ancestral_id', sa.Integer(), nullable=False),
+    sa.Column('descendente_id', sa.Integer(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('distancia', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestral_id'], ['animal.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendente_id'], ['animal.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['organizacao_id'], ['organizacao.id'], ),
+    sa.PrimaryKeyConstraint('ancestral_id', 'descendente_id')
+    )
+    op.create_index('ix_ancestralidadeanimal_descendente_ancestral', 'ancestralidadeanimal', ['descendente_id', 'ancestral_id'], unique=False)
+    op.create_index(op.f('ix_ancestralidadeanimal_organizacao_id'), 'ancestralidadeanimal', ['organizacao_id'], unique=False)
+
+    if context.is_offline_mode():
+        return
+
+    from app.services.ancestralidade import reconstruir_indice
+    from app.services.grafo_genealogico import CicloGenealogicoError
+
+    db = Session(bind=op.get_bind())
+    organizacoes = db.execute(sa.text("SELECT DISTINCT organizacao_id FROM animal ORDER BY organizacao_id")).scalars().all()
+    for organizacao_id in organizacoes:
+        try:
+            reconstruir_indice(db, organizacao_id)
+        except CicloGenealogicoError as erro:
+            logger.warning("Índice de ancestralidade não criado: %s", erro)
+
+
+def downgrade() -> None:
+    op.drop_table('ancestralidadeanimal')
@@ -0,0 +1,31 @@
+"""Índices da listagem paginada
+
+Índices compostos usados pela paginação por cursor de organizações e de
+animais (ordenada por nome e ID, com filtros).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_organizacao_nome_id', 'organizacao', ['nome', 'id'], unique=False)
+    op.create_index('ix_animal_organizacao_nome_id', 'animal', ['organizacao_id', 'nome', 'id'], unique=False)
+    op.create_index('ix_animal_organizacao_especie_raca_nome_id', 'animal', ['organizacao_id', 'especie', 'raca', 'nome', 'id'], unique=False)
+    op.create_index('ix_animal_organizacao_sexo_nome_id', 'animal', ['organizacao_id', 'sexo', 'nome', 'id'], unique=False)
+    op.create_index('ix_animal_organizacao_data_nascimento', 'animal', ['organizacao_id', 'data_nascimento'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_animal_organizacao_data_nascimento', table_name='animal')
+    op.drop_index('ix_animal_organizacao_sexo_nome_id', table_name='animal')
+    op.drop_index('ix_animal_organizacao_especie_raca_nome_id', table_name='animal')
+    op.drop_index('ix_animal_organizacao_nome_id', table_name='animal')
+    op.drop_index('ix_organizacao_nome_id', table_name='organizacao')
@@ -0,0 +1,44 @@
+"""Busca aproximada de animais
+
+No PostgreSQL, cria as extensões pg_trgm e unaccent, as funções imutáveis de
+normalização e o índice GIN de trigramas sobre nome, raça e características
+usados pela busca (ver app/services/busca.py). Esta migração é a única
+definição desses objetos: a troca de tabelas do particionamento recria o
+índice a partir da definição existente no banco. Em outros bancos a migração
+não altera nada.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BUSCA_TRIGRAMAS = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE OR REPLACE FUNCTION busca_normalizar(texto text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, texto)) $$;
+CREATE OR REPLACE FUNCTION busca_documento_animal(nome text, raca text, caracteristicas text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT busca_normalizar(coalesce(nome, '') || ' ' || coalesce(raca, '') || ' ' || coalesce(caracteristicas, '')) $$;
+CREATE INDEX IF NOT EXISTS ix_animal_busca_trgm ON animal
+    USING gin (busca_documento_animal(nome, raca, caracteristicas_fisicas) gin_trgm_ops);
+"""
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(BUSCA_TRIGRAMAS)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_animal_busca_trgm")
+        op.execute("DROP FUNCTION IF EXISTS busca_documento_animal(text, text, text)")
+        op.execute("DROP FUNCTION IF EXISTS busca_normalizar(text)")
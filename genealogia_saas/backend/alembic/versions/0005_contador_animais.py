@@ -0,0 +1,40 @@
+"""Contador de animais por organização
+
+Adiciona `organizacao.total_animais`, usado na verificação do limite do
+plano (ver app/services/contador_animais.py), e o preenche com a contagem
+atual de animais de cada organização.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('organizacao', sa.Column('total_animais', sa.Integer(), server_default='0', nullable=False))
+
+    if context.is_offline_mode():
+        # Sem conexão, a contagem é gerada como uma única instrução
+        op.execute(
+            "UPDATE organizacao SET total_animais = "
+            "(SELECT count(*) FROM animal WHERE animal.organizacao_id = organizacao.id)"
+        )
+        return
+
+    from app.services.contador_animais import reconciliar_contador
+
+    db = Session(bind=op.get_bind())
+    for organizacao_id in db.execute(sa.text("SELECT id FROM organizacao ORDER BY id")).scalars().all():
+        reconciliar_contador(db, organizacao_id)
+
+
+def downgrade() -> None:
+    op.drop_column('organizacao', 'total_animais')
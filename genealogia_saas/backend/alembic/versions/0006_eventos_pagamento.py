@@ -0,0 +1,55 @@
+"""Fila de eventos de pagamento
+
+Cria a fila de notificações do webhook de pagamentos e a tabela dos eventos
+que esgotaram as tentativas (ver app/services/pagamentos.py).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('eventopagamento',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.String(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('ocorrido_em', sa.DateTime(), nullable=True),
+    sa.Column('recebido_em', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('processado_em', sa.DateTime(), nullable=True),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('proxima_tentativa_em', sa.DateTime(), nullable=True),
+    sa.Column('ultimo_erro', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('evento_id')
+    )
+    op.create_index(op.f('ix_eventopagamento_id'), 'eventopagamento', ['id'], unique=False)
+    op.create_index('ix_eventopagamento_pendentes', 'eventopagamento', ['proxima_tentativa_em', 'id'], unique=False, postgresql_where=sa.text('processado_em IS NULL'))
+
+    op.create_table('eventopagamentofalho',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('evento_id', sa.String(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('erro', sa.Text(), nullable=True),
+    sa.Column('falhou_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_eventopagamentofalho_evento_id'), 'eventopagamentofalho', ['evento_id'], unique=False)
+    op.create_index(op.f('ix_eventopagamentofalho_id'), 'eventopagamentofalho', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('eventopagamentofalho')
+    op.drop_table('eventopagamento')
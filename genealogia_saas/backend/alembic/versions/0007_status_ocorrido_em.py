@@ -0,0 +1,25 @@
+"""Data do último evento de pagamento aplicado
+
+Adiciona `organizacao.status_ocorrido_em`, usada pelo consumidor de eventos
+de pagamento para não sobrescrever o status da assinatura com eventos
+atrasados (ver app/services/pagamentos.py).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('organizacao', sa.Column('status_ocorrido_em', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('organizacao', 'status_ocorrido_em')
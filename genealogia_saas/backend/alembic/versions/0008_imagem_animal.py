@@ -0,0 +1,25 @@
+"""Hash da foto dos animais
+
+Adiciona `animal.imagem_hash`, o SHA-256 da foto no armazenamento de imagens
+(ver app/services/imagens.py). Animais existentes continuam com a
+`imagem_url` anterior até receberem uma nova foto.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('animal', sa.Column('imagem_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('animal', 'imagem_hash')
@@ -0,0 +1,31 @@
+"""Versões dos recursos
+
+Cria a tabela com a versão de cada recurso por organização, usada nas ETags
+e no cache de respostas (ver app/db/versoes.py). As versões são criadas no
+primeiro commit que altera cada recurso.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('versaorecurso',
+    sa.Column('recurso', sa.String(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('versao', sa.Integer(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('recurso', 'organizacao_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('versaorecurso')
@@ -0,0 +1,56 @@
+"""Resumos do painel administrativo
+
+Cria as tabelas de resumo do painel (por plano, por status da assinatura e
+por mês). Elas são preenchidas pelo agendador do painel ou por
+`python -m app.cli atualizar-painel`.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('resumoplano',
+    sa.Column('plano_assinatura_id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('preco', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('organizacoes', sa.Integer(), nullable=False),
+    sa.Column('organizacoes_ativas', sa.Integer(), nullable=False),
+    sa.Column('animais', sa.Integer(), nullable=False),
+    sa.Column('receita_mensal', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('plano_assinatura_id')
+    )
+
+    op.create_table('resumostatusassinatura',
+    sa.Column('status_assinatura', sa.String(), nullable=False),
+    sa.Column('organizacoes', sa.Integer(), nullable=False),
+    sa.Column('animais', sa.Integer(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('status_assinatura')
+    )
+
+    op.create_table('resumomensal',
+    sa.Column('mes', sa.Date(), nullable=False),
+    sa.Column('novas_organizacoes', sa.Integer(), nullable=False),
+    sa.Column('organizacoes', sa.Integer(), nullable=True),
+    sa.Column('organizacoes_ativas', sa.Integer(), nullable=True),
+    sa.Column('animais', sa.Integer(), nullable=True),
+    sa.Column('receita_mensal', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('mes')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resumomensal')
+    op.drop_table('resumostatusassinatura')
+    op.drop_table('resumoplano')
@@ -0,0 +1,65 @@
+"""Particionar animais e índice de ancestralidade por organização (opcional)
+
+No PostgreSQL, `animal` e `ancestralidadeanimal` podem ser particionadas por
+lista de `organizacao_id`, com uma partição por organização e uma partição
+padrão. Consultas filtradas pela organização leem apenas a partição dela, e
+excluir uma organização passa a ser desanexar e descartar suas partições
+(ver app/db/particoes.py).
+
+A conversão recria as duas tabelas e as mantém bloqueadas até o fim da
+migração, por isso só é executada quando pedida explicitamente:
+
+    alembic upgrade head -x particionar=sim
+
+Sem a opção (ou em outros bancos) a revisão não altera nada; o
+particionamento pode ser ativado depois, em uma janela de manutenção, com
+`python -m app.cli particionar-animais`. As cópias são conferidas antes de
+descartar as tabelas originais e qualquer falha desfaz toda a migração.
+
+As chaves primárias passam a incluir `organizacao_id` (exigência do
+particionamento). As chaves estrangeiras que apontavam para `animal.id` (pai,
+mãe e o índice de ancestralidade) deixam de existir no banco: no PostgreSQL
+elas exigiriam a organização na chave referenciada e impediriam desanexar as
+partições; a consistência é garantida pela aplicação (services/ancestralidade).
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+"""
+import logging
+
+from alembic import context, op
+from alembic.util import CommandError
+from sqlalchemy.orm import Session
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+    if context.get_x_argument(as_dictionary=True).get("particionar") != "sim":
+        logger.info("Particionamento de animais não solicitado (use -x particionar=sim ou `cli particionar-animais`).")
+        return
+    if context.is_offline_mode():
+        raise CommandError("O particionamento de animais precisa de conexão com o banco; aplique-o sem --sql.")
+
+    from app.db.particoes import substituir_tabelas
+
+    substituir_tabelas(Session(bind=op.get_bind()), particionar=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql" or context.is_offline_mode():
+        return
+
+    from app.db.particoes import particionamento_ativo, substituir_tabelas
+
+    db = Session(bind=op.get_bind())
+    if particionamento_ativo(db):
+        substituir_tabelas(db, particionar=False)
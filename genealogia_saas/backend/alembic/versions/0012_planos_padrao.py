@@ -0,0 +1,84 @@
+"""Planos de assinatura padrão
+
+Cadastra os planos Bronze, Prata e Ouro, antes criados por `init_db` na
+inicialização de cada worker. Planos com o mesmo nome já cadastrados são
+mantidos. O administrador padrão é criado pelo comando
+`python -m app.cli inicializar-banco`.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+import json
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+planoassinatura = sa.table(
+    "planoassinatura",
+    sa.column("id", sa.Integer),
+    sa.column("nome", sa.String),
+    sa.column("preco", sa.Numeric(10, 2)),
+    sa.column("limite_animais", sa.Integer),
+    sa.column("descricao", sa.Text),
+    # Gravadas já serializadas, para que o modo offline (--sql) consiga gerar o INSERT
+    sa.column("funcionalidades", sa.Text),
+)
+
+PLANOS = [
+    {
+        "nome": "Bronze",
+        "preco": 99.90,
+        "limite_animais": 50,
+        "descricao": "Plano básico para pequenas organizações",
+        "funcionalidades": ["Cadastro de animais", "Visualização básica de genealogia"],
+    },
+    {
+        "nome": "Prata",
+        "preco": 199.90,
+        "limite_animais": 200,
+        "descricao": "Plano intermediário para organizações médias",
+        "funcionalidades": ["Cadastro de animais", "Visualização avançada de genealogia", "Exportação de relatórios"],
+    },
+    {
+        "nome": "Ouro",
+        "preco": 399.90,
+        "limite_animais": 500,
+        "descricao": "Plano completo para grandes organizações",
+        "funcionalidades": [
+            "Cadastro de animais",
+            "Visualização avançada de genealogia",
+            "Exportação de relatórios",
+            "API de integração",
+            "Suporte prioritário",
+        ],
+    },
+]
+
+
+def upgrade() -> None:
+    existentes = set()
+    if not context.is_offline_mode():
+        existentes = set(op.get_bind().execute(sa.select(planoassinatura.c.nome)).scalars())
+    novos = [plano for plano in PLANOS if plano["nome"] not in existentes]
+    if novos:
+        op.bulk_insert(
+            planoassinatura,
+            [{**plano, "funcionalidades": json.dumps(plano["funcionalidades"], ensure_ascii=False)} for plano in novos],
+        )
+
+
+def downgrade() -> None:
+    # Apenas os planos padrão ainda sem organizações
+    organizacao = sa.table("organizacao", sa.column("plano_assinatura_id", sa.Integer))
+    op.execute(
+        planoassinatura.delete().where(
+            planoassinatura.c.nome.in_([plano["nome"] for plano in PLANOS]),
+            ~sa.exists().where(organizacao.c.plano_assinatura_id == planoassinatura.c.id),
+        )
+    )
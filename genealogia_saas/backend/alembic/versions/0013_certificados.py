@@ -0,0 +1,58 @@
+"""Fila de certificados de genealogia
+
+Cria as tabelas dos lotes e dos trabalhos de certificado, executados em
+segundo plano (ver app/services/fila_certificados.py).
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('lotecertificados',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('formato', sa.String(), nullable=False),
+    sa.Column('geracoes', sa.Integer(), nullable=False),
+    sa.Column('filtros', sa.JSON(), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lotecertificados_id'), 'lotecertificados', ['id'], unique=False)
+    op.create_index(op.f('ix_lotecertificados_organizacao_id'), 'lotecertificados', ['organizacao_id'], unique=False)
+
+    op.create_table('trabalhocertificado',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organizacao_id', sa.Integer(), nullable=False),
+    sa.Column('lote_id', sa.Integer(), nullable=True),
+    sa.Column('animal_id', sa.Integer(), nullable=False),
+    sa.Column('formato', sa.String(), nullable=False),
+    sa.Column('geracoes', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('chave', sa.String(length=64), nullable=True),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('erro', sa.Text(), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['lote_id'], ['lotecertificados.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_trabalhocertificado_id'), 'trabalhocertificado', ['id'], unique=False)
+    op.create_index(op.f('ix_trabalhocertificado_lote_id'), 'trabalhocertificado', ['lote_id'], unique=False)
+    op.create_index('ix_trabalhocertificado_organizacao_id', 'trabalhocertificado', ['organizacao_id', 'id'], unique=False)
+    op.create_index('ix_trabalhocertificado_fila', 'trabalhocertificado', ['status', 'id'], unique=False, postgresql_where=sa.text("status IN ('pendente', 'processando')"))
+
+
+def downgrade() -> None:
+    op.drop_table('trabalhocertificado')
+    op.drop_table('lotecertificados')
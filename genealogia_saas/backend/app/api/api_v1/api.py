@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import organizacoes, planos_assinatura, usuarios_admin, animais, auth
+from app.api.api_v1.endpoints import organizacoes, planos_assinatura, usuarios_admin, animais, auth, pagamentos, imagens, painel_admin, certificados
 
 api_router = APIRouter()
 
@@ -16,5 +16,17 @@ api_router.include_router(planos_assinatura.router, prefix="/planos-assinatura",
 # Incluir rotas para usuários administradores
 api_router.include_router(usuarios_admin.router, prefix="/usuarios-admin", tags=["usuários administradores"])
 
+# Incluir rotas do painel administrativo
+api_router.include_router(painel_admin.router, prefix="/painel-admin", tags=["painel administrativo"])
+
 # Incluir rotas para animais
-api_router.include_router(animais.router, prefix="/animais", tags=["animais"])
\ No newline at end of file
+api_router.include_router(animais.router, prefix="/animais", tags=["animais"])
+
+# Incluir rotas das imagens dos animais (públicas: identificadas pelo hash do conteúdo)
+api_router.include_router(imagens.router, prefix="/imagens", tags=["imagens"])
+
+# Incluir rotas dos certificados de genealogia (gerados em segundo plano)
+api_router.include_router(certificados.router, prefix="/certificados", tags=["certificados"])
+
+# Incluir rotas do webhook de pagamentos
+api_router.include_router(pagamentos.router, prefix="/pagamentos", tags=["pagamentos"])
\ No newline at end of file
@@ -0,0 +1,710 @@
+from datetime import date
+from typing import Any, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+
+from app.api.deps import get_async_db, get_db, get_current_organizacao
+from app.api.projecao import (
+    DESCRICAO_CAMPOS,
+    campos_do_esquema,
+    campos_solicitados,
+    itens_projetados,
+    selecionar_campos,
+)
+from app.api.respostas import resposta_condicional
+from app.core.serializacao import RespostaJSON
+from app.db.paginacao import CursorInvalidoError, estimar_total_async, paginar_async, paginar_linhas_async
+from app.db.versoes import GENEALOGIA, obter_versao_async
+from app.models.animal import Animal
+from app.models.plano_assinatura import PlanoAssinatura
+from app.schemas.animal import (
+    AnimalCreate,
+    AnimalResponse,
+    AnimalUpdate,
+    ArvoreGenealogica,
+    ConsanguinidadeAnimal,
+    DescendentesAnimal,
+    ParentescoAnimais,
+    Reprodutor,
+    ResultadoAcasalamento,
+    ResultadoBusca,
+    ResultadoImportacao,
+    ResumoGenealogico,
+    SimulacaoAcasalamento,
+    UsoPlano,
+)
+from app.schemas.paginacao import Pagina
+from app.schemas.principal import OrganizacaoAutenticada
+from app.services.ancestralidade import (
+    AtribuicaoGenitores,
+    GenealogiaInvalidaError,
+    indexar_novos_animais,
+    reindexar_genealogia,
+    remover_do_indice,
+    validar_alteracao_sexo,
+    validar_genitores,
+)
+from app.services.busca import buscar_animais
+from app.services.consanguinidade import CalculadoraConsanguinidade, registro_consanguinidade
+from app.services.contador_animais import liberar_vagas, reservar_vagas, uso_do_plano
+from app.services.exportacao import (
+    FORMATOS as FORMATOS_EXPORTACAO,
+    FUNCIONALIDADE_EXPORTACAO,
+    colunas_exportacao,
+    exportar_animais,
+)
+from app.services.genealogia import obter_arvore_genealogica_async
+from app.services.grafo_genealogico import SEM_GENITOR, CicloGenealogicoError, GrafoGenealogico, registro_grafos
+from app.services.imagens import (
+    ImagemGrandeDemaisError,
+    ImagemInvalidaError,
+    agendar_variantes,
+    armazenar_original,
+    url_imagem,
+)
+from app.services.importacao import (
+    FORMATOS,
+    ImportacaoInvalidaError,
+    LimitePlanoExcedidoError,
+    detectar_formato,
+    importar_animais,
+    ler_registros,
+)
+from app.services.parentesco import BuscaParentesco, descrever_parentesco
+
+router = APIRouter()
+
+# Campos que podem ser pedidos na listagem com `fields` (colunas de AnimalResponse)
+CAMPOS_LISTAGEM = campos_do_esquema(AnimalResponse, Animal)
+
+
+def _obter_grafo(db: Session, organizacao_id: int, animal_id: int) -> GrafoGenealogico:
+    """Obtém o grafo genealógico da organização contendo o animal informado."""
+    grafo = registro_grafos.obter_com_animal(db, organizacao_id, animal_id)
+    if not grafo:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+    return grafo
+
+
+def _obter_calculadora(db: Session, organizacao_id: int) -> CalculadoraConsanguinidade:
+    """Obtém a calculadora com os coeficientes de consanguinidade atualizados da organização."""
+    try:
+        calculadora = registro_consanguinidade.calculadora(db, organizacao_id)
+    except CicloGenealogicoError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(erro)
+        )
+    if calculadora is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Os coeficientes de consanguinidade estão sendo calculados. Tente novamente em instantes.",
+            headers={"Retry-After": "5"},
+        )
+    return calculadora
+
+
+@router.get("/", response_model=Pagina[AnimalResponse])
+async def listar_animais(
+    especie: Optional[str] = None,
+    raca: Optional[str] = None,
+    sexo: Optional[str] = None,
+    nascido_desde: Optional[date] = Query(None, description="Data de nascimento mínima"),
+    nascido_ate: Optional[date] = Query(None, description="Data de nascimento máxima"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado pela página anterior"),
+    limite: int = Query(50, ge=1, le=200),
+    estimar: bool = Query(False, description="Incluir uma estimativa do total de animais"),
+    campos: Optional[str] = Query(None, alias="fields", description=DESCRICAO_CAMPOS),
+    db: AsyncSession = Depends(get_async_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Lista os animais da organização por nome, com filtros e paginação por cursor.
+
+    Com `fields`, apenas as colunas pedidas são lidas e os itens vão direto ao
+    JSON, sem objetos ORM nem validação item a item.
+    """
+    selecionados = campos_solicitados(campos, CAMPOS_LISTAGEM)
+    filtros = [Animal.organizacao_id == organizacao.id]
+    if especie:
+        filtros.append(Animal.especie == especie)
+    if raca:
+        filtros.append(Animal.raca == raca)
+    if sexo:
+        filtros.append(Animal.sexo == sexo)
+    if nascido_desde:
+        filtros.append(Animal.data_nascimento >= nascido_desde)
+    if nascido_ate:
+        filtros.append(Animal.data_nascimento <= nascido_ate)
+
+    chaves = [Animal.nome, Animal.id]
+    try:
+        if selecionados:
+            consulta = selecionar_campos(Animal, selecionados, chaves).where(*filtros)
+            animais, proximo_cursor = await paginar_linhas_async(db, consulta, chaves, cursor, limite)
+        else:
+            # Relacionamentos nunca são carregados implicitamente na sessão assíncrona
+            consulta = select(Animal).options(raiseload("*")).where(*filtros)
+            animais, proximo_cursor = await paginar_async(db, consulta, chaves, cursor, limite)
+    except CursorInvalidoError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro)
+        )
+
+    pagina = {
+        "itens": itens_projetados(selecionados, animais) if selecionados else animais,
+        "proximo_cursor": proximo_cursor,
+        "total_estimado": await estimar_total_async(db, consulta) if estimar else None,
+    }
+    return RespostaJSON(pagina) if selecionados else pagina
+
+
+@router.post("/", response_model=AnimalResponse, status_code=status.HTTP_201_CREATED)
+def criar_animal(
+    *,
+    db: Session = Depends(get_db),
+    animal_in: AnimalCreate,
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Cadastra um novo animal na organização."""
+    # Verificar se pai e mãe existem e são compatíveis
+    try:
+        validar_genitores(db, organizacao.id, [
+            AtribuicaoGenitores(None, animal_in.especie, animal_in.pai_id, animal_in.mae_id)
+        ])
+    except GenealogiaInvalidaError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro)
+        )
+
+    # Reservar uma vaga no contador do plano (atômico; seguro com cadastros simultâneos)
+    if not reservar_vagas(db, organizacao.id):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Limite de animais do plano de assinatura atingido."
+        )
+
+    # Criar o animal e incluí-lo no índice de ancestralidade
+    animal = Animal(organizacao_id=organizacao.id, **animal_in.dict())
+    db.add(animal)
+    db.flush()
+    indexar_novos_animais(db, organizacao.id, [[animal.id]])
+    db.commit()
+    db.refresh(animal)
+
+    return animal
+
+
+@router.post("/importacao", response_model=ResultadoImportacao, status_code=status.HTTP_201_CREATED)
+def importar_arquivo_animais(
+    *,
+    db: Session = Depends(get_db),
+    arquivo: UploadFile = File(...),
+    formato: Optional[str] = Query(None, description="csv ou jsonl (detectado pela extensão se omitido)"),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Importa em lote animais de um arquivo CSV ou JSON-lines."""
+    formato = formato or detectar_formato(arquivo.filename)
+    if formato not in FORMATOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de arquivo não suportado. Use CSV ou JSON-lines."
+        )
+
+    try:
+        resultado = importar_animais(db, organizacao.id, ler_registros(arquivo.file, formato))
+    except ImportacaoInvalidaError as erro:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=erro.erros
+        )
+    except LimitePlanoExcedidoError as erro:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(erro)
+        )
+    except (UnicodeDecodeError, ValueError):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Não foi possível ler o arquivo. Verifique o formato e a codificação (UTF-8)."
+        )
+
+    db.commit()
+    return resultado
+
+
+@router.get("/uso-plano", response_model=UsoPlano)
+def obter_uso_plano(
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém o total de animais cadastrados e o limite do plano da organização."""
+    total_animais, limite_animais = uso_do_plano(db, organizacao.id)
+    return {"total_animais": total_animais, "limite_animais": limite_animais}
+
+
+@router.get("/busca", response_model=List[ResultadoBusca])
+def buscar(
+    q: str = Query(..., min_length=2, max_length=100, description="Nome, raça ou característica"),
+    limite: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Busca animais por nome, raça e características, sem distinguir acentos e tolerando erros de digitação."""
+    resultados = buscar_animais(db, organizacao.id, q, limite)
+    if not resultados:
+        return []
+
+    animais = {
+        animal.id: animal
+        for animal in db.query(Animal.id, Animal.nome, Animal.especie, Animal.raca, Animal.sexo).filter(
+            Animal.organizacao_id == organizacao.id, Animal.id.in_([animal_id for animal_id, _ in resultados])
+        )
+    }
+    return [
+        {**animais[animal_id]._asdict(), "relevancia": relevancia}
+        for animal_id, relevancia in resultados
+        if animal_id in animais
+    ]
+
+
+@router.get("/exportacao")
+def exportar_arquivo_animais(
+    formato: str = Query("csv", description="csv ou ndjson"),
+    ancestrais: bool = Query(False, description="Incluir nomes de pais e avós"),
+    campos: Optional[str] = Query(None, alias="fields", description=DESCRICAO_CAMPOS),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Exporta todos os animais da organização em CSV ou NDJSON, transmitindo em blocos."""
+    if formato not in FORMATOS_EXPORTACAO:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato de exportação não suportado. Use CSV ou NDJSON."
+        )
+    selecionados = campos_solicitados(campos, colunas_exportacao(ancestrais))
+
+    plano = db.query(PlanoAssinatura).filter(PlanoAssinatura.id == organizacao.plano_assinatura_id).first()
+    if not plano or not plano.possui_funcionalidade(FUNCIONALIDADE_EXPORTACAO):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="O plano de assinatura não inclui a exportação de relatórios."
+        )
+
+    return StreamingResponse(
+        exportar_animais(organizacao.id, formato, ancestrais, selecionados),
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="animais.{formato}"'},
+    )
+
+
+@router.get("/reprodutores", response_model=List[Reprodutor])
+def listar_reprodutores(
+    limite: int = Query(10, ge=1, le=100),
+    sexo: Optional[str] = Query(None, description="Macho ou Fêmea"),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Lista os animais com maior número de filhos registrados."""
+    grafo = registro_grafos.obter(db, organizacao.id)
+    contagens = grafo.top_reprodutores(limite, sexo)
+    if not contagens:
+        return []
+
+    # Apenas os poucos reprodutores retornados são buscados no banco
+    ids = [animal_id for animal_id, _ in contagens]
+    animais = {
+        animal.id: animal
+        for animal in db.query(Animal.id, Animal.nome, Animal.sexo).filter(
+            Animal.organizacao_id == organizacao.id, Animal.id.in_(ids)
+        )
+    }
+    return [
+        {
+            "animal_id": animal_id,
+            "nome": animais[animal_id].nome,
+            "sexo": animais[animal_id].sexo,
+            "total_filhos": total_filhos,
+        }
+        for animal_id, total_filhos in contagens
+        if animal_id in animais
+    ]
+
+
+@router.get("/consanguinidade", response_model=List[ConsanguinidadeAnimal])
+def listar_consanguinidade(
+    ids: Optional[List[int]] = Query(None, description="IDs dos animais (todos se omitido)"),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Lista os coeficientes de consanguinidade dos animais da organização.
+
+    Responde 503 (com Retry-After) enquanto um recálculo grande é feito em segundo plano.
+    """
+    calculadora = _obter_calculadora(db, organizacao.id)
+    grafo, coeficientes = calculadora.grafo, calculadora.coeficientes
+
+    indices = np.arange(len(grafo))
+    if ids:
+        indices = grafo.indices_de(np.array(ids, dtype=np.int64))
+        indices = indices[indices != SEM_GENITOR]
+
+    return [
+        {"animal_id": int(animal_id), "coeficiente": float(coeficiente)}
+        for animal_id, coeficiente in zip(grafo.ids[indices], coeficientes[indices])
+    ]
+
+
+@router.post("/acasalamentos/simulacao", response_model=List[ResultadoAcasalamento])
+def simular_acasalamentos(
+    *,
+    db: Session = Depends(get_db),
+    simulacao: SimulacaoAcasalamento,
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Calcula o parentesco e a consanguinidade esperada da prole para cada par fêmea x macho."""
+    femeas_ids = list(dict.fromkeys(simulacao.femeas_ids))
+    machos_ids = list(dict.fromkeys(simulacao.machos_ids))
+
+    # Verificar se os animais existem na organização e se os sexos são compatíveis
+    sexos = dict(
+        db.query(Animal.id, Animal.sexo).filter(
+            Animal.organizacao_id == organizacao.id, Animal.id.in_(femeas_ids + machos_ids)
+        )
+    )
+    ausentes = [animal_id for animal_id in femeas_ids + machos_ids if animal_id not in sexos]
+    if ausentes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Animais não encontrados: {ausentes}."
+        )
+    if any(sexos[animal_id] == "Macho" for animal_id in femeas_ids) or any(
+        sexos[animal_id] == "Fêmea" for animal_id in machos_ids
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="As fêmeas e os machos informados devem ter sexos compatíveis."
+        )
+
+    calculadora = _obter_calculadora(db, organizacao.id)
+    grafo = calculadora.grafo
+    femeas = grafo.indices_de(np.array(femeas_ids, dtype=np.int64))
+    machos = grafo.indices_de(np.array(machos_ids, dtype=np.int64))
+    if (femeas == SEM_GENITOR).any() or (machos == SEM_GENITOR).any():
+        # Animais gravados fora do ORM (sem mudar a versão da genealogia) ainda não presentes no grafo
+        registro_grafos.recarregar(db, organizacao.id)
+        calculadora = _obter_calculadora(db, organizacao.id)
+        grafo = calculadora.grafo
+        femeas = grafo.indices_de(np.array(femeas_ids, dtype=np.int64))
+        machos = grafo.indices_de(np.array(machos_ids, dtype=np.int64))
+    parentesco = calculadora.parentesco(femeas, machos)
+
+    return [
+        {
+            "femea_id": femea_id,
+            "macho_id": macho_id,
+            "coeficiente_parentesco": float(parentesco[i, j]),
+            "consanguinidade_prole": float(parentesco[i, j]),
+        }
+        for i, femea_id in enumerate(femeas_ids)
+        for j, macho_id in enumerate(machos_ids)
+    ]
+
+
+@router.get("/{animal_id}", response_model=AnimalResponse)
+def obter_animal(
+    animal_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém um animal da organização pelo ID, com seu coeficiente de consanguinidade.
+
+    O coeficiente vem nulo enquanto a consanguinidade da organização é recalculada em segundo plano.
+    """
+    animal = db.query(Animal).filter(
+        Animal.id == animal_id, Animal.organizacao_id == organizacao.id
+    ).first()
+    if not animal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+
+    resposta = AnimalResponse.from_orm(animal)
+    try:
+        resposta.coeficiente_consanguinidade = registro_consanguinidade.coeficiente(db, organizacao.id, animal_id)
+    except CicloGenealogicoError:
+        # A genealogia inconsistente não impede a consulta dos dados do animal
+        resposta.coeficiente_consanguinidade = None
+    return resposta
+
+
+@router.put("/{animal_id}", response_model=AnimalResponse)
+def atualizar_animal(
+    *,
+    db: Session = Depends(get_db),
+    animal_id: int,
+    animal_in: AnimalUpdate,
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Atualiza um animal existente da organização."""
+    animal = db.query(Animal).filter(
+        Animal.id == animal_id, Animal.organizacao_id == organizacao.id
+    ).first()
+    if not animal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+
+    update_data = animal_in.dict(exclude_unset=True)
+    pai_id = update_data.get("pai_id", animal.pai_id)
+    mae_id = update_data.get("mae_id", animal.mae_id)
+    especie = update_data.get("especie") or animal.especie
+    genealogia_alterada = pai_id != animal.pai_id or mae_id != animal.mae_id
+
+    # Validar pai, mãe e sexo em relação à genealogia já registrada
+    try:
+        if genealogia_alterada or especie != animal.especie:
+            validar_genitores(db, organizacao.id, [AtribuicaoGenitores(animal.id, especie, pai_id, mae_id)])
+        if "sexo" in update_data and update_data["sexo"] != animal.sexo:
+            validar_alteracao_sexo(db, organizacao.id, animal.id, update_data["sexo"])
+    except GenealogiaInvalidaError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro)
+        )
+
+    # Atualizar os campos do animal
+    for field, value in update_data.items():
+        setattr(animal, field, value)
+
+    db.add(animal)
+    if genealogia_alterada:
+        db.flush()
+        reindexar_genealogia(db, organizacao.id, animal.id)
+    db.commit()
+    db.refresh(animal)
+
+    return animal
+
+
+@router.delete("/{animal_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+def excluir_animal(
+    *,
+    db: Session = Depends(get_db),
+    animal_id: int,
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Exclui um animal da organização (apenas se não tiver filhos registrados)."""
+    animal = db.query(Animal).filter(
+        Animal.id == animal_id, Animal.organizacao_id == organizacao.id
+    ).first()
+    if not animal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+
+    possui_filhos = db.query(
+        select(Animal.id).where(
+            Animal.organizacao_id == organizacao.id, or_(Animal.pai_id == animal_id, Animal.mae_id == animal_id)
+        ).exists()
+    ).scalar()
+    if possui_filhos:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="O animal possui filhos registrados e não pode ser excluído."
+        )
+
+    # Excluir o animal, suas linhas no índice de ancestralidade e liberar a vaga do plano
+    remover_do_indice(db, organizacao.id, animal_id)
+    db.delete(animal)
+    liberar_vagas(db, organizacao.id)
+    db.commit()
+
+    return None
+
+
+@router.put("/{animal_id}/imagem", response_model=AnimalResponse)
+def enviar_imagem_animal(
+    *,
+    db: Session = Depends(get_db),
+    animal_id: int,
+    arquivo: UploadFile = File(...),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Envia a foto de um animal; as versões reduzidas são geradas em segundo plano."""
+    animal = db.query(Animal).filter(
+        Animal.id == animal_id, Animal.organizacao_id == organizacao.id
+    ).first()
+    if not animal:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+
+    try:
+        hash_imagem, _ = armazenar_original(arquivo.file)
+    except ImagemInvalidaError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(erro)
+        )
+    except ImagemGrandeDemaisError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(erro)
+        )
+
+    animal.imagem_hash = hash_imagem
+    animal.imagem_url = url_imagem(hash_imagem)
+    db.add(animal)
+    db.commit()
+    db.refresh(animal)
+
+    agendar_variantes(hash_imagem)
+    return animal
+
+
+@router.get("/{animal_id}/arvore", response_model=ArvoreGenealogica)
+async def obter_arvore(
+    animal_id: int,
+    request: Request,
+    geracoes: int = Query(4, ge=1, le=12, description="Número de gerações de ancestrais"),
+    db: AsyncSession = Depends(get_async_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém a árvore genealógica (ancestrais) de um animal da organização.
+
+    A resposta muda apenas quando algum animal da organização é alterado:
+    o cliente pode revalidá-la com a ETag e recebe 304 se nada mudou.
+    """
+    # A existência é verificada antes da revalidação: um animal inexistente nunca recebe 304
+    existe = await db.scalar(
+        select(Animal.id).where(Animal.organizacao_id == organizacao.id, Animal.id == animal_id)
+    )
+    if existe is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+
+    async def conteudo() -> ArvoreGenealogica:
+        arvore = await obter_arvore_genealogica_async(db, animal_id, organizacao.id, geracoes)
+        if not arvore:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Animal não encontrado."
+            )
+        return ArvoreGenealogica(**arvore)
+
+    versao = await obter_versao_async(db, GENEALOGIA, organizacao.id)
+    return await resposta_condicional(
+        request, GENEALOGIA, organizacao.id, versao, conteudo, "private, no-cache", chave=(animal_id, geracoes)
+    )
+
+
+@router.get("/{animal_id}/descendentes", response_model=DescendentesAnimal)
+def listar_descendentes(
+    animal_id: int,
+    geracoes: Optional[int] = Query(None, ge=1, description="Limite de gerações (todas se omitido)"),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Lista os descendentes de um animal a partir do grafo genealógico em memória."""
+    grafo = _obter_grafo(db, organizacao.id, animal_id)
+    indices, niveis = grafo.descendentes(animal_id, geracoes)
+
+    return {
+        "animal_id": animal_id,
+        "total": len(indices),
+        "descendentes": [
+            {"id": int(animal), "geracao": int(geracao)}
+            for animal, geracao in zip(grafo.ids[indices], niveis)
+        ],
+    }
+
+
+@router.get("/{animal_id}/resumo-genealogico", response_model=ResumoGenealogico)
+def obter_resumo_genealogico(
+    animal_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém profundidade da genealogia, total de filhos e de descendentes de um animal."""
+    grafo = _obter_grafo(db, organizacao.id, animal_id)
+    indice = grafo.indice_de(animal_id)
+    filhos_pai, filhos_mae = grafo.progenie
+
+    try:
+        geracoes_conhecidas = int(grafo.geracoes[indice])
+    except CicloGenealogicoError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(erro)
+        )
+
+    descendentes, _ = grafo.descendentes(animal_id)
+    return {
+        "animal_id": animal_id,
+        "geracoes_conhecidas": geracoes_conhecidas,
+        "total_filhos": int(filhos_pai[indice] + filhos_mae[indice]),
+        "total_descendentes": len(descendentes),
+    }
+
+
+@router.get("/{animal_id}/parentesco/{outro_id}", response_model=ParentescoAnimais)
+def obter_parentesco(
+    animal_id: int,
+    outro_id: int,
+    geracoes: Optional[int] = Query(None, ge=1, le=50, description="Limite de gerações de cada lado (todas se omitido)"),
+    limite_caminhos: int = Query(10, ge=1, le=100, description="Máximo de caminhos retornados"),
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém os ancestrais comuns mais próximos de dois animais e os caminhos entre eles.
+
+    Usa uma busca bidirecional pelos ancestrais no grafo genealógico em
+    memória, que para assim que os dois lados se encontram e nenhum caminho
+    mais curto é possível, e descreve a relação (ex.: meio-irmãos, primos).
+    """
+    if animal_id == outro_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe dois animais diferentes."
+        )
+
+    grafo = _obter_grafo(db, organizacao.id, animal_id)
+    if not grafo.contem(outro_id):
+        grafo = _obter_grafo(db, organizacao.id, outro_id)
+        if not grafo.contem(animal_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Animal não encontrado."
+            )
+
+    busca = BuscaParentesco(grafo, animal_id, outro_id, geracoes)
+    animais = {
+        linha.id: linha
+        for linha in db.execute(
+            select(Animal.id, Animal.nome, Animal.sexo).where(
+                Animal.organizacao_id == organizacao.id,
+                Animal.id.in_([animal_id, outro_id] + busca.animais_comuns()),
+            )
+        )
+    }
+    return descrever_parentesco(busca, animais, limite_caminhos)
@@ -1,13 +1,14 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.security import FilaSenhasCheiaError, create_access_token, verify_and_update_password
 from app.models.organizacao import Organizacao
 from app.models.usuario_admin_saas import UsuarioAdminSaaS
 from app.schemas.token import Token, TokenPayload
@@ -15,26 +16,51 @@ from app.schemas.token import Token, TokenPayload
 router = APIRouter()
 
 
+def _buscar_admin_por_email(db: Session, email: str) -> Optional[UsuarioAdminSaaS]:
+    return db.query(UsuarioAdminSaaS).filter(UsuarioAdminSaaS.email == email).first()
+
+
+def _atualizar_hash_senha(db: Session, usuario: UsuarioAdminSaaS, senha_hash: str) -> None:
+    usuario.senha_hash = senha_hash
+    db.add(usuario)
+    db.commit()
+
+
 @router.post("/login/admin", response_model=Token)
-def login_admin(
+async def login_admin(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """Endpoint para autenticação de administradores do SaaS."""
-    # Buscar usuário pelo email
-    usuario = db.query(UsuarioAdminSaaS).filter(UsuarioAdminSaaS.email == form_data.username).first()
+    # Buscar usuário pelo email (acesso ao banco fora do loop de eventos)
+    usuario = await run_in_threadpool(_buscar_admin_por_email, db, form_data.username)
+    
+    # Verificar a senha no pool de processos dedicado ao bcrypt
+    senha_valida, novo_hash = False, None
+    if usuario:
+        try:
+            senha_valida, novo_hash = await verify_and_update_password(form_data.password, usuario.senha_hash)
+        except FilaSenhasCheiaError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Muitas tentativas de login simultâneas. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
     
     # Verificar se o usuário existe e se a senha está correta
-    if not usuario or not verify_password(form_data.password, usuario.senha_hash):
+    if not senha_valida:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Regravar o hash se o custo configurado do bcrypt mudou
+    if novo_hash:
+        await run_in_threadpool(_atualizar_hash_senha, db, usuario, novo_hash)
+    
     # Criar token de acesso
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
-        "sub": str(usuario.id),
         "email": usuario.email,
         "tipo": "admin",
         "permissoes": usuario.permissoes
@@ -42,7 +68,7 @@ def login_admin(
     
     return {
         "access_token": create_access_token(
-            payload, expires_delta=access_token_expires
+            usuario.id, expires_delta=access_token_expires, **payload
         ),
         "token_type": "bearer",
     }
@@ -77,7 +103,6 @@ def login_organizacao(
     # Criar token de acesso
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
-        "sub": str(organizacao.id),
         "email": organizacao.email,
         "tipo": "organizacao",
         "plano_id": organizacao.plano_assinatura_id
@@ -85,7 +110,7 @@ def login_organizacao(
     
     return {
         "access_token": create_access_token(
-            payload, expires_delta=access_token_expires
+            organizacao.id, expires_delta=access_token_expires, **payload
         ),
         "token_type": "bearer",
     }
\ No newline at end of file
@@ -0,0 +1,230 @@
+import os
+import re
+import tempfile
+import zipfile
+from typing import Any, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_organizacao
+from app.core.config import settings
+from app.models.animal import Animal
+from app.models.certificado import LoteCertificados, TrabalhoCertificado
+from app.schemas.certificado import (
+    LoteCertificadosResponse,
+    SolicitacaoCertificado,
+    SolicitacaoLoteCertificados,
+    TrabalhoCertificadoResponse,
+)
+from app.schemas.principal import OrganizacaoAutenticada
+from app.services.certificados import FORMATOS_CERTIFICADO, caminho_certificado
+from app.services.fila_certificados import (
+    CONCLUIDO,
+    FALHOU,
+    PENDENTE,
+    PROCESSANDO,
+    LoteCertificadosInvalidoError,
+    executor,
+    situacao_lote,
+    solicitar_certificado,
+    solicitar_lote,
+)
+
+router = APIRouter()
+
+# O arquivo de uma chave nunca muda, mas pertence a uma organização
+CACHE_CERTIFICADO = "private, max-age=31536000, immutable"
+
+_TAMANHO_BLOCO = 64 * 1024
+
+
+def _nome_arquivo(animal_id: int, nome: str, formato: str) -> str:
+    nome = re.sub(r"[^\w\- ]+", "", nome or "").strip().replace(" ", "_")
+    return f"certificado_{animal_id}_{nome}.{formato}" if nome else f"certificado_{animal_id}.{formato}"
+
+
+def _obter_lote(db: Session, lote_id: int, organizacao_id: int) -> LoteCertificados:
+    lote = db.execute(
+        select(LoteCertificados).where(LoteCertificados.id == lote_id, LoteCertificados.organizacao_id == organizacao_id)
+    ).scalar()
+    if not lote:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lote de certificados não encontrado."
+        )
+    return lote
+
+
+def _resposta_lote(db: Session, lote: LoteCertificados) -> LoteCertificadosResponse:
+    contagens = situacao_lote(db, lote.id)
+    return LoteCertificadosResponse(
+        id=lote.id,
+        formato=lote.formato,
+        geracoes=lote.geracoes,
+        filtros=lote.filtros,
+        total=lote.total,
+        pendentes=contagens[PENDENTE] + contagens[PROCESSANDO],
+        concluidos=contagens[CONCLUIDO],
+        falhos=contagens[FALHOU],
+        criado_em=lote.criado_em,
+        arquivo_url=f"{settings.API_V1_STR}/certificados/lotes/{lote.id}/arquivo",
+    )
+
+
+@router.post("/", response_model=TrabalhoCertificadoResponse, status_code=status.HTTP_202_ACCEPTED)
+def solicitar(
+    pedido: SolicitacaoCertificado,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Solicita o certificado de genealogia de um animal, gerado em segundo plano.
+
+    Se nenhum ancestral mudou desde um pedido anterior, o certificado já
+    gerado é reaproveitado e o trabalho retorna concluído.
+    """
+    trabalho = solicitar_certificado(db, organizacao.id, pedido.animal_id, pedido.formato, pedido.geracoes)
+    if not trabalho:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Animal não encontrado."
+        )
+    db.commit()
+    db.refresh(trabalho)
+
+    if trabalho.status != CONCLUIDO:
+        executor.notificar()
+    return trabalho
+
+
+@router.post("/lotes", response_model=LoteCertificadosResponse, status_code=status.HTTP_202_ACCEPTED)
+def solicitar_lote_certificados(
+    pedido: SolicitacaoLoteCertificados,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Solicita os certificados de todos os animais selecionados pelos filtros (ex.: nascidos na temporada)."""
+    try:
+        lote = solicitar_lote(
+            db, organizacao.id, pedido.formato, pedido.geracoes, pedido.dict(exclude={"formato", "geracoes"})
+        )
+    except LoteCertificadosInvalidoError as erro:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro)
+        )
+    db.commit()
+
+    executor.notificar()
+    return _resposta_lote(db, lote)
+
+
+@router.get("/lotes/{lote_id}", response_model=LoteCertificadosResponse)
+def obter_lote(
+    lote_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém o andamento de um lote de certificados."""
+    return _resposta_lote(db, _obter_lote(db, lote_id, organizacao.id))
+
+
+@router.get("/lotes/{lote_id}/arquivo")
+def baixar_lote(
+    lote_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Baixa um arquivo ZIP com os certificados do lote já gerados."""
+    lote = _obter_lote(db, lote_id, organizacao.id)
+    gerados = db.execute(
+        select(TrabalhoCertificado.animal_id, TrabalhoCertificado.chave, Animal.nome)
+        .outerjoin(Animal, and_(
+            Animal.id == TrabalhoCertificado.animal_id, Animal.organizacao_id == TrabalhoCertificado.organizacao_id
+        ))
+        .where(TrabalhoCertificado.lote_id == lote.id, TrabalhoCertificado.status == CONCLUIDO)
+        .order_by(TrabalhoCertificado.animal_id)
+    ).all()
+    gerados = [linha for linha in gerados if os.path.exists(caminho_certificado(linha.chave, lote.formato))]
+    if not gerados:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Nenhum certificado do lote foi gerado ainda."
+        )
+
+    # PDFs já são comprimidos; SVGs (texto) ainda ganham com a compressão
+    compressao = zipfile.ZIP_DEFLATED if lote.formato == "svg" else zipfile.ZIP_STORED
+    arquivo = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+    with zipfile.ZipFile(arquivo, "w", compression=compressao) as compactado:
+        for linha in gerados:
+            compactado.write(
+                caminho_certificado(linha.chave, lote.formato),
+                _nome_arquivo(linha.animal_id, linha.nome, lote.formato),
+            )
+    arquivo.seek(0)
+
+    def blocos() -> Iterator[bytes]:
+        with arquivo:
+            while bloco := arquivo.read(_TAMANHO_BLOCO):
+                yield bloco
+
+    return StreamingResponse(
+        blocos(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="certificados_lote_{lote.id}.zip"'},
+    )
+
+
+@router.get("/{trabalho_id}", response_model=TrabalhoCertificadoResponse)
+def obter_trabalho(
+    trabalho_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Obtém a situação de um certificado solicitado."""
+    trabalho = db.execute(
+        select(TrabalhoCertificado).where(
+            TrabalhoCertificado.id == trabalho_id, TrabalhoCertificado.organizacao_id == organizacao.id
+        )
+    ).scalar()
+    if not trabalho:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificado não encontrado."
+        )
+    return trabalho
+
+
+@router.get("/{trabalho_id}/arquivo")
+def baixar_certificado(
+    trabalho_id: int,
+    db: Session = Depends(get_db),
+    organizacao: OrganizacaoAutenticada = Depends(get_current_organizacao)
+) -> Any:
+    """Baixa o certificado gerado (PDF ou SVG)."""
+    trabalho = obter_trabalho(trabalho_id, db, organizacao)
+    if trabalho.status != CONCLUIDO:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="O certificado ainda não foi gerado." if trabalho.status != FALHOU else "A geração do certificado falhou.",
+        )
+
+    caminho = caminho_certificado(trabalho.chave, trabalho.formato)
+    if not os.path.exists(caminho):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="O arquivo do certificado não está mais disponível; solicite-o novamente."
+        )
+
+    nome = db.execute(
+        select(Animal.nome).where(Animal.id == trabalho.animal_id, Animal.organizacao_id == organizacao.id)
+    ).scalar()
+    return FileResponse(
+        caminho,
+        media_type=FORMATOS_CERTIFICADO[trabalho.formato],
+        filename=_nome_arquivo(trabalho.animal_id, nome, trabalho.formato),
+        headers={"ETag": f'"{trabalho.chave}"', "Cache-Control": CACHE_CERTIFICADO},
+    )
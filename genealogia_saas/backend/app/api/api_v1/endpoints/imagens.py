@@ -0,0 +1,133 @@
+import os
+from typing import Any, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import FileResponse, Response
+
+from app.api.respostas import etag_confere
+from app.services.imagens import (
+    VARIANTES,
+    agendar_variantes,
+    caminho_original,
+    caminho_variante,
+    detectar_tipo,
+    hash_valido,
+)
+
+router = APIRouter()
+
+# O conteúdo de um hash nunca muda: pode ficar em cache indefinidamente
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+
+# Original servido no lugar de uma variante ainda não gerada
+CACHE_PROVISORIO = "public, max-age=60"
+
+
+def _intervalo(cabecalho: str, tamanho: int) -> Optional[Tuple[int, int]]:
+    """Interpreta um cabeçalho Range de intervalo único; None para servir o arquivo inteiro."""
+    unidade, _, intervalos = cabecalho.partition("=")
+    if unidade.strip() != "bytes" or "," in intervalos:
+        # Vários intervalos: o servidor pode responder com o conteúdo completo
+        return None
+    inicio, separador, fim = intervalos.strip().partition("-")
+    if not separador:
+        return None
+    try:
+        if inicio:
+            primeiro = int(inicio)
+            ultimo = min(int(fim), tamanho - 1) if fim else tamanho - 1
+        else:
+            # Sufixo: os últimos N bytes
+            primeiro = max(tamanho - int(fim), 0)
+            ultimo = tamanho - 1
+    except ValueError:
+        return None
+    if primeiro > ultimo or primeiro >= tamanho:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Intervalo solicitado inválido.",
+            headers={"Content-Range": f"bytes */{tamanho}"},
+        )
+    return primeiro, ultimo
+
+
+def _servir(
+    caminho: str,
+    tipo: str,
+    etag: str,
+    cache_control: str,
+    if_none_match: Optional[str],
+    range_: Optional[str],
+    if_range: Optional[str],
+) -> Response:
+    cabecalhos = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    if etag_confere(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+
+    tamanho = os.path.getsize(caminho)
+    intervalo = None
+    if range_ and (not if_range or if_range.strip() == etag):
+        intervalo = _intervalo(range_, tamanho)
+    if intervalo is None:
+        return FileResponse(caminho, media_type=tipo, headers=cabecalhos)
+
+    primeiro, ultimo = intervalo
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(primeiro)
+        conteudo = arquivo.read(ultimo - primeiro + 1)
+    cabecalhos["Content-Range"] = f"bytes {primeiro}-{ultimo}/{tamanho}"
+    return Response(conteudo, status_code=status.HTTP_206_PARTIAL_CONTENT, media_type=tipo, headers=cabecalhos)
+
+
+def _imagem_nao_encontrada() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Imagem não encontrada."
+    )
+
+
+def _servir_original(hash_imagem: str, cache_control: str, *cabecalhos: Optional[str]) -> Response:
+    caminho = caminho_original(hash_imagem)
+    if not os.path.exists(caminho):
+        raise _imagem_nao_encontrada()
+
+    with open(caminho, "rb") as arquivo:
+        tipo = detectar_tipo(arquivo.read(16)) or "application/octet-stream"
+    return _servir(caminho, tipo, f'"{hash_imagem}"', cache_control, *cabecalhos)
+
+
+@router.get("/{hash_imagem}")
+def obter_imagem(
+    hash_imagem: str,
+    if_none_match: Optional[str] = Header(None),
+    range_: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+) -> Any:
+    """Obtém a foto original, identificada pelo hash do conteúdo."""
+    if not hash_valido(hash_imagem):
+        raise _imagem_nao_encontrada()
+
+    return _servir_original(hash_imagem, CACHE_IMUTAVEL, if_none_match, range_, if_range)
+
+
+@router.get("/{hash_imagem}/{variante}")
+def obter_variante_imagem(
+    hash_imagem: str,
+    variante: str,
+    if_none_match: Optional[str] = Header(None),
+    range_: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+) -> Any:
+    """Obtém uma versão reduzida da foto (miniatura ou media)."""
+    if variante not in VARIANTES or not hash_valido(hash_imagem):
+        raise _imagem_nao_encontrada()
+
+    caminho = caminho_variante(hash_imagem, variante)
+    if os.path.exists(caminho):
+        etag = f'"{hash_imagem}-{variante}"'
+        return _servir(caminho, "image/jpeg", etag, CACHE_IMUTAVEL, if_none_match, range_, if_range)
+
+    # Variante ainda não gerada (ou com falha): agendar e servir o original por pouco tempo
+    resposta = _servir_original(hash_imagem, CACHE_PROVISORIO, if_none_match, range_, if_range)
+    agendar_variantes(hash_imagem)
+    return resposta
@@ -1,26 +1,68 @@
-from typing import Any, List
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
 
-from app.api.deps import get_db, get_current_user_admin
+from app.api.deps import get_async_db, get_db, get_current_user_admin, invalidar_organizacao_autenticada
+from app.api.projecao import (
+    DESCRICAO_CAMPOS,
+    campos_do_esquema,
+    campos_solicitados,
+    itens_projetados,
+    selecionar_campos,
+)
+from app.core.serializacao import RespostaJSON
+from app.db.paginacao import CursorInvalidoError, estimar_total_async, paginar_async, paginar_linhas_async
+from app.db.particoes import criar_particoes, excluir_dados_organizacao
 from app.models.organizacao import Organizacao
 from app.models.plano_assinatura import PlanoAssinatura
 from app.schemas.organizacao import OrganizacaoCreate, OrganizacaoUpdate, OrganizacaoResponse
+from app.schemas.paginacao import Pagina
 
 router = APIRouter()
 
+# Campos que podem ser pedidos na listagem com `fields` (colunas de OrganizacaoResponse)
+CAMPOS_LISTAGEM = campos_do_esquema(OrganizacaoResponse, Organizacao)
 
-@router.get("/", response_model=List[OrganizacaoResponse])
-def listar_organizacoes(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+
+@router.get("/", response_model=Pagina[OrganizacaoResponse])
+async def listar_organizacoes(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = Query(None, description="Cursor retornado pela página anterior"),
+    limit: int = Query(100, ge=1, le=500),
+    estimar: bool = Query(False, description="Incluir uma estimativa do total de organizações"),
+    campos: Optional[str] = Query(None, alias="fields", description=DESCRICAO_CAMPOS),
     admin = Depends(get_current_user_admin)
 ) -> Any:
-    """Lista todas as organizações cadastradas."""
-    organizacoes = db.query(Organizacao).offset(skip).limit(limit).all()
-    return organizacoes
+    """Lista as organizações cadastradas por nome, com paginação por cursor.
+
+    Com `fields`, apenas as colunas pedidas são lidas e os itens vão direto ao
+    JSON, sem objetos ORM nem validação item a item.
+    """
+    selecionados = campos_solicitados(campos, CAMPOS_LISTAGEM)
+    chaves = [Organizacao.nome, Organizacao.id]
+    try:
+        if selecionados:
+            consulta = selecionar_campos(Organizacao, selecionados, chaves)
+            organizacoes, proximo_cursor = await paginar_linhas_async(db, consulta, chaves, cursor, limit)
+        else:
+            # Relacionamentos nunca são carregados implicitamente na sessão assíncrona
+            consulta = select(Organizacao).options(raiseload("*"))
+            organizacoes, proximo_cursor = await paginar_async(db, consulta, chaves, cursor, limit)
+    except CursorInvalidoError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(erro)
+        )
+
+    pagina = {
+        "itens": itens_projetados(selecionados, organizacoes) if selecionados else organizacoes,
+        "proximo_cursor": proximo_cursor,
+        "total_estimado": await estimar_total_async(db, consulta) if estimar else None,
+    }
+    return RespostaJSON(pagina) if selecionados else pagina
 
 
 @router.post("/", response_model=OrganizacaoResponse, status_code=status.HTTP_201_CREATED)
@@ -67,6 +109,9 @@ def criar_organizacao(
     )
     
     db.add(organizacao)
+    db.flush()
+    # Partições próprias da organização para animais e índice de ancestralidade
+    criar_particoes(db, organizacao.id)
     db.commit()
     db.refresh(organizacao)
     
@@ -141,6 +186,7 @@ def atualizar_organizacao(
     db.add(organizacao)
     db.commit()
     db.refresh(organizacao)
+    invalidar_organizacao_autenticada(organizacao.id)
     
     return organizacao
 
@@ -160,8 +206,10 @@ def excluir_organizacao(
             detail="Organização não encontrada."
         )
     
-    # Excluir a organização
+    # Excluir os animais (descartando as partições da organização, se houver) e a organização
+    excluir_dados_organizacao(db, organizacao_id)
     db.delete(organizacao)
     db.commit()
+    invalidar_organizacao_autenticada(organizacao_id)
     
     return None
\ No newline at end of file
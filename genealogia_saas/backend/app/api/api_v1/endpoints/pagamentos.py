@@ -0,0 +1,67 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.config import settings
+from app.schemas.pagamento import NotificacaoPagamento, ResultadoWebhook
+from app.services.pagamentos import assinatura_valida, consumidor, registrar_eventos
+
+router = APIRouter()
+
+
+def _enfileirar(db: Session, notificacao: NotificacaoPagamento) -> int:
+    novos = registrar_eventos(
+        db,
+        (
+            {
+                "evento_id": evento.evento_id,
+                "organizacao_id": evento.organizacao_id,
+                "tipo": evento.tipo,
+                "ocorrido_em": evento.ocorrido_em,
+                "payload": evento.dados,
+            }
+            for evento in notificacao.eventos
+        ),
+    )
+    db.commit()
+    return novos
+
+
+@router.post("/webhook", response_model=ResultadoWebhook, status_code=status.HTTP_202_ACCEPTED)
+async def receber_webhook(
+    request: Request,
+    db: Session = Depends(get_db),
+    x_assinatura: Optional[str] = Header(None),
+) -> Any:
+    """Recebe notificações do provedor de pagamentos.
+
+    Apenas valida a assinatura, descarta eventos repetidos e os enfileira; o
+    status das assinaturas é atualizado em lote pelo consumidor em segundo plano.
+    """
+    if not settings.PAGAMENTOS_WEBHOOK_SEGREDO:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook de pagamentos não configurado.",
+        )
+
+    corpo = await request.body()
+    if not assinatura_valida(corpo, x_assinatura):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Assinatura da notificação inválida.",
+        )
+
+    try:
+        notificacao = NotificacaoPagamento.parse_raw(corpo)
+    except ValidationError as erro:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=erro.errors())
+
+    novos = await run_in_threadpool(_enfileirar, db, notificacao)
+    if novos:
+        consumidor.notificar()
+
+    return {"recebidos": len(notificacao.eventos), "novos": novos}
@@ -0,0 +1,36 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user_admin, get_db
+from app.schemas.painel import ResumoPainel
+from app.schemas.principal import AdminAutenticado
+from app.services.painel import atualizar_resumos, obter_resumo
+
+router = APIRouter()
+
+
+@router.get("/resumo", response_model=ResumoPainel)
+def obter_resumo_painel(
+    db: Session = Depends(get_db),
+    admin: AdminAutenticado = Depends(get_current_user_admin)
+) -> Any:
+    """Obtém os números da plataforma, lidos das tabelas de resumo pré-calculadas."""
+    return obter_resumo(db)
+
+
+@router.post("/resumo/atualizacao", response_model=ResumoPainel)
+def atualizar_resumo_painel(
+    db: Session = Depends(get_db),
+    admin: AdminAutenticado = Depends(get_current_user_admin)
+) -> Any:
+    """Recalcula imediatamente os números da plataforma."""
+    if atualizar_resumos(db) is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Os resumos já estão sendo atualizados. Tente novamente em instantes."
+        )
+    db.commit()
+
+    return obter_resumo(db)
@@ -0,0 +1,47 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.api.deps import get_async_db
+from app.api.respostas import resposta_condicional
+from app.db.versoes import PLANOS, obter_versao_async
+from app.models.plano_assinatura import PlanoAssinatura
+from app.schemas.plano_assinatura import PlanoAssinaturaResponse
+
+router = APIRouter()
+
+# Página pública: navegadores e CDN podem guardar, mas revalidam (ETag) a cada uso
+CACHE_PLANOS = "public, no-cache"
+
+
+@router.get("/", response_model=List[PlanoAssinaturaResponse])
+async def listar_planos(request: Request, db: AsyncSession = Depends(get_async_db)) -> Any:
+    """Lista os planos de assinatura disponíveis, do mais barato ao mais caro."""
+    async def conteudo() -> List[PlanoAssinaturaResponse]:
+        resultado = await db.execute(
+            select(PlanoAssinatura).options(raiseload("*")).order_by(PlanoAssinatura.preco, PlanoAssinatura.id)
+        )
+        return [PlanoAssinaturaResponse.from_orm(plano) for plano in resultado.scalars()]
+
+    versao = await obter_versao_async(db, PLANOS)
+    return await resposta_condicional(request, PLANOS, 0, versao, conteudo, CACHE_PLANOS)
+
+
+@router.get("/{plano_id}", response_model=PlanoAssinaturaResponse)
+async def obter_plano(plano_id: int, request: Request, db: AsyncSession = Depends(get_async_db)) -> Any:
+    """Obtém um plano de assinatura pelo ID."""
+    plano = await db.get(PlanoAssinatura, plano_id, options=[raiseload("*")])
+    if not plano:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plano de assinatura não encontrado."
+        )
+
+    async def conteudo() -> PlanoAssinaturaResponse:
+        return PlanoAssinaturaResponse.from_orm(plano)
+
+    versao = await obter_versao_async(db, PLANOS)
+    return await resposta_condicional(request, PLANOS, 0, versao, conteudo, CACHE_PLANOS)
@@ -1,15 +1,19 @@
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import CacheTTL
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.models.organizacao import Organizacao
 from app.models.usuario_admin_saas import UsuarioAdminSaaS
+from app.schemas.principal import AdminAutenticado, OrganizacaoAutenticada
 from app.schemas.token import TokenPayload
 
 # Configuração do OAuth2 para autenticação via token
@@ -24,6 +28,11 @@ oauth2_scheme_organizacao = OAuth2PasswordBearer(
     scheme_name="JWT"
 )
 
+# Caches por processo: tokens já decodificados e dados dos usuários autenticados
+_tokens: CacheTTL[TokenPayload] = CacheTTL(settings.TOKENS_CACHE_TTL_SEGUNDOS)
+_organizacoes: CacheTTL[OrganizacaoAutenticada] = CacheTTL(settings.PRINCIPAIS_CACHE_TTL_SEGUNDOS)
+_admins: CacheTTL[AdminAutenticado] = CacheTTL(settings.PRINCIPAIS_CACHE_TTL_SEGUNDOS)
+
 
 def get_db() -> Generator:
     """Dependência para obter uma sessão do banco de dados."""
@@ -34,71 +43,93 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user_admin(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> UsuarioAdminSaaS:
-    """Obtém o usuário administrador atual a partir do token JWT."""
-    try:
-        # Decodificar o token JWT
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-        token_data = TokenPayload(**payload)
-        
-        # Verificar se o token é de um administrador
-        if payload.get("tipo") != "admin":
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependência para obter uma sessão assíncrona do banco de dados."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def invalidar_organizacao_autenticada(organizacao_id: int) -> None:
+    """Descarta do cache os dados de uma organização alterada ou excluída."""
+    _organizacoes.remover(organizacao_id)
+
+
+def invalidar_admin_autenticado(usuario_id: int) -> None:
+    """Descarta do cache os dados de um administrador alterado ou excluído."""
+    _admins.remover(usuario_id)
+
+
+def _decodificar_token(token: str, tipo: str) -> TokenPayload:
+    """Decodifica o token JWT (ou o obtém do cache) e verifica o tipo de usuário."""
+    token_data = _tokens.obter(token)
+    if token_data is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=["HS256"]
+            )
+            token_data = TokenPayload(**payload)
+            int(token_data.sub)
+        except (JWTError, ValidationError, TypeError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Não autorizado. Acesso apenas para administradores.",
+                detail="Não foi possível validar as credenciais",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-    except (JWTError, ValidationError):
+        # O token não pode permanecer no cache além da própria expiração
+        expiracao = payload.get("exp")
+        _tokens.definir(token, token_data, expiracao - time.time() if expiracao else None)
+
+    if token_data.tipo != tipo:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Não foi possível validar as credenciais",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Buscar o usuário no banco de dados
-    user = db.query(UsuarioAdminSaaS).filter(UsuarioAdminSaaS.id == int(token_data.sub)).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário não encontrado",
+            detail=(
+                "Não autorizado. Acesso apenas para administradores."
+                if tipo == "admin"
+                else "Não autorizado. Acesso apenas para organizações."
+            ),
         )
-    return user
+    return token_data
+
+
+def get_current_user_admin(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> AdminAutenticado:
+    """Obtém o usuário administrador atual a partir do token JWT."""
+    token_data = _decodificar_token(token, "admin")
+    usuario_id = int(token_data.sub)
+
+    # Buscar o usuário no banco de dados apenas se não estiver em cache
+    admin = _admins.obter(usuario_id)
+    if admin is None:
+        user = db.query(UsuarioAdminSaaS).filter(UsuarioAdminSaaS.id == usuario_id).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuário não encontrado",
+            )
+        admin = AdminAutenticado.from_orm(user)
+        _admins.definir(usuario_id, admin)
+    return admin
 
 
 def get_current_organizacao(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme_organizacao)
-) -> Organizacao:
+) -> OrganizacaoAutenticada:
     """Obtém a organização atual a partir do token JWT."""
-    try:
-        # Decodificar o token JWT
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-        token_data = TokenPayload(**payload)
-        
-        # Verificar se o token é de uma organização
-        if payload.get("tipo") != "organizacao":
+    token_data = _decodificar_token(token, "organizacao")
+    organizacao_id = int(token_data.sub)
+
+    # Buscar a organização no banco de dados apenas se não estiver em cache
+    organizacao = _organizacoes.obter(organizacao_id)
+    if organizacao is None:
+        registro = db.query(Organizacao).filter(Organizacao.id == organizacao_id).first()
+        if not registro:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Não autorizado. Acesso apenas para organizações.",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organização não encontrada",
             )
-    except (JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Não foi possível validar as credenciais",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Buscar a organização no banco de dados
-    organizacao = db.query(Organizacao).filter(Organizacao.id == int(token_data.sub)).first()
-    if not organizacao:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organização não encontrada",
-        )
+        organizacao = OrganizacaoAutenticada.from_orm(registro)
+        _organizacoes.definir(organizacao_id, organizacao)
     
     # Verificar se a assinatura está ativa
     if not organizacao.assinatura_ativa:
@@ -107,4 +138,4 @@ def get_current_organizacao(
             detail="Assinatura inativa. Por favor, renove sua assinatura para continuar.",
         )
     
-    return organizacao
\ No newline at end of file
+    return organizacao
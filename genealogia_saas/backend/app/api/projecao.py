@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+# Descrição comum do parâmetro `fields` das listagens
+DESCRICAO_CAMPOS = "Campos retornados, separados por vírgula (ex.: id,nome); omitido = todos"
+
+
+def campos_do_esquema(esquema: Any, modelo: Any) -> List[str]:
+    """Campos do esquema de resposta que correspondem a colunas do modelo, na ordem do esquema."""
+    colunas = modelo.__table__.columns
+    return [campo for campo in esquema.__fields__ if campo in colunas]
+
+
+def campos_solicitados(campos: Optional[str], disponiveis: Sequence[str]) -> Optional[List[str]]:
+    """Lê o parâmetro `fields` (nomes separados por vírgula); None se não informado."""
+    if campos is None:
+        return None
+    solicitados = list(dict.fromkeys(campo.strip() for campo in campos.split(",") if campo.strip()))
+    invalidos = [campo for campo in solicitados if campo not in disponiveis]
+    if not solicitados or invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos: {', '.join(invalidos) or campos!r}. Disponíveis: {', '.join(disponiveis)}.",
+        )
+    return solicitados
+
+
+def selecionar_campos(modelo: Any, campos: Sequence[str], chaves: Sequence[InstrumentedAttribute] = ()) -> Select:
+    """Consulta apenas das colunas pedidas, seguidas das chaves de paginação que faltarem."""
+    colunas = list(campos) + [chave.key for chave in chaves if chave.key not in campos]
+    return select(*(getattr(modelo, coluna) for coluna in colunas))
+
+
+def itens_projetados(campos: Sequence[str], linhas: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Converte as linhas em dicionários com os campos pedidos (descarta as chaves extras)."""
+    return [dict(zip(campos, linha)) for linha in linhas]
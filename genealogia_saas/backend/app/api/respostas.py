@@ -0,0 +1,78 @@
+import zlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.core.cache import CacheTTL
+from app.core.config import settings
+from app.core.serializacao import json_bytes
+from app.db.versoes import Versao
+
+# Respostas já serializadas, por (recurso, organização, versão, chave da consulta).
+# Uma alteração muda a versão: entradas antigas deixam de ser usadas e expiram
+_respostas: CacheTTL[bytes] = CacheTTL(settings.RESPOSTAS_CACHE_TTL_SEGUNDOS, settings.RESPOSTAS_CACHE_TAMANHO)
+
+
+def etag_confere(cabecalho: Optional[str], etag: str) -> bool:
+    """Compara um cabeçalho If-None-Match com a ETag (comparação fraca, ignorando o prefixo W/)."""
+    if not cabecalho:
+        return False
+    if cabecalho.strip() == "*":
+        return True
+    opaco = etag.removeprefix("W/")
+    return any(item.strip().removeprefix("W/") == opaco for item in cabecalho.split(","))
+
+
+def _nao_modificado_desde(cabecalho: str, versao: Versao) -> bool:
+    if versao.atualizado_em is None:
+        return False
+    try:
+        data = parsedate_to_datetime(cabecalho).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return False
+    return versao.atualizado_em.replace(microsecond=0) <= data
+
+
+async def resposta_condicional(
+    request: Request,
+    recurso: str,
+    organizacao_id: int,
+    versao: Versao,
+    conteudo: Callable[[], Awaitable[Any]],
+    cache_control: str,
+    chave: Hashable = None,
+) -> Response:
+    """Monta a resposta JSON de um recurso versionado, com ETag e Last-Modified.
+
+    Responde 304 quando o cliente já tem a versão atual (If-None-Match ou
+    If-Modified-Since). Caso contrário usa a resposta em cache para a versão
+    ou chama `conteudo`, que deve retornar os dados já validados pelo esquema.
+    `chave` distingue respostas diferentes do mesmo recurso (ex.: parâmetros).
+    """
+    chave = chave if chave is not None else (request.url.path, str(request.query_params))
+    # O hash da chave é estável entre processos, para que a ETag valha em qualquer worker
+    etag = f'W/"{recurso}-{organizacao_id}-{versao.numero}-{zlib.crc32(repr(chave).encode()):08x}"'
+    cabecalhos: Dict[str, str] = {"ETag": etag, "Cache-Control": cache_control}
+    if versao.atualizado_em is not None:
+        cabecalhos["Last-Modified"] = format_datetime(
+            versao.atualizado_em.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+        )
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if etag_confere(if_none_match, etag) or (
+        not if_none_match and if_modified_since and _nao_modificado_desde(if_modified_since, versao)
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+
+    chave_cache = (recurso, organizacao_id, versao.numero, chave)
+    corpo: Optional[bytes] = _respostas.obter(chave_cache)
+    if corpo is None:
+        corpo = json_bytes(jsonable_encoder(await conteudo()))
+        _respostas.definir(chave_cache, corpo)
+
+    return Response(corpo, media_type="application/json", headers=cabecalhos)
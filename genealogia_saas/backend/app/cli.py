@@ -0,0 +1,278 @@
+"""Comandos administrativos executados fora da API.
+
+Uso: python -m app.cli <comando> [opções]
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from app.db.session import SessionLocal
+
+
+def inicializar_banco(args: argparse.Namespace) -> int:
+    """Cria os planos padrão e o administrador padrão, se ainda não existirem."""
+    from app.db.init_db import init_db
+
+    db = SessionLocal()
+    try:
+        init_db(db)
+    finally:
+        db.close()
+
+    print("Dados iniciais verificados.")
+    return 0
+
+
+def importar_animais(args: argparse.Namespace) -> int:
+    """Importa um arquivo CSV ou JSON-lines de animais para uma organização."""
+    from app.services.importacao import (
+        ImportacaoInvalidaError,
+        LimitePlanoExcedidoError,
+        detectar_formato,
+        importar_animais as importar,
+        ler_registros,
+    )
+
+    formato = args.formato or detectar_formato(args.arquivo)
+    if not formato:
+        print("Não foi possível detectar o formato do arquivo; use --formato.", file=sys.stderr)
+        return 2
+
+    db = SessionLocal()
+    try:
+        with open(args.arquivo, "rb") as arquivo:
+            resultado = importar(db, args.organizacao, ler_registros(arquivo, formato))
+        db.commit()
+    except ImportacaoInvalidaError as erro:
+        db.rollback()
+        for mensagem in erro.erros:
+            print(mensagem, file=sys.stderr)
+        return 1
+    except LimitePlanoExcedidoError as erro:
+        db.rollback()
+        print(str(erro), file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(f"{resultado['total_importados']} animais importados em {resultado['geracoes']} gerações.")
+    return 0
+
+
+def reconciliar_contadores(args: argparse.Namespace) -> int:
+    """Corrige os contadores de animais das organizações que divergem da contagem real."""
+    from sqlalchemy import select
+
+    from app.models.organizacao import Organizacao
+    from app.services.contador_animais import reconciliar_contador
+
+    db = SessionLocal()
+    corrigidas = 0
+    try:
+        organizacoes = [args.organizacao] if args.organizacao else db.execute(
+            select(Organizacao.id).order_by(Organizacao.id)
+        ).scalars().all()
+        # Uma transação por organização: a linha fica bloqueada apenas durante a sua contagem
+        for organizacao_id in organizacoes:
+            corrigidas += reconciliar_contador(db, organizacao_id)
+            db.commit()
+    finally:
+        db.close()
+
+    print(f"{corrigidas} organizações com contador corrigido.")
+    return 0
+
+
+def reconstruir_indice(args: argparse.Namespace) -> int:
+    """Reconstrói o índice de ancestralidade usado na validação de genitores."""
+    from sqlalchemy import select
+
+    from app.models.organizacao import Organizacao
+    from app.services.ancestralidade import reconstruir_indice as reconstruir
+    from app.services.grafo_genealogico import CicloGenealogicoError
+
+    db = SessionLocal()
+    falhas = 0
+    try:
+        organizacoes = [args.organizacao] if args.organizacao else db.execute(
+            select(Organizacao.id).order_by(Organizacao.id)
+        ).scalars().all()
+        # Uma transação por organização, para manter os locks curtos
+        for organizacao_id in organizacoes:
+            try:
+                reconstruir(db, organizacao_id)
+                db.commit()
+            except CicloGenealogicoError as erro:
+                db.rollback()
+                falhas += 1
+                print(str(erro), file=sys.stderr)
+    finally:
+        db.close()
+
+    print(f"Índice de ancestralidade reconstruído para {len(organizacoes) - falhas} organizações.")
+    return 1 if falhas else 0
+
+
+def atualizar_painel(args: argparse.Namespace) -> int:
+    """Recalcula as tabelas de resumo do painel administrativo."""
+    from app.services.painel import agendador
+
+    if agendador.atualizar() is None:
+        print("Os resumos já estão sendo atualizados por outro processo.", file=sys.stderr)
+        return 1
+
+    print("Resumos do painel atualizados.")
+    return 0
+
+
+def particionar_animais(args: argparse.Namespace) -> int:
+    """Converte as tabelas de animais em tabelas particionadas por organização."""
+    from app.db.particoes import ParticionamentoError, particionamento_ativo, substituir_tabelas
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            print("O particionamento de animais requer PostgreSQL.", file=sys.stderr)
+            return 1
+        if particionamento_ativo(db):
+            print("As tabelas de animais já estão particionadas.")
+            return 0
+        try:
+            substituir_tabelas(db, particionar=True)
+            db.commit()
+        except ParticionamentoError as erro:
+            db.rollback()
+            print(str(erro), file=sys.stderr)
+            return 1
+    finally:
+        db.close()
+
+    print("Tabelas de animais particionadas por organização.")
+    return 0
+
+
+def criar_particoes(args: argparse.Namespace) -> int:
+    """Cria as partições das organizações que ainda usam a partição padrão."""
+    from app.db.particoes import criar_particoes as criar, organizacoes_sem_particao, particionamento_ativo
+
+    db = SessionLocal()
+    try:
+        if not particionamento_ativo(db):
+            print("A tabela de animais não está particionada (use `particionar-animais`).", file=sys.stderr)
+            return 1
+        organizacoes = [args.organizacao] if args.organizacao else organizacoes_sem_particao(db)
+        # Uma transação por organização, para manter os locks curtos
+        for organizacao_id in organizacoes:
+            criar(db, organizacao_id)
+            db.commit()
+    finally:
+        db.close()
+
+    print(f"Partições criadas para {len(organizacoes)} organizações.")
+    return 0
+
+
+def processar_certificados(args: argparse.Namespace) -> int:
+    """Executa a fila de certificados em primeiro plano, até ser interrompido (Ctrl+C)."""
+    import threading
+
+    from app.core.config import settings
+    from app.services.fila_certificados import ExecutorCertificados
+
+    executor = ExecutorCertificados(SessionLocal, args.processos or max(settings.CERTIFICADOS_PROCESSOS, 1))
+    if args.uma_vez:
+        try:
+            total = executor.processar_pendentes()
+        finally:
+            executor.parar()
+        print(f"{total} trabalhos de certificado processados.")
+        return 0
+
+    executor.iniciar()
+    print(f"Processando certificados com {executor.processos} processos; Ctrl+C para encerrar.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.parar()
+    return 0
+
+
+def limpar_certificados(args: argparse.Namespace) -> int:
+    """Remove trabalhos de certificado antigos e os arquivos que não são mais usados."""
+    from app.core.config import settings
+    from app.services.fila_certificados import limpar_certificados as limpar
+
+    db = SessionLocal()
+    try:
+        trabalhos, arquivos = limpar(db, args.dias or settings.CERTIFICADOS_RETENCAO_DIAS)
+    finally:
+        db.close()
+
+    print(f"{trabalhos} trabalhos e {arquivos} arquivos de certificado removidos.")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Comandos administrativos do Genealogia SaaS.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    inicializar = comandos.add_parser(
+        "inicializar-banco", help="Cria os dados iniciais (planos e administrador padrão); executar após as migrações."
+    )
+    inicializar.set_defaults(executar=inicializar_banco)
+
+    importar = comandos.add_parser("importar-animais", help="Importa animais de um arquivo CSV ou JSON-lines.")
+    importar.add_argument("arquivo", help="Caminho do arquivo (.csv, .jsonl ou .ndjson)")
+    importar.add_argument("--organizacao", type=int, required=True, help="ID da organização de destino")
+    importar.add_argument("--formato", choices=["csv", "jsonl"], help="Formato do arquivo (detectado pela extensão)")
+    importar.set_defaults(executar=importar_animais)
+
+    reconciliar = comandos.add_parser(
+        "reconciliar-contadores", help="Corrige os contadores de animais das organizações."
+    )
+    reconciliar.add_argument("--organizacao", type=int, help="ID de uma organização (todas se omitido)")
+    reconciliar.set_defaults(executar=reconciliar_contadores)
+
+    indice = comandos.add_parser(
+        "reconstruir-indice",
+        help="Reconstrói o índice de ancestralidade (obrigatório para animais cadastrados antes dele).",
+    )
+    indice.add_argument("--organizacao", type=int, help="ID de uma organização (todas se omitido)")
+    indice.set_defaults(executar=reconstruir_indice)
+
+    particionar = comandos.add_parser(
+        "particionar-animais",
+        help="Particiona as tabelas de animais por organização (bloqueia os animais; usar em manutenção).",
+    )
+    particionar.set_defaults(executar=particionar_animais)
+
+    particoes = comandos.add_parser(
+        "criar-particoes", help="Cria as partições de animais das organizações que ainda não as têm."
+    )
+    particoes.add_argument("--organizacao", type=int, help="ID de uma organização (todas sem partição se omitido)")
+    particoes.set_defaults(executar=criar_particoes)
+
+    painel = comandos.add_parser("atualizar-painel", help="Recalcula os resumos do painel administrativo.")
+    painel.set_defaults(executar=atualizar_painel)
+
+    certificados = comandos.add_parser(
+        "processar-certificados", help="Gera os certificados pendentes (quando CERTIFICADOS_PROCESSOS=0 na API)."
+    )
+    certificados.add_argument("--processos", type=int, help="Processos de renderização (padrão: CERTIFICADOS_PROCESSOS)")
+    certificados.add_argument("--uma-vez", action="store_true", help="Encerrar quando a fila esvaziar")
+    certificados.set_defaults(executar=processar_certificados)
+
+    limpeza = comandos.add_parser(
+        "limpar-certificados", help="Remove trabalhos de certificado antigos e os arquivos não referenciados."
+    )
+    limpeza.add_argument("--dias", type=int, help="Dias de retenção (padrão: CERTIFICADOS_RETENCAO_DIAS)")
+    limpeza.set_defaults(executar=limpar_certificados)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
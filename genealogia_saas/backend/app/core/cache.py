@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheTTL(Generic[V]):
+    """Cache em memória (por processo) com expiração por tempo e tamanho máximo.
+
+    Quando o tamanho máximo é atingido, as entradas usadas há mais tempo são
+    descartadas primeiro. Seguro para uso entre threads.
+    """
+
+    def __init__(self, ttl_segundos: float, tamanho_maximo: int = 10000):
+        self.ttl_segundos = ttl_segundos
+        self.tamanho_maximo = tamanho_maximo
+        self._itens: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: Hashable) -> Optional[V]:
+        """Retorna o valor armazenado ou None se ausente ou expirado."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return item[1]
+
+    def definir(self, chave: Hashable, valor: V, ttl_segundos: Optional[float] = None) -> None:
+        """Armazena um valor; `ttl_segundos` pode apenas encurtar o TTL padrão."""
+        ttl = self.ttl_segundos if ttl_segundos is None else min(ttl_segundos, self.ttl_segundos)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+
+    def remover(self, chave: Hashable) -> None:
+        """Remove uma entrada, se existir."""
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
@@ -47,6 +47,84 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    # Mesmo banco, acessado pelo driver assíncrono (asyncpg)
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
+
+    @validator("SQLALCHEMY_ASYNC_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        uri = str(values.get("SQLALCHEMY_DATABASE_URI") or "")
+        for prefixo in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+            if uri.startswith(prefixo):
+                return "postgresql+asyncpg://" + uri[len(prefixo):]
+        return uri
+
+    # Pool de conexões (por processo/worker do uvicorn). Com BANCO_PGBOUNCER o pool
+    # local é desativado e o asyncpg não usa instruções preparadas no servidor
+    BANCO_POOL_TAMANHO: int = 5
+    BANCO_POOL_EXCEDENTE: int = 10
+    BANCO_POOL_TIMEOUT_SEGUNDOS: float = 30
+    BANCO_POOL_RECICLAR_SEGUNDOS: int = 1800
+    BANCO_POOL_PRE_PING: bool = False  # uma ida ao banco a mais por checkout
+    BANCO_PGBOUNCER: bool = False
+    BANCO_STATEMENT_TIMEOUT_MS: int = 0  # 0 = sem limite
+
+    # Registrar em log (com as instruções SQL) requisições mais lentas que este limite; 0 = desativado
+    LOG_REQUISICOES_LENTAS_MS: int = 0
+
+    # Grafo genealógico em memória (por processo). Alterações de outros processos são detectadas pela
+    # versão da genealogia no banco; o TTL só limita a idade do grafo para alterações feitas fora do ORM
+    GRAFO_GENEALOGICO_TTL_SEGUNDOS: int = 300
+
+    # Consanguinidade: recálculos com até este número de animais afetados são feitos na própria
+    # requisição; os maiores (e o primeiro cálculo de cada organização) em processos dedicados
+    CONSANGUINIDADE_RECALCULO_SINCRONO_MAXIMO: int = 200
+    CONSANGUINIDADE_PROCESSOS: int = 1
+
+    # Cache por processo da autenticação: tokens decodificados e dados de organizações/administradores.
+    # Alterações feitas por outro processo são vistas após no máximo PRINCIPAIS_CACHE_TTL_SEGUNDOS
+    TOKENS_CACHE_TTL_SEGUNDOS: int = 300
+    PRINCIPAIS_CACHE_TTL_SEGUNDOS: int = 30
+
+    # Senhas: custo do bcrypt e pool de processos dedicado às operações de hash
+    BCRYPT_ROUNDS: int = 12
+    SENHAS_PROCESSOS: int = 2
+    SENHAS_FILA_MAXIMA: int = 32  # operações aguardando antes de recusar com 503
+
+    # Índice de busca em memória, usado quando o banco não é o PostgreSQL
+    BUSCA_INDICE_TTL_SEGUNDOS: int = 300
+
+    # Webhook de pagamentos: segredo do HMAC (vazio = webhook desativado) e consumidor da fila de eventos
+    PAGAMENTOS_WEBHOOK_SEGREDO: str = ""
+    PAGAMENTOS_TAMANHO_LOTE: int = 500
+    PAGAMENTOS_MAXIMO_TENTATIVAS: int = 5
+    PAGAMENTOS_INTERVALO_SEGUNDOS: float = 2
+
+    # Imagens dos animais: diretório do armazenamento (endereçado pelo hash do conteúdo),
+    # tamanho máximo do envio e processos dedicados à geração das miniaturas
+    MEDIA_DIR: str = "media"
+    IMAGENS_TAMANHO_MAXIMO_MB: int = 10
+    IMAGENS_PROCESSOS: int = 2
+
+    # Cache por processo das respostas de recursos versionados (planos e árvores genealógicas)
+    RESPOSTAS_CACHE_TTL_SEGUNDOS: int = 300
+    RESPOSTAS_CACHE_TAMANHO: int = 2000
+
+    # Intervalo de atualização das tabelas de resumo do painel administrativo; 0 = apenas sob demanda
+    PAINEL_ATUALIZACAO_SEGUNDOS: int = 300
+
+    # Certificados de genealogia: processos de renderização por worker (0 = gerados apenas pelo
+    # comando `python -m app.cli processar-certificados`), tentativas, tempo máximo de cada
+    # certificado (também o prazo para renovar a reserva de um trabalho), animais por lote e dias
+    # de retenção dos trabalhos concluídos
+    CERTIFICADOS_PROCESSOS: int = 2
+    CERTIFICADOS_MAXIMO_TENTATIVAS: int = 3
+    CERTIFICADOS_TIMEOUT_SEGUNDOS: float = 120
+    CERTIFICADOS_INTERVALO_SEGUNDOS: float = 2
+    CERTIFICADOS_LOTE_MAXIMO: int = 2000
+    CERTIFICADOS_RETENCAO_DIAS: int = 30
+
     class Config:
         case_sensitive = True
         env_file = ".env"
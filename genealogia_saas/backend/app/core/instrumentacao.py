@@ -0,0 +1,138 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metricas import contador, histograma, medidor
+
+logger = logging.getLogger("app.requisicoes_lentas")
+
+# Limites dos histogramas de quantidade de consultas por requisição
+LIMITES_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+# Quantidade máxima de instruções SQL guardadas para o log de requisições lentas
+MAXIMO_INSTRUCOES_LOG = 50
+
+
+class EstatisticasRequisicao:
+    """Consultas ao banco feitas durante uma requisição."""
+
+    __slots__ = ("consultas", "tempo_banco", "instrucoes")
+
+    def __init__(self, guardar_instrucoes: bool):
+        self.consultas = 0
+        self.tempo_banco = 0.0
+        self.instrucoes: Optional[List[str]] = [] if guardar_instrucoes else None
+
+
+# Objeto mutável compartilhado pela requisição (inclusive threads e greenlets
+# que herdam o contexto), onde os eventos do engine acumulam as consultas
+_estatisticas: ContextVar[Optional[EstatisticasRequisicao]] = ContextVar("estatisticas_requisicao", default=None)
+
+_em_andamento = 0
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Conta as consultas e o tempo de banco de cada requisição no engine informado."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes_da_consulta(conexao, cursor, instrucao, parametros, contexto, executemany) -> None:
+        if _estatisticas.get() is not None:
+            conexao.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _depois_da_consulta(conexao, cursor, instrucao, parametros, contexto, executemany) -> None:
+        estatisticas = _estatisticas.get()
+        inicios = conexao.info.get("inicio_consultas")
+        if estatisticas is None or not inicios:
+            return
+        estatisticas.consultas += 1
+        estatisticas.tempo_banco += time.perf_counter() - inicios.pop()
+        if estatisticas.instrucoes is not None and len(estatisticas.instrucoes) < MAXIMO_INSTRUCOES_LOG:
+            estatisticas.instrucoes.append(instrucao)
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI que mede latência, status, requisições em andamento e consultas por rota.
+
+    As rotas são identificadas pelo caminho declarado (ex.: /animais/{animal_id}),
+    para que os rótulos das métricas não cresçam com os IDs das URLs.
+    """
+
+    def __init__(self, app: ASGIApp, rotas: Callable[[], list]):
+        self.app = app
+        self._rotas = rotas
+        self._caminhos: Dict[Callable, str] = {}
+        self._limite_lento = settings.LOG_REQUISICOES_LENTAS_MS / 1000
+        medidor("http_requisicoes_em_andamento", "Requisições HTTP em andamento", lambda: _em_andamento)
+
+    def _caminho_rota(self, scope: Scope) -> str:
+        rota = scope.get("route")
+        if rota is not None:
+            return rota.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "desconhecida"
+        if endpoint not in self._caminhos:
+            self._caminhos = {
+                getattr(item, "endpoint", None): item.path for item in self._rotas() if hasattr(item, "path")
+            }
+        return self._caminhos.get(endpoint, "desconhecida")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _em_andamento
+        estatisticas = EstatisticasRequisicao(guardar_instrucoes=self._limite_lento > 0)
+        token = _estatisticas.set(estatisticas)
+        codigo_status = 500
+        inicio = time.perf_counter()
+        _em_andamento += 1
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal codigo_status
+            if mensagem["type"] == "http.response.start":
+                codigo_status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _em_andamento -= 1
+            _estatisticas.reset(token)
+            duracao = time.perf_counter() - inicio
+            self._registrar(scope, codigo_status, duracao, estatisticas)
+
+    def _registrar(
+        self, scope: Scope, codigo_status: int, duracao: float, estatisticas: EstatisticasRequisicao
+    ) -> None:
+        rotulos = {"metodo": scope["method"], "rota": self._caminho_rota(scope)}
+        contador(
+            "http_requisicoes_total", "Total de requisições HTTP", {**rotulos, "status": str(codigo_status)}
+        ).incrementar()
+        histograma("http_requisicao_duracao_segundos", "Duração das requisições HTTP", rotulos=rotulos).observar(duracao)
+        histograma(
+            "banco_consultas_por_requisicao", "Consultas ao banco por requisição", LIMITES_CONSULTAS, rotulos
+        ).observar(estatisticas.consultas)
+        histograma(
+            "banco_tempo_por_requisicao_segundos", "Tempo gasto no banco por requisição", rotulos=rotulos
+        ).observar(estatisticas.tempo_banco)
+
+        if self._limite_lento and duracao >= self._limite_lento:
+            logger.warning(
+                "Requisição lenta: %s %s (%s) %.1f ms, %d consultas, %.1f ms no banco\n%s",
+                scope["method"],
+                scope.get("path"),
+                rotulos["rota"],
+                duracao * 1000,
+                estatisticas.consultas,
+                estatisticas.tempo_banco * 1000,
+                "\n".join(estatisticas.instrucoes or []),
+            )
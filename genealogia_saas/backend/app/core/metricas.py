@@ -0,0 +1,191 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Limites padrão (em segundos) dos intervalos dos histogramas de latência
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+def _rotulos(rotulos: Optional[Dict[str, str]]) -> Rotulos:
+    return tuple(sorted((rotulos or {}).items()))
+
+
+class Histograma:
+    """Histograma cumulativo de valores observados (ex.: latências em segundos)."""
+
+    def __init__(
+        self,
+        nome: str,
+        descricao: str,
+        limites: Sequence[float] = LIMITES_LATENCIA,
+        rotulos: Rotulos = (),
+    ):
+        self.nome = nome
+        self.descricao = descricao
+        self.limites = tuple(sorted(limites))
+        self.rotulos = rotulos
+        self._contagens = [0] * (len(self.limites) + 1)
+        self._soma = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float) -> None:
+        """Registra um valor observado."""
+        posicao = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            self._contagens[posicao] += 1
+            self._soma += valor
+
+    def valores(self) -> Tuple[List[Tuple[float, int]], float, int]:
+        """Retorna os intervalos cumulativos (limite, contagem), a soma e o total observado."""
+        with self._lock:
+            contagens = self._contagens[:]
+            soma = self._soma
+        acumulado, intervalos = 0, []
+        for limite, contagem in zip(self.limites + (math.inf,), contagens):
+            acumulado += contagem
+            intervalos.append((limite, acumulado))
+        return intervalos, soma, acumulado
+
+
+class Contador:
+    """Contador que só aumenta (ex.: total de requisições)."""
+
+    def __init__(self, nome: str, descricao: str, rotulos: Rotulos = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self._valor = 0.0
+        self._lock = threading.Lock()
+
+    def incrementar(self, quantidade: float = 1) -> None:
+        """Soma a quantidade ao contador."""
+        with self._lock:
+            self._valor += quantidade
+
+    def valor(self) -> float:
+        """Retorna o valor acumulado."""
+        return self._valor
+
+
+class Medidor:
+    """Valor instantâneo (ex.: conexões em uso), lido no momento da exportação."""
+
+    def __init__(self, nome: str, descricao: str, leitura: Callable[[], float], rotulos: Rotulos = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.leitura = leitura
+        self.rotulos = rotulos
+
+    def valor(self) -> float:
+        """Lê o valor atual."""
+        return float(self.leitura())
+
+
+_histogramas: Dict[Tuple[str, Rotulos], Histograma] = {}
+_contadores: Dict[Tuple[str, Rotulos], Contador] = {}
+_medidores: Dict[Tuple[str, Rotulos], Medidor] = {}
+_lock = threading.Lock()
+
+
+def histograma(
+    nome: str,
+    descricao: str,
+    limites: Sequence[float] = LIMITES_LATENCIA,
+    rotulos: Optional[Dict[str, str]] = None,
+) -> Histograma:
+    """Obtém (ou cria) o histograma registrado com o nome e os rótulos informados."""
+    chave = (nome, _rotulos(rotulos))
+    item = _histogramas.get(chave)
+    if item is None:
+        with _lock:
+            item = _histogramas.setdefault(chave, Histograma(nome, descricao, limites, chave[1]))
+    return item
+
+
+def contador(nome: str, descricao: str, rotulos: Optional[Dict[str, str]] = None) -> Contador:
+    """Obtém (ou cria) o contador registrado com o nome e os rótulos informados."""
+    chave = (nome, _rotulos(rotulos))
+    item = _contadores.get(chave)
+    if item is None:
+        with _lock:
+            item = _contadores.setdefault(chave, Contador(nome, descricao, chave[1]))
+    return item
+
+
+def medidor(
+    nome: str, descricao: str, leitura: Callable[[], float], rotulos: Optional[Dict[str, str]] = None
+) -> Medidor:
+    """Registra (ou substitui) um medidor lido pela função informada."""
+    chave = (nome, _rotulos(rotulos))
+    with _lock:
+        _medidores[chave] = Medidor(nome, descricao, leitura, chave[1])
+        return _medidores[chave]
+
+
+def histogramas() -> List[Histograma]:
+    """Lista os histogramas registrados no processo."""
+    with _lock:
+        return list(_histogramas.values())
+
+
+def contadores() -> List[Contador]:
+    """Lista os contadores registrados no processo."""
+    with _lock:
+        return list(_contadores.values())
+
+
+def medidores() -> List[Medidor]:
+    """Lista os medidores registrados no processo."""
+    with _lock:
+        return list(_medidores.values())
+
+
+def _formatar_rotulos(rotulos: Rotulos, extra: Rotulos = ()) -> str:
+    pares = rotulos + extra
+    if not pares:
+        return ""
+    conteudo = ",".join(
+        '{}="{}"'.format(nome, str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for nome, valor in pares
+    )
+    return "{" + conteudo + "}"
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+def exportar_prometheus() -> str:
+    """Exporta todas as métricas do processo no formato de texto do Prometheus."""
+    linhas: List[str] = []
+    cabecalhos = set()
+
+    def cabecalho(nome: str, descricao: str, tipo: str) -> None:
+        if nome not in cabecalhos:
+            cabecalhos.add(nome)
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+    for item in sorted(contadores(), key=lambda c: (c.nome, c.rotulos)):
+        cabecalho(item.nome, item.descricao, "counter")
+        linhas.append(f"{item.nome}{_formatar_rotulos(item.rotulos)} {_formatar_numero(item.valor())}")
+
+    for item in sorted(medidores(), key=lambda m: (m.nome, m.rotulos)):
+        cabecalho(item.nome, item.descricao, "gauge")
+        linhas.append(f"{item.nome}{_formatar_rotulos(item.rotulos)} {_formatar_numero(item.valor())}")
+
+    for item in sorted(histogramas(), key=lambda h: (h.nome, h.rotulos)):
+        cabecalho(item.nome, item.descricao, "histogram")
+        intervalos, soma, total = item.valores()
+        for limite, acumulado in intervalos:
+            rotulos = _formatar_rotulos(item.rotulos, (("le", _formatar_numero(limite)),))
+            linhas.append(f"{item.nome}_bucket{rotulos} {acumulado}")
+        linhas.append(f"{item.nome}_sum{_formatar_rotulos(item.rotulos)} {_formatar_numero(soma)}")
+        linhas.append(f"{item.nome}_count{_formatar_rotulos(item.rotulos)} {total}")
+
+    return "\n".join(linhas) + "\n"
@@ -1,13 +1,25 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metricas import histograma
 
-# Configuração do contexto de criptografia para senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configuração do contexto de criptografia para senhas. Hashes com custo
+# diferente do configurado são marcados para atualização no próximo login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 # Algoritmo para geração do JWT
 ALGORITHM = "HS256"
@@ -32,11 +44,72 @@ def create_access_token(
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a senha em texto plano corresponde ao hash armazenado."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def get_password_hash(password: str) -> str:
     """Gera um hash seguro para a senha fornecida."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+class FilaSenhasCheiaError(RuntimeError):
+    """Erro lançado quando há operações de senha demais aguardando o pool de processos."""
+
+
+# O bcrypt é executado em um pool de processos dedicado, para não ocupar as
+# threads do servidor; o semáforo limita quantas operações podem aguardar
+_pool_senhas: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_fila_senhas = threading.BoundedSemaphore(settings.SENHAS_FILA_MAXIMA)
+
+_latencia_hash = histograma(
+    "senha_hash_segundos", "Tempo de execução do bcrypt no pool de processos (sem a espera na fila)"
+)
+
+
+def _obter_pool_senhas() -> ProcessPoolExecutor:
+    global _pool_senhas
+    with _pool_lock:
+        if _pool_senhas is None:
+            _pool_senhas = ProcessPoolExecutor(max_workers=settings.SENHAS_PROCESSOS)
+        return _pool_senhas
+
+
+def encerrar_pool_senhas() -> None:
+    """Encerra o pool de processos de senhas (no desligamento da aplicação)."""
+    global _pool_senhas
+    with _pool_lock:
+        if _pool_senhas is not None:
+            _pool_senhas.shutdown(wait=False, cancel_futures=True)
+            _pool_senhas = None
+
+
+def _verificar_e_atualizar(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    # Funções de módulo: os métodos do contexto não podem ser enviados a outro processo
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _cronometrar(funcao, *args) -> Tuple[Any, float]:
+    # Executada no processo do pool: mede só a operação, sem o tempo aguardando um processo livre
+    inicio = time.perf_counter()
+    return funcao(*args), time.perf_counter() - inicio
+
+
+async def _executar_no_pool(funcao, *args) -> Any:
+    if not _fila_senhas.acquire(blocking=False):
+        raise FilaSenhasCheiaError("Muitas autenticações em andamento.")
+    try:
+        resultado, duracao = await asyncio.wrap_future(_obter_pool_senhas().submit(_cronometrar, funcao, *args))
+    finally:
+        _fila_senhas.release()
+    _latencia_hash.observar(duracao)
+    return resultado
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha no pool de processos.
+
+    Retorna se a senha confere e, quando o hash usa um custo diferente do
+    configurado, o novo hash a ser gravado (senão None).
+    """
+    return await _executar_no_pool(_verificar_e_atualizar, plain_password, hashed_password)
+
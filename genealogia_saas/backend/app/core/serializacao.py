@@ -0,0 +1,42 @@
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # o orjson é opcional: sem ele, usa o módulo json
+    orjson = None
+
+
+def _padrao(valor: Any) -> Any:
+    # Tipos que nenhum dos codificadores serializa por conta própria
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+
+def json_bytes(dados: Any) -> bytes:
+    """Serializa em JSON compacto (UTF-8), com o orjson quando disponível.
+
+    Aceita apenas tipos simples (dicionários, listas, tuplas, números, textos,
+    datas e Decimal): os dados não passam pelo `jsonable_encoder`.
+    """
+    if orjson is not None:
+        return orjson.dumps(dados, default=_padrao)
+    return json.dumps(dados, default=_padrao, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class RespostaJSON(JSONResponse):
+    """Resposta JSON serializada por `json_bytes`, sem validação por esquema.
+
+    Retornada diretamente pelo endpoint, o FastAPI não aplica o
+    `response_model`: o conteúdo deve ter o mesmo formato do esquema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
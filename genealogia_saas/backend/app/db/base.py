@@ -3,4 +3,9 @@ from app.db.base_class import Base  # noqa
 from app.models.organizacao import Organizacao  # noqa
 from app.models.plano_assinatura import PlanoAssinatura  # noqa
 from app.models.usuario_admin_saas import UsuarioAdminSaaS  # noqa
-from app.models.animal import Animal  # noqa
\ No newline at end of file
+from app.models.animal import Animal  # noqa
+from app.models.ancestralidade_animal import AncestralidadeAnimal  # noqa
+from app.models.evento_pagamento import EventoPagamento, EventoPagamentoFalho  # noqa
+from app.models.versao_recurso import VersaoRecurso  # noqa
+from app.models.resumo_painel import ResumoMensal, ResumoPlano, ResumoStatusAssinatura  # noqa
+from app.models.certificado import LoteCertificados, TrabalhoCertificado  # noqa
@@ -0,0 +1,98 @@
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.animal import Animal
+
+# Chave usada em `Session.info` para acumular as alterações até o commit
+_CHAVE_ALTERACOES = "alteracoes_animais"
+
+# Tipos de alteração
+INSERCAO = "insercao"
+ATUALIZACAO = "atualizacao"
+EXCLUSAO = "exclusao"
+LOTE = "lote"  # alterações em massa; os observadores devem recarregar a organização
+
+
+class AlteracaoAnimal(NamedTuple):
+    """Alteração de um animal confirmada no banco de dados."""
+    tipo: str
+    organizacao_id: int
+    animal_id: Optional[int]
+    pai_id: Optional[int]
+    mae_id: Optional[int]
+    genealogia_alterada: bool
+    # Versão da genealogia da organização criada pelo commit (ver app/db/versoes.py)
+    versao_genealogia: Optional[int] = None
+
+
+ObservadorAnimais = Callable[[List[AlteracaoAnimal]], None]
+
+_observadores: List[ObservadorAnimais] = []
+
+
+def observar_alteracoes_animais(observador: ObservadorAnimais) -> ObservadorAnimais:
+    """Registra uma função chamada com as alterações de animais após cada commit."""
+    _observadores.append(observador)
+    return observador
+
+
+def registrar_alteracao(db: Session, alteracao: AlteracaoAnimal) -> None:
+    """Registra uma alteração feita fora do ORM (ex.: inserções em lote via Core)."""
+    db.info.setdefault(_CHAVE_ALTERACOES, []).append(alteracao)
+
+
+def alteracoes_pendentes(db: Session) -> List[AlteracaoAnimal]:
+    """Alterações de animais registradas na transação atual e ainda não confirmadas."""
+    return list(db.info.get(_CHAVE_ALTERACOES, ()))
+
+
+def definir_versoes_genealogia(db: Session, versoes: Dict[int, int]) -> None:
+    """Associa às alterações pendentes a nova versão da genealogia de cada organização."""
+    alteracoes = db.info.get(_CHAVE_ALTERACOES)
+    if alteracoes:
+        db.info[_CHAVE_ALTERACOES] = [
+            alteracao._replace(versao_genealogia=versoes.get(alteracao.organizacao_id)) for alteracao in alteracoes
+        ]
+
+
+def _genealogia_alterada(animal: Animal) -> bool:
+    estado = inspect(animal)
+    return estado.attrs.pai_id.history.has_changes() or estado.attrs.mae_id.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _coletar_alteracoes(session: Session, flush_context) -> None:
+    # Após o flush as listas new/dirty/deleted ainda refletem o estado anterior
+    for obj in session.new:
+        if isinstance(obj, Animal):
+            registrar_alteracao(session, AlteracaoAnimal(
+                INSERCAO, obj.organizacao_id, obj.id, obj.pai_id, obj.mae_id, True
+            ))
+
+    for obj in session.dirty:
+        if isinstance(obj, Animal) and session.is_modified(obj):
+            registrar_alteracao(session, AlteracaoAnimal(
+                ATUALIZACAO, obj.organizacao_id, obj.id, obj.pai_id, obj.mae_id, _genealogia_alterada(obj)
+            ))
+
+    for obj in session.deleted:
+        if isinstance(obj, Animal):
+            registrar_alteracao(session, AlteracaoAnimal(
+                EXCLUSAO, obj.organizacao_id, obj.id, obj.pai_id, obj.mae_id, True
+            ))
+
+
+@event.listens_for(Session, "after_commit")
+def _notificar_observadores(session: Session) -> None:
+    alteracoes = session.info.pop(_CHAVE_ALTERACOES, None)
+    if not alteracoes:
+        return
+    for observador in _observadores:
+        observador(alteracoes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_alteracoes(session: Session) -> None:
+    session.info.pop(_CHAVE_ALTERACOES, None)
@@ -0,0 +1,178 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from sqlalchemy.sql import ClauseElement, Executable, Select
+
+
+class CursorInvalidoError(ValueError):
+    """Erro lançado quando o cursor de paginação não pode ser decodificado."""
+
+
+def _serializar_valor(valor: Any) -> Any:
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f"Valor não suportado em cursor: {valor!r}")
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Codifica os valores das chaves de ordenação do último item em um cursor opaco."""
+    bruto = json.dumps(list(valores), separators=(",", ":"), ensure_ascii=False, default=_serializar_valor).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def _converter_valor(valor: Any, chave: InstrumentedAttribute) -> Any:
+    # Valores de tipo diferente do da coluna chegariam ao banco na comparação (erro 500 no PostgreSQL)
+    try:
+        tipo = chave.type.python_type
+    except NotImplementedError:
+        return valor
+    if valor is None or isinstance(valor, bool):
+        raise ValueError(valor)
+    if tipo is int:
+        if not isinstance(valor, int):
+            raise ValueError(valor)
+        return valor
+    if tipo is float:
+        if not isinstance(valor, (int, float)):
+            raise ValueError(valor)
+        return float(valor)
+    if tipo is str:
+        if not isinstance(valor, str):
+            raise ValueError(valor)
+        return valor
+    if tipo in (date, datetime) and isinstance(valor, str):
+        return tipo.fromisoformat(valor)
+    if tipo is Decimal and isinstance(valor, (str, int)):
+        return Decimal(valor)
+    raise ValueError(valor)
+
+
+def decodificar_cursor(cursor: str, chaves: Sequence[InstrumentedAttribute]) -> List[Any]:
+    """Decodifica um cursor gerado por `codificar_cursor`, validando o tipo de cada chave."""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        valores = json.loads(bruto)
+        if not isinstance(valores, list) or len(valores) != len(chaves):
+            raise ValueError(valores)
+        return [_converter_valor(valor, chave) for valor, chave in zip(valores, chaves)]
+    except (ValueError, TypeError, InvalidOperation):
+        raise CursorInvalidoError("Cursor de paginação inválido.")
+
+
+def _consulta_pagina(
+    consulta: Select, chaves: Sequence[InstrumentedAttribute], cursor: Optional[str], limite: int
+) -> Select:
+    if cursor:
+        valores = decodificar_cursor(cursor, chaves)
+        consulta = consulta.where(tuple_(*chaves) > tuple_(*valores))
+
+    # Um item a mais indica se existe uma próxima página
+    return consulta.order_by(*chaves).limit(limite + 1)
+
+
+def _montar_pagina(
+    itens: List[Any], chaves: Sequence[InstrumentedAttribute], limite: int
+) -> Tuple[List[Any], Optional[str]]:
+    if len(itens) <= limite:
+        return itens, None
+
+    itens = itens[:limite]
+    return itens, codificar_cursor([getattr(itens[-1], chave.key) for chave in chaves])
+
+
+def paginar(
+    db: Session,
+    consulta: Select,
+    chaves: Sequence[InstrumentedAttribute],
+    cursor: Optional[str],
+    limite: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Executa a consulta de uma entidade com paginação por chave (keyset).
+
+    Os resultados são ordenados pelas `chaves`, que devem formar uma ordem
+    estável e não nula (a última normalmente é o ID). Em vez de OFFSET, a
+    página seguinte começa depois dos valores do último item, o que permite
+    ao banco posicionar-se diretamente no índice composto correspondente.
+    Retorna os itens e o cursor da próxima página (None na última).
+    """
+    itens = db.execute(_consulta_pagina(consulta, chaves, cursor, limite)).scalars().all()
+    return _montar_pagina(itens, chaves, limite)
+
+
+async def paginar_async(
+    db: AsyncSession,
+    consulta: Select,
+    chaves: Sequence[InstrumentedAttribute],
+    cursor: Optional[str],
+    limite: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Versão assíncrona de `paginar`."""
+    resultado = await db.execute(_consulta_pagina(consulta, chaves, cursor, limite))
+    return _montar_pagina(resultado.scalars().all(), chaves, limite)
+
+
+async def paginar_linhas_async(
+    db: AsyncSession,
+    consulta: Select,
+    chaves: Sequence[InstrumentedAttribute],
+    cursor: Optional[str],
+    limite: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Como `paginar_async`, para consultas de colunas: retorna as linhas (tuplas).
+
+    As chaves de ordenação devem estar entre as colunas selecionadas.
+    """
+    resultado = await db.execute(_consulta_pagina(consulta, chaves, cursor, limite))
+    return _montar_pagina(resultado.all(), chaves, limite)
+
+
+class _Explain(Executable, ClauseElement):
+    """Instrução EXPLAIN (FORMAT JSON) sobre uma consulta, com os parâmetros do driver em uso."""
+
+    inherit_cache = False
+
+    def __init__(self, consulta: Select):
+        self.consulta = consulta
+
+
+@compiles(_Explain, "postgresql")
+def _compilar_explain(elemento: _Explain, compilador, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compilador.process(elemento.consulta, **kw)
+
+
+def _consulta_total(dialeto: str, consulta: Select) -> Executable:
+    if dialeto == "postgresql":
+        return _Explain(consulta.order_by(None))
+    return select(func.count()).select_from(consulta.order_by(None).subquery())
+
+
+def _ler_total(dialeto: str, valor: Any) -> int:
+    if dialeto != "postgresql":
+        return valor
+    plano = json.loads(valor) if isinstance(valor, str) else valor
+    return int(plano[0]["Plan"]["Plan Rows"])
+
+
+def estimar_total(db: Session, consulta: Select) -> int:
+    """Estima o total de linhas da consulta sem percorrê-las.
+
+    No PostgreSQL usa a estimativa do planejador (EXPLAIN), que não executa a
+    consulta; em outros bancos recorre a um COUNT(*).
+    """
+    dialeto = db.get_bind().dialect.name
+    return _ler_total(dialeto, db.execute(_consulta_total(dialeto, consulta)).scalar())
+
+
+async def estimar_total_async(db: AsyncSession, consulta: Select) -> int:
+    """Versão assíncrona de `estimar_total`."""
+    dialeto = db.get_bind().dialect.name
+    return _ler_total(dialeto, (await db.execute(_consulta_total(dialeto, consulta))).scalar())
@@ -0,0 +1,240 @@
+"""Partições por organização das tabelas de animais (apenas PostgreSQL).
+
+Com o particionamento ativado (migração 0011 com `-x particionar=sim` ou o
+comando `python -m app.cli particionar-animais`), `animal` e
+`ancestralidadeanimal` são particionadas por lista de `organizacao_id`: cada
+organização tem sua própria partição e uma partição padrão recebe as
+organizações sem partição. Em outros bancos (ou sem o particionamento) as
+funções não fazem nada.
+"""
+from typing import List
+
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+
+from app.db.eventos import LOTE, AlteracaoAnimal, registrar_alteracao
+from app.models.ancestralidade_animal import AncestralidadeAnimal
+from app.models.animal import Animal
+
+# Tabelas particionadas, na ordem de criação (a remoção segue a ordem inversa)
+TABELAS_PARTICIONADAS = ("animal", "ancestralidadeanimal")
+
+# Tempo máximo de espera pelos locks das tabelas ao criar ou remover partições
+LOCK_TIMEOUT = "5s"
+
+
+COLUNAS_ANIMAL = (
+    "id, organizacao_id, nome, especie, raca, data_nascimento, sexo, "
+    "caracteristicas_fisicas, imagem_url, imagem_hash, pai_id, mae_id"
+)
+COLUNAS_ANCESTRALIDADE = "ancestral_id, descendente_id, organizacao_id, distancia"
+
+DEFINICAO_ANIMAL = """
+    id integer NOT NULL DEFAULT nextval('animal_id_seq'::regclass),
+    organizacao_id integer NOT NULL,
+    nome varchar NOT NULL,
+    especie varchar NOT NULL,
+    raca varchar,
+    data_nascimento date,
+    sexo varchar,
+    caracteristicas_fisicas text,
+    imagem_url varchar,
+    imagem_hash varchar(64),
+    pai_id integer,
+    mae_id integer
+"""
+DEFINICAO_ANCESTRALIDADE = """
+    ancestral_id integer NOT NULL,
+    descendente_id integer NOT NULL,
+    organizacao_id integer NOT NULL,
+    distancia integer NOT NULL
+"""
+
+# Índices das tabelas, exceto os das restrições (chaves primárias), como definidos
+# pelas migrações; a troca de tabelas os recria a partir do banco, sem cópia local
+INDICES_TABELA = """
+    SELECT pg_get_indexdef(i.indexrelid)
+    FROM pg_index i JOIN pg_class t ON t.oid = i.indrelid
+    WHERE t.relname = :tabela AND t.relnamespace = current_schema()::regnamespace
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+    ORDER BY i.indexrelid
+"""
+
+
+class ParticionamentoError(RuntimeError):
+    """Erro lançado quando a cópia das tabelas não confere com os dados originais."""
+
+
+def nome_particao(tabela: str, organizacao_id: int) -> str:
+    """Nome da partição de uma organização (ex.: animal_o42)."""
+    return f"{tabela}_o{int(organizacao_id)}"
+
+
+def particionamento_ativo(db: Session) -> bool:
+    """Verifica se a tabela de animais está particionada no banco atual."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'animal' AND c.relnamespace = current_schema()::regnamespace)"
+    )).scalar())
+
+
+def _contagens(db: Session, sufixo: str = "") -> List[int]:
+    return [
+        db.execute(text(f"SELECT count(*) FROM {tabela}{sufixo}")).scalar()
+        for tabela in TABELAS_PARTICIONADAS
+    ]
+
+
+def _definicoes_indices(db: Session) -> List[str]:
+    definicoes = []
+    for tabela in TABELAS_PARTICIONADAS:
+        for definicao in db.execute(text(INDICES_TABELA), {"tabela": tabela}).scalars():
+            # Índices de tabelas particionadas são listados com ON ONLY; recriados, devem alcançar as partições
+            definicoes.append(definicao.replace(" ON ONLY ", " ON ", 1))
+    return definicoes
+
+
+def substituir_tabelas(db: Session, particionar: bool) -> None:
+    """Recria animal e ancestralidadeanimal, particionadas por organização ou não.
+
+    As tabelas são bloqueadas, copiadas para novas tabelas (com uma partição
+    por organização existente) e só são descartadas depois que as contagens
+    das cópias conferem com as originais; qualquer falha desfaz tudo, já que
+    o DDL do PostgreSQL é transacional. O bloqueio impede leituras e escritas
+    de animais até o commit: execute em uma janela de manutenção. Os índices
+    são recriados com as definições das tabelas originais. As chaves
+    estrangeiras de pai, mãe e do índice de ancestralidade existem apenas nas
+    tabelas não particionadas. O chamador é responsável pelo commit.
+    """
+    db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    db.execute(text("LOCK TABLE animal, ancestralidadeanimal IN ACCESS EXCLUSIVE MODE"))
+    indices = _definicoes_indices(db)
+    db.execute(text("ALTER SEQUENCE animal_id_seq OWNED BY NONE"))
+
+    sufixo = " PARTITION BY LIST (organizacao_id)" if particionar else ""
+    db.execute(text(f"CREATE TABLE animal_nova ({DEFINICAO_ANIMAL}){sufixo}"))
+    db.execute(text(f"CREATE TABLE ancestralidadeanimal_nova ({DEFINICAO_ANCESTRALIDADE}){sufixo}"))
+    if particionar:
+        organizacoes = db.execute(text("SELECT id FROM organizacao ORDER BY id")).scalars().all()
+        for tabela in TABELAS_PARTICIONADAS:
+            db.execute(text(f"CREATE TABLE {tabela}_padrao PARTITION OF {tabela}_nova DEFAULT"))
+            for organizacao_id in organizacoes:
+                db.execute(text(
+                    f"CREATE TABLE {nome_particao(tabela, organizacao_id)} PARTITION OF {tabela}_nova "
+                    f"FOR VALUES IN ({int(organizacao_id)})"
+                ))
+
+    db.execute(text(f"INSERT INTO animal_nova ({COLUNAS_ANIMAL}) SELECT {COLUNAS_ANIMAL} FROM animal"))
+    db.execute(text(
+        f"INSERT INTO ancestralidadeanimal_nova ({COLUNAS_ANCESTRALIDADE}) "
+        f"SELECT {COLUNAS_ANCESTRALIDADE} FROM ancestralidadeanimal"
+    ))
+    originais, copias = _contagens(db), _contagens(db, "_nova")
+    if originais != copias:
+        raise ParticionamentoError(
+            f"A cópia das tabelas de animais não confere (originais {originais}, cópias {copias})."
+        )
+
+    db.execute(text("DROP TABLE ancestralidadeanimal"))
+    db.execute(text("DROP TABLE animal"))
+    db.execute(text("ALTER TABLE animal_nova RENAME TO animal"))
+    db.execute(text("ALTER TABLE ancestralidadeanimal_nova RENAME TO ancestralidadeanimal"))
+    db.execute(text("ALTER SEQUENCE animal_id_seq OWNED BY animal.id"))
+
+    if particionar:
+        db.execute(text("ALTER TABLE animal ADD CONSTRAINT animal_pkey PRIMARY KEY (organizacao_id, id)"))
+        db.execute(text(
+            "ALTER TABLE ancestralidadeanimal ADD CONSTRAINT ancestralidadeanimal_pkey "
+            "PRIMARY KEY (organizacao_id, ancestral_id, descendente_id)"
+        ))
+    else:
+        db.execute(text("ALTER TABLE animal ADD CONSTRAINT animal_pkey PRIMARY KEY (id)"))
+        db.execute(text(
+            "ALTER TABLE ancestralidadeanimal ADD CONSTRAINT ancestralidadeanimal_pkey "
+            "PRIMARY KEY (ancestral_id, descendente_id)"
+        ))
+        for coluna in ("pai_id", "mae_id"):
+            db.execute(text(
+                f"ALTER TABLE animal ADD CONSTRAINT animal_{coluna}_fkey FOREIGN KEY ({coluna}) REFERENCES animal (id)"
+            ))
+        for coluna in ("ancestral_id", "descendente_id"):
+            db.execute(text(
+                f"ALTER TABLE ancestralidadeanimal ADD CONSTRAINT ancestralidadeanimal_{coluna}_fkey "
+                f"FOREIGN KEY ({coluna}) REFERENCES animal (id) ON DELETE CASCADE"
+            ))
+
+    for tabela in TABELAS_PARTICIONADAS:
+        db.execute(text(
+            f"ALTER TABLE {tabela} ADD CONSTRAINT {tabela}_organizacao_id_fkey "
+            "FOREIGN KEY (organizacao_id) REFERENCES organizacao (id)"
+        ))
+    for indice in indices:
+        db.execute(text(indice))
+    for tabela in TABELAS_PARTICIONADAS:
+        db.execute(text(f"ANALYZE {tabela}"))
+
+
+def _particao_existe(db: Session, particao: str) -> bool:
+    return db.execute(text("SELECT to_regclass(:nome) IS NOT NULL"), {"nome": particao}).scalar()
+
+
+def criar_particoes(db: Session, organizacao_id: int) -> bool:
+    """Cria as partições de uma organização.
+
+    Cada partição é criada como tabela comum, recebe os registros que a
+    organização já tenha na partição padrão e só então é anexada (ATTACH
+    PARTITION exige um lock mais leve na tabela principal do que CREATE
+    TABLE ... PARTITION OF). Retorna False se o particionamento não estiver
+    ativo. O chamador é responsável pelo commit.
+    """
+    if not particionamento_ativo(db):
+        return False
+
+    organizacao_id = int(organizacao_id)
+    db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    for tabela in TABELAS_PARTICIONADAS:
+        particao = nome_particao(tabela, organizacao_id)
+        if _particao_existe(db, particao):
+            continue
+        db.execute(text(f"CREATE TABLE {particao} (LIKE {tabela} INCLUDING DEFAULTS)"))
+        # A restrição evita que o ATTACH precise varrer a nova partição
+        db.execute(text(f"ALTER TABLE {particao} ADD CONSTRAINT {particao}_organizacao CHECK (organizacao_id = {organizacao_id})"))
+        db.execute(text(f"INSERT INTO {particao} SELECT * FROM {tabela}_padrao WHERE organizacao_id = {organizacao_id}"))
+        db.execute(text(f"DELETE FROM {tabela}_padrao WHERE organizacao_id = {organizacao_id}"))
+        db.execute(text(f"ALTER TABLE {tabela} ATTACH PARTITION {particao} FOR VALUES IN ({organizacao_id})"))
+        db.execute(text(f"ALTER TABLE {particao} DROP CONSTRAINT {particao}_organizacao"))
+    return True
+
+
+def organizacoes_sem_particao(db: Session) -> List[int]:
+    """Lista as organizações que ainda usam a partição padrão."""
+    if not particionamento_ativo(db):
+        return []
+    return list(db.execute(text(
+        "SELECT o.id FROM organizacao o WHERE to_regclass('animal_o' || o.id) IS NULL ORDER BY o.id"
+    )).scalars())
+
+
+def excluir_dados_organizacao(db: Session, organizacao_id: int) -> None:
+    """Exclui os animais e o índice de ancestralidade de uma organização.
+
+    Com partições, elas são desanexadas e descartadas, sem percorrer os
+    registros; sem elas, os registros são excluídos com DELETE. O chamador é
+    responsável pelo commit.
+    """
+    organizacao_id = int(organizacao_id)
+    # Os caches em memória da organização (grafo, busca...) são descartados no commit
+    registrar_alteracao(db, AlteracaoAnimal(LOTE, organizacao_id, None, None, None, True))
+    if particionamento_ativo(db) and _particao_existe(db, nome_particao("animal", organizacao_id)):
+        db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        for tabela in reversed(TABELAS_PARTICIONADAS):
+            particao = nome_particao(tabela, organizacao_id)
+            if _particao_existe(db, particao):
+                db.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {particao}"))
+                db.execute(text(f"DROP TABLE {particao}"))
+        return
+
+    db.execute(delete(AncestralidadeAnimal.__table__).where(AncestralidadeAnimal.organizacao_id == organizacao_id))
+    db.execute(delete(Animal.__table__).where(Animal.organizacao_id == organizacao_id))
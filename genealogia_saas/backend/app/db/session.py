@@ -1,10 +1,110 @@
-from sqlalchemy import create_engine
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from app.core.config import settings
+from app.core.metricas import histograma, medidor
+
+
+class _CheckoutMedido:
+    """Mede o tempo de espera para obter uma conexão do pool."""
+
+    nome_metrica = "banco_pool"
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            histograma(
+                f"{self.nome_metrica}_espera_segundos", "Tempo de espera para obter uma conexão do pool"
+            ).observar(time.perf_counter() - inicio)
+
+
+class PoolMedido(_CheckoutMedido, QueuePool):
+    """QueuePool que registra o tempo de espera de cada checkout."""
+
+
+class PoolAssincronoMedido(_CheckoutMedido, AsyncAdaptedQueuePool):
+    """Pool do engine assíncrono que registra o tempo de espera de cada checkout."""
+
+    nome_metrica = "banco_pool_assincrono"
+
+
+def _opcoes_engine(pool_medido: type, connect_args: Dict[str, Any]) -> Dict[str, Any]:
+    """Opções comuns aos engines síncrono e assíncrono, conforme a configuração."""
+    if settings.BANCO_PGBOUNCER:
+        # O PgBouncer já mantém o pool: cada sessão abre e devolve a conexão a ele
+        return {"poolclass": NullPool, "connect_args": connect_args}
+
+    return {
+        "poolclass": pool_medido,
+        "pool_size": settings.BANCO_POOL_TAMANHO,
+        "max_overflow": settings.BANCO_POOL_EXCEDENTE,
+        "pool_timeout": settings.BANCO_POOL_TIMEOUT_SEGUNDOS,
+        "pool_recycle": settings.BANCO_POOL_RECICLAR_SEGUNDOS,
+        "pool_pre_ping": settings.BANCO_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _configurar_statement_timeout(engine: Engine) -> None:
+    """Aplica o tempo máximo das instruções SQL (BANCO_STATEMENT_TIMEOUT_MS)."""
+    if not settings.BANCO_STATEMENT_TIMEOUT_MS or engine.dialect.name != "postgresql":
+        return
+    comando = f"SET statement_timeout = {int(settings.BANCO_STATEMENT_TIMEOUT_MS)}"
+
+    if settings.BANCO_PGBOUNCER:
+        # No modo transação do PgBouncer a conexão do servidor muda a cada
+        # transação: o valor precisa ser definido em cada uma (SET LOCAL)
+        @event.listens_for(engine, "begin")
+        def _definir_timeout_transacao(conexao) -> None:
+            conexao.exec_driver_sql(comando.replace("SET", "SET LOCAL", 1))
+    else:
+        @event.listens_for(engine, "connect")
+        def _definir_timeout_conexao(conexao_dbapi, registro) -> None:
+            cursor = conexao_dbapi.cursor()
+            cursor.execute(comando)
+            cursor.close()
+            conexao_dbapi.commit()
+
+
+def _registrar_medidores(engine: Engine, prefixo: str) -> None:
+    """Exporta conexões em uso, excedentes e ociosas do pool."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    medidor(f"{prefixo}_em_uso", "Conexões do pool em uso", pool.checkedout)
+    medidor(f"{prefixo}_excedentes", "Conexões abertas além do tamanho do pool", lambda: max(pool.overflow(), 0))
+    medidor(f"{prefixo}_ociosas", "Conexões ociosas no pool", pool.checkedin)
+
 
 # Criar engine do SQLAlchemy para conexão com o PostgreSQL
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **_opcoes_engine(PoolMedido, {}))
+_configurar_statement_timeout(engine)
+_registrar_medidores(engine, "banco_pool")
 
 # Criar fábrica de sessões do SQLAlchemy
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine e fábrica de sessões assíncronas (asyncpg), usadas pelas rotas de leitura.
+# Sem expirar no commit, para que os objetos não disparem carregamentos implícitos.
+# Com PgBouncer, o asyncpg não pode usar instruções preparadas no servidor
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+    **_opcoes_engine(
+        PoolAssincronoMedido,
+        {"statement_cache_size": 0, "prepared_statement_cache_size": 0} if settings.BANCO_PGBOUNCER else {},
+    ),
+)
+_configurar_statement_timeout(async_engine.sync_engine)
+_registrar_medidores(async_engine.sync_engine, "banco_pool_assincrono")
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Versões dos recursos (ETags e cache de respostas), incrementadas a cada commit
+from app.db import versoes  # noqa: E402,F401
@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.eventos import alteracoes_pendentes, definir_versoes_genealogia
+from app.models.plano_assinatura import PlanoAssinatura
+from app.models.versao_recurso import VersaoRecurso
+
+# Recursos versionados
+PLANOS = "planos"  # global (organização 0)
+GENEALOGIA = "genealogia"  # por organização: qualquer alteração de animal muda as árvores
+
+# Chave usada em `Session.info` para os recursos globais alterados na transação
+_CHAVE_RECURSOS = "recursos_alterados"
+
+
+class Versao(NamedTuple):
+    """Versão atual de um recurso e a data da última alteração."""
+    numero: int
+    atualizado_em: Optional[datetime]
+
+
+def _consulta_versao(recurso: str, organizacao_id: int):
+    return select(VersaoRecurso.versao, VersaoRecurso.atualizado_em).where(
+        VersaoRecurso.recurso == recurso, VersaoRecurso.organizacao_id == organizacao_id
+    )
+
+
+def obter_versao(db: Session, recurso: str, organizacao_id: int = 0) -> Versao:
+    """Obtém a versão de um recurso (0 se ainda nunca foi alterado)."""
+    linha = db.execute(_consulta_versao(recurso, organizacao_id)).first()
+    return Versao(*linha) if linha else Versao(0, None)
+
+
+async def obter_versao_async(db: AsyncSession, recurso: str, organizacao_id: int = 0) -> Versao:
+    """Versão assíncrona de `obter_versao`."""
+    linha = (await db.execute(_consulta_versao(recurso, organizacao_id))).first()
+    return Versao(*linha) if linha else Versao(0, None)
+
+
+def incrementar_versoes(db: Session, chaves: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], int]:
+    """Incrementa, na transação atual, a versão dos recursos (recurso, organização) informados.
+
+    Retorna a nova versão de cada recurso.
+    """
+    agora = datetime.utcnow()
+    tabela = VersaoRecurso.__table__
+    dialeto = db.get_bind().dialect.name
+    versoes = {}
+    for recurso, organizacao_id in sorted(set(chaves)):
+        if dialeto in ("postgresql", "sqlite"):
+            inserir = insert_postgresql if dialeto == "postgresql" else insert_sqlite
+            consulta = inserir(tabela).values(recurso=recurso, organizacao_id=organizacao_id, versao=1, atualizado_em=agora)
+            versoes[(recurso, organizacao_id)] = db.execute(consulta.on_conflict_do_update(
+                index_elements=["recurso", "organizacao_id"],
+                set_={"versao": tabela.c.versao + 1, "atualizado_em": agora},
+            ).returning(tabela.c.versao)).scalar_one()
+            continue
+
+        resultado = db.execute(
+            update(tabela)
+            .where(tabela.c.recurso == recurso, tabela.c.organizacao_id == organizacao_id)
+            .values(versao=tabela.c.versao + 1, atualizado_em=agora)
+        )
+        if resultado.rowcount == 0:
+            try:
+                with db.begin_nested():
+                    db.execute(tabela.insert().values(
+                        recurso=recurso, organizacao_id=organizacao_id, versao=1, atualizado_em=agora
+                    ))
+            except IntegrityError:
+                # Outra transação criou a linha ao mesmo tempo
+                db.execute(
+                    update(tabela)
+                    .where(tabela.c.recurso == recurso, tabela.c.organizacao_id == organizacao_id)
+                    .values(versao=tabela.c.versao + 1, atualizado_em=agora)
+                )
+        versoes[(recurso, organizacao_id)] = db.execute(
+            select(tabela.c.versao).where(tabela.c.recurso == recurso, tabela.c.organizacao_id == organizacao_id)
+        ).scalar_one()
+    return versoes
+
+
+@event.listens_for(Session, "after_flush")
+def _coletar_recursos(session: Session, flush_context) -> None:
+    alterados = list(session.new) + list(session.deleted) + [obj for obj in session.dirty if session.is_modified(obj)]
+    if any(isinstance(obj, PlanoAssinatura) for obj in alterados):
+        session.info.setdefault(_CHAVE_RECURSOS, set()).add((PLANOS, 0))
+
+
+@event.listens_for(Session, "before_commit")
+def _incrementar_versoes_alteradas(session: Session) -> None:
+    # As alterações ainda pendentes são enviadas antes, para que todas sejam consideradas
+    session.flush()
+    chaves: Set[Tuple[str, int]] = session.info.pop(_CHAVE_RECURSOS, set())
+    chaves.update((GENEALOGIA, alteracao.organizacao_id) for alteracao in alteracoes_pendentes(session))
+    if chaves:
+        versoes = incrementar_versoes(session, chaves)
+        # Os observadores dos animais recebem a versão criada por este commit
+        definir_versoes_genealogia(session, {
+            organizacao_id: versao for (recurso, organizacao_id), versao in versoes.items() if recurso == GENEALOGIA
+        })
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_recursos(session: Session) -> None:
+    session.info.pop(_CHAVE_RECURSOS, None)
@@ -1,21 +1,48 @@
+import logging
+import time
+
+# Início da importação da aplicação, para o tempo de inicialização do worker
+_inicio = time.perf_counter()
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
 from app.api.api_v1.api import api_router
+from app.api.deps import invalidar_organizacao_autenticada
 from app.core.config import settings
-from app.db.session import engine, SessionLocal
-from app.db.init_db import init_db
+from app.core.instrumentacao import MiddlewareMetricas, instrumentar_engine
+from app.core.metricas import exportar_prometheus
+from app.core.security import encerrar_pool_senhas
+from app.db.session import async_engine, engine, SessionLocal
+from app.services.consanguinidade import encerrar_pool_consanguinidade
+from app.services.fila_certificados import executor as executor_certificados
+from app.services.imagens import encerrar_pool_imagens
+from app.services.pagamentos import consumidor as consumidor_pagamentos
+from app.services.painel import agendador as agendador_painel
 
-# Criar tabelas no banco de dados
+# Registrar todos os modelos (o esquema e os dados iniciais vêm das migrações
+# do Alembic e do comando `python -m app.cli inicializar-banco`)
 from app.db import base  # noqa: F401
 
+logger = logging.getLogger(__name__)
+
+# Etapas da inicialização do worker, em segundos (registradas no startup)
+_tempos_inicializacao = {"importacoes": time.perf_counter() - _inicio}
+_inicio = time.perf_counter()
+
 # Inicializar aplicação FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Métricas por rota (latência, status, consultas ao banco) e contagem de consultas
+app.add_middleware(MiddlewareMetricas, rotas=lambda: app.routes)
+instrumentar_engine(engine)
+instrumentar_engine(async_engine.sync_engine)
+
 # Configurar CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -28,6 +55,7 @@ if settings.BACKEND_CORS_ORIGINS:
 
 # Incluir rotas da API
 app.include_router(api_router, prefix=settings.API_V1_STR)
+_tempos_inicializacao["aplicacao"] = time.perf_counter() - _inicio
 
 # Dependência para obter a sessão do banco de dados
 def get_db():
@@ -42,14 +70,51 @@ def get_db():
 def health_check():
     return {"status": "ok", "message": "API funcionando corretamente"}
 
-# Inicializar banco de dados com dados iniciais se necessário
+# Métricas do processo no formato do Prometheus
+@app.get("/metrics", include_in_schema=False)
+def metricas():
+    return PlainTextResponse(exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
+# Descartar do cache de autenticação as organizações cujo status de assinatura mudou
+def _invalidar_organizacoes(ids):
+    for organizacao_id in ids:
+        invalidar_organizacao_autenticada(organizacao_id)
+
+# Iniciar as tarefas de segundo plano. O worker não acessa o banco ao iniciar:
+# várias instâncias sobem em paralelo sem disputar a criação de dados iniciais
 @app.on_event("startup")
 def startup_event():
-    db = SessionLocal()
-    try:
-        init_db(db)
-    finally:
-        db.close()
+    inicio = time.perf_counter()
+
+    # Consumidor da fila de eventos de pagamento
+    consumidor_pagamentos.ao_alterar_organizacoes = _invalidar_organizacoes
+    consumidor_pagamentos.iniciar()
+
+    # Atualização periódica dos resumos do painel administrativo
+    agendador_painel.iniciar()
+
+    # Geração dos certificados de genealogia (ou apenas pelo comando processar-certificados)
+    if settings.CERTIFICADOS_PROCESSOS > 0:
+        executor_certificados.iniciar()
+
+    _tempos_inicializacao["tarefas"] = time.perf_counter() - inicio
+    logger.info(
+        "Worker iniciado em %.0f ms (importações %.0f ms, aplicação e rotas %.0f ms, tarefas %.0f ms).",
+        sum(_tempos_inicializacao.values()) * 1000,
+        _tempos_inicializacao["importacoes"] * 1000,
+        _tempos_inicializacao["aplicacao"] * 1000,
+        _tempos_inicializacao["tarefas"] * 1000,
+    )
+
+# Encerrar as tarefas de segundo plano e os pools de processos de senhas, imagens, certificados e consanguinidade
+@app.on_event("shutdown")
+def shutdown_event():
+    consumidor_pagamentos.parar()
+    agendador_painel.parar()
+    executor_certificados.parar()
+    encerrar_pool_senhas()
+    encerrar_pool_imagens()
+    encerrar_pool_consanguinidade()
 
 # Executar a aplicação com uvicorn se este arquivo for executado diretamente
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer
+
+from app.db.base_class import Base
+
+
+class AncestralidadeAnimal(Base):
+    """Modelo para o índice de ancestralidade (fechamento transitivo) dos animais.
+
+    Cada linha indica que `ancestral_id` é ancestral de `descendente_id` (ou o
+    próprio animal, com distância 0), permitindo verificar ciclos na genealogia
+    com uma única consulta indexada. Como `animal`, é particionada por
+    organização no PostgreSQL, sem as chaves estrangeiras para `animal.id`.
+    """
+
+    ancestral_id = Column(Integer, ForeignKey("animal.id", ondelete="CASCADE"), primary_key=True)
+    descendente_id = Column(Integer, ForeignKey("animal.id", ondelete="CASCADE"), primary_key=True)
+    organizacao_id = Column(Integer, ForeignKey("organizacao.id"), nullable=False, index=True)
+    distancia = Column(Integer, nullable=False)  # menor número de gerações entre os dois
+
+    __table_args__ = (
+        Index("ix_ancestralidadeanimal_descendente_ancestral", "descendente_id", "ancestral_id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<AncestralidadeAnimal(ancestral_id={self.ancestral_id}, "
+            f"descendente_id={self.descendente_id}, distancia={self.distancia})>"
+        )
@@ -1,14 +1,21 @@
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import Column, String, Date, ForeignKey, Integer, Text
+from sqlalchemy import Column, String, Date, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
 
 class Animal(Base):
-    """Modelo para representar um animal no sistema."""
+    """Modelo para representar um animal no sistema.
+
+    No PostgreSQL a tabela pode ser particionada por organização pelas
+    migrações (ver app/db/particoes.py); lá as chaves estrangeiras de pai e
+    mãe existem apenas no ORM. A chave do mapeamento é (organizacao_id, id),
+    como a chave primária das tabelas particionadas: os UPDATE e DELETE do
+    ORM filtram pela organização e alcançam apenas a partição dela.
+    """
     
     id = Column(Integer, primary_key=True, index=True)
     organizacao_id = Column(Integer, ForeignKey("organizacao.id"), nullable=False)
@@ -19,6 +26,7 @@ class Animal(Base):
     sexo = Column(String, nullable=True)
     caracteristicas_fisicas = Column(Text, nullable=True)
     imagem_url = Column(String, nullable=True)
+    imagem_hash = Column(String(64), nullable=True)  # SHA-256 da foto no armazenamento de imagens
     pai_id = Column(Integer, ForeignKey("animal.id"), nullable=True)
     mae_id = Column(Integer, ForeignKey("animal.id"), nullable=True)
     
@@ -27,6 +35,16 @@ class Animal(Base):
     pai = relationship("Animal", foreign_keys=[pai_id], remote_side=[id], backref="filhos_pai")
     mae = relationship("Animal", foreign_keys=[mae_id], remote_side=[id], backref="filhos_mae")
     
+    # Índices compostos para a listagem paginada (ordenada por nome e ID) com filtros.
+    # O índice de trigramas da busca (PostgreSQL) é criado pela migração 0004_busca_trigramas
+    __table_args__ = (
+        Index("ix_animal_organizacao_nome_id", "organizacao_id", "nome", "id"),
+        Index("ix_animal_organizacao_especie_raca_nome_id", "organizacao_id", "especie", "raca", "nome", "id"),
+        Index("ix_animal_organizacao_sexo_nome_id", "organizacao_id", "sexo", "nome", "id"),
+        Index("ix_animal_organizacao_data_nascimento", "organizacao_id", "data_nascimento"),
+    )
+    __mapper_args__ = {"primary_key": [organizacao_id, id]}
+    
     def __repr__(self):
         return f"<Animal(id={self.id}, nome='{self.nome}', especie='{self.especie}')>"
     
@@ -46,4 +64,4 @@ class Animal(Base):
     @property
     def tem_genealogia_completa(self) -> bool:
         """Verifica se o animal tem pai e mãe registrados."""
-        return self.pai_id is not None and self.mae_id is not None
\ No newline at end of file
+        return self.pai_id is not None and self.mae_id is not None
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
+
+from app.db.base_class import Base
+
+
+class LoteCertificados(Base):
+    """Modelo para um pedido de certificados de vários animais (ex.: nascidos na temporada).
+
+    Os filtros usados na seleção dos animais são guardados para consulta; cada
+    animal selecionado gera um trabalho de certificado ligado ao lote.
+    """
+
+    id = Column(Integer, primary_key=True, index=True)
+    organizacao_id = Column(Integer, nullable=False, index=True)
+    formato = Column(String, nullable=False)
+    geracoes = Column(Integer, nullable=False)
+    filtros = Column(JSON, nullable=True)
+    total = Column(Integer, nullable=False, default=0)
+    criado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LoteCertificados(id={self.id}, organizacao_id={self.organizacao_id}, total={self.total})>"
+
+
+class TrabalhoCertificado(Base):
+    """Modelo para a fila de geração de certificados de genealogia.
+
+    Os trabalhos pendentes são executados em segundo plano por um pool de
+    processos. O arquivo gerado é identificado pela `chave`, o SHA-256 dos
+    dados impressos: enquanto nenhum ancestral muda, novos pedidos reutilizam
+    o mesmo arquivo.
+    """
+
+    id = Column(Integer, primary_key=True, index=True)
+    organizacao_id = Column(Integer, nullable=False)
+    lote_id = Column(Integer, ForeignKey("lotecertificados.id", ondelete="CASCADE"), nullable=True, index=True)
+    animal_id = Column(Integer, nullable=False)
+    formato = Column(String, nullable=False)  # 'pdf' ou 'svg'
+    geracoes = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="pendente")  # pendente, processando, concluido ou falhou
+    chave = Column(String(64), nullable=True)
+    tentativas = Column(Integer, nullable=False, default=0)
+    erro = Column(Text, nullable=True)
+    criado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    iniciado_em = Column(DateTime, nullable=True)
+    concluido_em = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_trabalhocertificado_organizacao_id", "organizacao_id", "id"),
+        # Apenas os trabalhos ainda não concluídos são consultados pelo executor
+        Index("ix_trabalhocertificado_fila", "status", "id", postgresql_where=status.in_(("pendente", "processando"))),
+    )
+
+    def __repr__(self):
+        return f"<TrabalhoCertificado(id={self.id}, animal_id={self.animal_id}, status='{self.status}')>"
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String, Text
+
+from app.db.base_class import Base
+
+
+class EventoPagamento(Base):
+    """Modelo para a fila de notificações de pagamento recebidas pelo webhook.
+
+    O identificador do evento no provedor é único, o que torna o recebimento
+    idempotente. Os eventos são aplicados em lote por um consumidor em
+    segundo plano e marcados como processados.
+    """
+
+    id = Column(Integer, primary_key=True, index=True)
+    evento_id = Column(String, unique=True, nullable=False)
+    organizacao_id = Column(Integer, nullable=False)
+    tipo = Column(String, nullable=False)
+    ocorrido_em = Column(DateTime, nullable=True)
+    recebido_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    payload = Column(JSON, nullable=True)
+    processado_em = Column(DateTime, nullable=True)
+    tentativas = Column(Integer, nullable=False, default=0)
+    proxima_tentativa_em = Column(DateTime, nullable=True)
+    ultimo_erro = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Apenas os eventos pendentes são consultados pelo consumidor
+        Index("ix_eventopagamento_pendentes", "proxima_tentativa_em", "id", postgresql_where=processado_em.is_(None)),
+    )
+
+    def __repr__(self):
+        return f"<EventoPagamento(evento_id='{self.evento_id}', tipo='{self.tipo}', organizacao_id={self.organizacao_id})>"
+
+
+class EventoPagamentoFalho(Base):
+    """Modelo para os eventos de pagamento que esgotaram as tentativas (dead-letter)."""
+
+    id = Column(Integer, primary_key=True, index=True)
+    evento_id = Column(String, nullable=False, index=True)
+    organizacao_id = Column(Integer, nullable=False)
+    tipo = Column(String, nullable=False)
+    payload = Column(JSON, nullable=True)
+    tentativas = Column(Integer, nullable=False)
+    erro = Column(Text, nullable=True)
+    falhou_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<EventoPagamentoFalho(evento_id='{self.evento_id}', tentativas={self.tentativas})>"
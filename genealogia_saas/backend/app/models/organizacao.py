@@ -1,7 +1,7 @@
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import Column, String, Date, ForeignKey, Integer
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -17,11 +17,20 @@ class Organizacao(Base):
     plano_assinatura_id = Column(Integer, ForeignKey("planoassinatura.id"))
     data_assinatura = Column(Date, nullable=True)
     status_assinatura = Column(String, nullable=False, default="Pendente")
+    # Ocorrência do último evento de pagamento aplicado ao status (ver services/pagamentos)
+    status_ocorrido_em = Column(DateTime, nullable=True)
+    # Contador mantido a cada cadastro/exclusão de animal (ver services/contador_animais)
+    total_animais = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relacionamentos
     plano_assinatura = relationship("PlanoAssinatura", back_populates="organizacoes")
     animais = relationship("Animal", back_populates="organizacao")
     
+    # Índice composto para a listagem paginada (ordenada por nome e ID)
+    __table_args__ = (
+        Index("ix_organizacao_nome_id", "nome", "id"),
+    )
+    
     def __repr__(self):
         return f"<Organizacao(id={self.id}, nome='{self.nome}', email='{self.email}')>"
     
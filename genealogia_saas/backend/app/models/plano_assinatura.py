@@ -27,4 +27,8 @@ class PlanoAssinatura(Base):
     
     def permite_mais_animais(self, quantidade_atual: int) -> bool:
         """Verifica se o plano permite adicionar mais animais."""
-        return quantidade_atual < self.limite_animais
\ No newline at end of file
+        return quantidade_atual < self.limite_animais
+    
+    def possui_funcionalidade(self, funcionalidade: str) -> bool:
+        """Verifica se o plano inclui a funcionalidade informada."""
+        return funcionalidade in (self.funcionalidades or [])
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String
+
+from app.db.base_class import Base
+
+
+class ResumoPlano(Base):
+    """Totais da plataforma por plano de assinatura, recalculados periodicamente para o painel."""
+
+    plano_assinatura_id = Column(Integer, primary_key=True)
+    nome = Column(String, nullable=False)
+    preco = Column(Numeric(10, 2), nullable=False)
+    organizacoes = Column(Integer, nullable=False, default=0)
+    organizacoes_ativas = Column(Integer, nullable=False, default=0)
+    animais = Column(Integer, nullable=False, default=0)
+    receita_mensal = Column(Numeric(14, 2), nullable=False, default=0)  # preço x organizações ativas
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ResumoPlano(plano_assinatura_id={self.plano_assinatura_id}, organizacoes={self.organizacoes})>"
+
+
+class ResumoStatusAssinatura(Base):
+    """Quantidade de organizações (e de seus animais) por status de assinatura."""
+
+    status_assinatura = Column(String, primary_key=True)
+    organizacoes = Column(Integer, nullable=False, default=0)
+    animais = Column(Integer, nullable=False, default=0)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ResumoStatusAssinatura(status_assinatura='{self.status_assinatura}', organizacoes={self.organizacoes})>"
+
+
+class ResumoMensal(Base):
+    """Evolução mensal da plataforma.
+
+    Os totais do mês corrente são sobrescritos a cada atualização e ficam
+    congelados quando o mês termina, formando o histórico de crescimento.
+    """
+
+    mes = Column(Date, primary_key=True)  # primeiro dia do mês
+    novas_organizacoes = Column(Integer, nullable=False, default=0)  # pela data de assinatura
+    organizacoes = Column(Integer, nullable=True)
+    organizacoes_ativas = Column(Integer, nullable=True)
+    animais = Column(Integer, nullable=True)
+    receita_mensal = Column(Numeric(14, 2), nullable=True)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ResumoMensal(mes={self.mes}, organizacoes={self.organizacoes})>"
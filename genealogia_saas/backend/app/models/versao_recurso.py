@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base_class import Base
+
+
+class VersaoRecurso(Base):
+    """Modelo para a versão de um recurso, incrementada a cada alteração.
+
+    Usada para gerar ETags e como chave do cache de respostas. Recursos
+    globais (ex.: planos) usam organizacao_id 0.
+    """
+
+    recurso = Column(String, primary_key=True)
+    organizacao_id = Column(Integer, primary_key=True, default=0)
+    versao = Column(Integer, nullable=False, default=1)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<VersaoRecurso(recurso='{self.recurso}', organizacao_id={self.organizacao_id}, versao={self.versao})>"
@@ -0,0 +1,192 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, conlist, validator
+
+from app.services.imagens import url_imagem
+
+
+class AnimalBase(BaseModel):
+    """Esquema base para animais."""
+    nome: str
+    especie: str
+    raca: Optional[str] = None
+    data_nascimento: Optional[date] = None
+    sexo: Optional[str] = None  # 'Macho', 'Fêmea' ou 'Indefinido'
+    caracteristicas_fisicas: Optional[str] = None
+    imagem_url: Optional[str] = None
+    pai_id: Optional[int] = None
+    mae_id: Optional[int] = None
+
+
+class AnimalCreate(AnimalBase):
+    """Esquema para criação de animais."""
+    pass
+
+
+class AnimalUpdate(BaseModel):
+    """Esquema para atualização de animais."""
+    nome: Optional[str] = None
+    especie: Optional[str] = None
+    raca: Optional[str] = None
+    data_nascimento: Optional[date] = None
+    sexo: Optional[str] = None
+    caracteristicas_fisicas: Optional[str] = None
+    imagem_url: Optional[str] = None
+    pai_id: Optional[int] = None
+    mae_id: Optional[int] = None
+
+
+class ComImagem(BaseModel):
+    """Campos com as URLs das versões reduzidas da foto enviada do animal."""
+    imagem_hash: Optional[str] = None
+    imagem_miniatura_url: Optional[str] = None
+    imagem_media_url: Optional[str] = None
+
+    @validator("imagem_miniatura_url", always=True)
+    def _url_miniatura(cls, valor, values):
+        return valor or url_imagem(values.get("imagem_hash"), "miniatura")
+
+    @validator("imagem_media_url", always=True)
+    def _url_media(cls, valor, values):
+        return valor or url_imagem(values.get("imagem_hash"), "media")
+
+
+class AnimalResponse(ComImagem, AnimalBase):
+    """Esquema para resposta com dados de um animal."""
+    id: int
+    organizacao_id: int
+    coeficiente_consanguinidade: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ConsanguinidadeAnimal(BaseModel):
+    """Esquema para representar o coeficiente de consanguinidade (F de Wright) de um animal."""
+    animal_id: int
+    coeficiente: float
+
+
+class NoArvoreGenealogica(ComImagem):
+    """Esquema para representar um animal dentro de uma árvore genealógica."""
+    id: int
+    nome: str
+    especie: str
+    raca: Optional[str] = None
+    sexo: Optional[str] = None
+    data_nascimento: Optional[date] = None
+    imagem_url: Optional[str] = None
+    geracao: int  # 0 para o animal consultado, 1 para os pais, 2 para os avós...
+    pai: Optional["NoArvoreGenealogica"] = None
+    mae: Optional["NoArvoreGenealogica"] = None
+
+
+NoArvoreGenealogica.update_forward_refs()
+
+
+class ArvoreGenealogica(BaseModel):
+    """Esquema para representar a árvore genealógica completa de um animal."""
+    geracoes: int
+    total_ancestrais: int
+    animal: NoArvoreGenealogica
+
+
+class DescendenteGenealogico(BaseModel):
+    """Esquema para representar um descendente de um animal."""
+    id: int
+    geracao: int  # 1 para os filhos, 2 para os netos...
+
+
+class DescendentesAnimal(BaseModel):
+    """Esquema para representar os descendentes de um animal."""
+    animal_id: int
+    total: int
+    descendentes: List[DescendenteGenealogico]
+
+
+class ResumoGenealogico(BaseModel):
+    """Esquema para representar o resumo genealógico de um animal."""
+    animal_id: int
+    geracoes_conhecidas: int
+    total_filhos: int
+    total_descendentes: int
+
+
+class Reprodutor(BaseModel):
+    """Esquema para representar um reprodutor e o tamanho de sua progênie."""
+    animal_id: int
+    nome: str
+    sexo: Optional[str] = None
+    total_filhos: int
+
+
+class SimulacaoAcasalamento(BaseModel):
+    """Esquema para simular acasalamentos entre fêmeas e machos candidatos."""
+    femeas_ids: conlist(int, min_items=1, max_items=500)
+    machos_ids: conlist(int, min_items=1, max_items=500)
+
+
+class ResultadoAcasalamento(BaseModel):
+    """Esquema para representar o resultado da simulação de um acasalamento."""
+    femea_id: int
+    macho_id: int
+    coeficiente_parentesco: float  # coancestria entre fêmea e macho
+    consanguinidade_prole: float  # F esperado da prole (igual ao parentesco)
+
+
+class ResultadoImportacao(BaseModel):
+    """Esquema para representar o resultado de uma importação de animais."""
+    total_importados: int
+    geracoes: int
+
+
+class ResultadoBusca(BaseModel):
+    """Esquema para representar um animal encontrado na busca aproximada."""
+    id: int
+    nome: str
+    especie: str
+    raca: Optional[str] = None
+    sexo: Optional[str] = None
+    relevancia: float
+
+
+class UsoPlano(BaseModel):
+    """Esquema para representar o uso do limite de animais do plano."""
+    total_animais: int
+    limite_animais: Optional[int] = None
+
+
+class AncestralComum(BaseModel):
+    """Esquema para um ancestral comum mais próximo de dois animais."""
+    id: int
+    nome: str
+    distancia_a: int  # gerações do primeiro animal até o ancestral
+    distancia_b: int  # gerações do segundo animal até o ancestral
+
+
+class RelacaoParentesco(BaseModel):
+    """Esquema para uma relação de parentesco entre dois animais (ex.: meio-irmãos por parte de pai)."""
+    grau: str
+    descricao: str
+    distancia_a: int
+    distancia_b: int
+    ancestrais_ids: List[int]
+
+
+class CaminhoParentesco(BaseModel):
+    """Esquema para um caminho mais curto entre dois animais, passando por um ancestral comum."""
+    ancestral_id: int
+    animais: List[int]  # do primeiro ao segundo animal
+
+
+class ParentescoAnimais(BaseModel):
+    """Esquema para representar o parentesco entre dois animais."""
+    animal_id: int
+    outro_id: int
+    aparentados: bool
+    distancia: Optional[int] = None  # total de gerações no caminho mais curto
+    ancestrais_comuns: List[AncestralComum]
+    relacoes: List[RelacaoParentesco]
+    caminhos: List[CaminhoParentesco]
+    animais_visitados: int
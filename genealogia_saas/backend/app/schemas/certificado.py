@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, conint, validator
+
+from app.core.config import settings
+from app.services.certificados import FORMATOS_CERTIFICADO, GERACOES_MAXIMAS
+
+
+class OpcoesCertificado(BaseModel):
+    """Opções de impressão comuns aos pedidos de certificado."""
+    formato: str = "pdf"  # 'pdf' ou 'svg'
+    geracoes: conint(ge=1, le=GERACOES_MAXIMAS) = 4
+
+    @validator("formato")
+    def _formato_suportado(cls, valor):
+        valor = valor.lower()
+        if valor not in FORMATOS_CERTIFICADO:
+            raise ValueError("Formato de certificado não suportado. Use PDF ou SVG.")
+        return valor
+
+
+class SolicitacaoCertificado(OpcoesCertificado):
+    """Esquema para solicitar o certificado de genealogia de um animal."""
+    animal_id: int
+
+
+class SolicitacaoLoteCertificados(OpcoesCertificado):
+    """Esquema para solicitar os certificados dos animais selecionados pelos filtros."""
+    especie: Optional[str] = None
+    raca: Optional[str] = None
+    sexo: Optional[str] = None
+    nascido_desde: Optional[date] = None
+    nascido_ate: Optional[date] = None
+
+
+class TrabalhoCertificadoResponse(BaseModel):
+    """Esquema para resposta com a situação de um certificado solicitado."""
+    id: int
+    animal_id: int
+    lote_id: Optional[int] = None
+    formato: str
+    geracoes: int
+    status: str  # 'pendente', 'processando', 'concluido' ou 'falhou'
+    erro: Optional[str] = None
+    criado_em: datetime
+    concluido_em: Optional[datetime] = None
+    arquivo_url: Optional[str] = None
+
+    @validator("arquivo_url", always=True)
+    def _url_arquivo(cls, valor, values):
+        if valor or values.get("status") != "concluido":
+            return valor
+        return f"{settings.API_V1_STR}/certificados/{values['id']}/arquivo"
+
+    class Config:
+        orm_mode = True
+
+
+class LoteCertificadosResponse(BaseModel):
+    """Esquema para resposta com a situação de um lote de certificados."""
+    id: int
+    formato: str
+    geracoes: int
+    filtros: Optional[Dict[str, Any]] = None
+    total: int
+    pendentes: int
+    concluidos: int
+    falhos: int
+    criado_em: datetime
+    arquivo_url: str  # arquivo ZIP com os certificados já gerados
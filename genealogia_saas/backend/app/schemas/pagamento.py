@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, constr
+
+
+class EventoPagamentoEntrada(BaseModel):
+    """Esquema de um evento de pagamento enviado pelo provedor."""
+    evento_id: constr(min_length=1, max_length=255)
+    organizacao_id: int
+    tipo: str
+    ocorrido_em: Optional[datetime] = None
+    dados: Optional[Dict[str, Any]] = None
+
+
+class NotificacaoPagamento(BaseModel):
+    """Esquema do corpo do webhook: um evento ou um lote de eventos."""
+    __root__: Union[List[EventoPagamentoEntrada], EventoPagamentoEntrada]
+
+    @property
+    def eventos(self) -> List[EventoPagamentoEntrada]:
+        return self.__root__ if isinstance(self.__root__, list) else [self.__root__]
+
+
+class ResultadoWebhook(BaseModel):
+    """Esquema para resposta do webhook de pagamentos."""
+    recebidos: int
+    novos: int
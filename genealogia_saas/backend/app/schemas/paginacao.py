@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic.generics import GenericModel
+
+T = TypeVar("T")
+
+
+class Pagina(GenericModel, Generic[T]):
+    """Esquema para uma página de resultados com paginação por cursor."""
+    itens: List[T]
+    proximo_cursor: Optional[str] = None  # None quando não há mais páginas
+    total_estimado: Optional[int] = None  # apenas quando solicitado
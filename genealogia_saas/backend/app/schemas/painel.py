@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ResumoPlanoResponse(BaseModel):
+    """Esquema com os totais de um plano de assinatura."""
+    plano_assinatura_id: int
+    nome: str
+    preco: Decimal
+    organizacoes: int
+    organizacoes_ativas: int
+    animais: int
+    receita_mensal: Decimal
+
+    class Config:
+        orm_mode = True
+
+
+class ResumoMensalResponse(BaseModel):
+    """Esquema com a evolução da plataforma em um mês."""
+    mes: date
+    novas_organizacoes: int
+    organizacoes: Optional[int] = None
+    organizacoes_ativas: Optional[int] = None
+    animais: Optional[int] = None
+    receita_mensal: Optional[Decimal] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ResumoPainel(BaseModel):
+    """Esquema com os números do painel administrativo."""
+    atualizado_em: Optional[datetime] = None
+    total_organizacoes: int
+    total_animais: int
+    total_planos: int
+    receita_mensal: Decimal
+    organizacoes_por_status: Dict[str, int]
+    planos: List[ResumoPlanoResponse]
+    crescimento: List[ResumoMensalResponse]
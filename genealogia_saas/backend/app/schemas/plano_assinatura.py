@@ -0,0 +1,17 @@
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PlanoAssinaturaResponse(BaseModel):
+    """Esquema para resposta com dados de um plano de assinatura."""
+    id: int
+    nome: str
+    preco: Decimal
+    limite_animais: int
+    descricao: Optional[str] = None
+    funcionalidades: Optional[List[str]] = None
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class OrganizacaoAutenticada(BaseModel):
+    """Dados da organização autenticada mantidos em cache entre requisições."""
+    id: int
+    email: str
+    plano_assinatura_id: Optional[int] = None
+    status_assinatura: str
+
+    @property
+    def assinatura_ativa(self) -> bool:
+        """Verifica se a assinatura da organização está ativa."""
+        return self.status_assinatura == "Ativa"
+
+    class Config:
+        orm_mode = True
+        allow_mutation = False
+
+
+class AdminAutenticado(BaseModel):
+    """Dados do administrador autenticado mantidos em cache entre requisições."""
+    id: int
+    nome: str
+    email: str
+    permissoes: Optional[List[str]] = None
+
+    def tem_permissao(self, permissao: str) -> bool:
+        """Verifica se o usuário tem uma permissão específica."""
+        return permissao in (self.permissoes or [])
+
+    class Config:
+        orm_mode = True
+        allow_mutation = False
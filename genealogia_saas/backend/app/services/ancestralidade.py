@@ -0,0 +1,228 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.ancestralidade_animal import AncestralidadeAnimal
+from app.models.animal import Animal
+from app.services.grafo_genealogico import carregar_grafo
+
+
+class GenealogiaInvalidaError(ValueError):
+    """Erro lançado quando a atribuição de pai/mãe de um animal é inválida."""
+
+    def __init__(self, erros: List[str]):
+        super().__init__(" ".join(erros))
+        self.erros = erros
+
+
+class AtribuicaoGenitores(NamedTuple):
+    """Pai e mãe propostos para um animal (animal_id é None para animais novos)."""
+    animal_id: Optional[int]
+    especie: str
+    pai_id: Optional[int]
+    mae_id: Optional[int]
+    nome: Optional[str] = None
+
+
+def validar_genitores(db: Session, organizacao_id: int, atribuicoes: Iterable[AtribuicaoGenitores]) -> None:
+    """Valida pai e mãe de um ou mais animais em uma única consulta.
+
+    Para cada genitor proposto verifica, de uma vez, se ele existe na
+    organização, se o sexo e a espécie são compatíveis e se o animal editado
+    não é o próprio genitor nem um de seus ancestrais (o que criaria um ciclo).
+    A verificação de ciclo usa o índice de ancestralidade em vez de percorrer
+    a descendência do animal.
+    """
+    atribuicoes = list(atribuicoes)
+    genitores_ids = {
+        genitor_id
+        for atribuicao in atribuicoes
+        for genitor_id in (atribuicao.pai_id, atribuicao.mae_id)
+        if genitor_id is not None
+    }
+    if not genitores_ids:
+        return
+
+    animais_ids = {atribuicao.animal_id for atribuicao in atribuicoes if atribuicao.animal_id is not None}
+
+    # Genitores e, para cada um, quais dos animais editados são ele mesmo ou seus ancestrais
+    consulta = (
+        select(Animal.id, Animal.sexo, Animal.especie, AncestralidadeAnimal.ancestral_id)
+        .outerjoin(
+            AncestralidadeAnimal,
+            and_(
+                AncestralidadeAnimal.organizacao_id == organizacao_id,
+                AncestralidadeAnimal.descendente_id == Animal.id,
+                AncestralidadeAnimal.ancestral_id.in_(animais_ids or [-1]),
+            ),
+        )
+        .where(Animal.organizacao_id == organizacao_id, Animal.id.in_(genitores_ids))
+    )
+    genitores: Dict[int, Dict] = {}
+    for linha in db.execute(consulta):
+        genitor = genitores.setdefault(linha.id, {"sexo": linha.sexo, "especie": linha.especie, "descendentes_de": set()})
+        if linha.ancestral_id is not None:
+            genitor["descendentes_de"].add(linha.ancestral_id)
+
+    erros = []
+    for atribuicao in atribuicoes:
+        animal = atribuicao.nome or (f"Animal {atribuicao.animal_id}" if atribuicao.animal_id else "Animal")
+        if atribuicao.pai_id is not None and atribuicao.pai_id == atribuicao.mae_id:
+            erros.append(f"{animal}: pai e mãe não podem ser o mesmo animal.")
+            continue
+
+        for papel, genitor_id, sexo_invalido in (
+            ("pai", atribuicao.pai_id, "Fêmea"),
+            ("mãe", atribuicao.mae_id, "Macho"),
+        ):
+            if genitor_id is None:
+                continue
+            genitor = genitores.get(genitor_id)
+            if genitor is None:
+                erros.append(f"{animal}: o animal {genitor_id} indicado como {papel} não foi encontrado.")
+            elif atribuicao.animal_id is not None and atribuicao.animal_id in genitor["descendentes_de"]:
+                erros.append(f"{animal}: {papel} não pode ser o próprio animal nem um de seus descendentes.")
+            elif genitor["sexo"] == sexo_invalido:
+                erros.append(f"{animal}: sexo incompatível para {papel}.")
+            elif genitor["especie"] != atribuicao.especie:
+                erros.append(f"{animal}: {papel} de outra espécie.")
+
+    if erros:
+        raise GenealogiaInvalidaError(erros)
+
+
+def validar_alteracao_sexo(db: Session, organizacao_id: int, animal_id: int, sexo: Optional[str]) -> None:
+    """Verifica se o novo sexo de um animal é compatível com os filhos já registrados."""
+    if sexo == "Fêmea":
+        papel, coluna = "pai", Animal.pai_id
+    elif sexo == "Macho":
+        papel, coluna = "mãe", Animal.mae_id
+    else:
+        return
+
+    filhos = select(Animal.id).where(Animal.organizacao_id == organizacao_id, coluna == animal_id)
+    if db.query(filhos.exists()).scalar():
+        raise GenealogiaInvalidaError([f"O animal está registrado como {papel} de outros animais."])
+
+
+def _inserir_ancestrais_dos_genitores(db: Session, organizacao_id: int, animais_ids: List[int]) -> None:
+    # Ancestrais de um animal novo: os genitores e os ancestrais deles (linha própria com distância 0)
+    ancestralidade = AncestralidadeAnimal.__table__
+    db.execute(
+        insert(ancestralidade).from_select(
+            ["ancestral_id", "descendente_id", "organizacao_id", "distancia"],
+            select(
+                ancestralidade.c.ancestral_id,
+                Animal.id,
+                literal(organizacao_id),
+                func.min(ancestralidade.c.distancia + 1),
+            )
+            .join(
+                ancestralidade,
+                and_(
+                    ancestralidade.c.organizacao_id == organizacao_id,
+                    or_(ancestralidade.c.descendente_id == Animal.pai_id, ancestralidade.c.descendente_id == Animal.mae_id),
+                ),
+            )
+            .where(Animal.organizacao_id == organizacao_id, Animal.id.in_(animais_ids))
+            .group_by(ancestralidade.c.ancestral_id, Animal.id),
+        )
+    )
+
+
+def indexar_novos_animais(db: Session, organizacao_id: int, camadas: Iterable[List[int]]) -> None:
+    """Inclui no índice de ancestralidade animais recém-inseridos.
+
+    As camadas devem estar em ordem topológica (genitores antes dos filhos),
+    já que cada camada é indexada a partir das linhas dos genitores.
+    """
+    for camada in camadas:
+        if not camada:
+            continue
+        db.execute(
+            insert(AncestralidadeAnimal.__table__),
+            [
+                {"ancestral_id": animal_id, "descendente_id": animal_id, "organizacao_id": organizacao_id, "distancia": 0}
+                for animal_id in camada
+            ],
+        )
+        _inserir_ancestrais_dos_genitores(db, organizacao_id, camada)
+
+
+def reindexar_genealogia(db: Session, organizacao_id: int, animal_id: int) -> None:
+    """Atualiza o índice de ancestralidade após alterar o pai ou a mãe de um animal.
+
+    Somente as ligações entre ancestrais externos e a descendência do animal
+    mudam: elas são removidas e recriadas a partir dos genitores externos de
+    cada membro da descendência, em duas instruções SQL.
+    """
+    ancestralidade = AncestralidadeAnimal.__table__
+    membros = ancestralidade.alias("membros")
+    descendencia = select(membros.c.descendente_id).where(
+        membros.c.organizacao_id == organizacao_id, membros.c.ancestral_id == animal_id
+    )
+
+    db.execute(
+        delete(ancestralidade).where(
+            ancestralidade.c.organizacao_id == organizacao_id,
+            ancestralidade.c.descendente_id.in_(descendencia),
+            ancestralidade.c.ancestral_id.notin_(descendencia),
+        )
+    )
+
+    # Para cada membro S da descendência com um genitor P externo, os ancestrais
+    # de P passam a ser ancestrais de tudo que descende de S
+    interno = ancestralidade.alias("interno")
+    externo = ancestralidade.alias("externo")
+    membro = aliased(Animal)
+    db.execute(
+        insert(ancestralidade).from_select(
+            ["ancestral_id", "descendente_id", "organizacao_id", "distancia"],
+            select(
+                externo.c.ancestral_id,
+                interno.c.descendente_id,
+                literal(organizacao_id),
+                func.min(externo.c.distancia + 1 + interno.c.distancia),
+            )
+            .select_from(interno)
+            .join(membro, and_(membro.organizacao_id == organizacao_id, membro.id == interno.c.ancestral_id))
+            .join(
+                externo,
+                and_(
+                    externo.c.organizacao_id == organizacao_id,
+                    or_(externo.c.descendente_id == membro.pai_id, externo.c.descendente_id == membro.mae_id),
+                ),
+            )
+            .where(
+                interno.c.organizacao_id == organizacao_id,
+                interno.c.ancestral_id.in_(descendencia),
+                externo.c.descendente_id.notin_(descendencia),
+            )
+            .group_by(externo.c.ancestral_id, interno.c.descendente_id),
+        )
+    )
+
+
+def remover_do_indice(db: Session, organizacao_id: int, animal_id: int) -> None:
+    """Remove do índice de ancestralidade todas as linhas de um animal."""
+    ancestralidade = AncestralidadeAnimal.__table__
+    db.execute(
+        delete(ancestralidade).where(
+            ancestralidade.c.organizacao_id == organizacao_id,
+            or_(ancestralidade.c.ancestral_id == animal_id, ancestralidade.c.descendente_id == animal_id),
+        )
+    )
+
+
+def reconstruir_indice(db: Session, organizacao_id: int) -> None:
+    """Reconstrói por completo o índice de ancestralidade de uma organização."""
+    db.execute(delete(AncestralidadeAnimal.__table__).where(AncestralidadeAnimal.organizacao_id == organizacao_id))
+
+    grafo = carregar_grafo(db, organizacao_id)
+    geracoes = grafo.geracoes
+    camadas: Dict[int, List[int]] = {}
+    for animal_id, geracao in zip(grafo.ids.tolist(), geracoes.tolist()):
+        camadas.setdefault(geracao, []).append(animal_id)
+    indexar_novos_animais(db, organizacao_id, (camadas[geracao] for geracao in sorted(camadas)))
+
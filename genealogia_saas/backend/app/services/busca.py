@@ -0,0 +1,133 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.eventos import AlteracaoAnimal, observar_alteracoes_animais
+from app.models.animal import Animal
+
+# Fração mínima dos trigramas da busca que deve aparecer no animal
+LIMIAR_SIMILARIDADE = 0.4
+
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e converte para minúsculas ("Galo Índio" -> "galo indio")."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere)).lower()
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas de cada palavra do texto normalizado, no mesmo formato do pg_trgm."""
+    resultado = set()
+    for palavra in _PALAVRA.findall(normalizar(texto)):
+        palavra = f"  {palavra} "
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
+
+
+def _documento(nome: Optional[str], raca: Optional[str], caracteristicas: Optional[str]) -> str:
+    return " ".join(parte for parte in (nome, raca, caracteristicas) if parte)
+
+
+class IndiceBusca:
+    """Índice invertido de trigramas dos animais de uma organização.
+
+    Usado quando o banco não é o PostgreSQL (ex.: SQLite em desenvolvimento).
+    A relevância é a fração dos trigramas da busca presentes no animal, o que
+    tolera acentos e pequenos erros de digitação.
+    """
+
+    def __init__(self, documentos: Dict[int, str]):
+        self._postagens: Dict[str, List[int]] = {}
+        for animal_id, documento in documentos.items():
+            for trigrama in trigramas(documento):
+                self._postagens.setdefault(trigrama, []).append(animal_id)
+
+    def buscar(self, termo: str, limite: int) -> List[Tuple[int, float]]:
+        """Retorna (animal_id, relevância) dos animais mais parecidos com o termo."""
+        consulta = trigramas(termo)
+        if not consulta:
+            return []
+
+        ocorrencias = Counter()
+        for trigrama in consulta:
+            ocorrencias.update(self._postagens.get(trigrama, ()))
+
+        resultados = [
+            (animal_id, quantidade / len(consulta))
+            for animal_id, quantidade in ocorrencias.items()
+            if quantidade / len(consulta) >= LIMIAR_SIMILARIDADE
+        ]
+        resultados.sort(key=lambda item: (-item[1], item[0]))
+        return resultados[:limite]
+
+
+class RegistroIndicesBusca:
+    """Mantém em memória, por organização, os índices de busca já construídos."""
+
+    def __init__(self, ttl_segundos: int):
+        self.ttl_segundos = ttl_segundos
+        self._indices: Dict[int, Tuple[float, IndiceBusca]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, db: Session, organizacao_id: int) -> IndiceBusca:
+        """Obtém o índice da organização, construindo-o na primeira utilização."""
+        with self._lock:
+            item = self._indices.get(organizacao_id)
+        if item is not None and time.monotonic() - item[0] < self.ttl_segundos:
+            return item[1]
+
+        linhas = db.execute(
+            select(Animal.id, Animal.nome, Animal.raca, Animal.caracteristicas_fisicas)
+            .where(Animal.organizacao_id == organizacao_id)
+        )
+        indice = IndiceBusca({linha.id: _documento(linha.nome, linha.raca, linha.caracteristicas_fisicas) for linha in linhas})
+        with self._lock:
+            self._indices[organizacao_id] = (time.monotonic(), indice)
+        return indice
+
+    def invalidar_alteracoes(self, alteracoes: List[AlteracaoAnimal]) -> None:
+        """Descarta os índices das organizações com animais alterados."""
+        with self._lock:
+            for alteracao in alteracoes:
+                self._indices.pop(alteracao.organizacao_id, None)
+
+
+registro_indices_busca = RegistroIndicesBusca(settings.BUSCA_INDICE_TTL_SEGUNDOS)
+observar_alteracoes_animais(registro_indices_busca.invalidar_alteracoes)
+
+
+def _buscar_postgresql(db: Session, organizacao_id: int, termo: str, limite: int) -> List[Tuple[int, float]]:
+    # A expressão precisa ser idêntica à do índice ix_animal_busca_trgm
+    documento = func.busca_documento_animal(Animal.nome, Animal.raca, Animal.caracteristicas_fisicas)
+    consulta = func.busca_normalizar(termo)
+    relevancia = func.word_similarity(consulta, documento)
+
+    # O operador <% usa o índice GIN com o limiar definido apenas nesta transação
+    db.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(LIMIAR_SIMILARIDADE), True)))
+    linhas = db.execute(
+        select(Animal.id, relevancia.label("relevancia"))
+        .where(Animal.organizacao_id == organizacao_id, consulta.op("<%")(documento))
+        .order_by(relevancia.desc(), Animal.id)
+        .limit(limite)
+    )
+    return [(linha.id, float(linha.relevancia)) for linha in linhas]
+
+
+def buscar_animais(db: Session, organizacao_id: int, termo: str, limite: int) -> List[Tuple[int, float]]:
+    """Busca aproximada por nome, raça e características, ordenada por relevância.
+
+    Retorna (animal_id, relevância entre 0 e 1). No PostgreSQL usa o índice de
+    trigramas do banco; nos demais, o índice em memória da organização.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _buscar_postgresql(db, organizacao_id, termo, limite)
+    return registro_indices_busca.obter(db, organizacao_id).buscar(termo, limite)
@@ -0,0 +1,302 @@
+import base64
+import hashlib
+import json
+import os
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.organizacao import Organizacao
+from app.services.genealogia import obter_arvore_genealogica
+from app.services.imagens import caminho_variante
+
+# Versão do layout impresso: alterá-la faz todos os certificados serem gerados de novo
+VERSAO_LAYOUT = 1
+
+# Formatos aceitos e seus tipos de conteúdo
+FORMATOS_CERTIFICADO = {"pdf": "application/pdf", "svg": "image/svg+xml"}
+
+GERACOES_MAXIMAS = 5
+
+# Título de cada coluna do certificado, por geração
+_TITULOS_COLUNAS = ("Animal", "Pais", "Avós", "Bisavós", "Trisavós", "Tetravós")
+
+# Página A4 em paisagem, em pontos (1/72 de polegada)
+LARGURA_PAGINA = 842.0
+ALTURA_PAGINA = 595.0
+_MARGEM = 28.0
+_CABECALHO = 64.0
+_ESPACO_COLUNAS = 14.0
+_ESPACO_CAIXAS = 4.0
+_ALTURA_MAXIMA_CAIXA = 120.0
+_ALTURA_MINIMA_FOTO = 34.0  # caixas mais baixas são impressas sem a foto
+_LADO_MAXIMO_FOTO = 72.0
+
+_CORES_SEXO = {"Macho": "#e8f0fb", "Fêmea": "#fbe8f1"}
+_COR_CAIXA = "#f2f2f2"
+_COR_TRACO = "#555555"
+_COR_TEXTO = "#222222"
+_COR_SECUNDARIA = "#666666"
+
+
+class Elemento(NamedTuple):
+    """Primitiva de desenho do certificado, em pontos a partir do canto superior esquerdo.
+
+    `tipo` é 'retangulo' (x, y, largura, altura, cor), 'linha' (pontos),
+    'texto' (x, y da linha de base, texto, tamanho, negrito, cor, à direita)
+    ou 'imagem' (caminho, x, y, lado).
+    """
+    tipo: str
+    valores: Tuple[Any, ...]
+
+
+def _foto(no: Dict[str, Any]) -> Optional[str]:
+    # Apenas as versões reduzidas (JPEG) entram no certificado; o original pode ser enorme
+    if not no.get("imagem_hash"):
+        return None
+    for variante in ("media", "miniatura"):
+        if os.path.exists(caminho_variante(no["imagem_hash"], variante)):
+            return variante
+    return None
+
+
+def _no_certificado(no: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if no is None:
+        return None
+    nascimento = no.get("data_nascimento")
+    return {
+        "id": no["id"],
+        "nome": no["nome"],
+        "especie": no["especie"],
+        "raca": no.get("raca"),
+        "sexo": no.get("sexo"),
+        "data_nascimento": nascimento.isoformat() if nascimento else None,
+        "imagem_hash": no.get("imagem_hash"),
+        "foto": _foto(no),
+        "pai": _no_certificado(no.get("pai")),
+        "mae": _no_certificado(no.get("mae")),
+    }
+
+
+def dados_certificado(db: Session, animal_id: int, organizacao_id: int, geracoes: int) -> Optional[Dict[str, Any]]:
+    """Reúne tudo o que é impresso no certificado (None se o animal não existir).
+
+    O resultado contém apenas tipos simples: é enviado aos processos de
+    renderização e determina a chave do arquivo gerado.
+    """
+    arvore = obter_arvore_genealogica(db, animal_id, organizacao_id, geracoes)
+    if arvore is None:
+        return None
+    organizacao = db.execute(select(Organizacao.nome).where(Organizacao.id == organizacao_id)).scalar()
+    return {
+        "versao": VERSAO_LAYOUT,
+        "organizacao": organizacao,
+        "geracoes": geracoes,
+        "animal": _no_certificado(arvore["animal"]),
+    }
+
+
+def chave_certificado(dados: Dict[str, Any], formato: str) -> str:
+    """SHA-256 dos dados impressos e do formato; muda quando qualquer ancestral muda."""
+    conteudo = json.dumps({**dados, "formato": formato}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def caminho_certificado(chave: str, formato: str) -> str:
+    """Caminho do certificado no armazenamento, derivado da chave."""
+    return os.path.join(settings.MEDIA_DIR, "certificados", chave[:2], f"{chave}.{formato}")
+
+
+def _ajustar(texto: str, largura: float, tamanho: float, negrito: bool = False) -> str:
+    # Largura média de um caractere da Helvetica; basta para não invadir a caixa vizinha
+    cabem = int(largura / (tamanho * (0.56 if negrito else 0.5)))
+    return texto if len(texto) <= cabem else texto[:max(cabem - 1, 1)].rstrip() + "…"
+
+
+def _data(valor: Optional[str]) -> Optional[str]:
+    return date.fromisoformat(valor).strftime("%d/%m/%Y") if valor else None
+
+
+def _caixa(no: Dict[str, Any], x: float, y: float, largura: float, altura: float) -> List[Elemento]:
+    elementos = [Elemento("retangulo", (x, y, largura, altura, _CORES_SEXO.get(no["sexo"], _COR_CAIXA)))]
+
+    texto_x = x + 5
+    if no["foto"] and altura >= _ALTURA_MINIMA_FOTO:
+        lado = min(altura - 6, _LADO_MAXIMO_FOTO, largura * 0.35)
+        caminho = caminho_variante(no["imagem_hash"], no["foto"])
+        elementos.append(Elemento("imagem", (caminho, x + 3, y + (altura - lado) / 2, lado)))
+        texto_x += lado + 3
+    largura_texto = x + largura - 4 - texto_x
+
+    tamanho = max(6.0, min(11.0, altura / 4))
+    detalhes = [
+        " · ".join(filter(None, (no["raca"] or no["especie"], no["sexo"]))),
+        f"Nasc.: {_data(no['data_nascimento'])}" if no["data_nascimento"] else None,
+    ]
+    detalhes = [detalhe for detalhe in detalhes if detalhe]
+    # Linhas de detalhe que cabem abaixo do nome
+    cabem = max(int((altura - 4 - tamanho * 1.3) // (tamanho * 1.1)), 0)
+    linhas = [(no["nome"], tamanho, True)] + [(detalhe, tamanho * 0.85, False) for detalhe in detalhes[:cabem]]
+
+    altura_texto = sum(tamanho_linha * 1.25 for _, tamanho_linha, _ in linhas)
+    base = y + (altura - altura_texto) / 2
+    for texto, tamanho_linha, negrito in linhas:
+        base += tamanho_linha * 1.25
+        elementos.append(Elemento("texto", (
+            texto_x,
+            base - tamanho_linha * 0.25,
+            _ajustar(texto, largura_texto, tamanho_linha, negrito),
+            tamanho_linha,
+            negrito,
+            _COR_TEXTO if negrito else _COR_SECUNDARIA,
+            False,
+        )))
+    return elementos
+
+
+def elementos_certificado(dados: Dict[str, Any]) -> List[Elemento]:
+    """Monta o desenho do certificado: cabeçalho e uma coluna por geração.
+
+    Cada geração divide a altura da página igualmente entre as posições
+    possíveis (2, 4, 8...), como em um pedigree impresso; ancestrais
+    desconhecidos deixam a posição em branco.
+    """
+    geracoes = dados["geracoes"]
+    animal = dados["animal"]
+    largura = (LARGURA_PAGINA - 2 * _MARGEM - geracoes * _ESPACO_COLUNAS) / (geracoes + 1)
+    topo = _MARGEM + _CABECALHO
+    altura_util = ALTURA_PAGINA - topo - _MARGEM
+
+    subtitulo = " · ".join(filter(None, (animal["nome"], animal["especie"], animal["raca"])))
+    elementos = [
+        Elemento("texto", (_MARGEM, _MARGEM + 18, "Certificado de Genealogia", 20.0, True, _COR_TEXTO, False)),
+        Elemento("texto", (_MARGEM, _MARGEM + 36, _ajustar(subtitulo, LARGURA_PAGINA / 2, 12.0), 12.0, False, _COR_TEXTO, False)),
+    ]
+    if dados["organizacao"]:
+        elementos.append(Elemento("texto", (
+            LARGURA_PAGINA - _MARGEM, _MARGEM + 18, f"Emitido por {dados['organizacao']}", 9.0, False, _COR_SECUNDARIA, True
+        )))
+    for geracao in range(geracoes + 1):
+        x = _MARGEM + geracao * (largura + _ESPACO_COLUNAS)
+        elementos.append(Elemento("texto", (x, topo - 8, _TITULOS_COLUNAS[geracao], 8.0, True, _COR_SECUNDARIA, False)))
+
+    def posicionar(no: Optional[Dict[str, Any]], geracao: int, posicao: int, ligacao: Optional[Tuple[float, float]]) -> None:
+        if no is None or geracao > geracoes:
+            return
+        faixa = altura_util / 2 ** geracao
+        altura = min(faixa - _ESPACO_CAIXAS, _ALTURA_MAXIMA_CAIXA)
+        x = _MARGEM + geracao * (largura + _ESPACO_COLUNAS)
+        y = topo + posicao * faixa + (faixa - altura) / 2
+        if ligacao is not None:
+            meio = ligacao[0] + _ESPACO_COLUNAS / 2
+            elementos.append(Elemento("linha", (ligacao, (meio, ligacao[1]), (meio, y + altura / 2), (x, y + altura / 2))))
+        elementos.extend(_caixa(no, x, y, largura, altura))
+
+        saida = (x + largura, y + altura / 2)
+        posicionar(no["pai"], geracao + 1, 2 * posicao, saida)
+        posicionar(no["mae"], geracao + 1, 2 * posicao + 1, saida)
+
+    posicionar(animal, 0, 0, None)
+    return elementos
+
+
+def _svg(elementos: List[Elemento], titulo: str) -> bytes:
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{LARGURA_PAGINA:g}pt" height="{ALTURA_PAGINA:g}pt" '
+        f'viewBox="0 0 {LARGURA_PAGINA:g} {ALTURA_PAGINA:g}" font-family="Helvetica, Arial, sans-serif">',
+        f"<title>{escape(titulo)}</title>",
+        f'<rect width="{LARGURA_PAGINA:g}" height="{ALTURA_PAGINA:g}" fill="#ffffff"/>',
+    ]
+    for elemento in elementos:
+        valores = elemento.valores
+        if elemento.tipo == "retangulo":
+            x, y, largura, altura, cor = valores
+            partes.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{largura:.1f}" height="{altura:.1f}" rx="4" '
+                f'fill="{cor}" stroke="{_COR_TRACO}" stroke-width="0.8"/>'
+            )
+        elif elemento.tipo == "linha":
+            pontos = " ".join(f"{x:.1f},{y:.1f}" for x, y in valores)
+            partes.append(f'<polyline points="{pontos}" fill="none" stroke="{_COR_TRACO}" stroke-width="0.8"/>')
+        elif elemento.tipo == "texto":
+            x, y, texto, tamanho, negrito, cor, direita = valores
+            atributos = ' font-weight="bold"' if negrito else ""
+            atributos += ' text-anchor="end"' if direita else ""
+            partes.append(
+                f'<text x="{x:.1f}" y="{y:.1f}" font-size="{tamanho:.1f}" fill="{cor}"{atributos}>{escape(texto)}</text>'
+            )
+        elif elemento.tipo == "imagem":
+            caminho, x, y, lado = valores
+            with open(caminho, "rb") as arquivo:
+                conteudo = base64.b64encode(arquivo.read()).decode("ascii")
+            partes.append(
+                f'<image x="{x:.1f}" y="{y:.1f}" width="{lado:.1f}" height="{lado:.1f}" '
+                f'preserveAspectRatio="xMidYMid slice" href={quoteattr("data:image/jpeg;base64," + conteudo)}/>'
+            )
+    partes.append("</svg>")
+    return "\n".join(partes).encode("utf-8")
+
+
+def _pdf(elementos: List[Elemento], titulo: str, destino: str) -> None:
+    # Executada no pool de processos: o ReportLab é importado apenas nos processos filhos
+    from reportlab.lib.colors import HexColor
+    from reportlab.pdfgen import canvas
+
+    pagina = canvas.Canvas(destino, pagesize=(LARGURA_PAGINA, ALTURA_PAGINA), invariant=1)
+    pagina.setTitle(titulo)
+    pagina.setLineWidth(0.8)
+    pagina.setStrokeColor(HexColor(_COR_TRACO))
+    # O PDF mede a altura a partir da base da página
+    for elemento in elementos:
+        valores = elemento.valores
+        if elemento.tipo == "retangulo":
+            x, y, largura, altura, cor = valores
+            pagina.setFillColor(HexColor(cor))
+            pagina.roundRect(x, ALTURA_PAGINA - y - altura, largura, altura, 4, stroke=1, fill=1)
+        elif elemento.tipo == "linha":
+            caminho = pagina.beginPath()
+            (x, y), *seguintes = valores
+            caminho.moveTo(x, ALTURA_PAGINA - y)
+            for x, y in seguintes:
+                caminho.lineTo(x, ALTURA_PAGINA - y)
+            pagina.drawPath(caminho, stroke=1, fill=0)
+        elif elemento.tipo == "texto":
+            x, y, texto, tamanho, negrito, cor, direita = valores
+            pagina.setFont("Helvetica-Bold" if negrito else "Helvetica", tamanho)
+            pagina.setFillColor(HexColor(cor))
+            desenhar = pagina.drawRightString if direita else pagina.drawString
+            desenhar(x, ALTURA_PAGINA - y, texto)
+        elif elemento.tipo == "imagem":
+            caminho, x, y, lado = valores
+            pagina.drawImage(caminho, x, ALTURA_PAGINA - y - lado, lado, lado, preserveAspectRatio=True, anchor="c")
+    pagina.showPage()
+    pagina.save()
+
+
+def renderizar_certificado(dados: Dict[str, Any], formato: str, destino: str) -> int:
+    """Gera o arquivo do certificado em `destino`; retorna o tamanho em bytes.
+
+    Executada no pool de processos. O arquivo é escrito em um temporário e
+    movido ao final, para que nunca seja servido pela metade.
+    """
+    elementos = elementos_certificado(dados)
+    titulo = f"Certificado de Genealogia - {dados['animal']['nome']}"
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    try:
+        if formato == "svg":
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(_svg(elementos, titulo))
+        else:
+            _pdf(elementos, titulo, temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return os.path.getsize(destino)
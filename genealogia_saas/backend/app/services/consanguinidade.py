@@ -0,0 +1,332 @@
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.grafo_genealogico import SEM_GENITOR, GrafoGenealogico, registro_grafos
+
+logger = logging.getLogger(__name__)
+
+
+class CalculadoraConsanguinidade:
+    """Calcula coeficientes de consanguinidade de Wright (F) sobre um grafo genealógico.
+
+    Usa a decomposição A = L D L' da matriz de parentesco (Meuwissen & Luo, 1992):
+    L_ij é a contribuição do ancestral j para o animal i e D_j a variância
+    mendeliana de j, de modo que F_i = sum_j L_ij^2 * D_j - 1. Os animais são
+    processados em ordem topológica, uma geração por vez; os casais de uma
+    geração são agrupados em lotes e suas contribuições propagadas aos
+    ancestrais com operações matriciais do NumPy. Irmãos completos
+    compartilham o mesmo casal e são calculados uma única vez.
+    """
+
+    # Quantidade de casais (colunas) propagados juntos em cada lote
+    TAMANHO_LOTE = 64
+
+    def __init__(self, grafo: GrafoGenealogico, coeficientes: np.ndarray, variancias: np.ndarray):
+        self.grafo = grafo
+        self.geracoes = grafo.geracoes
+        self.coeficientes = coeficientes
+        self.variancias = variancias
+        self._auxiliares: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _vetores_auxiliares(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Vetores de trabalho (visitados, posições) reaproveitados entre lotes
+        if self._auxiliares is None:
+            n = len(self.grafo)
+            self._auxiliares = (np.zeros(n, dtype=bool), np.full(n, -1, dtype=np.int64))
+        return self._auxiliares
+
+    def _variancias_mendelianas(self, indices: np.ndarray) -> np.ndarray:
+        pais, maes = self.grafo.pais[indices], self.grafo.maes[indices]
+        f_pai = np.where(pais != SEM_GENITOR, self.coeficientes[pais], 0.0)
+        f_mae = np.where(maes != SEM_GENITOR, self.coeficientes[maes], 0.0)
+        conhecidos = (pais != SEM_GENITOR).astype(np.int8) + (maes != SEM_GENITOR)
+        return np.select(
+            [conhecidos == 2, conhecidos == 1],
+            [0.5 - 0.25 * (f_pai + f_mae), 0.75 - 0.25 * (f_pai + f_mae)],
+            default=1.0,
+        )
+
+    def ancestrais(self, indices: np.ndarray) -> np.ndarray:
+        """Retorna os animais informados e todos os seus ancestrais (posições)."""
+        pais, maes = self.grafo.pais, self.grafo.maes
+        visitados, _ = self._vetores_auxiliares()
+        fronteira = np.unique(indices)
+        visitados[fronteira] = True
+        encontrados = [fronteira]
+        while len(fronteira):
+            genitores = np.concatenate([pais[fronteira], maes[fronteira]])
+            genitores = np.unique(genitores[genitores != SEM_GENITOR])
+            fronteira = genitores[~visitados[genitores]]
+            visitados[fronteira] = True
+            encontrados.append(fronteira)
+
+        todos = np.concatenate(encontrados)
+        visitados[todos] = False
+        return todos
+
+    def matriz_contribuicoes(
+        self, origens: np.ndarray, colunas: np.ndarray, pesos: np.ndarray, total_colunas: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Calcula as contribuições dos ancestrais (linhas de L) para várias origens de uma vez.
+
+        Cada coluna recebe o peso das origens indicadas (`origens[k]` contribui
+        com `pesos[k]` na coluna `colunas[k]`). Retorna os ancestrais envolvidos,
+        ordenados da geração mais recente para a mais antiga, e a matriz de
+        contribuições (ancestrais x colunas). Ancestrais comuns a várias colunas
+        são percorridos uma única vez.
+        """
+        nos = self.ancestrais(origens)
+        nos = nos[np.argsort(-self.geracoes[nos], kind="stable")]
+        _, posicoes = self._vetores_auxiliares()
+        posicoes[nos] = np.arange(len(nos))
+
+        contribuicoes = np.zeros((len(nos), total_colunas), dtype=np.float64)
+        np.add.at(contribuicoes, (posicoes[origens], colunas), pesos)
+
+        # Como os genitores pertencem a gerações anteriores, ao chegar a um bloco
+        # de mesma geração suas contribuições já estão completas
+        pais, maes = self.grafo.pais[nos], self.grafo.maes[nos]
+        geracoes = self.geracoes[nos]
+        limites = np.flatnonzero(np.diff(geracoes)) + 1
+        for inicio, fim in zip(np.r_[0, limites], np.r_[limites, len(nos)]):
+            valores = 0.5 * contribuicoes[inicio:fim]
+            for genitores in (pais[inicio:fim], maes[inicio:fim]):
+                conhecidos = genitores != SEM_GENITOR
+                if conhecidos.any():
+                    np.add.at(contribuicoes, posicoes[genitores[conhecidos]], valores[conhecidos])
+
+        posicoes[nos] = -1
+        return nos, contribuicoes
+
+    def endogamia_prole(self, pais: np.ndarray, maes: np.ndarray) -> np.ndarray:
+        """Coeficientes de consanguinidade da prole de vários casais (posições no grafo)."""
+        colunas = np.arange(len(pais))
+        nos, contribuicoes = self.matriz_contribuicoes(
+            np.concatenate([pais, maes]),
+            np.concatenate([colunas, colunas]),
+            np.full(2 * len(pais), 0.5),
+            len(pais),
+        )
+        soma = (contribuicoes * contribuicoes * self.variancias[nos][:, None]).sum(axis=0)
+        variancia_prole = 0.5 - 0.25 * (self.coeficientes[pais] + self.coeficientes[maes])
+        return np.maximum(0.0, soma + variancia_prole - 1.0)
+
+    def parentesco(self, femeas: np.ndarray, machos: np.ndarray) -> np.ndarray:
+        """Coeficientes de parentesco (coancestria) entre fêmeas e machos (matriz N x M).
+
+        As linhas de L de todos os candidatos são calculadas em uma única
+        propagação, de modo que ancestrais compartilhados são visitados uma só
+        vez; o parentesco de todos os pares sai de um produto matricial
+        (A = L D L'). O valor é igual à consanguinidade esperada da prole.
+        """
+        total = len(femeas) + len(machos)
+        nos, contribuicoes = self.matriz_contribuicoes(
+            np.concatenate([femeas, machos]), np.arange(total), np.ones(total), total
+        )
+        ponderadas = contribuicoes[:, :len(femeas)] * self.variancias[nos][:, None]
+        return 0.5 * (ponderadas.T @ contribuicoes[:, len(femeas):])
+
+    def calcular(self, afetados: Optional[np.ndarray] = None) -> None:
+        """Calcula F para os animais afetados (todos se omitido), geração por geração."""
+        if afetados is None:
+            afetados = np.arange(len(self.grafo))
+        if not len(afetados):
+            return
+
+        pais, maes = self.grafo.pais, self.grafo.maes
+        geracoes_afetados = self.geracoes[afetados]
+        for geracao in np.unique(geracoes_afetados):
+            camada = afetados[geracoes_afetados == geracao]
+            self.coeficientes[camada] = 0.0
+
+            # Só há consanguinidade com os dois genitores conhecidos
+            casais = camada[(pais[camada] != SEM_GENITOR) & (maes[camada] != SEM_GENITOR)]
+            if len(casais):
+                unicos, inverso = np.unique(
+                    np.stack([pais[casais], maes[casais]], axis=1), axis=0, return_inverse=True
+                )
+                valores = np.concatenate([
+                    self.endogamia_prole(lote[:, 0], lote[:, 1])
+                    for lote in np.array_split(unicos, -(-len(unicos) // self.TAMANHO_LOTE))
+                ])
+                self.coeficientes[casais] = valores[inverso.ravel()]
+
+            self.variancias[camada] = self._variancias_mendelianas(camada)
+
+
+def _ids_genitores(grafo: GrafoGenealogico, genitores: np.ndarray) -> np.ndarray:
+    return np.where(genitores != SEM_GENITOR, grafo.ids[genitores], SEM_GENITOR)
+
+
+def animais_afetados(anterior: GrafoGenealogico, atual: GrafoGenealogico) -> Tuple[np.ndarray, np.ndarray]:
+    """Compara o grafo usado no último cálculo com o atual.
+
+    Retorna a posição de cada animal atual no grafo anterior (SEM_GENITOR se
+    for novo) e as posições dos animais cujo coeficiente precisa ser
+    recalculado: os novos, os com genitores alterados (inclusive por exclusão
+    de um genitor) e todos os seus descendentes.
+    """
+    posicoes = anterior.indices_de(atual.ids)
+    existentes = posicoes != SEM_GENITOR
+    alterados = ~existentes
+    for genitores_atuais, genitores_anteriores in ((atual.pais, anterior.pais), (atual.maes, anterior.maes)):
+        alterados[existentes] |= (
+            _ids_genitores(atual, genitores_atuais[existentes])
+            != _ids_genitores(anterior, genitores_anteriores[posicoes[existentes]])
+        )
+    return posicoes, atual.descendentes_de(np.flatnonzero(alterados))
+
+
+def _calcular_coeficientes(
+    organizacao_id: int,
+    ids: np.ndarray,
+    pais: np.ndarray,
+    maes: np.ndarray,
+    coeficientes: np.ndarray,
+    variancias: np.ndarray,
+    afetados: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Executada no pool de processos: os vetores são copiados para o processo e de volta
+    calculadora = CalculadoraConsanguinidade(GrafoGenealogico(organizacao_id, ids, pais, maes), coeficientes, variancias)
+    calculadora.calcular(afetados)
+    return calculadora.coeficientes, calculadora.variancias
+
+
+# Os cálculos grandes são feitos em processos dedicados, fora do caminho da requisição
+_pool_consanguinidade: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _obter_pool_consanguinidade() -> ProcessPoolExecutor:
+    global _pool_consanguinidade
+    with _pool_lock:
+        if _pool_consanguinidade is None:
+            _pool_consanguinidade = ProcessPoolExecutor(max_workers=settings.CONSANGUINIDADE_PROCESSOS)
+        return _pool_consanguinidade
+
+
+def encerrar_pool_consanguinidade() -> None:
+    """Encerra o pool de processos de consanguinidade (no desligamento da aplicação)."""
+    global _pool_consanguinidade
+    with _pool_lock:
+        if _pool_consanguinidade is not None:
+            _pool_consanguinidade.shutdown(wait=False, cancel_futures=True)
+            _pool_consanguinidade = None
+
+
+class _EstadoConsanguinidade:
+    """Último cálculo dos coeficientes de uma organização."""
+
+    def __init__(self):
+        # Instantâneo do grafo usado no cálculo; sua versão da genealogia identifica os coeficientes
+        self.grafo: Optional[GrafoGenealogico] = None
+        self.coeficientes = np.zeros(0, dtype=np.float64)
+        self.variancias = np.zeros(0, dtype=np.float64)
+        self.agendado = False
+        self.lock = threading.Lock()
+
+
+class RegistroConsanguinidade:
+    """Mantém em cache os coeficientes de consanguinidade de cada organização.
+
+    Os coeficientes valem para a versão da genealogia do grafo usado no
+    cálculo. Quando a versão muda, o grafo atual é comparado ao do último
+    cálculo e apenas os animais afetados (novos, com genitores alterados e
+    seus descendentes) são recalculados: na própria requisição se forem até
+    CONSANGUINIDADE_RECALCULO_SINCRONO_MAXIMO, senão em um processo dedicado
+    (o que inclui o primeiro cálculo de organizações grandes). Enquanto esse
+    cálculo não termina, os coeficientes ficam pendentes.
+    """
+
+    def __init__(self):
+        self._estados: Dict[int, _EstadoConsanguinidade] = {}
+        self._lock = threading.Lock()
+
+    def _estado(self, organizacao_id: int) -> _EstadoConsanguinidade:
+        with self._lock:
+            return self._estados.setdefault(organizacao_id, _EstadoConsanguinidade())
+
+    def calculadora(self, db: Session, organizacao_id: int) -> Optional[CalculadoraConsanguinidade]:
+        """Retorna a calculadora com os coeficientes atualizados da organização.
+
+        Retorna None se os coeficientes estão sendo calculados em segundo plano.
+        """
+        grafo = registro_grafos.obter(db, organizacao_id)
+        # A ordem topológica detecta ciclos antes de qualquer cálculo
+        grafo.geracoes
+        estado = self._estado(organizacao_id)
+
+        with estado.lock:
+            anterior = estado.grafo
+            if anterior is not None and anterior.versao_banco == grafo.versao_banco and len(anterior) == len(grafo):
+                return CalculadoraConsanguinidade(anterior, estado.coeficientes, estado.variancias)
+            if estado.agendado:
+                return None
+
+            n = len(grafo)
+            coeficientes = np.zeros(n, dtype=np.float64)
+            variancias = np.ones(n, dtype=np.float64)
+            afetados = None
+            if anterior is not None:
+                posicoes, afetados = animais_afetados(anterior, grafo)
+                existentes = posicoes != SEM_GENITOR
+                coeficientes[existentes] = estado.coeficientes[posicoes[existentes]]
+                variancias[existentes] = estado.variancias[posicoes[existentes]]
+
+            if (n if afetados is None else len(afetados)) > settings.CONSANGUINIDADE_RECALCULO_SINCRONO_MAXIMO:
+                self._agendar(estado, grafo, coeficientes, variancias, afetados)
+                return None
+
+            calculadora = CalculadoraConsanguinidade(grafo, coeficientes, variancias)
+            calculadora.calcular(afetados)
+            estado.grafo, estado.coeficientes, estado.variancias = grafo, coeficientes, variancias
+            return calculadora
+
+    def _agendar(
+        self,
+        estado: _EstadoConsanguinidade,
+        grafo: GrafoGenealogico,
+        coeficientes: np.ndarray,
+        variancias: np.ndarray,
+        afetados: Optional[np.ndarray],
+    ) -> None:
+        # Chamado com estado.lock adquirido
+        def _concluir(futuro: Future) -> None:
+            with estado.lock:
+                estado.agendado = False
+                if futuro.cancelled():
+                    return
+                if futuro.exception() is not None:
+                    logger.error(
+                        "Falha ao calcular a consanguinidade da organização %s",
+                        grafo.organizacao_id, exc_info=futuro.exception(),
+                    )
+                    return
+                estado.grafo = grafo
+                estado.coeficientes, estado.variancias = futuro.result()
+
+        futuro = _obter_pool_consanguinidade().submit(
+            _calcular_coeficientes,
+            grafo.organizacao_id, grafo.ids, grafo.pais, grafo.maes, coeficientes, variancias, afetados,
+        )
+        estado.agendado = True
+        futuro.add_done_callback(_concluir)
+
+    def coeficiente(self, db: Session, organizacao_id: int, animal_id: int) -> Optional[float]:
+        """Retorna o coeficiente de consanguinidade de um animal (None se ainda em cálculo)."""
+        calculadora = self.calculadora(db, organizacao_id)
+        if calculadora is None:
+            return None
+        indice = calculadora.grafo.indice_de(animal_id)
+        if indice == SEM_GENITOR:
+            return None
+        return float(calculadora.coeficientes[indice])
+
+
+registro_consanguinidade = RegistroConsanguinidade()
@@ -0,0 +1,81 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.animal import Animal
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+
+
+def reservar_vagas(db: Session, organizacao_id: int, quantidade: int = 1) -> bool:
+    """Incrementa o contador de animais da organização se o plano comportar a quantidade.
+
+    A verificação e o incremento são uma única instrução UPDATE condicional:
+    a linha da organização fica bloqueada até o fim da transação, e cadastros
+    concorrentes reavaliam o limite com o valor já incrementado. Retorna False
+    (sem alterar nada) se o limite do plano for ultrapassado.
+    """
+    limite = (
+        select(PlanoAssinatura.limite_animais)
+        .where(PlanoAssinatura.id == Organizacao.plano_assinatura_id)
+        .scalar_subquery()
+    )
+    resultado = db.execute(
+        update(Organizacao)
+        .where(Organizacao.id == organizacao_id, Organizacao.total_animais + quantidade <= limite)
+        .values(total_animais=Organizacao.total_animais + quantidade)
+        .execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount == 1
+
+
+def liberar_vagas(db: Session, organizacao_id: int, quantidade: int = 1) -> None:
+    """Decrementa o contador de animais da organização (após excluir animais)."""
+    db.execute(
+        update(Organizacao)
+        .where(Organizacao.id == organizacao_id)
+        .values(
+            total_animais=case(
+                (Organizacao.total_animais > quantidade, Organizacao.total_animais - quantidade), else_=0
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def uso_do_plano(db: Session, organizacao_id: int) -> Tuple[int, Optional[int]]:
+    """Retorna o total de animais da organização e o limite do plano."""
+    linha = db.execute(
+        select(Organizacao.total_animais, PlanoAssinatura.limite_animais)
+        .outerjoin(PlanoAssinatura, PlanoAssinatura.id == Organizacao.plano_assinatura_id)
+        .where(Organizacao.id == organizacao_id)
+    ).first()
+    return (linha.total_animais, linha.limite_animais) if linha else (0, None)
+
+
+def reconciliar_contador(db: Session, organizacao_id: int) -> bool:
+    """Corrige o contador de animais da organização se divergir da contagem real.
+
+    A linha da organização é bloqueada antes da contagem: cadastros que já
+    reservaram vagas terminam antes (e entram na contagem) e os seguintes
+    aguardam a correção. Deve ser confirmado em uma transação própria por
+    organização, para não bloquear os cadastros das demais. Retorna True se
+    o contador foi corrigido.
+    """
+    total = db.execute(
+        select(Organizacao.total_animais).where(Organizacao.id == organizacao_id).with_for_update()
+    ).scalar()
+    if total is None:
+        return False
+
+    contagem = db.execute(select(func.count(Animal.id)).where(Animal.organizacao_id == organizacao_id)).scalar()
+    if contagem == total:
+        return False
+    db.execute(
+        update(Organizacao)
+        .where(Organizacao.id == organizacao_id)
+        .values(total_animais=contagem)
+        .execution_options(synchronize_session=False)
+    )
+    return True
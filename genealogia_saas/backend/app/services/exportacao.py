@@ -0,0 +1,114 @@
+import csv
+import io
+from datetime import date
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from app.core.serializacao import json_bytes
+from app.db.session import SessionLocal
+from app.models.animal import Animal
+
+# Funcionalidade do plano de assinatura exigida para exportar
+FUNCIONALIDADE_EXPORTACAO = "Exportação de relatórios"
+
+# Quantidade de linhas lidas do cursor do servidor e enviadas a cada bloco
+TAMANHO_LOTE = 1000
+
+FORMATOS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+COLUNAS_ANIMAL = (
+    "id", "nome", "especie", "raca", "sexo", "data_nascimento",
+    "caracteristicas_fisicas", "imagem_url", "pai_id", "mae_id",
+)
+
+COLUNAS_ANCESTRAIS = (
+    "pai_nome", "mae_nome",
+    "avo_paterno_nome", "avo_paterna_nome", "avo_materno_nome", "avo_materna_nome",
+)
+
+
+def colunas_exportacao(ancestrais: bool) -> List[str]:
+    """Retorna as colunas do arquivo exportado."""
+    return list(COLUNAS_ANIMAL + (COLUNAS_ANCESTRAIS if ancestrais else ()))
+
+
+def consulta_exportacao(organizacao_id: int, ancestrais: bool, campos: Optional[Sequence[str]] = None) -> Select:
+    """Monta a consulta dos animais da organização, com pais e avós via junções.
+
+    Com `campos`, apenas essas colunas são selecionadas, e as junções só são
+    feitas se algum nome de ancestral for pedido. Cada junção também filtra
+    pela organização: com as tabelas particionadas, alcança apenas a partição
+    dela, e um genitor de outra organização nunca tem o nome exportado.
+    """
+    campos = list(campos or colunas_exportacao(ancestrais))
+    colunas = {coluna: getattr(Animal, coluna).label(coluna) for coluna in COLUNAS_ANIMAL}
+    consulta = select(Animal.id).where(Animal.organizacao_id == organizacao_id)
+
+    if ancestrais and any(campo in COLUNAS_ANCESTRAIS for campo in campos):
+        pai, mae = aliased(Animal), aliased(Animal)
+        avo_paterno, avo_paterna = aliased(Animal), aliased(Animal)
+        avo_materno, avo_materna = aliased(Animal), aliased(Animal)
+        colunas.update(
+            pai_nome=pai.nome.label("pai_nome"),
+            mae_nome=mae.nome.label("mae_nome"),
+            avo_paterno_nome=avo_paterno.nome.label("avo_paterno_nome"),
+            avo_paterna_nome=avo_paterna.nome.label("avo_paterna_nome"),
+            avo_materno_nome=avo_materno.nome.label("avo_materno_nome"),
+            avo_materna_nome=avo_materna.nome.label("avo_materna_nome"),
+        )
+        consulta = (
+            consulta
+            .outerjoin(pai, and_(pai.organizacao_id == organizacao_id, pai.id == Animal.pai_id))
+            .outerjoin(mae, and_(mae.organizacao_id == organizacao_id, mae.id == Animal.mae_id))
+            .outerjoin(avo_paterno, and_(avo_paterno.organizacao_id == organizacao_id, avo_paterno.id == pai.pai_id))
+            .outerjoin(avo_paterna, and_(avo_paterna.organizacao_id == organizacao_id, avo_paterna.id == pai.mae_id))
+            .outerjoin(avo_materno, and_(avo_materno.organizacao_id == organizacao_id, avo_materno.id == mae.pai_id))
+            .outerjoin(avo_materna, and_(avo_materna.organizacao_id == organizacao_id, avo_materna.id == mae.mae_id))
+        )
+
+    return consulta.with_only_columns(*(colunas[campo] for campo in campos)).order_by(Animal.id)
+
+
+def _serializar(valor: Any) -> Any:
+    return valor.isoformat() if isinstance(valor, date) else valor
+
+
+def _bloco_csv(linhas: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerows([[_serializar(valor) for valor in linha] for linha in linhas])
+    return buffer.getvalue()
+
+
+def _bloco_ndjson(colunas: List[str], linhas: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(json_bytes(dict(zip(colunas, linha))) + b"\n" for linha in linhas)
+
+
+def exportar_animais(
+    organizacao_id: int, formato: str, ancestrais: bool = False, campos: Optional[Sequence[str]] = None
+) -> Iterator[Union[str, bytes]]:
+    """Gera o arquivo de exportação em blocos, lendo os animais por um cursor do servidor.
+
+    A memória usada é limitada ao tamanho do lote, e não ao tamanho do
+    rebanho. O gerador abre a própria sessão, já que é consumido pela
+    resposta depois que o endpoint retornou.
+    """
+    colunas = list(campos or colunas_exportacao(ancestrais))
+    if formato == "csv":
+        yield _bloco_csv([colunas])
+
+    db = SessionLocal()
+    try:
+        resultado = db.execute(
+            consulta_exportacao(organizacao_id, ancestrais, colunas).execution_options(stream_results=True)
+        )
+        for linhas in resultado.partitions(TAMANHO_LOTE):
+            yield _bloco_csv(linhas) if formato == "csv" else _bloco_ndjson(colunas, linhas)
+    finally:
+        db.close()
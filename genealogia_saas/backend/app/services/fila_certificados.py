@@ -0,0 +1,397 @@
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.animal import Animal
+from app.models.certificado import LoteCertificados, TrabalhoCertificado
+from app.services.certificados import caminho_certificado, chave_certificado, dados_certificado, renderizar_certificado
+
+logger = logging.getLogger(__name__)
+
+# Status dos trabalhos
+PENDENTE = "pendente"
+PROCESSANDO = "processando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+
+# Filtros aceitos na seleção dos animais de um lote
+FILTROS_LOTE = ("especie", "raca", "sexo", "nascido_desde", "nascido_ate")
+
+
+class LoteCertificadosInvalidoError(ValueError):
+    """Erro lançado quando os filtros de um lote não selecionam animais ou selecionam animais demais."""
+
+
+def _concluir(trabalho: TrabalhoCertificado, chave: str, agora: datetime) -> None:
+    trabalho.status = CONCLUIDO
+    trabalho.chave = chave
+    trabalho.erro = None
+    trabalho.concluido_em = agora
+
+
+def solicitar_certificado(
+    db: Session, organizacao_id: int, animal_id: int, formato: str, geracoes: int
+) -> Optional[TrabalhoCertificado]:
+    """Cria o trabalho de certificado de um animal (None se o animal não existir).
+
+    Se um certificado com os mesmos dados já foi gerado, o trabalho é criado
+    já concluído, apontando para o mesmo arquivo; se um pedido idêntico ainda
+    estiver na fila, ele é devolvido no lugar de um novo. O chamador é
+    responsável pelo commit.
+    """
+    dados = dados_certificado(db, animal_id, organizacao_id, geracoes)
+    if dados is None:
+        return None
+
+    agora = datetime.utcnow()
+    chave = chave_certificado(dados, formato)
+    gerado = os.path.exists(caminho_certificado(chave, formato))
+    if not gerado:
+        em_fila = db.execute(
+            select(TrabalhoCertificado).where(
+                TrabalhoCertificado.organizacao_id == organizacao_id,
+                TrabalhoCertificado.animal_id == animal_id,
+                TrabalhoCertificado.formato == formato,
+                TrabalhoCertificado.geracoes == geracoes,
+                TrabalhoCertificado.lote_id.is_(None),
+                TrabalhoCertificado.status.in_((PENDENTE, PROCESSANDO)),
+            ).limit(1)
+        ).scalar()
+        if em_fila is not None:
+            return em_fila
+
+    trabalho = TrabalhoCertificado(
+        organizacao_id=organizacao_id,
+        animal_id=animal_id,
+        formato=formato,
+        geracoes=geracoes,
+        status=PENDENTE,
+        tentativas=0,
+        criado_em=agora,
+    )
+    if gerado:
+        _concluir(trabalho, chave, agora)
+    db.add(trabalho)
+    db.flush()
+    return trabalho
+
+
+def solicitar_lote(
+    db: Session, organizacao_id: int, formato: str, geracoes: int, filtros: Dict[str, Any]
+) -> LoteCertificados:
+    """Cria um lote com um trabalho de certificado por animal selecionado pelos filtros.
+
+    Os trabalhos são inseridos com um único INSERT ... SELECT, sem carregar os
+    animais; os dados de cada certificado são lidos apenas pelo executor. O
+    chamador é responsável pelo commit.
+    """
+    condicoes = [Animal.organizacao_id == organizacao_id]
+    if filtros.get("especie"):
+        condicoes.append(Animal.especie == filtros["especie"])
+    if filtros.get("raca"):
+        condicoes.append(Animal.raca == filtros["raca"])
+    if filtros.get("sexo"):
+        condicoes.append(Animal.sexo == filtros["sexo"])
+    if filtros.get("nascido_desde"):
+        condicoes.append(Animal.data_nascimento >= filtros["nascido_desde"])
+    if filtros.get("nascido_ate"):
+        condicoes.append(Animal.data_nascimento <= filtros["nascido_ate"])
+
+    total = db.execute(select(func.count()).select_from(Animal).where(*condicoes)).scalar_one()
+    if total == 0:
+        raise LoteCertificadosInvalidoError("Nenhum animal corresponde aos filtros informados.")
+    if total > settings.CERTIFICADOS_LOTE_MAXIMO:
+        raise LoteCertificadosInvalidoError(
+            f"Os filtros selecionam {total} animais; o máximo por lote é {settings.CERTIFICADOS_LOTE_MAXIMO}."
+        )
+
+    agora = datetime.utcnow()
+    lote = LoteCertificados(
+        organizacao_id=organizacao_id,
+        formato=formato,
+        geracoes=geracoes,
+        filtros={
+            nome: valor.isoformat() if isinstance(valor, date) else valor
+            for nome, valor in filtros.items()
+            if nome in FILTROS_LOTE and valor is not None
+        },
+        total=total,
+        criado_em=agora,
+    )
+    db.add(lote)
+    db.flush()
+
+    tabela = TrabalhoCertificado.__table__
+    db.execute(insert(tabela).from_select(
+        ["organizacao_id", "lote_id", "animal_id", "formato", "geracoes", "status", "tentativas", "criado_em"],
+        select(
+            literal(organizacao_id),
+            literal(lote.id),
+            Animal.id,
+            literal(formato),
+            literal(geracoes),
+            literal(PENDENTE),
+            literal(0),
+            literal(agora),
+        ).where(*condicoes).order_by(Animal.id),
+    ))
+    return lote
+
+
+def situacao_lote(db: Session, lote_id: int) -> Dict[str, int]:
+    """Quantidade de trabalhos do lote em cada status."""
+    contagens = {PENDENTE: 0, PROCESSANDO: 0, CONCLUIDO: 0, FALHOU: 0}
+    contagens.update(db.execute(
+        select(TrabalhoCertificado.status, func.count())
+        .where(TrabalhoCertificado.lote_id == lote_id)
+        .group_by(TrabalhoCertificado.status)
+    ).all())
+    return contagens
+
+
+def reservar_trabalhos(db: Session, quantidade: int) -> List[TrabalhoCertificado]:
+    """Reserva trabalhos pendentes para este processo, marcando-os como em processamento.
+
+    Trabalhos em processamento cuja reserva não é renovada há mais que o tempo
+    máximo (ex.: o processo que os reservou foi encerrado) voltam a ser
+    elegíveis. O chamador é responsável pelo commit.
+    """
+    agora = datetime.utcnow()
+    expirados = agora - timedelta(seconds=settings.CERTIFICADOS_TIMEOUT_SEGUNDOS)
+    trabalhos = db.execute(
+        select(TrabalhoCertificado)
+        .where(or_(
+            TrabalhoCertificado.status == PENDENTE,
+            and_(TrabalhoCertificado.status == PROCESSANDO, TrabalhoCertificado.iniciado_em < expirados),
+        ))
+        .order_by(TrabalhoCertificado.id)
+        .limit(quantidade)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    for trabalho in trabalhos:
+        trabalho.status = PROCESSANDO
+        trabalho.iniciado_em = agora
+        trabalho.tentativas += 1
+    return trabalhos
+
+
+def renovar_reservas(db: Session, trabalhos_ids: List[int]) -> None:
+    """Renova o início da reserva dos trabalhos ainda em processamento por este processo.
+
+    O chamador é responsável pelo commit.
+    """
+    db.execute(
+        update(TrabalhoCertificado)
+        .where(TrabalhoCertificado.id.in_(trabalhos_ids), TrabalhoCertificado.status == PROCESSANDO)
+        .values(iniciado_em=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def limpar_certificados(db: Session, dias: int) -> Tuple[int, int]:
+    """Remove os trabalhos encerrados há mais de `dias` dias e os arquivos sem trabalhos.
+
+    Retorna quantos trabalhos e quantos arquivos foram removidos. Os arquivos
+    são apagados após o commit da remoção dos trabalhos.
+    """
+    limite = datetime.utcnow() - timedelta(days=dias)
+    removidos = db.execute(
+        delete(TrabalhoCertificado).where(
+            TrabalhoCertificado.status.in_((CONCLUIDO, FALHOU)), TrabalhoCertificado.criado_em < limite
+        )
+    ).rowcount
+    db.execute(
+        delete(LoteCertificados).where(
+            LoteCertificados.criado_em < limite,
+            ~select(TrabalhoCertificado.id).where(TrabalhoCertificado.lote_id == LoteCertificados.id).exists(),
+        )
+    )
+    db.commit()
+
+    em_uso = set(db.execute(select(TrabalhoCertificado.chave).where(TrabalhoCertificado.chave.is_not(None))).scalars())
+    arquivos = 0
+    raiz = os.path.join(settings.MEDIA_DIR, "certificados")
+    for diretorio, _, nomes in os.walk(raiz):
+        for nome in nomes:
+            caminho = os.path.join(diretorio, nome)
+            chave = nome.split(".", 1)[0]
+            # Arquivos recentes podem pertencer a um certificado ainda sendo gravado
+            if chave not in em_uso and os.path.getmtime(caminho) < limite.timestamp():
+                os.remove(caminho)
+                arquivos += 1
+    return removidos, arquivos
+
+
+class ExecutorCertificados:
+    """Executor em segundo plano da fila de certificados.
+
+    Uma thread reserva os trabalhos no banco (vários processos podem executar
+    a mesma fila) e lê os dados de cada certificado; a renderização, que
+    consome CPU, ocorre em um pool de processos dedicado. Certificados com a
+    mesma chave são gerados uma única vez. Falhas são tentadas de novo até o
+    máximo configurado.
+    """
+
+    def __init__(self, fabrica_sessoes: Callable[[], Session], processos: int):
+        self.fabrica_sessoes = fabrica_sessoes
+        self.processos = processos
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._aviso = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        """Inicia a thread do executor."""
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="executor-certificados", daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = 5) -> None:
+        """Interrompe o executor após os trabalhos em andamento e encerra o pool de processos."""
+        self._parar.set()
+        self._aviso.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._encerrar_pool()
+
+    def notificar(self) -> None:
+        """Avisa que há novos trabalhos na fila."""
+        self._aviso.set()
+
+    def _obter_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processos)
+        return self._pool
+
+    def _encerrar_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _aguardar(self, db: Session, aguardando: List[Tuple[int, int, str, Future]], renderizacoes: int) -> Set[Future]:
+        """Aguarda as renderizações até o prazo do lote, renovando as reservas dos trabalhos.
+
+        O prazo é o tempo máximo de um certificado multiplicado pelas rodadas
+        de renderização do lote no pool. Retorna as renderizações que ainda
+        não terminaram ao fim do prazo.
+        """
+        prazo = time.monotonic() + settings.CERTIFICADOS_TIMEOUT_SEGUNDOS * math.ceil(renderizacoes / self.processos)
+        pendentes = {futuro for *_, futuro in aguardando}
+        while pendentes:
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            _, pendentes = wait(pendentes, timeout=min(restante, settings.CERTIFICADOS_TIMEOUT_SEGUNDOS / 3))
+            if pendentes:
+                renovar_reservas(db, [trabalho_id for trabalho_id, _, _, futuro in aguardando if futuro in pendentes])
+                db.commit()
+        return pendentes
+
+    def processar_lote(self, db: Session) -> int:
+        """Reserva e executa um lote de trabalhos; retorna quantos foram reservados.
+
+        A transação de leitura é encerrada antes de aguardar as renderizações.
+        Trabalhos cuja renderização ainda executa ao fim do prazo do lote
+        continuam reservados, sem renovação: voltam à fila após o tempo máximo,
+        quando o arquivo já gerado (se a renderização terminar) é reaproveitado.
+        """
+        trabalhos = reservar_trabalhos(db, self.processos * 2)
+        db.commit()
+        if not trabalhos:
+            return 0
+
+        renderizacoes: Dict[str, Future] = {}
+        aguardando: List[Tuple[int, int, str, Future]] = []
+        for trabalho in trabalhos:
+            dados = dados_certificado(db, trabalho.animal_id, trabalho.organizacao_id, trabalho.geracoes)
+            if dados is None:
+                trabalho.status = FALHOU
+                trabalho.erro = "Animal não encontrado."
+                trabalho.concluido_em = datetime.utcnow()
+                continue
+
+            chave = chave_certificado(dados, trabalho.formato)
+            destino = caminho_certificado(chave, trabalho.formato)
+            if os.path.exists(destino):
+                _concluir(trabalho, chave, datetime.utcnow())
+                continue
+            if chave not in renderizacoes:
+                renderizacoes[chave] = self._obter_pool().submit(renderizar_certificado, dados, trabalho.formato, destino)
+            aguardando.append((trabalho.id, trabalho.tentativas, chave, renderizacoes[chave]))
+        db.commit()
+
+        pendentes = self._aguardar(db, aguardando, len(renderizacoes))
+        if pendentes:
+            # Renderizações presas não podem ser canceladas: o próximo lote usa um pool novo
+            self._encerrar_pool()
+
+        agora = datetime.utcnow()
+        for trabalho_id, tentativas, chave, futuro in aguardando:
+            if futuro in pendentes:
+                logger.error("Prazo esgotado ao gerar o certificado do trabalho %s", trabalho_id)
+                continue
+            try:
+                futuro.result()
+            except Exception as erro:
+                logger.error("Falha ao gerar o certificado do trabalho %s", trabalho_id, exc_info=erro)
+                if isinstance(erro, BrokenProcessPool):
+                    # Um processo filho morreu: o pool precisa ser recriado
+                    self._encerrar_pool()
+                valores = {"status": PENDENTE, "erro": f"{type(erro).__name__}: {erro}"}
+                if tentativas >= settings.CERTIFICADOS_MAXIMO_TENTATIVAS:
+                    valores.update(status=FALHOU, concluido_em=agora)
+            else:
+                valores = {"status": CONCLUIDO, "chave": chave, "erro": None, "concluido_em": agora}
+            db.execute(
+                update(TrabalhoCertificado)
+                .where(TrabalhoCertificado.id == trabalho_id, TrabalhoCertificado.status == PROCESSANDO)
+                .values(**valores)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        return len(trabalhos)
+
+    def processar_pendentes(self) -> int:
+        """Processa lotes até esvaziar a fila; retorna o total de trabalhos tratados."""
+        total = 0
+        while not self._parar.is_set():
+            db = self.fabrica_sessoes()
+            try:
+                tratados = self.processar_lote(db)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            total += tratados
+            if tratados < self.processos * 2:
+                break
+        return total
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            self._aviso.clear()
+            try:
+                self.processar_pendentes()
+            except Exception:
+                logger.exception("Falha ao processar a fila de certificados; nova tentativa no próximo ciclo.")
+            self._aviso.wait(settings.CERTIFICADOS_INTERVALO_SEGUNDOS)
+
+
+# Executor do processo; iniciado e parado junto com a aplicação (se CERTIFICADOS_PROCESSOS > 0)
+executor = ExecutorCertificados(SessionLocal, max(settings.CERTIFICADOS_PROCESSOS, 1))
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.animal import Animal
+
+# Colunas do animal necessárias para montar a árvore genealógica
+_COLUNAS_ARVORE = ("id", "nome", "especie", "raca", "sexo", "data_nascimento", "imagem_url", "imagem_hash", "pai_id", "mae_id")
+
+
+def consulta_ancestrais(animal_id: int, organizacao_id: int, geracoes: int):
+    """Monta a consulta recursiva (CTE) que busca um animal e seus ancestrais.
+
+    A consulta inteira é resolvida pelo banco em uma única ida e volta, evitando
+    um SELECT por ancestral ao navegar pelos relacionamentos `pai` / `mae`.
+    """
+    tabela = Animal.__table__
+    colunas = [tabela.c[nome] for nome in _COLUNAS_ARVORE]
+
+    # Caso base: o próprio animal, restrito à organização
+    ancestrais = (
+        select(*colunas, literal(0).label("geracao"))
+        .where(tabela.c.id == animal_id, tabela.c.organizacao_id == organizacao_id)
+        .cte("ancestrais", recursive=True)
+    )
+
+    # Passo recursivo: pais dos animais já encontrados, até a geração pedida
+    pais = (
+        select(*colunas, (ancestrais.c.geracao + 1).label("geracao"))
+        .join(ancestrais, or_(tabela.c.id == ancestrais.c.pai_id, tabela.c.id == ancestrais.c.mae_id))
+        .where(tabela.c.organizacao_id == organizacao_id, ancestrais.c.geracao < geracoes)
+    )
+    ancestrais = ancestrais.union(pais)
+
+    return select(*[ancestrais.c[nome] for nome in _COLUNAS_ARVORE])
+
+
+def buscar_ancestrais(db: Session, animal_id: int, organizacao_id: int, geracoes: int) -> Dict[int, Any]:
+    """Busca um animal e seus ancestrais, indexados pelo ID."""
+    linhas = db.execute(consulta_ancestrais(animal_id, organizacao_id, geracoes)).all()
+    return {linha.id: linha for linha in linhas}
+
+
+def montar_arvore(ancestrais: Dict[int, Any], animal_id: int, geracoes: int) -> Optional[Dict[str, Any]]:
+    """Monta em memória a árvore genealógica a partir dos ancestrais já carregados.
+
+    Um mesmo ancestral pode aparecer em mais de uma posição da árvore quando
+    há consanguinidade, exatamente como em um pedigree impresso.
+    """
+    def montar_no(id_no: Optional[int], geracao: int) -> Optional[Dict[str, Any]]:
+        linha = ancestrais.get(id_no) if id_no is not None else None
+        if linha is None:
+            return None
+
+        no = {nome: getattr(linha, nome) for nome in _COLUNAS_ARVORE if nome not in ("pai_id", "mae_id")}
+        no["geracao"] = geracao
+        no["pai"] = None
+        no["mae"] = None
+        if geracao < geracoes:
+            no["pai"] = montar_no(linha.pai_id, geracao + 1)
+            no["mae"] = montar_no(linha.mae_id, geracao + 1)
+        return no
+
+    return montar_no(animal_id, 0)
+
+
+def _resumir_arvore(ancestrais: Dict[int, Any], animal_id: int, geracoes: int) -> Optional[Dict[str, Any]]:
+    raiz = montar_arvore(ancestrais, animal_id, geracoes)
+    if raiz is None:
+        return None
+
+    return {
+        "geracoes": geracoes,
+        "total_ancestrais": len(ancestrais) - 1,
+        "animal": raiz,
+    }
+
+
+def obter_arvore_genealogica(
+    db: Session, animal_id: int, organizacao_id: int, geracoes: int
+) -> Optional[Dict[str, Any]]:
+    """Obtém a árvore genealógica de um animal com o número de gerações pedido."""
+    ancestrais = buscar_ancestrais(db, animal_id, organizacao_id, geracoes)
+    return _resumir_arvore(ancestrais, animal_id, geracoes)
+
+
+async def obter_arvore_genealogica_async(
+    db: AsyncSession, animal_id: int, organizacao_id: int, geracoes: int
+) -> Optional[Dict[str, Any]]:
+    """Versão assíncrona de `obter_arvore_genealogica`."""
+    resultado = await db.execute(consulta_ancestrais(animal_id, organizacao_id, geracoes))
+    ancestrais = {linha.id: linha for linha in resultado.all()}
+    return _resumir_arvore(ancestrais, animal_id, geracoes)
@@ -0,0 +1,373 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.eventos import ATUALIZACAO, INSERCAO, AlteracaoAnimal, observar_alteracoes_animais
+from app.db.versoes import GENEALOGIA, obter_versao
+from app.models.animal import Animal
+
+# Valor usado nos vetores de pai/mãe quando o genitor não está registrado
+SEM_GENITOR = -1
+
+
+class CicloGenealogicoError(ValueError):
+    """Erro lançado quando a genealogia da organização contém um ciclo."""
+
+
+class GrafoGenealogico:
+    """Grafo genealógico compacto de uma organização.
+
+    Os animais são representados por posições em vetores paralelos de inteiros
+    (IDs ordenados, índice do pai, índice da mãe) e os filhos por uma lista de
+    adjacência comprimida (CSR), construída sob demanda. Consultas de
+    descendência, progênie e profundidade são respondidas sem acessar o banco.
+
+    Os vetores nunca são alterados depois que o grafo é publicado no registro:
+    uma atualização incremental cria outro grafo, que substitui este de uma
+    só vez, e leitores que já o obtiveram continuam com um estado consistente.
+    """
+
+    def __init__(self, organizacao_id: int, ids: np.ndarray, pais: np.ndarray, maes: np.ndarray):
+        self.organizacao_id = organizacao_id
+        self.ids = ids
+        self.pais = pais
+        self.maes = maes
+        # Versão da genealogia da organização no banco (tabela versaorecurso) a que o grafo corresponde
+        self.versao_banco = 0
+        self._derivados: Dict[str, object] = {}
+
+    @classmethod
+    def a_partir_de_ids(
+        cls, organizacao_id: int, ids: np.ndarray, pais_ids: np.ndarray, maes_ids: np.ndarray
+    ) -> "GrafoGenealogico":
+        """Cria o grafo a partir dos IDs (ordenados) dos animais e de seus genitores."""
+        grafo = cls(organizacao_id, ids, None, None)
+        grafo.pais = grafo.indices_de(pais_ids)
+        grafo.maes = grafo.indices_de(maes_ids)
+        return grafo
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def indices_de(self, animal_ids: np.ndarray) -> np.ndarray:
+        """Converte IDs de animais em posições do grafo (SEM_GENITOR se ausentes)."""
+        animal_ids = np.asarray(animal_ids, dtype=np.int64)
+        if len(self.ids) == 0:
+            return np.full(len(animal_ids), SEM_GENITOR, dtype=np.int32)
+        posicoes = np.searchsorted(self.ids, animal_ids)
+        posicoes = np.minimum(posicoes, len(self.ids) - 1)
+        encontrados = self.ids[posicoes] == animal_ids
+        return np.where(encontrados, posicoes, SEM_GENITOR).astype(np.int32)
+
+    def indice_de(self, animal_id: Optional[int]) -> int:
+        """Retorna a posição de um animal no grafo (SEM_GENITOR se ausente)."""
+        if animal_id is None:
+            return SEM_GENITOR
+        return int(self.indices_de(np.array([animal_id]))[0])
+
+    def contem(self, animal_id: int) -> bool:
+        """Verifica se o animal está presente no grafo."""
+        return self.indice_de(animal_id) != SEM_GENITOR
+
+    # Estruturas derivadas, calculadas na primeira consulta de cada grafo
+
+    def _derivado(self, nome: str, calcular):
+        valor = self._derivados.get(nome)
+        if valor is None:
+            # Leitores simultâneos podem calcular o mesmo valor; qualquer um deles serve
+            valor = self._derivados[nome] = calcular()
+        return valor
+
+    def _calcular_filhos(self) -> Tuple[np.ndarray, np.ndarray]:
+        todos = np.arange(len(self.ids), dtype=np.int32)
+        com_pai = self.pais != SEM_GENITOR
+        com_mae = self.maes != SEM_GENITOR
+        genitores = np.concatenate([self.pais[com_pai], self.maes[com_mae]])
+        filhos = np.concatenate([todos[com_pai], todos[com_mae]])
+
+        ordem = np.argsort(genitores, kind="stable")
+        contagem = np.bincount(genitores, minlength=len(self.ids))
+        inicio = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(contagem, out=inicio[1:])
+        return inicio, filhos[ordem]
+
+    @property
+    def filhos(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Adjacência de filhos em formato CSR: (início de cada animal, filhos)."""
+        return self._derivado("filhos", self._calcular_filhos)
+
+    def _calcular_geracoes(self) -> np.ndarray:
+        # Ordenação topológica por camadas (Kahn): um animal entra na camada
+        # seguinte quando todos os seus genitores já foram processados
+        n = len(self.ids)
+        pendentes = (self.pais != SEM_GENITOR).astype(np.int32) + (self.maes != SEM_GENITOR)
+        geracoes = np.zeros(n, dtype=np.int32)
+        fronteira = np.flatnonzero(pendentes == 0)
+        processados = 0
+        geracao = 0
+        while len(fronteira):
+            geracoes[fronteira] = geracao
+            processados += len(fronteira)
+            filhos = self.filhos_de(fronteira)
+            np.subtract.at(pendentes, filhos, 1)
+            candidatos = np.unique(filhos)
+            fronteira = candidatos[pendentes[candidatos] == 0]
+            geracao += 1
+
+        if processados < n:
+            raise CicloGenealogicoError(
+                f"A genealogia da organização {self.organizacao_id} contém um ciclo."
+            )
+        return geracoes
+
+    @property
+    def geracoes(self) -> np.ndarray:
+        """Número de gerações de ancestrais conhecidos de cada animal."""
+        return self._derivado("geracoes", self._calcular_geracoes)
+
+    def _calcular_progenie(self) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(self.ids)
+        filhos_pai = np.bincount(self.pais[self.pais != SEM_GENITOR], minlength=n)
+        filhos_mae = np.bincount(self.maes[self.maes != SEM_GENITOR], minlength=n)
+        return filhos_pai, filhos_mae
+
+    @property
+    def progenie(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Quantidade de filhos de cada animal como pai e como mãe."""
+        return self._derivado("progenie", self._calcular_progenie)
+
+    # Consultas
+
+    def filhos_de(self, indices: np.ndarray) -> np.ndarray:
+        """Retorna os filhos (posições) de um conjunto de animais."""
+        inicio, filhos = self.filhos
+        comeco = inicio[indices]
+        tamanhos = inicio[indices + 1] - comeco
+        total = int(tamanhos.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32)
+        deslocamentos = np.repeat(comeco - np.cumsum(tamanhos) + tamanhos, tamanhos)
+        return filhos[deslocamentos + np.arange(total)]
+
+    def descendentes(
+        self, animal_id: int, geracoes: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Retorna as posições dos descendentes de um animal e a geração de cada um."""
+        indice = self.indice_de(animal_id)
+        visitados = np.zeros(len(self.ids), dtype=bool)
+        visitados[indice] = True
+        fronteira = np.array([indice], dtype=np.int32)
+        encontrados: List[np.ndarray] = []
+        niveis: List[np.ndarray] = []
+
+        geracao = 0
+        while len(fronteira) and (geracoes is None or geracao < geracoes):
+            geracao += 1
+            fronteira = np.unique(self.filhos_de(fronteira))
+            fronteira = fronteira[~visitados[fronteira]]
+            visitados[fronteira] = True
+            encontrados.append(fronteira)
+            niveis.append(np.full(len(fronteira), geracao, dtype=np.int32))
+
+        if not encontrados:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        return np.concatenate(encontrados), np.concatenate(niveis)
+
+    def descendentes_de(self, indices: np.ndarray) -> np.ndarray:
+        """Retorna os animais informados e todos os seus descendentes (posições ordenadas)."""
+        visitados = np.zeros(len(self.ids), dtype=bool)
+        fronteira = np.unique(indices)
+        visitados[fronteira] = True
+        while len(fronteira):
+            fronteira = np.unique(self.filhos_de(fronteira))
+            fronteira = fronteira[~visitados[fronteira]]
+            visitados[fronteira] = True
+        return np.flatnonzero(visitados)
+
+    def top_reprodutores(self, limite: int, sexo: Optional[str] = None) -> List[Tuple[int, int]]:
+        """Retorna os animais com mais filhos como pares (animal_id, total de filhos)."""
+        filhos_pai, filhos_mae = self.progenie
+        if sexo == "Macho":
+            contagem = filhos_pai
+        elif sexo == "Fêmea":
+            contagem = filhos_mae
+        else:
+            contagem = filhos_pai + filhos_mae
+
+        limite = min(limite, len(contagem))
+        if limite <= 0:
+            return []
+        candidatos = np.argpartition(-contagem, limite - 1)[:limite]
+        candidatos = candidatos[np.lexsort((self.ids[candidatos], -contagem[candidatos]))]
+        return [
+            (int(self.ids[i]), int(contagem[i]))
+            for i in candidatos
+            if contagem[i] > 0
+        ]
+
+    # Atualizações incrementais: retornam um novo grafo, sem alterar este
+
+    def com_animal(
+        self, animal_id: int, pai_id: Optional[int], mae_id: Optional[int]
+    ) -> Optional["GrafoGenealogico"]:
+        """Retorna o grafo com um novo animal (de ID maior que os existentes); None se for preciso recarregá-lo."""
+        if len(self.ids) and animal_id <= self.ids[-1]:
+            return None
+        pai, mae = self.indice_de(pai_id), self.indice_de(mae_id)
+        if (pai_id is not None and pai == SEM_GENITOR) or (mae_id is not None and mae == SEM_GENITOR):
+            return None
+        return GrafoGenealogico(
+            self.organizacao_id,
+            np.append(self.ids, np.int64(animal_id)),
+            np.append(self.pais, np.int32(pai)),
+            np.append(self.maes, np.int32(mae)),
+        )
+
+    def com_genitores(
+        self, animal_id: int, pai_id: Optional[int], mae_id: Optional[int]
+    ) -> Optional["GrafoGenealogico"]:
+        """Retorna o grafo com os genitores de um animal alterados; None se for preciso recarregá-lo."""
+        indice = self.indice_de(animal_id)
+        pai, mae = self.indice_de(pai_id), self.indice_de(mae_id)
+        if indice == SEM_GENITOR:
+            return None
+        if (pai_id is not None and pai == SEM_GENITOR) or (mae_id is not None and mae == SEM_GENITOR):
+            return None
+        pais, maes = self.pais.copy(), self.maes.copy()
+        pais[indice], maes[indice] = pai, mae
+        return GrafoGenealogico(self.organizacao_id, self.ids, pais, maes)
+
+
+def carregar_grafo(db: Session, organizacao_id: int) -> GrafoGenealogico:
+    """Carrega do banco o grafo genealógico de uma organização."""
+    linhas = db.execute(
+        select(Animal.id, Animal.pai_id, Animal.mae_id)
+        .where(Animal.organizacao_id == organizacao_id)
+        .order_by(Animal.id)
+    ).all()
+
+    ids = np.fromiter((linha[0] for linha in linhas), dtype=np.int64, count=len(linhas))
+    pais = np.fromiter(
+        (linha[1] if linha[1] is not None else SEM_GENITOR for linha in linhas), dtype=np.int64, count=len(linhas)
+    )
+    maes = np.fromiter(
+        (linha[2] if linha[2] is not None else SEM_GENITOR for linha in linhas), dtype=np.int64, count=len(linhas)
+    )
+    return GrafoGenealogico.a_partir_de_ids(organizacao_id, ids, pais, maes)
+
+
+class RegistroGrafos:
+    """Mantém em memória, por organização, os grafos genealógicos já carregados.
+
+    Antes de reutilizar um grafo, sua versão é comparada à versão da genealogia
+    no banco (uma leitura pela chave primária de versaorecurso), incrementada a
+    cada commit que altera animais da organização; assim, alterações feitas
+    por outros processos são vistas na consulta seguinte. O TTL limita a idade
+    do grafo para alterações feitas fora do ORM, que não mudam a versão.
+    """
+
+    def __init__(self, ttl_segundos: int):
+        self.ttl_segundos = ttl_segundos
+        self._grafos: Dict[int, Tuple[float, GrafoGenealogico]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, db: Session, organizacao_id: int) -> GrafoGenealogico:
+        """Obtém o grafo da organização, recarregando-o se a genealogia mudou no banco."""
+        versao = obter_versao(db, GENEALOGIA, organizacao_id).numero
+        with self._lock:
+            item = self._grafos.get(organizacao_id)
+        if item is not None and item[1].versao_banco == versao and time.monotonic() - item[0] < self.ttl_segundos:
+            return item[1]
+        return self._carregar(db, organizacao_id, versao)
+
+    def obter_com_animal(self, db: Session, organizacao_id: int, animal_id: int) -> Optional[GrafoGenealogico]:
+        """Obtém o grafo garantindo que contém o animal (recarrega uma vez se necessário)."""
+        grafo = self.obter(db, organizacao_id)
+        if not grafo.contem(animal_id):
+            grafo = self.recarregar(db, organizacao_id)
+        return grafo if grafo.contem(animal_id) else None
+
+    def recarregar(self, db: Session, organizacao_id: int) -> GrafoGenealogico:
+        """Recarrega do banco o grafo da organização."""
+        return self._carregar(db, organizacao_id, obter_versao(db, GENEALOGIA, organizacao_id).numero)
+
+    def _carregar(self, db: Session, organizacao_id: int, versao: int) -> GrafoGenealogico:
+        # A versão é lida antes dos animais: uma alteração confirmada entre as duas
+        # consultas deixa o grafo com uma versão menor e apenas antecipa a recarga
+        grafo = carregar_grafo(db, organizacao_id)
+        grafo.versao_banco = versao
+        with self._lock:
+            self._grafos[organizacao_id] = (time.monotonic(), grafo)
+        return grafo
+
+    def invalidar(self, organizacao_id: Optional[int] = None) -> None:
+        """Descarta o grafo de uma organização (ou de todas)."""
+        with self._lock:
+            if organizacao_id is None:
+                self._grafos.clear()
+            else:
+                self._grafos.pop(organizacao_id, None)
+
+    def aplicar_alteracoes(self, alteracoes: List[AlteracaoAnimal]) -> None:
+        """Aplica incrementalmente as alterações de um commit aos grafos carregados.
+
+        Só é aplicado ao grafo que estava na versão imediatamente anterior à
+        criada pelo commit; se outro processo alterou a organização nesse meio
+        tempo, o grafo é descartado e recarregado na consulta seguinte. As
+        alterações produzem um novo grafo, publicado no lugar do anterior com
+        uma única atribuição.
+        """
+        por_organizacao: Dict[int, List[AlteracaoAnimal]] = {}
+        for alteracao in alteracoes:
+            por_organizacao.setdefault(alteracao.organizacao_id, []).append(alteracao)
+
+        for organizacao_id, alteracoes_organizacao in por_organizacao.items():
+            with self._lock:
+                item = self._grafos.get(organizacao_id)
+            if item is None:
+                continue
+
+            grafo = item[1]
+            versao = alteracoes_organizacao[0].versao_genealogia
+            if versao is not None and grafo.versao_banco >= versao:
+                # Grafo recarregado depois do commit: já contém as alterações
+                continue
+            if versao is None or grafo.versao_banco != versao - 1:
+                self.invalidar(organizacao_id)
+                continue
+
+            novo: Optional[GrafoGenealogico] = grafo
+            for alteracao in alteracoes_organizacao:
+                if alteracao.tipo == INSERCAO:
+                    novo = novo.com_animal(alteracao.animal_id, alteracao.pai_id, alteracao.mae_id)
+                elif alteracao.tipo == ATUALIZACAO:
+                    if alteracao.genealogia_alterada:
+                        novo = novo.com_genitores(alteracao.animal_id, alteracao.pai_id, alteracao.mae_id)
+                else:
+                    novo = None
+                if novo is None:
+                    break
+            if novo is grafo:
+                # Sem alteração de genealogia: os vetores e as estruturas derivadas são compartilhados
+                novo = GrafoGenealogico(grafo.organizacao_id, grafo.ids, grafo.pais, grafo.maes)
+                novo._derivados = grafo._derivados
+
+            with self._lock:
+                if self._grafos.get(organizacao_id) is not item:
+                    # Recarregado ou descartado por outra thread enquanto as alterações eram aplicadas
+                    continue
+                if novo is None:
+                    del self._grafos[organizacao_id]
+                else:
+                    novo.versao_banco = versao
+                    self._grafos[organizacao_id] = (item[0], novo)
+
+
+registro_grafos = RegistroGrafos(settings.GRAFO_GENEALOGICO_TTL_SEGUNDOS)
+
+observar_alteracoes_animais(registro_grafos.aplicar_alteracoes)
@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import BinaryIO, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Variantes geradas para cada foto: nome -> maior lado em pixels
+VARIANTES = {"miniatura": 160, "media": 640}
+
+# Assinaturas (primeiros bytes) dos formatos aceitos
+_ASSINATURAS = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+_TAMANHO_BLOCO = 64 * 1024
+
+
+class ImagemInvalidaError(ValueError):
+    """Erro lançado quando o arquivo enviado não é uma imagem aceita."""
+
+
+class ImagemGrandeDemaisError(ValueError):
+    """Erro lançado quando o arquivo enviado excede o tamanho máximo."""
+
+
+def detectar_tipo(cabecalho: bytes) -> Optional[str]:
+    """Identifica o tipo da imagem pelos primeiros bytes do arquivo."""
+    if cabecalho[:4] == b"RIFF" and cabecalho[8:12] == b"WEBP":
+        return "image/webp"
+    for assinatura, tipo in _ASSINATURAS:
+        if cabecalho.startswith(assinatura):
+            return tipo
+    return None
+
+
+def hash_valido(hash_imagem: str) -> bool:
+    """Verifica se o texto é um SHA-256 em hexadecimal (evita caminhos arbitrários)."""
+    return len(hash_imagem) == 64 and all(c in "0123456789abcdef" for c in hash_imagem)
+
+
+def caminho_original(hash_imagem: str) -> str:
+    """Caminho do arquivo original no armazenamento, derivado do hash do conteúdo."""
+    return os.path.join(settings.MEDIA_DIR, "originais", hash_imagem[:2], hash_imagem)
+
+
+def caminho_variante(hash_imagem: str, variante: str) -> str:
+    """Caminho de uma variante (JPEG redimensionado) da imagem."""
+    return os.path.join(settings.MEDIA_DIR, variante, hash_imagem[:2], f"{hash_imagem}.jpg")
+
+
+def url_imagem(hash_imagem: Optional[str], variante: Optional[str] = None) -> Optional[str]:
+    """URL pública da imagem original ou de uma de suas variantes."""
+    if not hash_imagem:
+        return None
+    url = f"{settings.API_V1_STR}/imagens/{hash_imagem}"
+    return f"{url}/{variante}" if variante else url
+
+
+def armazenar_original(arquivo: BinaryIO) -> Tuple[str, str]:
+    """Grava a imagem enviada no armazenamento endereçado pelo conteúdo.
+
+    O arquivo é lido em blocos, calculando o SHA-256 enquanto é copiado para
+    um arquivo temporário; se já existir uma imagem com o mesmo hash, a cópia
+    é descartada. Retorna o hash e o tipo da imagem.
+    """
+    limite = settings.IMAGENS_TAMANHO_MAXIMO_MB * 1024 * 1024
+    diretorio_temporario = os.path.join(settings.MEDIA_DIR, "tmp")
+    os.makedirs(diretorio_temporario, exist_ok=True)
+
+    bloco = arquivo.read(_TAMANHO_BLOCO)
+    tipo = detectar_tipo(bloco[:16])
+    if tipo is None:
+        raise ImagemInvalidaError("Formato de imagem não suportado. Envie JPEG, PNG, GIF ou WebP.")
+
+    soma = hashlib.sha256()
+    tamanho = 0
+    descritor, temporario = tempfile.mkstemp(dir=diretorio_temporario)
+    try:
+        with os.fdopen(descritor, "wb") as destino:
+            while bloco:
+                tamanho += len(bloco)
+                if tamanho > limite:
+                    raise ImagemGrandeDemaisError(
+                        f"A imagem excede o tamanho máximo de {settings.IMAGENS_TAMANHO_MAXIMO_MB} MB."
+                    )
+                soma.update(bloco)
+                destino.write(bloco)
+                bloco = arquivo.read(_TAMANHO_BLOCO)
+
+        hash_imagem = soma.hexdigest()
+        final = caminho_original(hash_imagem)
+        if os.path.exists(final):
+            os.remove(temporario)
+        else:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(temporario, final)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    return hash_imagem, tipo
+
+
+def _gerar_variantes(origem: str, destinos: Dict[str, Tuple[str, int]]) -> None:
+    # Executada no pool de processos: o Pillow é importado apenas nos processos filhos
+    from PIL import Image, ImageOps
+
+    with Image.open(origem) as imagem:
+        imagem = ImageOps.exif_transpose(imagem)
+        if imagem.mode not in ("RGB", "L"):
+            imagem = imagem.convert("RGB")
+        # Da maior para a menor, reaproveitando a redução anterior
+        for caminho, lado in sorted(destinos.values(), key=lambda destino: -destino[1]):
+            imagem.thumbnail((lado, lado))
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            imagem.save(temporario, "JPEG", quality=85, optimize=True, progressive=True)
+            os.replace(temporario, caminho)
+
+
+# As variantes são geradas em processos dedicados, fora do caminho da requisição
+_pool_imagens: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_em_andamento: Set[str] = set()
+
+
+def _obter_pool_imagens() -> ProcessPoolExecutor:
+    global _pool_imagens
+    with _pool_lock:
+        if _pool_imagens is None:
+            _pool_imagens = ProcessPoolExecutor(max_workers=settings.IMAGENS_PROCESSOS)
+        return _pool_imagens
+
+
+def encerrar_pool_imagens() -> None:
+    """Encerra o pool de processos de imagens (no desligamento da aplicação)."""
+    global _pool_imagens
+    with _pool_lock:
+        if _pool_imagens is not None:
+            _pool_imagens.shutdown(wait=False, cancel_futures=True)
+            _pool_imagens = None
+
+
+def agendar_variantes(hash_imagem: str) -> Optional[Future]:
+    """Agenda a geração das variantes ainda inexistentes de uma imagem.
+
+    Retorna None se todas já existirem ou se a geração já estiver em andamento.
+    """
+    destinos = {
+        variante: (caminho_variante(hash_imagem, variante), lado)
+        for variante, lado in VARIANTES.items()
+        if not os.path.exists(caminho_variante(hash_imagem, variante))
+    }
+    if not destinos:
+        return None
+
+    with _pool_lock:
+        if hash_imagem in _em_andamento:
+            return None
+        _em_andamento.add(hash_imagem)
+
+    def _concluir(futuro: Future) -> None:
+        with _pool_lock:
+            _em_andamento.discard(hash_imagem)
+        if not futuro.cancelled() and futuro.exception() is not None:
+            logger.error("Falha ao gerar as variantes da imagem %s", hash_imagem, exc_info=futuro.exception())
+
+    try:
+        futuro = _obter_pool_imagens().submit(_gerar_variantes, caminho_original(hash_imagem), destinos)
+    except BaseException:
+        with _pool_lock:
+            _em_andamento.discard(hash_imagem)
+        raise
+    futuro.add_done_callback(_concluir)
+    return futuro
@@ -0,0 +1,213 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.eventos import LOTE, AlteracaoAnimal, registrar_alteracao
+from app.models.animal import Animal
+from app.services.ancestralidade import indexar_novos_animais
+from app.services.contador_animais import reservar_vagas, uso_do_plano
+
+# Campos do animal aceitos no arquivo, além de "codigo", "pai" e "mae"
+CAMPOS_ANIMAL = ("nome", "especie", "raca", "data_nascimento", "sexo", "caracteristicas_fisicas", "imagem_url")
+
+# Quantidade de animais enviados ao banco em cada instrução (executemany)
+TAMANHO_LOTE = 1000
+
+# Quantidade máxima de erros detalhados devolvidos ao usuário
+MAXIMO_ERROS = 50
+
+FORMATOS = ("csv", "jsonl")
+
+
+class ImportacaoInvalidaError(ValueError):
+    """Erro lançado quando o arquivo de importação contém registros inválidos."""
+
+    def __init__(self, erros: List[str]):
+        super().__init__(" ".join(erros[:MAXIMO_ERROS]))
+        self.erros = erros[:MAXIMO_ERROS]
+
+
+class LimitePlanoExcedidoError(ValueError):
+    """Erro lançado quando a importação ultrapassa o limite de animais do plano."""
+
+
+def detectar_formato(nome_arquivo: Optional[str]) -> Optional[str]:
+    """Detecta o formato do arquivo pela extensão (csv ou jsonl)."""
+    nome = (nome_arquivo or "").lower()
+    if nome.endswith(".csv"):
+        return "csv"
+    if nome.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def ler_registros(arquivo: BinaryIO, formato: str) -> Iterator[Dict[str, Any]]:
+    """Lê os registros do arquivo linha a linha, sem carregá-lo inteiro na memória."""
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    if formato == "csv":
+        yield from csv.DictReader(texto)
+    else:
+        for numero, linha in enumerate(texto, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                raise ImportacaoInvalidaError([f"Linha {numero}: JSON inválido."])
+            if not isinstance(registro, dict):
+                raise ImportacaoInvalidaError([f"Linha {numero}: o registro deve ser um objeto JSON."])
+            yield registro
+
+
+def _valor(registro: Dict[str, Any], campo: str) -> Optional[Any]:
+    valor = registro.get(campo)
+    if isinstance(valor, str):
+        valor = valor.strip()
+    return valor if valor not in ("", None) else None
+
+
+def _reservar_ids(db: Session, quantidade: int) -> List[int]:
+    """Reserva IDs para os novos animais, permitindo resolver pai e mãe antes de inserir."""
+    if db.get_bind().dialect.name == "postgresql":
+        return list(
+            db.execute(
+                text("SELECT nextval(pg_get_serial_sequence('animal', 'id')) FROM generate_series(1, :quantidade)"),
+                {"quantidade": quantidade},
+            ).scalars()
+        )
+
+    # Bancos sem sequência (SQLite de desenvolvimento): continuar a partir do maior ID
+    maior_id = db.execute(select(func.max(Animal.id))).scalar() or 0
+    return list(range(maior_id + 1, maior_id + 1 + quantidade))
+
+
+def importar_animais(db: Session, organizacao_id: int, registros: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Importa em lote os animais de um arquivo para a organização.
+
+    Pai e mãe são indicados pelas colunas "pai" e "mae", que referenciam o
+    "codigo" (ou, na falta dele, o "nome") de outro registro do mesmo arquivo.
+    Os registros são ordenados topologicamente para que os genitores sejam
+    inseridos antes dos filhos, e a gravação é feita em lotes. A importação é
+    tudo ou nada: qualquer registro inválido cancela o arquivo inteiro.
+    """
+    animais: List[Dict[str, Any]] = []
+    referencias_pais: List[tuple] = []
+    por_codigo: Dict[str, int] = {}
+    por_nome: Dict[str, Optional[int]] = {}
+    erros: List[str] = []
+
+    # Ler e normalizar os registros
+    for numero, registro in enumerate(registros, start=1):
+        registro = {str(chave).strip().lower(): valor for chave, valor in registro.items() if chave is not None}
+        animal = {campo: _valor(registro, campo) for campo in CAMPOS_ANIMAL}
+        if not animal["nome"] or not animal["especie"]:
+            erros.append(f"Linha {numero}: nome e espécie são obrigatórios.")
+        if animal["data_nascimento"] is not None:
+            try:
+                animal["data_nascimento"] = date.fromisoformat(str(animal["data_nascimento"]))
+            except ValueError:
+                erros.append(f"Linha {numero}: data de nascimento inválida (use AAAA-MM-DD).")
+
+        indice = len(animais)
+        codigo = _valor(registro, "codigo")
+        if codigo is not None:
+            if str(codigo) in por_codigo:
+                erros.append(f"Linha {numero}: código '{codigo}' repetido.")
+            por_codigo[str(codigo)] = indice
+        if animal["nome"]:
+            # Nomes repetidos não podem ser usados como referência
+            por_nome[animal["nome"]] = None if animal["nome"] in por_nome else indice
+
+        animais.append(animal)
+        referencias_pais.append((numero, _valor(registro, "pai"), _valor(registro, "mae")))
+
+    # Resolver pai e mãe dentro do arquivo
+    pais: List[Optional[int]] = []
+    maes: List[Optional[int]] = []
+    for indice, (numero, pai, mae) in enumerate(referencias_pais):
+        for papel, referencia, sexo_invalido, destino in (
+            ("pai", pai, "Fêmea", pais),
+            ("mãe", mae, "Macho", maes),
+        ):
+            genitor = None
+            if referencia is not None:
+                genitor = por_codigo.get(str(referencia), por_nome.get(str(referencia)))
+                if genitor is None:
+                    erros.append(f"Linha {numero}: {papel} '{referencia}' não encontrado no arquivo (ou nome ambíguo).")
+                elif genitor == indice:
+                    erros.append(f"Linha {numero}: {papel} não pode ser o próprio animal.")
+                elif animais[genitor]["sexo"] == sexo_invalido:
+                    erros.append(f"Linha {numero}: sexo incompatível para {papel}.")
+                elif animais[genitor]["especie"] != animais[indice]["especie"]:
+                    erros.append(f"Linha {numero}: {papel} de outra espécie.")
+            destino.append(genitor)
+        # Com sexo em branco ou indefinido, o mesmo registro poderia ser pai e mãe
+        if pais[-1] is not None and pais[-1] == maes[-1]:
+            erros.append(f"Linha {numero}: pai e mãe não podem ser o mesmo animal.")
+
+    if erros:
+        raise ImportacaoInvalidaError(erros)
+
+    camadas = _ordenar_por_geracao(pais, maes)
+    if sum(len(camada) for camada in camadas) < len(animais):
+        raise ImportacaoInvalidaError(["A genealogia do arquivo contém um ciclo."])
+
+    # Reservar no contador do plano, de uma só vez, as vagas do lote inteiro
+    if not reservar_vagas(db, organizacao_id, len(animais)):
+        quantidade_atual, limite = uso_do_plano(db, organizacao_id)
+        raise LimitePlanoExcedidoError(
+            f"A importação de {len(animais)} animais excede o limite do plano "
+            f"({quantidade_atual} de {limite or 0} já utilizados)."
+        )
+
+    # Inserir em lotes, geração por geração, com IDs reservados previamente
+    ids = _reservar_ids(db, len(animais))
+    tabela = Animal.__table__
+    camadas_ids: List[List[int]] = []
+    for camada in camadas:
+        linhas = [
+            {
+                **animais[indice],
+                "id": ids[indice],
+                "organizacao_id": organizacao_id,
+                "pai_id": ids[pais[indice]] if pais[indice] is not None else None,
+                "mae_id": ids[maes[indice]] if maes[indice] is not None else None,
+            }
+            for indice in camada
+        ]
+        for inicio in range(0, len(linhas), TAMANHO_LOTE):
+            db.execute(insert(tabela), linhas[inicio:inicio + TAMANHO_LOTE])
+        camadas_ids.append([ids[indice] for indice in camada])
+
+    indexar_novos_animais(db, organizacao_id, camadas_ids)
+    registrar_alteracao(db, AlteracaoAnimal(LOTE, organizacao_id, None, None, None, True))
+
+    return {"total_importados": len(animais), "geracoes": len(camadas)}
+
+
+def _ordenar_por_geracao(pais: List[Optional[int]], maes: List[Optional[int]]) -> List[List[int]]:
+    """Ordena os registros em camadas topológicas (Kahn); registros em ciclo ficam de fora."""
+    pendentes = [(pai is not None) + (mae is not None) for pai, mae in zip(pais, maes)]
+    filhos: Dict[int, List[int]] = {}
+    for indice, (pai, mae) in enumerate(zip(pais, maes)):
+        for genitor in (pai, mae):
+            if genitor is not None:
+                filhos.setdefault(genitor, []).append(indice)
+
+    camadas = []
+    camada = [indice for indice, quantidade in enumerate(pendentes) if quantidade == 0]
+    while camada:
+        camadas.append(camada)
+        proxima = []
+        for genitor in camada:
+            for filho in filhos.get(genitor, ()):
+                pendentes[filho] -= 1
+                if pendentes[filho] == 0:
+                    proxima.append(filho)
+        camada = proxima
+    return camadas
@@ -0,0 +1,251 @@
+import hashlib
+import hmac
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.evento_pagamento import EventoPagamento, EventoPagamentoFalho
+from app.models.organizacao import Organizacao
+
+logger = logging.getLogger(__name__)
+
+# Status da assinatura resultante de cada tipo de notificação do provedor
+STATUS_POR_TIPO = {
+    "pagamento_aprovado": "Ativa",
+    "pagamento_pendente": "Pendente",
+    "pagamento_recusado": "Inativa",
+    "assinatura_cancelada": "Inativa",
+}
+
+
+class ResultadoLote(NamedTuple):
+    """Resumo de um lote de eventos processado pelo consumidor."""
+    processados: int
+    reagendados: int
+    descartados: int
+    organizacoes_alteradas: List[int]
+
+
+def assinatura_valida(corpo: bytes, assinatura: Optional[str]) -> bool:
+    """Verifica a assinatura HMAC-SHA256 (hexadecimal) do corpo da notificação."""
+    if not settings.PAGAMENTOS_WEBHOOK_SEGREDO or not assinatura:
+        return False
+    esperada = hmac.new(settings.PAGAMENTOS_WEBHOOK_SEGREDO.encode(), corpo, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(esperada, assinatura.strip().lower())
+
+
+def registrar_eventos(db: Session, eventos: Iterable[Dict[str, Any]]) -> int:
+    """Enfileira os eventos recebidos, ignorando os já registrados (pelo evento_id).
+
+    Uma única instrução INSERT ... ON CONFLICT DO NOTHING grava todos os
+    eventos da notificação. Retorna quantos eventos eram novos.
+    """
+    agora = datetime.utcnow()
+    linhas = [
+        {
+            "evento_id": evento["evento_id"],
+            "organizacao_id": evento["organizacao_id"],
+            "tipo": evento["tipo"],
+            "ocorrido_em": evento.get("ocorrido_em"),
+            "payload": evento.get("payload"),
+            "recebido_em": agora,
+            "proxima_tentativa_em": agora,
+            "tentativas": 0,
+        }
+        for evento in eventos
+    ]
+    if not linhas:
+        return 0
+
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "postgresql":
+        consulta = insert_postgresql(EventoPagamento).on_conflict_do_nothing(index_elements=["evento_id"])
+    elif dialeto == "sqlite":
+        consulta = insert_sqlite(EventoPagamento).on_conflict_do_nothing(index_elements=["evento_id"])
+    else:
+        # Outros bancos: descartar antes os eventos já existentes
+        existentes = set(db.execute(
+            select(EventoPagamento.evento_id).where(EventoPagamento.evento_id.in_([l["evento_id"] for l in linhas]))
+        ).scalars())
+        linhas = [linha for linha in linhas if linha["evento_id"] not in existentes]
+        consulta = insert(EventoPagamento)
+
+    # Sem RETURNING, o rowcount de um INSERT com vários VALUES é o total inserido
+    return db.execute(consulta.values(linhas)).rowcount if linhas else 0
+
+
+def _adiar(tentativas: int) -> timedelta:
+    """Espera exponencial entre tentativas: 2, 4, 8... segundos, até 10 minutos."""
+    return timedelta(seconds=min(2 ** tentativas, 600))
+
+
+def processar_lote(db: Session, tamanho: int) -> ResultadoLote:
+    """Aplica um lote de eventos pendentes em uma única transação.
+
+    Para cada organização vale o evento mais recente do lote (por data de
+    ocorrência e ordem de chegada), e os status são gravados com um único
+    UPDATE em lote, condicionado à data do último evento já aplicado a cada
+    organização. Eventos inválidos (tipo desconhecido ou organização
+    inexistente) são reagendados e, esgotadas as tentativas, movidos para a
+    tabela de eventos falhos. O chamador é responsável pelo commit.
+    """
+    agora = datetime.utcnow()
+    eventos = db.execute(
+        select(EventoPagamento)
+        .where(
+            EventoPagamento.processado_em.is_(None),
+            or_(EventoPagamento.proxima_tentativa_em.is_(None), EventoPagamento.proxima_tentativa_em <= agora),
+        )
+        .order_by(EventoPagamento.id)
+        .limit(tamanho)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not eventos:
+        return ResultadoLote(0, 0, 0, [])
+
+    organizacoes = set(db.execute(
+        select(Organizacao.id).where(Organizacao.id.in_({evento.organizacao_id for evento in eventos}))
+    ).scalars())
+
+    # Último status de cada organização no lote
+    finais: Dict[int, EventoPagamento] = {}
+    reagendados = descartados = 0
+    for evento in eventos:
+        erro = None
+        if evento.tipo not in STATUS_POR_TIPO:
+            erro = f"Tipo de evento desconhecido: {evento.tipo}."
+        elif evento.organizacao_id not in organizacoes:
+            erro = f"Organização {evento.organizacao_id} não encontrada."
+
+        if erro is None:
+            atual = finais.get(evento.organizacao_id)
+            if atual is None or (evento.ocorrido_em or evento.recebido_em) >= (atual.ocorrido_em or atual.recebido_em):
+                finais[evento.organizacao_id] = evento
+            evento.processado_em = agora
+            continue
+
+        evento.tentativas += 1
+        evento.ultimo_erro = erro
+        if evento.tentativas >= settings.PAGAMENTOS_MAXIMO_TENTATIVAS:
+            db.add(EventoPagamentoFalho(
+                evento_id=evento.evento_id,
+                organizacao_id=evento.organizacao_id,
+                tipo=evento.tipo,
+                payload=evento.payload,
+                tentativas=evento.tentativas,
+                erro=erro,
+                falhou_em=agora,
+            ))
+            evento.processado_em = agora
+            descartados += 1
+        else:
+            evento.proxima_tentativa_em = agora + _adiar(evento.tentativas)
+            reagendados += 1
+
+    if finais:
+        # Eventos atrasados (mais antigos que o último já aplicado, possivelmente
+        # por outro lote) não sobrescrevem o status
+        tabela = Organizacao.__table__
+        db.execute(
+            update(tabela)
+            .where(
+                tabela.c.id == bindparam("organizacao"),
+                or_(tabela.c.status_ocorrido_em.is_(None), tabela.c.status_ocorrido_em <= bindparam("ocorrido")),
+            )
+            .values(status_assinatura=bindparam("status"), status_ocorrido_em=bindparam("ocorrido")),
+            [
+                {
+                    "organizacao": organizacao_id,
+                    "status": STATUS_POR_TIPO[evento.tipo],
+                    "ocorrido": evento.ocorrido_em or evento.recebido_em,
+                }
+                for organizacao_id, evento in finais.items()
+            ],
+        )
+
+    processados = len(eventos) - reagendados - descartados
+    return ResultadoLote(processados, reagendados, descartados, sorted(finais))
+
+
+class ConsumidorPagamentos:
+    """Consumidor em segundo plano da fila de eventos de pagamento.
+
+    Processa lotes enquanto houver eventos pendentes e, quando a fila esvazia,
+    aguarda o intervalo configurado ou um aviso de `notificar()` (chamado pelo
+    webhook após enfileirar). Falhas do lote inteiro (ex.: banco indisponível)
+    desfazem a transação e são tentadas de novo no próximo ciclo.
+    """
+
+    def __init__(
+        self,
+        fabrica_sessoes: Callable[[], Session],
+        ao_alterar_organizacoes: Optional[Callable[[List[int]], None]] = None,
+    ):
+        self.fabrica_sessoes = fabrica_sessoes
+        self.ao_alterar_organizacoes = ao_alterar_organizacoes
+        self._aviso = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        """Inicia a thread do consumidor."""
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="consumidor-pagamentos", daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = 5) -> None:
+        """Interrompe o consumidor após o lote em andamento."""
+        self._parar.set()
+        self._aviso.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notificar(self) -> None:
+        """Avisa que há novos eventos na fila."""
+        self._aviso.set()
+
+    def processar_pendentes(self) -> int:
+        """Processa lotes até esvaziar a fila; retorna o total de eventos tratados."""
+        total = 0
+        while not self._parar.is_set():
+            db = self.fabrica_sessoes()
+            try:
+                resultado = processar_lote(db, settings.PAGAMENTOS_TAMANHO_LOTE)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+            if resultado.organizacoes_alteradas and self.ao_alterar_organizacoes:
+                self.ao_alterar_organizacoes(resultado.organizacoes_alteradas)
+            tratados = resultado.processados + resultado.reagendados + resultado.descartados
+            total += tratados
+            if tratados < settings.PAGAMENTOS_TAMANHO_LOTE:
+                break
+        return total
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            self._aviso.clear()
+            try:
+                self.processar_pendentes()
+            except Exception:
+                logger.exception("Falha ao processar eventos de pagamento; nova tentativa no próximo ciclo.")
+            self._aviso.wait(settings.PAGAMENTOS_INTERVALO_SEGUNDOS)
+
+
+# Consumidor do processo; iniciado e parado junto com a aplicação
+consumidor = ConsumidorPagamentos(SessionLocal)
@@ -0,0 +1,189 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+from app.models.resumo_painel import ResumoMensal, ResumoPlano, ResumoStatusAssinatura
+
+logger = logging.getLogger(__name__)
+
+STATUS_ATIVA = "Ativa"
+
+# Meses de histórico devolvidos ao painel
+MESES_HISTORICO = 12
+
+# Chave do advisory lock do PostgreSQL: apenas um processo recalcula por vez
+_CHAVE_BLOQUEIO = 0x7265_7375  # "resu"
+
+
+def _primeiro_dia(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def _obter_bloqueio(db: Session) -> bool:
+    """Tenta obter o advisory lock até o fim da transação (sempre concedido fora do PostgreSQL)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(select(func.pg_try_advisory_xact_lock(_CHAVE_BLOQUEIO))).scalar())
+
+
+def atualizar_resumos(db: Session) -> Optional[datetime]:
+    """Recalcula as tabelas de resumo do painel administrativo.
+
+    Os totais vêm de uma única agregação sobre `organizacao` (o total de
+    animais usa o contador mantido por organização), sem varrer a tabela de
+    animais. Retorna o momento da atualização, ou None se outro processo já
+    estiver atualizando. O chamador é responsável pelo commit.
+    """
+    if not _obter_bloqueio(db):
+        return None
+
+    agora = datetime.utcnow()
+    planos = {
+        plano.id: {
+            "plano_assinatura_id": plano.id,
+            "nome": plano.nome,
+            "preco": plano.preco,
+            "organizacoes": 0,
+            "organizacoes_ativas": 0,
+            "animais": 0,
+            "atualizado_em": agora,
+        }
+        for plano in db.execute(select(PlanoAssinatura.id, PlanoAssinatura.nome, PlanoAssinatura.preco))
+    }
+    por_status: Dict[str, Dict[str, Any]] = {}
+
+    agregados = db.execute(
+        select(
+            Organizacao.plano_assinatura_id,
+            Organizacao.status_assinatura,
+            func.count(),
+            func.coalesce(func.sum(Organizacao.total_animais), 0),
+        ).group_by(Organizacao.plano_assinatura_id, Organizacao.status_assinatura)
+    )
+    for plano_id, status_assinatura, organizacoes, animais in agregados:
+        status = por_status.setdefault(status_assinatura, {
+            "status_assinatura": status_assinatura, "organizacoes": 0, "animais": 0, "atualizado_em": agora,
+        })
+        status["organizacoes"] += organizacoes
+        status["animais"] += animais
+        plano = planos.get(plano_id)
+        if plano is not None:
+            plano["organizacoes"] += organizacoes
+            plano["animais"] += animais
+            if status_assinatura == STATUS_ATIVA:
+                plano["organizacoes_ativas"] += organizacoes
+
+    for plano in planos.values():
+        plano["receita_mensal"] = Decimal(plano["preco"]) * plano["organizacoes_ativas"]
+
+    db.execute(delete(ResumoPlano))
+    if planos:
+        db.execute(insert(ResumoPlano), list(planos.values()))
+    db.execute(delete(ResumoStatusAssinatura))
+    if por_status:
+        db.execute(insert(ResumoStatusAssinatura), list(por_status.values()))
+
+    # Crescimento: novas organizações por mês de assinatura e os totais do mês corrente
+    novas_por_mes: Dict[date, int] = defaultdict(int)
+    for data_assinatura, quantidade in db.execute(
+        select(Organizacao.data_assinatura, func.count())
+        .where(Organizacao.data_assinatura.isnot(None))
+        .group_by(Organizacao.data_assinatura)
+    ):
+        novas_por_mes[_primeiro_dia(data_assinatura)] += quantidade
+
+    mes_atual = _primeiro_dia(agora.date())
+    meses = {resumo.mes: resumo for resumo in db.execute(select(ResumoMensal)).scalars()}
+    for mes in set(meses) | set(novas_por_mes) | {mes_atual}:
+        resumo = meses.get(mes) or ResumoMensal(mes=mes)
+        resumo.novas_organizacoes = novas_por_mes.get(mes, 0)
+        resumo.atualizado_em = agora
+        if mes == mes_atual:
+            resumo.organizacoes = sum(status["organizacoes"] for status in por_status.values())
+            resumo.organizacoes_ativas = por_status.get(STATUS_ATIVA, {}).get("organizacoes", 0)
+            resumo.animais = sum(status["animais"] for status in por_status.values())
+            resumo.receita_mensal = sum((plano["receita_mensal"] for plano in planos.values()), Decimal(0))
+        db.add(resumo)
+
+    db.flush()
+    return agora
+
+
+def obter_resumo(db: Session) -> Dict[str, Any]:
+    """Lê o resumo do painel administrativo das tabelas pré-calculadas."""
+    planos = db.execute(select(ResumoPlano).order_by(ResumoPlano.preco, ResumoPlano.plano_assinatura_id)).scalars().all()
+    status = db.execute(select(ResumoStatusAssinatura)).scalars().all()
+    meses = db.execute(
+        select(ResumoMensal).order_by(ResumoMensal.mes.desc()).limit(MESES_HISTORICO)
+    ).scalars().all()
+
+    atualizacoes = [item.atualizado_em for item in (*planos, *status)]
+    return {
+        "atualizado_em": max(atualizacoes) if atualizacoes else None,
+        "total_organizacoes": sum(item.organizacoes for item in status),
+        "total_animais": sum(item.animais for item in status),
+        "total_planos": len(planos),
+        "receita_mensal": sum((plano.receita_mensal for plano in planos), Decimal(0)),
+        "organizacoes_por_status": {item.status_assinatura: item.organizacoes for item in status},
+        "planos": planos,
+        "crescimento": list(reversed(meses)),
+    }
+
+
+class AgendadorPainel:
+    """Atualiza periodicamente os resumos do painel em uma thread de segundo plano."""
+
+    def __init__(self, fabrica_sessoes: Callable[[], Session]):
+        self.fabrica_sessoes = fabrica_sessoes
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        """Inicia a thread (desativada com PAINEL_ATUALIZACAO_SEGUNDOS = 0)."""
+        if self._thread is not None or settings.PAINEL_ATUALIZACAO_SEGUNDOS <= 0:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="agendador-painel", daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = 5) -> None:
+        """Interrompe o agendador."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def atualizar(self) -> Optional[datetime]:
+        """Executa uma atualização em uma sessão própria."""
+        db = self.fabrica_sessoes()
+        try:
+            atualizado_em = atualizar_resumos(db)
+            db.commit()
+            return atualizado_em
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            try:
+                self.atualizar()
+            except Exception:
+                logger.exception("Falha ao atualizar os resumos do painel administrativo.")
+            self._parar.wait(settings.PAINEL_ATUALIZACAO_SEGUNDOS)
+
+
+# Agendador do processo; iniciado e parado junto com a aplicação
+agendador = AgendadorPainel(SessionLocal)
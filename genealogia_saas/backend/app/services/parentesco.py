@@ -0,0 +1,272 @@
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from app.services.grafo_genealogico import SEM_GENITOR, GrafoGenealogico
+
+# Nomes das relações em linha direta, por número de gerações: (masculino, feminino)
+_ASCENDENTES = {1: ("pai", "mãe"), 2: ("avô", "avó"), 3: ("bisavô", "bisavó"), 4: ("trisavô", "trisavó")}
+_DESCENDENTES = {1: ("filho", "filha"), 2: ("neto", "neta"), 3: ("bisneto", "bisneta"), 4: ("trineto", "trineta")}
+
+# Relações colaterais com um dos lados a uma geração do ancestral comum
+_TIOS = {2: ("tio", "tia"), 3: ("tio-avô", "tia-avó"), 4: ("tio-bisavô", "tia-bisavó")}
+_SOBRINHOS = {2: ("sobrinho", "sobrinha"), 3: ("sobrinho-neto", "sobrinha-neta"), 4: ("sobrinho-bisneto", "sobrinha-bisneta")}
+
+
+class _BuscaAncestrais:
+    """Busca em largura pelos ancestrais de um animal, uma geração por vez."""
+
+    def __init__(self, origem: int):
+        self.distancias = {origem: 0}
+        # Para cada ancestral, os descendentes pelos quais ele foi alcançado na menor distância
+        self.anteriores: Dict[int, List[int]] = {origem: []}
+        self.fronteira = [origem]
+        self.nivel = 0
+        # Visitados apenas por esta busca (ainda não pela outra), contados pela distância
+        self.exclusivos = Counter({0: 1})
+
+    def menor_exclusivo(self) -> Optional[int]:
+        """Menor distância entre os animais visitados apenas por esta busca."""
+        return min((distancia for distancia, total in self.exclusivos.items() if total), default=None)
+
+    def expandir(self, grafo: GrafoGenealogico) -> List[int]:
+        """Visita os genitores da fronteira atual; retorna os ancestrais novos."""
+        novos = []
+        proximo = self.nivel + 1
+        for filho in self.fronteira:
+            for genitor in {int(grafo.pais[filho]), int(grafo.maes[filho])}:
+                if genitor == SEM_GENITOR:
+                    continue
+                distancia = self.distancias.get(genitor)
+                if distancia is None:
+                    self.distancias[genitor] = proximo
+                    self.anteriores[genitor] = [filho]
+                    novos.append(genitor)
+                elif distancia == proximo:
+                    self.anteriores[genitor].append(filho)
+        self.fronteira = novos
+        self.nivel = proximo
+        return novos
+
+    def caminhos(self, ancestral: int) -> Iterator[List[int]]:
+        """Caminhos mais curtos (posições) da origem até o ancestral."""
+        if not self.anteriores[ancestral]:
+            yield [ancestral]
+            return
+        for filho in self.anteriores[ancestral]:
+            for caminho in self.caminhos(filho):
+                yield caminho + [ancestral]
+
+
+class BuscaParentesco:
+    """Ancestrais comuns mais próximos de dois animais, por busca bidirecional.
+
+    Os ancestrais de cada animal são visitados geração a geração, sempre pelo
+    lado de fronteira menor, até que as buscas se encontrem. A busca termina
+    assim que nenhum ancestral ainda não visitado puder formar um caminho tão
+    curto quanto o melhor encontrado, sem percorrer os pedigrees completos.
+    """
+
+    def __init__(self, grafo: GrafoGenealogico, animal_id: int, outro_id: int, geracoes_maximas: Optional[int] = None):
+        self.grafo = grafo
+        self.animal = grafo.indice_de(animal_id)
+        self.outro = grafo.indice_de(outro_id)
+        self.geracoes_maximas = geracoes_maximas
+        self.busca_a = _BuscaAncestrais(self.animal)
+        self.busca_b = _BuscaAncestrais(self.outro)
+        self.distancia: Optional[int] = None
+        self.comuns: List[int] = []
+        self._buscar()
+
+    def _ativa(self, busca: _BuscaAncestrais) -> bool:
+        return bool(busca.fronteira) and (self.geracoes_maximas is None or busca.nivel < self.geracoes_maximas)
+
+    def _buscar(self) -> None:
+        if self.animal == self.outro:
+            self.distancia, self.comuns = 0, [self.animal]
+            return
+
+        melhor = float("inf")
+        while True:
+            ativa_a, ativa_b = self._ativa(self.busca_a), self._ativa(self.busca_b)
+            # Menor distância total possível para um ancestral comum ainda não encontrado: ele
+            # está além da fronteira de um dos lados e já foi (ou ainda será) visitado pelo outro
+            limite = float("inf")
+            minimo_a, minimo_b = self.busca_a.menor_exclusivo(), self.busca_b.menor_exclusivo()
+            if ativa_a and minimo_b is not None:
+                limite = min(limite, self.busca_a.nivel + 1 + minimo_b)
+            if ativa_b and minimo_a is not None:
+                limite = min(limite, self.busca_b.nivel + 1 + minimo_a)
+            if ativa_a and ativa_b:
+                limite = min(limite, self.busca_a.nivel + self.busca_b.nivel + 2)
+            # Continua enquanto houver empate possível, para reunir todos os ancestrais mais próximos
+            if limite == float("inf") or melhor < limite:
+                break
+
+            if ativa_a and (not ativa_b or len(self.busca_a.fronteira) <= len(self.busca_b.fronteira)):
+                busca, outra = self.busca_a, self.busca_b
+            else:
+                busca, outra = self.busca_b, self.busca_a
+            for ancestral in busca.expandir(self.grafo):
+                distancia_outra = outra.distancias.get(ancestral)
+                if distancia_outra is None:
+                    busca.exclusivos[busca.nivel] += 1
+                    continue
+                outra.exclusivos[distancia_outra] -= 1
+                total = busca.nivel + distancia_outra
+                if total < melhor:
+                    melhor, self.comuns = total, [ancestral]
+                elif total == melhor:
+                    self.comuns.append(ancestral)
+
+        if self.comuns:
+            self.distancia = int(melhor)
+            self.comuns.sort(key=lambda ancestral: (self.busca_a.distancias[ancestral], int(self.grafo.ids[ancestral])))
+
+    @property
+    def visitados(self) -> int:
+        """Total de animais visitados pelas duas buscas."""
+        return len(self.busca_a.distancias) + len(self.busca_b.distancias)
+
+    def animais_comuns(self) -> List[int]:
+        """IDs dos ancestrais comuns mais próximos."""
+        return [int(self.grafo.ids[ancestral]) for ancestral in self.comuns]
+
+    def caminhos(self, limite: int) -> List[Tuple[int, List[int]]]:
+        """Até `limite` caminhos mais curtos (ancestral, IDs do primeiro ao segundo animal)."""
+        resultado = []
+        for ancestral in self.comuns:
+            for subida in self.busca_a.caminhos(ancestral):
+                for descida in self.busca_b.caminhos(ancestral):
+                    posicoes = subida + descida[::-1][1:]
+                    resultado.append((int(self.grafo.ids[ancestral]), [int(self.grafo.ids[p]) for p in posicoes]))
+                    if len(resultado) >= limite:
+                        return resultado
+        return resultado
+
+    def _casais(self, busca: _BuscaAncestrais, grupo: Set[int]) -> Set[FrozenSet[int]]:
+        # Pares de ancestrais do grupo que são pai e mãe de um mesmo animal do caminho
+        casais = set()
+        for ancestral in grupo:
+            for filho in busca.anteriores[ancestral]:
+                casal = frozenset((int(self.grafo.pais[filho]), int(self.grafo.maes[filho])))
+                if len(casal) == 2 and casal <= grupo:
+                    casais.add(casal)
+        return casais
+
+    def grupos(self) -> List[Tuple[int, int, List[int], bool]]:
+        """Ancestrais comuns agrupados pelas distâncias (distância_a, distância_b, IDs, completo).
+
+        O parentesco é completo (ex.: irmãos, e não meio-irmãos) quando os
+        dois animais descendem de um mesmo casal de ancestrais comuns.
+        """
+        por_distancias: Dict[Tuple[int, int], List[int]] = {}
+        for ancestral in self.comuns:
+            chave = (self.busca_a.distancias[ancestral], self.busca_b.distancias[ancestral])
+            por_distancias.setdefault(chave, []).append(ancestral)
+
+        grupos = []
+        for (distancia_a, distancia_b), ancestrais in sorted(por_distancias.items()):
+            completo = False
+            if distancia_a and distancia_b:
+                completo = bool(self._casais(self.busca_a, set(ancestrais)) & self._casais(self.busca_b, set(ancestrais)))
+            grupos.append((distancia_a, distancia_b, [int(self.grafo.ids[a]) for a in ancestrais], completo))
+        return grupos
+
+    def lado(self, ancestral_id: int) -> Optional[str]:
+        """Se o ancestral comum foi alcançado pelo pai ou pela mãe do primeiro animal."""
+        ancestral = self.grafo.indice_de(ancestral_id)
+        for subida in islice(self.busca_a.caminhos(ancestral), 1):
+            if len(subida) > 1:
+                return "pai" if int(self.grafo.pais[self.animal]) == subida[1] else "mãe"
+        return None
+
+
+def _nome_relacao(distancia_a: int, distancia_b: int, feminino: bool) -> Tuple[str, bool]:
+    """Nome da relação do primeiro animal com o segundo e se ela é simétrica."""
+    genero = 1 if feminino else 0
+    if distancia_a == 0:
+        nome = _ASCENDENTES.get(distancia_b)
+        return (nome[genero] if nome else f"ancestral direto ({distancia_b} gerações)"), False
+    if distancia_b == 0:
+        nome = _DESCENDENTES.get(distancia_a)
+        return (nome[genero] if nome else f"descendente direto ({distancia_a} gerações)"), False
+    if distancia_a == distancia_b == 1:
+        return "irmãos", True
+    if distancia_a == 1:
+        nome = _TIOS.get(distancia_b)
+        return (nome[genero] if nome else f"tio em {distancia_b - 1}º grau"), False
+    if distancia_b == 1:
+        nome = _SOBRINHOS.get(distancia_a)
+        return (nome[genero] if nome else f"sobrinho em {distancia_a - 1}º grau"), False
+
+    nome = f"primos de {min(distancia_a, distancia_b) - 1}º grau"
+    diferenca = abs(distancia_a - distancia_b)
+    if diferenca:
+        nome += f" com {diferenca} {'geração' if diferenca == 1 else 'gerações'} de diferença"
+    return nome, True
+
+
+def descrever_parentesco(
+    busca: BuscaParentesco, animais: Dict[int, Any], limite_caminhos: int
+) -> Dict[str, Any]:
+    """Monta a resposta do parentesco, com a descrição de cada relação encontrada.
+
+    `animais` traz, por ID, as linhas (nome e sexo) dos dois animais e dos
+    ancestrais comuns.
+    """
+    def nome_animal(animal_id: int) -> str:
+        # O grafo em memória pode conter um animal excluído há pouco por outro processo
+        linha = animais.get(animal_id)
+        return linha.nome if linha is not None else f"Animal {animal_id}"
+
+    animal_id, outro_id = int(busca.grafo.ids[busca.animal]), int(busca.grafo.ids[busca.outro])
+    animal = animais.get(animal_id)
+
+    relacoes = []
+    for distancia_a, distancia_b, ancestrais, completo in busca.grupos():
+        if distancia_a == distancia_b == 0:
+            continue
+        nome, simetrica = _nome_relacao(distancia_a, distancia_b, animal is not None and animal.sexo == "Fêmea")
+        colateral = distancia_a > 0 and distancia_b > 0
+        if colateral and not completo:
+            nome = f"meio-{nome}"
+            lado = busca.lado(ancestrais[0])
+            if distancia_a == distancia_b == 1 and lado:
+                nome += f" por parte de {lado}"
+
+        if simetrica:
+            descricao = f"{nome_animal(animal_id)} e {nome_animal(outro_id)} são {nome}"
+        else:
+            descricao = f"{nome_animal(animal_id)} é {nome} de {nome_animal(outro_id)}"
+        if colateral:
+            descricao += ", via " + " e ".join(nome_animal(ancestral) for ancestral in ancestrais)
+        relacoes.append({
+            "grau": nome,
+            "descricao": descricao,
+            "distancia_a": distancia_a,
+            "distancia_b": distancia_b,
+            "ancestrais_ids": ancestrais,
+        })
+
+    return {
+        "animal_id": animal_id,
+        "outro_id": outro_id,
+        "aparentados": busca.distancia is not None,
+        "distancia": busca.distancia,
+        "ancestrais_comuns": [
+            {
+                "id": int(busca.grafo.ids[ancestral]),
+                "nome": nome_animal(int(busca.grafo.ids[ancestral])),
+                "distancia_a": busca.busca_a.distancias[ancestral],
+                "distancia_b": busca.busca_b.distancias[ancestral],
+            }
+            for ancestral in busca.comuns
+        ],
+        "relacoes": relacoes,
+        "caminhos": [
+            {"ancestral_id": ancestral_id, "animais": caminho}
+            for ancestral_id, caminho in busca.caminhos(limite_caminhos)
+        ],
+        "animais_visitados": busca.visitados,
+    }
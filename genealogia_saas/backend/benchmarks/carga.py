@@ -0,0 +1,361 @@
+"""Driver de carga: executa cenários com clientes concorrentes contra a API real.
+
+Uso (a partir de backend/, após gerar as organizações com benchmarks.gerador):
+    python -m benchmarks.carga --url http://localhost:8000 --organizacoes 5 --clientes 20 --saida base.json
+    python -m benchmarks.carga --banco sqlite:///benchmark.db --comparar base.json
+
+Com --url as requisições vão a um servidor já iniciado (uvicorn); sem ela a
+aplicação (app.main) roda no próprio processo, ligada ao banco de --banco
+(padrão: o da configuração; SQLite requer o aiosqlite). Para cada cenário são
+informadas a vazão, as latências p50/p90/p99 e as consultas ao banco por
+requisição, lidas do /metrics da aplicação antes e depois do cenário (com
+vários workers do uvicorn a contagem reflete apenas o worker que responder ao
+/metrics). O resultado pode ser salvo em JSON e comparado com o de outra versão.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from benchmarks.comum import ESPECIE, SENHA_ORGANIZACAO, email_organizacao
+
+CENARIOS = ("login", "listagem", "arvore", "cadastro", "misto")
+
+# Pesos dos cenários no cenário misto (uso típico: mais leituras que escritas)
+PESOS_MISTO = {"listagem": 50, "arvore": 35, "cadastro": 10, "login": 5}
+
+# Páginas seguidas por um cliente antes de voltar ao início da listagem
+PAGINAS_POR_SESSAO = 5
+
+# Métricas exportadas pelo MiddlewareMetricas (app/core/instrumentacao.py)
+_METRICA_BANCO = re.compile(
+    r"^(banco_consultas_por_requisicao|banco_tempo_por_requisicao_segundos)_(sum|count)(\{.*\})? (\S+)$"
+)
+
+# Métricas comparadas entre execuções, e se um valor maior é melhor
+METRICAS_COMPARADAS = (
+    ("vazao", True),
+    ("p50_ms", False),
+    ("p99_ms", False),
+    ("consultas_por_requisicao", False),
+)
+
+
+class Organizacao:
+    """Organização sintética autenticada e uma amostra dos seus animais."""
+
+    def __init__(self, email: str, token: str, machos: List[int], femeas: List[int]):
+        self.email = email
+        self.cabecalhos = {"Authorization": f"Bearer {token}"}
+        self.machos = machos
+        self.femeas = femeas
+        self.animais = machos + femeas
+
+
+class ClienteVirtual:
+    """Um usuário simulado: executa requisições em sequência para uma organização."""
+
+    def __init__(self, http: httpx.AsyncClient, organizacao: Organizacao, args: argparse.Namespace, semente: int):
+        self.http = http
+        self.organizacao = organizacao
+        self.args = args
+        self.aleatorio = random.Random(semente)
+        self.cursor: Optional[str] = None
+        self.paginas = 0
+
+    async def login(self) -> httpx.Response:
+        return await self.http.post(
+            f"{settings.API_V1_STR}/auth/login/organizacao",
+            data={"username": self.organizacao.email, "password": SENHA_ORGANIZACAO},
+        )
+
+    async def listagem(self) -> httpx.Response:
+        if self.paginas >= PAGINAS_POR_SESSAO:
+            self.cursor, self.paginas = None, 0
+        parametros: Dict[str, Any] = {"limite": 50}
+        if self.cursor:
+            parametros["cursor"] = self.cursor
+        resposta = await self.http.get(
+            f"{settings.API_V1_STR}/animais/", params=parametros, headers=self.organizacao.cabecalhos
+        )
+        if resposta.status_code == 200:
+            self.cursor = resposta.json().get("proximo_cursor")
+            self.paginas = self.paginas + 1 if self.cursor else PAGINAS_POR_SESSAO
+        return resposta
+
+    async def arvore(self) -> httpx.Response:
+        animal_id = self.aleatorio.choice(self.organizacao.animais)
+        return await self.http.get(
+            f"{settings.API_V1_STR}/animais/{animal_id}/arvore",
+            params={"geracoes": self.args.geracoes_arvore},
+            headers=self.organizacao.cabecalhos,
+        )
+
+    async def cadastro(self) -> httpx.Response:
+        # O cadastro passa pela verificação do limite do plano e pela validação da genealogia
+        dados = {
+            "nome": f"Carga {self.aleatorio.randrange(10 ** 9):09d}",
+            "especie": ESPECIE,
+            "sexo": self.aleatorio.choice(("Macho", "Fêmea")),
+            "pai_id": self.aleatorio.choice(self.organizacao.machos) if self.organizacao.machos else None,
+            "mae_id": self.aleatorio.choice(self.organizacao.femeas) if self.organizacao.femeas else None,
+        }
+        return await self.http.post(
+            f"{settings.API_V1_STR}/animais/", json=dados, headers=self.organizacao.cabecalhos
+        )
+
+    async def misto(self) -> httpx.Response:
+        cenario = self.aleatorio.choices(list(PESOS_MISTO), weights=list(PESOS_MISTO.values()))[0]
+        return await getattr(self, cenario)()
+
+
+def _aplicacao_local(url_banco: Optional[str]) -> Any:
+    """A aplicação FastAPI no próprio processo, opcionalmente ligada a outro banco."""
+    from app.main import app
+
+    if url_banco:
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from app.api import deps
+        from app.core.instrumentacao import instrumentar_engine
+        from benchmarks.comum import criar_sessoes, url_assincrona
+
+        engine, fabrica_sessoes = criar_sessoes(url_banco)
+        async_engine = create_async_engine(url_assincrona(url_banco))
+        fabrica_assincrona = sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        instrumentar_engine(engine)
+        instrumentar_engine(async_engine.sync_engine)
+
+        def get_db():
+            db = fabrica_sessoes()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def get_async_db():
+            async with fabrica_assincrona() as db:
+                yield db
+
+        app.dependency_overrides[deps.get_db] = get_db
+        app.dependency_overrides[deps.get_async_db] = get_async_db
+    return app
+
+
+async def _metricas_banco(http: httpx.AsyncClient) -> Optional[Dict[str, float]]:
+    """Totais de consultas, tempo de banco e requisições medidos pela aplicação."""
+    resposta = await http.get("/metrics")
+    if resposta.status_code != 200:
+        return None
+    totais = {"consultas": 0.0, "tempo_banco": 0.0, "requisicoes": 0.0}
+    for linha in resposta.text.splitlines():
+        encontrada = _METRICA_BANCO.match(linha)
+        if not encontrada or 'rota="/metrics"' in (encontrada.group(3) or ""):
+            continue
+        nome, sufixo, valor = encontrada.group(1), encontrada.group(2), float(encontrada.group(4))
+        if sufixo == "count":
+            if nome == "banco_consultas_por_requisicao":
+                totais["requisicoes"] += valor
+        elif nome == "banco_consultas_por_requisicao":
+            totais["consultas"] += valor
+        else:
+            totais["tempo_banco"] += valor
+    return totais
+
+
+async def _preparar_organizacao(http: httpx.AsyncClient, numero: int, amostra: int) -> Organizacao:
+    """Autentica a organização sintética e coleta uma amostra dos seus animais."""
+    email = email_organizacao(numero)
+    resposta = await http.post(
+        f"{settings.API_V1_STR}/auth/login/organizacao",
+        data={"username": email, "password": SENHA_ORGANIZACAO},
+    )
+    resposta.raise_for_status()
+    token = resposta.json()["access_token"]
+
+    machos: List[int] = []
+    femeas: List[int] = []
+    cursor = None
+    while len(machos) + len(femeas) < amostra:
+        parametros: Dict[str, Any] = {"limite": 200}
+        if cursor:
+            parametros["cursor"] = cursor
+        resposta = await http.get(
+            f"{settings.API_V1_STR}/animais/", params=parametros, headers={"Authorization": f"Bearer {token}"}
+        )
+        resposta.raise_for_status()
+        pagina = resposta.json()
+        for animal in pagina["itens"]:
+            (machos if animal["sexo"] == "Macho" else femeas).append(animal["id"])
+        cursor = pagina.get("proximo_cursor")
+        if not cursor:
+            break
+    if not machos and not femeas:
+        raise SystemExit(f"A organização {email} não tem animais; execute antes o benchmarks.gerador.")
+    return Organizacao(email, token, machos, femeas)
+
+
+def _percentil(valores: List[float], percentual: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores ordenados)."""
+    if not valores:
+        return 0.0
+    posicao = max(0, min(len(valores) - 1, round(percentual / 100 * len(valores) + 0.5) - 1))
+    return valores[posicao]
+
+
+async def _executar_cenario(
+    http: httpx.AsyncClient, organizacoes: List[Organizacao], cenario: str, args: argparse.Namespace
+) -> Dict[str, Any]:
+    clientes = [
+        ClienteVirtual(http, organizacoes[indice % len(organizacoes)], args, args.semente + indice)
+        for indice in range(args.clientes)
+    ]
+    latencias: List[float] = []
+    status_respostas: Dict[str, int] = {}
+
+    async def executar(cliente: ClienteVirtual, ate: float, medir: bool) -> None:
+        requisicao: Callable[[], Awaitable[httpx.Response]] = getattr(cliente, cenario)
+        while time.perf_counter() < ate:
+            inicio = time.perf_counter()
+            try:
+                codigo = str((await requisicao()).status_code)
+            except httpx.HTTPError:
+                codigo = "falha"
+            if medir:
+                latencias.append(time.perf_counter() - inicio)
+                status_respostas[codigo] = status_respostas.get(codigo, 0) + 1
+
+    # Aquecimento: preenche caches e o pool de conexões sem entrar nas medidas
+    if args.aquecimento > 0:
+        ate = time.perf_counter() + args.aquecimento
+        await asyncio.gather(*(executar(cliente, ate, False) for cliente in clientes))
+
+    antes = await _metricas_banco(http)
+    inicio = time.perf_counter()
+    ate = inicio + args.duracao
+    await asyncio.gather(*(executar(cliente, ate, True) for cliente in clientes))
+    duracao = time.perf_counter() - inicio
+    depois = await _metricas_banco(http)
+
+    latencias.sort()
+    erros = sum(quantidade for codigo, quantidade in status_respostas.items() if not codigo.startswith(("2", "3")))
+    resultado: Dict[str, Any] = {
+        "requisicoes": len(latencias),
+        "erros": erros,
+        "status": dict(sorted(status_respostas.items())),
+        "vazao": round(len(latencias) / duracao, 1),
+        "p50_ms": round(_percentil(latencias, 50) * 1000, 2),
+        "p90_ms": round(_percentil(latencias, 90) * 1000, 2),
+        "p99_ms": round(_percentil(latencias, 99) * 1000, 2),
+        "max_ms": round(latencias[-1] * 1000, 2) if latencias else 0.0,
+        "consultas_por_requisicao": None,
+        "tempo_banco_ms_por_requisicao": None,
+    }
+    if antes is not None and depois is not None:
+        requisicoes = depois["requisicoes"] - antes["requisicoes"]
+        if requisicoes > 0:
+            resultado["consultas_por_requisicao"] = round((depois["consultas"] - antes["consultas"]) / requisicoes, 2)
+            resultado["tempo_banco_ms_por_requisicao"] = round(
+                (depois["tempo_banco"] - antes["tempo_banco"]) * 1000 / requisicoes, 2
+            )
+    return resultado
+
+
+def _imprimir(resultados: Dict[str, Dict[str, Any]]) -> None:
+    colunas = ("requisicoes", "erros", "vazao", "p50_ms", "p90_ms", "p99_ms", "max_ms", "consultas_por_requisicao")
+    titulos = ("cenário", "req", "erros", "req/s", "p50 ms", "p90 ms", "p99 ms", "máx ms", "consultas/req")
+    linhas = [titulos] + [
+        (cenario, *("-" if resultado[coluna] is None else str(resultado[coluna]) for coluna in colunas))
+        for cenario, resultado in resultados.items()
+    ]
+    larguras = [max(len(linha[indice]) for linha in linhas) for indice in range(len(titulos))]
+    for linha in linhas:
+        print("  ".join(valor.rjust(largura) for valor, largura in zip(linha, larguras)))
+
+
+def _comparar(
+    resultados: Dict[str, Dict[str, Any]], base: Dict[str, Dict[str, Any]], tolerancia: float
+) -> List[Tuple[str, str, str]]:
+    """Diferenças percentuais em relação à execução base; retorna as pioras além da tolerância."""
+    pioras = []
+    print("\nComparação com a execução base:")
+    for cenario, resultado in resultados.items():
+        anterior = base.get(cenario)
+        if not anterior:
+            continue
+        partes = []
+        for metrica, maior_melhor in METRICAS_COMPARADAS:
+            atual, antigo = resultado.get(metrica), anterior.get(metrica)
+            if atual is None or not antigo:
+                continue
+            variacao = (atual - antigo) / antigo * 100
+            partes.append(f"{metrica} {antigo} -> {atual} ({variacao:+.1f}%)")
+            if (variacao < 0 if maior_melhor else variacao > 0) and abs(variacao) >= tolerancia:
+                pioras.append((cenario, metrica, f"{variacao:+.1f}%"))
+        print(f"  {cenario}: " + "; ".join(partes))
+    return pioras
+
+
+async def executar(args: argparse.Namespace) -> int:
+    if args.url:
+        http = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        transporte = httpx.ASGITransport(app=_aplicacao_local(args.banco))
+        http = httpx.AsyncClient(transport=transporte, base_url="http://benchmark", timeout=args.timeout)
+
+    async with http:
+        organizacoes = [
+            await _preparar_organizacao(http, numero, args.amostra) for numero in range(1, args.organizacoes + 1)
+        ]
+        resultados = {}
+        for cenario in args.cenarios:
+            print(f"Executando {cenario} ({args.clientes} clientes, {args.duracao:g} s)...", file=sys.stderr)
+            resultados[cenario] = await _executar_cenario(http, organizacoes, cenario, args)
+
+    _imprimir(resultados)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(
+                {"parametros": {k: v for k, v in vars(args).items() if k not in ("saida", "comparar", "tolerancia")},
+                 "cenarios": resultados},
+                arquivo, ensure_ascii=False, indent=2,
+            )
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            pioras = _comparar(resultados, json.load(arquivo)["cenarios"], args.tolerancia)
+        if pioras:
+            print(f"\nPioras de {args.tolerancia:g}% ou mais: " + ", ".join(" ".join(piora) for piora in pioras))
+            return 1
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Executa os cenários de carga contra a API.")
+    destino = parser.add_mutually_exclusive_group()
+    destino.add_argument("--url", help="URL de um servidor em execução (ex.: http://localhost:8000)")
+    destino.add_argument("--banco", help="URL do banco da aplicação executada no próprio processo")
+    parser.add_argument("--organizacoes", type=int, default=5, help="Organizações sintéticas usadas")
+    parser.add_argument("--clientes", type=int, default=10, help="Clientes concorrentes")
+    parser.add_argument("--duracao", type=float, default=10, help="Duração de cada cenário, em segundos")
+    parser.add_argument("--aquecimento", type=float, default=2, help="Aquecimento antes de cada cenário, em segundos")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument("--amostra", type=int, default=500, help="Animais de cada organização usados nas requisições")
+    parser.add_argument("--geracoes-arvore", type=int, default=4, help="Gerações pedidas no cenário arvore")
+    parser.add_argument("--timeout", type=float, default=30, help="Tempo máximo de cada requisição, em segundos")
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--saida", help="Arquivo JSON onde salvar os resultados")
+    parser.add_argument("--comparar", help="Resultados (JSON) de uma execução anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=10, help="Piora percentual que faz o comando falhar")
+    return asyncio.run(executar(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Definições compartilhadas pelo gerador de dados e pelo driver de carga."""
+from typing import Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+
+# Organizações sintéticas: e-mail derivado do número, para que o driver de
+# carga encontre as organizações criadas pelo gerador
+PREFIXO_EMAIL = "benchmark"
+DOMINIO_EMAIL = "exemplo.com"
+
+# Senha aceita pelo login de organizações (ver endpoints/auth.py)
+SENHA_ORGANIZACAO = "senha_temporaria"
+
+NOME_PLANO = "Benchmark"
+ESPECIE = "Galinha"
+
+
+def email_organizacao(numero: int) -> str:
+    """E-mail da organização sintética de número informado (a partir de 1)."""
+    return f"{PREFIXO_EMAIL}-{numero}@{DOMINIO_EMAIL}"
+
+
+def url_assincrona(url: str) -> str:
+    """URL equivalente para o driver assíncrono (asyncpg ou aiosqlite)."""
+    for prefixo, assincrono in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefixo):
+            return assincrono + url[len(prefixo):]
+    return url
+
+
+def criar_sessoes(url: Optional[str]) -> Tuple[Engine, sessionmaker]:
+    """Engine e fábrica de sessões para o banco informado (padrão: o da configuração)."""
+    url = url or str(settings.SQLALCHEMY_DATABASE_URI)
+    opcoes = {"connect_args": {"check_same_thread": False}} if url.startswith("sqlite") else {}
+    engine = create_engine(url, **opcoes)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
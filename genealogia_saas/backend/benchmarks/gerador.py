@@ -0,0 +1,208 @@
+"""Gerador de organizações sintéticas com genealogias realistas para os benchmarks.
+
+Uso (a partir de backend/):
+    python -m benchmarks.gerador --organizacoes 10 --animais 100000 --geracoes 12 --endogamia 0.2
+
+Cada organização recebe um plantel dividido em gerações sobrepostas: os
+fundadores não têm genitores e os demais animais têm pai e mãe das gerações
+anteriores. Com probabilidade `--endogamia`, a mãe é escolhida entre as
+parentes próximas do pai (irmãs ou meio-irmãs), o que aumenta a consanguinidade
+e a repetição de ancestrais nas árvores. Os tamanhos dos plantéis seguem uma
+distribuição de Zipf (a maior organização tem `--animais`), a menos que
+`--uniforme` seja informado. A gravação usa o mesmo serviço da importação em
+lote (services/importacao), inclusive o índice de ancestralidade e o contador
+do plano. Organizações sintéticas já existentes são recriadas.
+
+No PostgreSQL as tabelas devem ter sido criadas pelas migrações (alembic
+upgrade head); com SQLite, use --criar-tabelas.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import base  # noqa: F401
+from app.db.base_class import Base
+from app.db.particoes import criar_particoes, excluir_dados_organizacao
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+from app.services.importacao import importar_animais
+from benchmarks.comum import ESPECIE, NOME_PLANO, criar_sessoes, email_organizacao
+
+NOMES = (
+    "Acauã", "Barão", "Cacique", "Duque", "Estrela", "Faísca", "Guarani", "Herói", "Ipê", "Jaguar",
+    "Lua", "Morena", "Negrito", "Ouro", "Pérola", "Rubi", "Sultão", "Tupã", "Urutau", "Vitória",
+)
+RACAS = ("Índio Gigante", "Shamo", "Asil", "Malaio", "Sumatra")
+
+# Proporção de animais de cada geração que pode ser escolhida como genitor da
+# geração de duas gerações à frente (gerações sobrepostas)
+SOBREPOSICAO = 0.3
+
+DATA_INICIAL = date(2000, 1, 1)
+
+
+def tamanhos_plantel(organizacoes: int, maior: int, uniforme: bool) -> List[int]:
+    """Número de animais de cada organização (Zipf: a n-ésima tem maior / n)."""
+    if uniforme:
+        return [maior] * organizacoes
+    return [max(2, maior // posicao) for posicao in range(1, organizacoes + 1)]
+
+
+def gerar_registros(
+    quantidade: int, geracoes: int, endogamia: float, aleatorio: random.Random
+) -> Iterator[Dict[str, Any]]:
+    """Gera os registros do plantel no formato da importação (codigo, pai e mae).
+
+    Os registros saem em ordem de geração, de modo que os genitores sempre
+    aparecem antes dos filhos.
+    """
+    geracoes = max(1, min(geracoes, quantidade // 2))
+    por_geracao = quantidade // geracoes
+    # Filhos de cada animal, para escolher irmãs e meio-irmãs do pai
+    filhas: Dict[int, List[int]] = {}
+    machos: List[List[int]] = []
+    femeas: List[List[int]] = []
+    pais: List[Optional[int]] = []
+    maes: List[Optional[int]] = []
+
+    codigo = 0
+    for geracao in range(geracoes):
+        tamanho = por_geracao if geracao < geracoes - 1 else quantidade - codigo
+        machos.append([])
+        femeas.append([])
+        candidatos_machos = machos[geracao - 1] if geracao else []
+        candidatas_femeas = femeas[geracao - 1] if geracao else []
+        if geracao >= 2:
+            anteriores_m, anteriores_f = machos[geracao - 2], femeas[geracao - 2]
+            candidatos_machos = candidatos_machos + anteriores_m[:int(len(anteriores_m) * SOBREPOSICAO)]
+            candidatas_femeas = candidatas_femeas + anteriores_f[:int(len(anteriores_f) * SOBREPOSICAO)]
+
+        for posicao in range(tamanho):
+            # Alternar o sexo garante machos e fêmeas em toda geração
+            sexo = "Macho" if posicao % 2 == 0 else "Fêmea"
+            pai = mae = None
+            if candidatos_machos and candidatas_femeas:
+                pai = aleatorio.choice(candidatos_machos)
+                parentes = []
+                if aleatorio.random() < endogamia:
+                    for avo in (pais[pai], maes[pai]):
+                        parentes.extend(filhas.get(avo, ()) if avo is not None else ())
+                mae = aleatorio.choice(parentes or candidatas_femeas)
+                if sexo == "Fêmea":
+                    for genitor in (pai, mae):
+                        filhas.setdefault(genitor, []).append(codigo)
+
+            (machos if sexo == "Macho" else femeas)[geracao].append(codigo)
+            pais.append(pai)
+            maes.append(mae)
+            yield {
+                "codigo": codigo,
+                "nome": f"{aleatorio.choice(NOMES)} {codigo:07d}",
+                "especie": ESPECIE,
+                "raca": aleatorio.choice(RACAS),
+                "sexo": sexo,
+                "data_nascimento": (
+                    DATA_INICIAL + timedelta(days=geracao * 365 + aleatorio.randrange(365))
+                ).isoformat(),
+                "pai": pai,
+                "mae": mae,
+            }
+            codigo += 1
+
+
+def _obter_plano(db: Session, limite_animais: int) -> PlanoAssinatura:
+    plano = db.execute(select(PlanoAssinatura).where(PlanoAssinatura.nome == NOME_PLANO)).scalar_one_or_none()
+    if plano is None:
+        plano = PlanoAssinatura(
+            nome=NOME_PLANO,
+            preco=0,
+            limite_animais=limite_animais,
+            descricao="Plano das organizações sintéticas dos benchmarks",
+            funcionalidades=["Cadastro de animais", "Visualização avançada de genealogia", "Exportação de relatórios"],
+        )
+        db.add(plano)
+    plano.limite_animais = max(plano.limite_animais, limite_animais)
+    db.flush()
+    return plano
+
+
+def _preparar_organizacao(db: Session, numero: int, plano: PlanoAssinatura) -> Organizacao:
+    """Cria a organização sintética ou apaga os animais de uma já existente."""
+    email = email_organizacao(numero)
+    organizacao = db.execute(select(Organizacao).where(Organizacao.email == email)).scalar_one_or_none()
+    if organizacao is None:
+        organizacao = Organizacao(
+            nome=f"Benchmark {numero}",
+            email=email,
+            plano_assinatura_id=plano.id,
+            data_assinatura=date.today(),
+            status_assinatura="Ativa",
+        )
+        db.add(organizacao)
+        db.flush()
+        criar_particoes(db, organizacao.id)
+    else:
+        excluir_dados_organizacao(db, organizacao.id)
+        organizacao.plano_assinatura_id = plano.id
+        organizacao.status_assinatura = "Ativa"
+        organizacao.total_animais = 0
+        db.flush()
+    return organizacao
+
+
+def gerar(args: argparse.Namespace) -> int:
+    """Cria (ou recria) as organizações sintéticas e seus plantéis."""
+    engine, fabrica_sessoes = criar_sessoes(args.banco)
+    if args.criar_tabelas:
+        Base.metadata.create_all(engine)
+
+    tamanhos = tamanhos_plantel(args.organizacoes, args.animais, args.uniforme)
+    aleatorio = random.Random(args.semente)
+    db = fabrica_sessoes()
+    try:
+        # Folga no limite do plano para os cadastros feitos durante a carga
+        plano = _obter_plano(db, args.limite_plano or max(tamanhos) * 2)
+        db.commit()
+
+        for numero, tamanho in enumerate(tamanhos, start=1):
+            inicio = time.perf_counter()
+            organizacao = _preparar_organizacao(db, numero, plano)
+            resultado = importar_animais(
+                db, organizacao.id, gerar_registros(tamanho, args.geracoes, args.endogamia, aleatorio)
+            )
+            db.commit()
+            print(
+                f"{organizacao.email}: {resultado['total_importados']} animais em "
+                f"{resultado['geracoes']} gerações ({time.perf_counter() - inicio:.1f} s)."
+            )
+    finally:
+        db.close()
+        engine.dispose()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera organizações sintéticas para os benchmarks.")
+    parser.add_argument("--banco", help="URL do banco (padrão: SQLALCHEMY_DATABASE_URI)")
+    parser.add_argument("--organizacoes", type=int, default=5, help="Número de organizações")
+    parser.add_argument("--animais", type=int, default=10000, help="Animais da maior organização")
+    parser.add_argument("--uniforme", action="store_true", help="Todas as organizações com --animais animais")
+    parser.add_argument("--geracoes", type=int, default=10, help="Profundidade das genealogias")
+    parser.add_argument("--endogamia", type=float, default=0.1, help="Probabilidade de acasalar parentes (0 a 1)")
+    parser.add_argument("--limite-plano", type=int, help="Limite de animais do plano (padrão: 2x o maior plantel)")
+    parser.add_argument("--semente", type=int, default=42, help="Semente do gerador aleatório")
+    parser.add_argument("--criar-tabelas", action="store_true", help="Criar as tabelas (bancos sem migrações)")
+    args = parser.parse_args(argv)
+    if not 0 <= args.endogamia <= 1 or args.organizacoes < 1 or args.animais < 2:
+        parser.error("parâmetros inválidos")
+    return gerar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
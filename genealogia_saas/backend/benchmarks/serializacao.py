@@ -0,0 +1,125 @@
+"""Micro-benchmark: custo por linha da serialização das listagens.
+
+Uso (a partir de backend/):
+    python -m benchmarks.serializacao --linhas 200 --repeticoes 200
+
+Compara, para uma página de animais em um SQLite em memória, o caminho
+completo (objetos ORM, validação por `Pagina[AnimalResponse]`,
+`jsonable_encoder` e json), que é o que o FastAPI faz com o `response_model`,
+com o caminho de `fields=` (colunas como tuplas, dicionários e `json_bytes`).
+Informa o tempo por linha da leitura mais serialização e só da serialização.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.projecao import itens_projetados
+from app.core.serializacao import json_bytes, orjson
+from app.db import base  # noqa: F401
+from app.db.base_class import Base
+from app.models.animal import Animal
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+from app.schemas.animal import AnimalResponse
+from app.schemas.paginacao import Pagina
+
+# Campos pedidos no caminho com projeção (uma listagem típica da interface)
+CAMPOS = ["id", "nome", "sexo", "raca", "data_nascimento", "pai_id", "mae_id"]
+
+
+def _popular(db: Session, linhas: int) -> None:
+    aleatorio = random.Random(42)
+    db.add(PlanoAssinatura(id=1, nome="Benchmark", preco=0, limite_animais=linhas))
+    db.add(Organizacao(id=1, nome="Benchmark", email="benchmark@exemplo.com", plano_assinatura_id=1))
+    db.flush()
+    db.execute(insert(Animal), [
+        {
+            "id": numero,
+            "organizacao_id": 1,
+            "nome": f"Animal {numero:06d}",
+            "especie": "Galinha",
+            "raca": aleatorio.choice(("Índio Gigante", "Shamo", "Asil")),
+            "sexo": "Macho" if numero % 2 else "Fêmea",
+            "data_nascimento": date(2020, 1, 1) + timedelta(days=aleatorio.randrange(1000)),
+            "caracteristicas_fisicas": "Plumagem vermelha, crista ervilha",
+            "pai_id": numero - 2 if numero > 2 else None,
+            "mae_id": numero - 1 if numero > 2 else None,
+        }
+        for numero in range(1, linhas + 1)
+    ])
+    db.commit()
+
+
+def _completo(db: Session, linhas: int) -> bytes:
+    animais = db.execute(select(Animal).order_by(Animal.nome, Animal.id).limit(linhas)).scalars().all()
+    pagina = Pagina[AnimalResponse](itens=animais, proximo_cursor=None)
+    return json.dumps(jsonable_encoder(pagina), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _projetado(db: Session, linhas: int) -> bytes:
+    consulta = select(*(getattr(Animal, campo) for campo in CAMPOS)).order_by(Animal.nome, Animal.id).limit(linhas)
+    return json_bytes({"itens": itens_projetados(CAMPOS, db.execute(consulta).all()), "proximo_cursor": None})
+
+
+def _medir(funcao: Callable[[], object], repeticoes: int) -> float:
+    """Melhor tempo (em segundos) entre as repetições, para reduzir o ruído."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Custo por linha da serialização das listagens.")
+    parser.add_argument("--linhas", type=int, default=200, help="Linhas por página")
+    parser.add_argument("--repeticoes", type=int, default=200, help="Repetições de cada medida")
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    fabrica_sessoes = sessionmaker(bind=engine)
+    db = fabrica_sessoes()
+    _popular(db, args.linhas)
+
+    def em_nova_sessao(caminho: Callable[[Session, int], bytes]) -> Callable[[], bytes]:
+        # Uma sessão por medida, como em uma requisição (sem reaproveitar o mapa de identidade)
+        def executar() -> bytes:
+            with fabrica_sessoes() as sessao:
+                return caminho(sessao, args.linhas)
+        return executar
+
+    # Apenas serialização: objetos e linhas já carregados
+    animais = db.execute(select(Animal).order_by(Animal.nome, Animal.id)).scalars().all()
+    tuplas = db.execute(select(*(getattr(Animal, campo) for campo in CAMPOS)).order_by(Animal.nome, Animal.id)).all()
+    medidas = {
+        "completo (ORM + validação + jsonable_encoder)": (
+            _medir(em_nova_sessao(_completo), args.repeticoes),
+            _medir(lambda: json.dumps(jsonable_encoder(Pagina[AnimalResponse](itens=animais)), ensure_ascii=False), args.repeticoes),
+        ),
+        f"projeção fields= ({'orjson' if orjson else 'json'})": (
+            _medir(em_nova_sessao(_projetado), args.repeticoes),
+            _medir(lambda: json_bytes({"itens": itens_projetados(CAMPOS, tuplas)}), args.repeticoes),
+        ),
+    }
+
+    print(f"{args.linhas} linhas por página, melhor de {args.repeticoes} repetições (µs por linha):")
+    print(f"{'caminho':<48} {'leitura + serialização':>24} {'serialização':>14}")
+    for nome, (total, serializacao) in medidas.items():
+        print(f"{nome:<48} {total / args.linhas * 1e6:>24.1f} {serializacao / args.linhas * 1e6:>14.1f}")
+    (base_total, base_serial), (novo_total, novo_serial) = medidas.values()
+    print(f"Redução: {base_total / novo_total:.1f}x (leitura + serialização), {base_serial / novo_serial:.1f}x (serialização)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
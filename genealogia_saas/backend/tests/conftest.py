@@ -0,0 +1,146 @@
+"""Fixtures dos testes: banco SQLite temporário e cliente das rotas de animais.
+
+As rotas síncronas e as assíncronas usam o mesmo arquivo SQLite (pysqlite e
+aiosqlite). Os caches em memória por organização são descartados a cada
+teste, já que todos os bancos de teste reutilizam os mesmos IDs.
+"""
+from typing import Callable, Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import deps
+from app.api.api_v1.endpoints import animais
+from app.api.respostas import _respostas
+from app.db import base  # noqa: F401 (registra todos os modelos)
+from app.db.base_class import Base
+from app.models.animal import Animal
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+from app.schemas.principal import OrganizacaoAutenticada
+from app.services.busca import registro_indices_busca
+from app.services.consanguinidade import registro_consanguinidade
+from app.services.grafo_genealogico import registro_grafos
+
+# Plantel de teste: (id, nome, sexo, pai, mãe). 3 e 4 são irmãos completos,
+# 5 é filho deles e 6 é filha de 5 com a avó 2
+PLANTEL = [
+    (1, "Aurora", "Macho", None, None),
+    (2, "Brisa", "Fêmea", None, None),
+    (3, "Cometa", "Macho", 1, 2),
+    (4, "Duna", "Fêmea", 1, 2),
+    (5, "Eclipse", "Macho", 3, 4),
+    (6, "Faísca", "Fêmea", 5, 2),
+]
+
+
+def _limpar_caches() -> None:
+    for cache in (registro_grafos._grafos, registro_consanguinidade._estados, registro_indices_busca._indices):
+        cache.clear()
+    for cache in (deps._tokens, deps._organizacoes, deps._admins):
+        cache.limpar()
+    _respostas.limpar()
+
+
+@pytest.fixture(autouse=True)
+def caches_limpos() -> Iterator[None]:
+    _limpar_caches()
+    yield
+    _limpar_caches()
+
+
+@pytest.fixture
+def arquivo_banco(tmp_path) -> str:
+    return str(tmp_path / "genealogia.db")
+
+
+@pytest.fixture
+def fabrica_sessoes(arquivo_banco) -> Iterator[Callable[[], Session]]:
+    """Banco com um plano e as organizações 1 e 2, sem animais."""
+    engine = create_engine(f"sqlite:///{arquivo_banco}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    fabrica = sessionmaker(bind=engine, autoflush=False)
+    db = fabrica()
+    db.add(PlanoAssinatura(id=1, nome="Bronze", preco=99.9, limite_animais=1000, funcionalidades=[]))
+    db.add(Organizacao(id=1, nome="Granja Um", email="um@granja.com", plano_assinatura_id=1, status_assinatura="Ativa"))
+    db.add(Organizacao(id=2, nome="Granja Dois", email="dois@granja.com", plano_assinatura_id=1, status_assinatura="Ativa"))
+    db.commit()
+    db.close()
+    yield fabrica
+    engine.dispose()
+
+
+@pytest.fixture
+def db(fabrica_sessoes) -> Iterator[Session]:
+    sessao = fabrica_sessoes()
+    yield sessao
+    sessao.close()
+
+
+def cadastrar_plantel(db: Session, organizacao_id: int = 1) -> None:
+    """Cadastra o plantel de teste, com o contador e o índice de ancestralidade."""
+    from app.services.ancestralidade import reconstruir_indice
+
+    for animal_id, nome, sexo, pai_id, mae_id in PLANTEL:
+        db.add(Animal(
+            id=animal_id + (organizacao_id - 1) * 100,
+            organizacao_id=organizacao_id,
+            nome=nome,
+            especie="Galinha",
+            sexo=sexo,
+            pai_id=pai_id and pai_id + (organizacao_id - 1) * 100,
+            mae_id=mae_id and mae_id + (organizacao_id - 1) * 100,
+        ))
+    db.flush()
+    db.get(Organizacao, organizacao_id).total_animais = len(PLANTEL)
+    reconstruir_indice(db, organizacao_id)
+    db.commit()
+
+
+@pytest.fixture
+def plantel(db) -> Session:
+    """Sessão com o plantel de teste cadastrado na organização 1."""
+    cadastrar_plantel(db)
+    return db
+
+
+@pytest.fixture
+def plantel_duas_organizacoes(plantel) -> Session:
+    """Sessão com o plantel de teste cadastrado nas organizações 1 e 2 (IDs 101 a 106)."""
+    cadastrar_plantel(plantel, 2)
+    return plantel
+
+
+@pytest.fixture
+def cliente(fabrica_sessoes, arquivo_banco) -> Iterator[TestClient]:
+    """Cliente das rotas de animais autenticado como a organização 1."""
+    app = FastAPI()
+    app.include_router(animais.router, prefix="/api/v1/animais")
+
+    def get_db() -> Iterator[Session]:
+        sessao = fabrica_sessoes()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    # Sem pool: cada requisição abre a sua conexão no loop de eventos do TestClient
+    engine_async = create_async_engine(f"sqlite+aiosqlite:///{arquivo_banco}", poolclass=NullPool)
+    fabrica_async = sessionmaker(engine_async, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_async_db():
+        async with fabrica_async() as sessao:
+            yield sessao
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[deps.get_async_db] = get_async_db
+    app.dependency_overrides[deps.get_current_organizacao] = lambda: OrganizacaoAutenticada(
+        id=1, email="um@granja.com", plano_assinatura_id=1, status_assinatura="Ativa"
+    )
+    with TestClient(app) as cliente:
+        yield cliente
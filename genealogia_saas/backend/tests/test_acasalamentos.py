@@ -0,0 +1,30 @@
+def _matriz(resposta):
+    return {(item["femea_id"], item["macho_id"]): item["coeficiente_parentesco"] for item in resposta.json()}
+
+
+def test_matriz_de_parentesco(cliente, plantel):
+    resposta = cliente.post(
+        "/api/v1/animais/acasalamentos/simulacao", json={"femeas_ids": [4, 6, 2], "machos_ids": [3, 5, 1]}
+    )
+
+    assert resposta.status_code == 200
+    assert _matriz(resposta) == {
+        (4, 3): 0.25, (4, 5): 0.375, (4, 1): 0.25,
+        (6, 3): 0.3125, (6, 5): 0.4375, (6, 1): 0.125,
+        (2, 3): 0.25, (2, 5): 0.25, (2, 1): 0.0,
+    }
+    # A consanguinidade da prole é o parentesco entre os pais
+    assert all(item["consanguinidade_prole"] == item["coeficiente_parentesco"] for item in resposta.json())
+
+
+def test_sexos_incompativeis(cliente, plantel):
+    resposta = cliente.post("/api/v1/animais/acasalamentos/simulacao", json={"femeas_ids": [3], "machos_ids": [5]})
+
+    assert resposta.status_code == 400
+
+
+def test_animais_de_outra_organizacao(cliente, plantel):
+    resposta = cliente.post("/api/v1/animais/acasalamentos/simulacao", json={"femeas_ids": [4], "machos_ids": [999]})
+
+    assert resposta.status_code == 404
+    assert "999" in resposta.json()["detail"]
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.ancestralidade_animal import AncestralidadeAnimal
+from app.services.ancestralidade import AtribuicaoGenitores, GenealogiaInvalidaError, validar_genitores
+
+
+def _indice(db):
+    return set(db.execute(
+        select(AncestralidadeAnimal.ancestral_id, AncestralidadeAnimal.descendente_id, AncestralidadeAnimal.distancia)
+        .where(AncestralidadeAnimal.organizacao_id == 1)
+    ).all())
+
+
+@pytest.mark.parametrize("animal_id, alteracao", [
+    (1, {"pai_id": 5}),   # neto como pai do avô
+    (3, {"pai_id": 3}),   # o próprio animal
+    (2, {"mae_id": 6}),   # neta como mãe da avó
+])
+def test_ciclo_rejeitado(cliente, plantel, animal_id, alteracao):
+    resposta = cliente.put(f"/api/v1/animais/{animal_id}", json=alteracao)
+
+    assert resposta.status_code == 400
+    assert "descendentes" in resposta.json()["detail"]
+
+
+def test_sexo_do_genitor(cliente, plantel):
+    resposta = cliente.post(
+        "/api/v1/animais/", json={"nome": "Gema", "especie": "Galinha", "pai_id": 2, "mae_id": 4}
+    )
+
+    assert resposta.status_code == 400
+    assert "sexo incompatível para pai" in resposta.json()["detail"]
+
+
+def test_alteracao_de_sexo_com_filhos(cliente, plantel):
+    resposta = cliente.put("/api/v1/animais/5", json={"sexo": "Fêmea"})
+
+    assert resposta.status_code == 400
+
+
+def test_especie_do_genitor(cliente, plantel):
+    resposta = cliente.post(
+        "/api/v1/animais/", json={"nome": "Pato", "especie": "Pato", "pai_id": 5, "mae_id": 6}
+    )
+
+    assert resposta.status_code == 400
+    assert "outra espécie" in resposta.json()["detail"]
+
+
+def test_genitor_de_outra_organizacao(plantel):
+    with pytest.raises(GenealogiaInvalidaError) as erro:
+        validar_genitores(plantel, 2, [AtribuicaoGenitores(None, "Galinha", 5, None)])
+
+    assert "não foi encontrado" in erro.value.erros[0]
+
+
+def test_indice_acompanha_as_alteracoes(cliente, plantel):
+    assert (1, 6, 3) in _indice(plantel)
+
+    resposta = cliente.put("/api/v1/animais/6", json={"pai_id": 1})
+    assert resposta.status_code == 200
+
+    indice = _indice(plantel)
+    assert (5, 6, 1) not in indice
+    assert (1, 6, 1) in indice
+    # Depois da alteração, 6 passa a ser descendente de 1 e não pode ser pai dele
+    assert cliente.put("/api/v1/animais/1", json={"mae_id": 6}).status_code == 400
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.models.organizacao import Organizacao
+from app.services.pagamentos import ConsumidorPagamentos, registrar_eventos
+
+
+def _token(organizacao_id: int = 1) -> str:
+    return create_access_token(organizacao_id, tipo="organizacao")
+
+
+def _alterar_status(db, organizacao_id: int, status_assinatura: str) -> None:
+    db.get(Organizacao, organizacao_id).status_assinatura = status_assinatura
+    db.commit()
+
+
+@pytest.fixture
+def consultas(db):
+    registro = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: registro.append(args[2]))
+    return registro
+
+
+def test_organizacao_lida_do_banco_uma_vez(db, consultas):
+    token = _token()
+
+    primeira = deps.get_current_organizacao(db, token)
+    segunda = deps.get_current_organizacao(db, token)
+
+    assert primeira.id == segunda.id == 1
+    assert len(consultas) == 1
+
+
+def test_token_de_outro_tipo_recusado(db):
+    token = create_access_token(1, tipo="admin")
+
+    with pytest.raises(HTTPException) as erro:
+        deps.get_current_organizacao(db, token)
+    assert erro.value.status_code == 403
+
+
+def test_alteracao_da_organizacao_invalida_o_cache(db):
+    token = _token()
+    deps.get_current_organizacao(db, token)
+
+    _alterar_status(db, 1, "Inativa")
+    # Sem invalidação os dados em cache continuam valendo até o TTL
+    assert deps.get_current_organizacao(db, token).status_assinatura == "Ativa"
+
+    deps.invalidar_organizacao_autenticada(1)
+    with pytest.raises(HTTPException) as erro:
+        deps.get_current_organizacao(db, token)
+    assert erro.value.status_code == 403
+
+
+def test_exclusao_da_organizacao_invalida_o_cache(db):
+    token = _token(2)
+    deps.get_current_organizacao(db, token)
+
+    db.delete(db.get(Organizacao, 2))
+    db.commit()
+    deps.invalidar_organizacao_autenticada(2)
+
+    with pytest.raises(HTTPException) as erro:
+        deps.get_current_organizacao(db, token)
+    assert erro.value.status_code == 404
+
+
+def test_pagamento_invalida_o_cache(db, fabrica_sessoes):
+    token = _token()
+    deps.get_current_organizacao(db, token)
+    deps.get_current_organizacao(db, _token(2))
+
+    # Mesmo encadeamento do startup da aplicação (app/main.py)
+    consumidor = ConsumidorPagamentos(
+        fabrica_sessoes,
+        ao_alterar_organizacoes=lambda ids: [deps.invalidar_organizacao_autenticada(i) for i in ids],
+    )
+    registrar_eventos(db, [{
+        "evento_id": "cancelamento",
+        "organizacao_id": 1,
+        "tipo": "assinatura_cancelada",
+        "ocorrido_em": datetime(2026, 1, 1),
+    }])
+    db.commit()
+    assert consumidor.processar_pendentes() == 1
+
+    with pytest.raises(HTTPException) as erro:
+        deps.get_current_organizacao(db, token)
+    assert erro.value.status_code == 403
+    # As demais organizações continuam em cache
+    assert deps._organizacoes.obter(2) is not None
@@ -0,0 +1,48 @@
+from app.models.animal import Animal
+from app.services.busca import buscar_animais, normalizar, trigramas
+
+
+def test_normalizar_remove_acentos():
+    assert normalizar("Galo Índio Faísca") == "galo indio faisca"
+
+
+def test_trigramas_no_formato_do_pg_trgm():
+    assert trigramas("Céu") == {"  c", " ce", "ceu", "eu "}
+    assert trigramas("a b") == {"  a", " a ", "  b", " b "}
+    assert trigramas("!!") == set()
+
+
+def test_busca_sem_acentos_e_com_erro_de_digitacao(plantel):
+    assert buscar_animais(plantel, 1, "faisca", 5)[0] == (6, 1.0)
+    assert buscar_animais(plantel, 1, "Eclypse", 5)[0][0] == 5
+    assert buscar_animais(plantel, 1, "xyzw", 5) == []
+
+
+def test_busca_por_raca_e_caracteristicas(plantel):
+    animal = plantel.get(Animal, (1, 3))
+    animal.raca = "Índio Gigante"
+    animal.caracteristicas_fisicas = "Plumagem carijó"
+    plantel.commit()
+
+    assert [animal_id for animal_id, _ in buscar_animais(plantel, 1, "indio", 5)] == [3]
+    assert [animal_id for animal_id, _ in buscar_animais(plantel, 1, "carijo", 5)] == [3]
+
+
+def test_indice_descartado_ao_alterar_animais(plantel):
+    assert buscar_animais(plantel, 1, "Garoa", 5) == []
+
+    plantel.add(Animal(id=7, organizacao_id=1, nome="Garoa", especie="Galinha"))
+    plantel.commit()
+
+    assert buscar_animais(plantel, 1, "Garoa", 5) == [(7, 1.0)]
+
+
+def test_rota_de_busca_restrita_a_organizacao(cliente, plantel_duas_organizacoes):
+    resposta = cliente.get("/api/v1/animais/busca", params={"q": "Brisa"})
+
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert [item["id"] for item in corpo] == [2]
+    assert corpo[0]["nome"] == "Brisa"
+    assert corpo[0]["relevancia"] == 1.0
+    assert cliente.get("/api/v1/animais/busca", params={"q": "B"}).status_code == 422
@@ -0,0 +1,107 @@
+import random
+from concurrent.futures import Future
+
+import pytest
+
+from app.core.config import settings
+from app.models.animal import Animal
+from app.services import consanguinidade
+from app.services.consanguinidade import registro_consanguinidade
+
+# Coeficientes de Wright do plantel de teste: 5 é filho de irmãos completos e
+# 6 é filha de 5 com a avó paterna dele
+ESPERADOS = {1: 0.0, 2: 0.0, 3: 0.0, 4: 0.0, 5: 0.25, 6: 0.25}
+
+
+def _parentesco_referencia(pais, maes):
+    """Coeficientes de parentesco pela recursão clássica, para conferir o cálculo vetorizado."""
+    memoria = {}
+
+    def parentesco(a, b):
+        if a is None or b is None:
+            return 0.0
+        if a == b:
+            return 0.5 * (1 + parentesco(pais[a], maes[a]))
+        # Desce sempre pelo animal mais novo (IDs maiores nascem depois dos genitores)
+        if a < b:
+            a, b = b, a
+        chave = (a, b)
+        if chave not in memoria:
+            memoria[chave] = 0.5 * (parentesco(pais[a], b) + parentesco(maes[a], b))
+        return memoria[chave]
+
+    return parentesco
+
+
+def test_coeficientes_do_plantel(cliente, plantel):
+    resposta = cliente.get("/api/v1/animais/consanguinidade")
+
+    assert resposta.status_code == 200
+    assert {item["animal_id"]: item["coeficiente"] for item in resposta.json()} == ESPERADOS
+    assert cliente.get("/api/v1/animais/6").json()["coeficiente_consanguinidade"] == 0.25
+
+
+def test_coeficientes_conferem_com_a_recursao(db):
+    aleatorio = random.Random(7)
+    pais, maes = {}, {}
+    for animal_id in range(1, 151):
+        anteriores = list(range(1, animal_id))
+        pais[animal_id] = aleatorio.choice(anteriores) if animal_id > 10 else None
+        maes[animal_id] = aleatorio.choice([a for a in anteriores if a != pais[animal_id]]) if animal_id > 10 else None
+        db.add(Animal(id=animal_id, organizacao_id=1, nome=f"A{animal_id}", especie="Galinha",
+                      pai_id=pais[animal_id], mae_id=maes[animal_id]))
+    db.commit()
+
+    calculadora = registro_consanguinidade.calculadora(db, 1)
+    parentesco = _parentesco_referencia(pais, maes)
+    for animal_id in pais:
+        esperado = parentesco(pais[animal_id], maes[animal_id])
+        obtido = calculadora.coeficientes[calculadora.grafo.indice_de(animal_id)]
+        assert obtido == pytest.approx(esperado, abs=1e-12)
+
+
+def test_recalculo_apos_alterar_genitor(cliente, plantel):
+    assert cliente.get("/api/v1/animais/6").json()["coeficiente_consanguinidade"] == 0.25
+
+    resposta = cliente.put("/api/v1/animais/6", json={"pai_id": 1})
+
+    assert resposta.status_code == 200
+    assert cliente.get("/api/v1/animais/6").json()["coeficiente_consanguinidade"] == 0.0
+    assert cliente.get("/api/v1/animais/5").json()["coeficiente_consanguinidade"] == 0.25
+
+
+class PoolManual:
+    """Pool que só executa as tarefas quando o teste pede, para observar o estado pendente."""
+
+    def __init__(self):
+        self.tarefas = []
+
+    def submit(self, funcao, *args):
+        futuro = Future()
+        self.tarefas.append((futuro, funcao, args))
+        return futuro
+
+    def executar(self):
+        for futuro, funcao, args in self.tarefas:
+            futuro.set_result(funcao(*args))
+        self.tarefas.clear()
+
+
+def test_calculo_em_segundo_plano(cliente, plantel, monkeypatch):
+    # Qualquer recálculo vai para o pool; enquanto ele não termina os coeficientes ficam pendentes
+    pool = PoolManual()
+    monkeypatch.setattr(settings, "CONSANGUINIDADE_RECALCULO_SINCRONO_MAXIMO", 0)
+    monkeypatch.setattr(consanguinidade, "_obter_pool_consanguinidade", lambda: pool)
+
+    resposta = cliente.get("/api/v1/animais/consanguinidade")
+    assert resposta.status_code == 503
+    assert resposta.headers["Retry-After"]
+    assert cliente.get("/api/v1/animais/6").json()["coeficiente_consanguinidade"] is None
+    # Um único cálculo agendado, mesmo com várias requisições
+    assert len(pool.tarefas) == 1
+
+    pool.executar()
+
+    resposta = cliente.get("/api/v1/animais/consanguinidade")
+    assert resposta.status_code == 200
+    assert {item["animal_id"]: item["coeficiente"] for item in resposta.json()} == ESPERADOS
@@ -0,0 +1,82 @@
+import threading
+
+from sqlalchemy import update
+
+from app.models.organizacao import Organizacao
+from app.models.plano_assinatura import PlanoAssinatura
+from app.services.contador_animais import liberar_vagas, reconciliar_contador, reservar_vagas, uso_do_plano
+
+
+def _limitar_plano(db, limite: int) -> None:
+    db.execute(update(PlanoAssinatura).where(PlanoAssinatura.id == 1).values(limite_animais=limite))
+    db.commit()
+
+
+def test_reserva_respeita_o_limite(db):
+    _limitar_plano(db, 3)
+
+    assert reservar_vagas(db, 1, 2)
+    assert not reservar_vagas(db, 1, 2)
+    assert reservar_vagas(db, 1)
+    db.commit()
+
+    assert uso_do_plano(db, 1) == (3, 3)
+    assert uso_do_plano(db, 2) == (0, 3)
+
+
+def test_reservas_simultaneas_nao_ultrapassam_o_limite(fabrica_sessoes, db):
+    _limitar_plano(db, 5)
+    resultados = []
+    barreira = threading.Barrier(20)
+
+    def cadastrar() -> None:
+        sessao = fabrica_sessoes()
+        try:
+            barreira.wait()
+            reservado = reservar_vagas(sessao, 1)
+            sessao.commit()
+            resultados.append(reservado)
+        finally:
+            sessao.close()
+
+    threads = [threading.Thread(target=cadastrar) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(resultados) == 20
+    assert resultados.count(True) == 5
+    assert uso_do_plano(db, 1) == (5, 5)
+
+
+def test_liberar_vagas_nao_fica_negativo(db):
+    reservar_vagas(db, 1, 2)
+    liberar_vagas(db, 1)
+    db.commit()
+    assert uso_do_plano(db, 1)[0] == 1
+
+    liberar_vagas(db, 1, 5)
+    db.commit()
+    assert uso_do_plano(db, 1)[0] == 0
+
+
+def test_cadastro_bloqueado_no_limite(cliente, plantel):
+    _limitar_plano(plantel, 6)
+
+    resposta = cliente.post("/api/v1/animais/", json={"nome": "Gávea", "especie": "Galinha", "sexo": "Fêmea"})
+
+    assert resposta.status_code == 403
+    assert uso_do_plano(plantel, 1)[0] == 6
+
+
+def test_reconciliar_contador(plantel):
+    plantel.execute(update(Organizacao).where(Organizacao.id == 1).values(total_animais=42))
+    plantel.commit()
+
+    assert reconciliar_contador(plantel, 1)
+    plantel.commit()
+    assert uso_do_plano(plantel, 1)[0] == 6
+
+    assert not reconciliar_contador(plantel, 1)
+    assert not reconciliar_contador(plantel, 999)
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.models.animal import Animal
+from app.models.plano_assinatura import PlanoAssinatura
+from app.services import exportacao
+from app.services.exportacao import FUNCIONALIDADE_EXPORTACAO, consulta_exportacao
+
+
+@pytest.fixture
+def exportacao_liberada(plantel, fabrica_sessoes, monkeypatch):
+    """Plantel com a exportação incluída no plano; o gerador usa o banco de teste."""
+    monkeypatch.setattr(exportacao, "SessionLocal", fabrica_sessoes)
+    plantel.get(PlanoAssinatura, 1).funcionalidades = [FUNCIONALIDADE_EXPORTACAO]
+    plantel.commit()
+    return plantel
+
+
+def _linhas_csv(resposta):
+    return list(csv.DictReader(io.StringIO(resposta.text)))
+
+
+def test_exportacao_csv(cliente, exportacao_liberada):
+    resposta = cliente.get("/api/v1/animais/exportacao", params={"formato": "csv"})
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("text/csv")
+    assert resposta.headers["content-disposition"] == 'attachment; filename="animais.csv"'
+    linhas = _linhas_csv(resposta)
+    assert [linha["id"] for linha in linhas] == ["1", "2", "3", "4", "5", "6"]
+    assert linhas[5]["nome"] == "Faísca"
+    assert "pai_nome" not in linhas[0]
+
+
+def test_exportacao_ndjson_com_ancestrais(cliente, exportacao_liberada, monkeypatch):
+    # Lotes pequenos: o arquivo é transmitido em vários blocos
+    monkeypatch.setattr(exportacao, "TAMANHO_LOTE", 2)
+
+    resposta = cliente.get("/api/v1/animais/exportacao", params={"formato": "ndjson", "ancestrais": True})
+
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"].startswith("application/x-ndjson")
+    animais = {item["id"]: item for item in map(json.loads, resposta.text.splitlines())}
+    assert len(animais) == 6
+    assert animais[6]["pai_nome"] == "Eclipse"
+    assert animais[6]["mae_nome"] == "Brisa"
+    assert animais[6]["avo_paterno_nome"] == "Cometa"
+    assert animais[6]["avo_paterna_nome"] == "Duna"
+    assert animais[6]["avo_materno_nome"] is None
+    assert animais[1]["pai_nome"] is None
+
+
+def test_exportacao_de_campos_selecionados(cliente, exportacao_liberada):
+    resposta = cliente.get(
+        "/api/v1/animais/exportacao", params={"ancestrais": True, "fields": "id,mae_nome"}
+    )
+
+    assert resposta.status_code == 200
+    assert _linhas_csv(resposta)[4] == {"id": "5", "mae_nome": "Duna"}
+
+
+def test_exportacao_exige_funcionalidade_do_plano(cliente, plantel, fabrica_sessoes, monkeypatch):
+    monkeypatch.setattr(exportacao, "SessionLocal", fabrica_sessoes)
+
+    resposta = cliente.get("/api/v1/animais/exportacao")
+
+    assert resposta.status_code == 403
+    assert "exportação" in resposta.json()["detail"]
+
+
+def test_formato_desconhecido(cliente, exportacao_liberada):
+    assert cliente.get("/api/v1/animais/exportacao", params={"formato": "xlsx"}).status_code == 400
+
+
+def test_ancestral_de_outra_organizacao_nao_exportado(plantel_duas_organizacoes):
+    db = plantel_duas_organizacoes
+    # Genitor com o ID de um animal que só existe na organização 2
+    db.add(Animal(id=7, organizacao_id=1, nome="Garoa", especie="Galinha", pai_id=105, mae_id=4))
+    db.commit()
+
+    linhas = db.execute(consulta_exportacao(1, True, ["id", "pai_nome", "mae_nome", "avo_materno_nome"])).all()
+
+    assert [tuple(linha) for linha in linhas if linha.id == 7] == [(7, None, "Duna", "Aurora")]
+    assert {linha.id for linha in linhas} == {1, 2, 3, 4, 5, 6, 7}
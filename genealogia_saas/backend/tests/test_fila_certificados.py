@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+from app.core.config import settings
+from app.models.animal import Animal
+from app.models.certificado import TrabalhoCertificado
+from app.services import fila_certificados
+from app.services.certificados import caminho_certificado
+from app.services.fila_certificados import (
+    CONCLUIDO,
+    FALHOU,
+    PENDENTE,
+    PROCESSANDO,
+    ExecutorCertificados,
+    reservar_trabalhos,
+    solicitar_certificado,
+)
+
+
+class ExecutorEmThreads(ExecutorCertificados):
+    """Executor que renderiza em threads, para usar renderizações substituídas nos testes."""
+
+    def _obter_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.processos)
+        return self._pool
+
+
+@pytest.fixture(autouse=True)
+def midia(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DIR", str(tmp_path / "media"))
+    monkeypatch.setattr(settings, "CERTIFICADOS_MAXIMO_TENTATIVAS", 2)
+
+
+def _trabalho(db, trabalho_id: int) -> TrabalhoCertificado:
+    db.expire_all()
+    return db.get(TrabalhoCertificado, trabalho_id)
+
+
+def _solicitar(db, animal_id: int = 5) -> int:
+    trabalho = solicitar_certificado(db, 1, animal_id, "svg", 3)
+    db.commit()
+    return trabalho.id
+
+
+def test_certificado_gerado_pelo_pool_de_processos(fabrica_sessoes, plantel):
+    trabalho_id = _solicitar(plantel)
+    assert _trabalho(plantel, trabalho_id).status == PENDENTE
+
+    executor = ExecutorCertificados(fabrica_sessoes, 1)
+    try:
+        assert executor.processar_pendentes() == 1
+    finally:
+        executor.parar()
+
+    trabalho = _trabalho(plantel, trabalho_id)
+    assert (trabalho.status, trabalho.tentativas, trabalho.erro) == (CONCLUIDO, 1, None)
+    with open(caminho_certificado(trabalho.chave, "svg"), "rb") as arquivo:
+        assert b"Eclipse" in arquivo.read()
+
+
+def test_pedidos_identicos_reaproveitados(fabrica_sessoes, plantel):
+    primeiro = _solicitar(plantel)
+    assert _solicitar(plantel) == primeiro
+    assert _solicitar(plantel, 6) != primeiro
+
+    ExecutorEmThreads(fabrica_sessoes, 1).processar_pendentes()
+
+    # Com o arquivo já gerado, o novo pedido nasce concluído com a mesma chave
+    repetido = _trabalho(plantel, _solicitar(plantel))
+    assert repetido.id != primeiro
+    assert repetido.status == CONCLUIDO
+    assert repetido.chave == _trabalho(plantel, primeiro).chave
+
+
+def test_animal_inexistente(fabrica_sessoes, plantel):
+    assert solicitar_certificado(plantel, 1, 999, "svg", 3) is None
+    assert solicitar_certificado(plantel, 2, 5, "svg", 3) is None
+
+    trabalho_id = _solicitar(plantel, 6)
+    plantel.execute(delete(Animal).where(Animal.id == 6))
+    plantel.commit()
+    ExecutorEmThreads(fabrica_sessoes, 1).processar_pendentes()
+
+    trabalho = _trabalho(plantel, trabalho_id)
+    assert (trabalho.status, trabalho.erro) == (FALHOU, "Animal não encontrado.")
+
+
+def _falhar(dados, formato, destino):
+    raise RuntimeError("disco cheio")
+
+
+def test_falha_tentada_de_novo_ate_o_maximo(fabrica_sessoes, plantel, monkeypatch):
+    monkeypatch.setattr(fila_certificados, "renderizar_certificado", _falhar)
+    trabalho_id = _solicitar(plantel)
+    executor = ExecutorEmThreads(fabrica_sessoes, 1)
+
+    executor.processar_pendentes()
+    trabalho = _trabalho(plantel, trabalho_id)
+    assert (trabalho.status, trabalho.tentativas) == (PENDENTE, 1)
+    assert trabalho.erro == "RuntimeError: disco cheio"
+
+    executor.processar_pendentes()
+    trabalho = _trabalho(plantel, trabalho_id)
+    assert (trabalho.status, trabalho.tentativas) == (FALHOU, 2)
+    assert trabalho.concluido_em is not None
+
+    assert executor.processar_pendentes() == 0
+
+
+def test_reserva_expirada_volta_a_fila(plantel):
+    trabalho_id = _solicitar(plantel)
+
+    assert [trabalho.id for trabalho in reservar_trabalhos(plantel, 10)] == [trabalho_id]
+    plantel.commit()
+    assert reservar_trabalhos(plantel, 10) == []
+
+    expirado = datetime.utcnow() - timedelta(seconds=settings.CERTIFICADOS_TIMEOUT_SEGUNDOS + 1)
+    plantel.execute(update(TrabalhoCertificado).values(iniciado_em=expirado))
+    plantel.commit()
+
+    trabalhos = reservar_trabalhos(plantel, 10)
+    assert [(trabalho.id, trabalho.status, trabalho.tentativas) for trabalho in trabalhos] == [
+        (trabalho_id, PROCESSANDO, 2)
+    ]
+
+
+def test_renderizacao_presa_continua_reservada(fabrica_sessoes, plantel, monkeypatch):
+    liberar = threading.Event()
+
+    def presa(dados, formato, destino):
+        liberar.wait(5)
+
+    monkeypatch.setattr(fila_certificados, "renderizar_certificado", presa)
+    monkeypatch.setattr(settings, "CERTIFICADOS_TIMEOUT_SEGUNDOS", 0.3)
+    trabalho_id = _solicitar(plantel)
+    executor = ExecutorEmThreads(fabrica_sessoes, 1)
+    try:
+        executor.processar_pendentes()
+        trabalho = _trabalho(plantel, trabalho_id)
+        # Sem renovação da reserva: o trabalho volta à fila após o tempo máximo
+        assert (trabalho.status, trabalho.erro) == (PROCESSANDO, None)
+        assert executor._pool is None
+    finally:
+        liberar.set()
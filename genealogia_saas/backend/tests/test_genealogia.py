@@ -0,0 +1,38 @@
+from sqlalchemy import event
+
+from app.services.genealogia import obter_arvore_genealogica
+
+
+def test_arvore_em_uma_unica_consulta(plantel):
+    consultas = []
+    event.listen(plantel.get_bind(), "before_cursor_execute", lambda *args: consultas.append(args[2]))
+
+    arvore = obter_arvore_genealogica(plantel, 6, 1, 3)
+
+    assert len(consultas) == 1
+    assert arvore["total_ancestrais"] == 5
+    assert arvore["animal"]["pai"]["nome"] == "Eclipse"
+    assert arvore["animal"]["mae"]["nome"] == "Brisa"
+    assert arvore["animal"]["pai"]["pai"]["pai"]["nome"] == "Aurora"
+
+
+def test_arvore_limitada_pelas_geracoes(plantel):
+    arvore = obter_arvore_genealogica(plantel, 6, 1, 1)
+
+    assert arvore["animal"]["pai"]["nome"] == "Eclipse"
+    assert arvore["animal"]["pai"]["pai"] is None
+    assert arvore["total_ancestrais"] == 2
+
+
+def test_arvore_de_outra_organizacao(plantel):
+    assert obter_arvore_genealogica(plantel, 6, 2, 3) is None
+
+
+def test_rota_da_arvore(cliente, plantel):
+    resposta = cliente.get("/api/v1/animais/5/arvore", params={"geracoes": 2})
+
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert corpo["geracoes"] == 2
+    assert {corpo["animal"]["pai"]["id"], corpo["animal"]["mae"]["id"]} == {3, 4}
+    assert cliente.get("/api/v1/animais/999/arvore").status_code == 404
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.db.eventos import INSERCAO, AlteracaoAnimal
+from app.models.animal import Animal
+from app.services import grafo_genealogico
+from app.services.grafo_genealogico import SEM_GENITOR, carregar_grafo, registro_grafos
+
+
+@pytest.fixture
+def recargas(monkeypatch):
+    """Conta as cargas do grafo a partir do banco feitas pelo registro."""
+    chamadas = []
+    carregar = grafo_genealogico.carregar_grafo
+
+    def carregar_contando(db, organizacao_id):
+        chamadas.append(organizacao_id)
+        return carregar(db, organizacao_id)
+
+    monkeypatch.setattr(grafo_genealogico, "carregar_grafo", carregar_contando)
+    return chamadas
+
+
+def _assert_grafos_iguais(grafo, esperado):
+    np.testing.assert_array_equal(grafo.ids, esperado.ids)
+    np.testing.assert_array_equal(grafo.pais, esperado.pais)
+    np.testing.assert_array_equal(grafo.maes, esperado.maes)
+
+
+def test_insercao_aplicada_sem_recarregar(plantel, recargas):
+    anterior = registro_grafos.obter(plantel, 1)
+    anterior.descendentes(1)
+
+    plantel.add(Animal(id=7, organizacao_id=1, nome="Garoa", especie="Galinha", sexo="Fêmea", pai_id=5, mae_id=6))
+    plantel.commit()
+    grafo = registro_grafos.obter(plantel, 1)
+
+    assert recargas == [1]
+    assert grafo is not anterior
+    _assert_grafos_iguais(grafo, carregar_grafo(plantel, 1))
+    assert sorted(grafo.ids[grafo.descendentes(5)[0]]) == [6, 7]
+    # O grafo publicado antes do commit continua íntegro para quem já o obteve
+    assert len(anterior) == 6
+    assert sorted(anterior.ids[anterior.descendentes(5)[0]]) == [6]
+
+
+def test_genitores_alterados_sem_recarregar(plantel, recargas):
+    anterior = registro_grafos.obter(plantel, 1)
+
+    animal = plantel.get(Animal, (1, 6))
+    animal.mae_id = 4
+    plantel.commit()
+    grafo = registro_grafos.obter(plantel, 1)
+
+    assert recargas == [1]
+    _assert_grafos_iguais(grafo, carregar_grafo(plantel, 1))
+    assert grafo.maes[grafo.indice_de(6)] == grafo.indice_de(4)
+    assert anterior.maes[anterior.indice_de(6)] == anterior.indice_de(2)
+
+
+def test_alteracao_sem_genealogia_mantem_estruturas(plantel, recargas):
+    anterior = registro_grafos.obter(plantel, 1)
+    filhos = anterior.filhos
+
+    plantel.get(Animal, (1, 6)).nome = "Fagulha"
+    plantel.commit()
+    grafo = registro_grafos.obter(plantel, 1)
+
+    assert recargas == [1]
+    assert grafo is not anterior
+    assert grafo.filhos is filhos
+
+
+def test_versao_desatualizada_descarta_o_grafo(plantel, recargas):
+    grafo = registro_grafos.obter(plantel, 1)
+
+    # Commit de outro processo entre a carga e esta alteração: a versão pula um número
+    registro_grafos.aplicar_alteracoes([
+        AlteracaoAnimal(INSERCAO, 1, 7, 5, 6, True, versao_genealogia=grafo.versao_banco + 2)
+    ])
+
+    assert 1 not in registro_grafos._grafos
+    registro_grafos.obter(plantel, 1)
+    assert recargas == [1, 1]
+
+
+def test_alteracoes_que_exigem_recarga(plantel):
+    grafo = registro_grafos.obter(plantel, 1)
+
+    # Genitor fora do grafo, ID menor que o último e animal inexistente
+    assert grafo.com_animal(7, 999, None) is None
+    assert grafo.com_animal(6, None, None) is None
+    assert grafo.com_genitores(999, 1, 2) is None
+    assert grafo.com_genitores(6, None, 999) is None
+
+    novo = grafo.com_animal(7, None, None)
+    assert novo.pais[-1] == SEM_GENITOR and novo.maes[-1] == SEM_GENITOR
+    assert len(grafo) == 6
@@ -0,0 +1,132 @@
+import io
+import os
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.api.api_v1.endpoints import imagens
+from app.api.api_v1.endpoints.imagens import CACHE_IMUTAVEL, CACHE_PROVISORIO, _intervalo
+from app.core.config import settings
+from app.services.imagens import armazenar_original, caminho_variante, encerrar_pool_imagens
+
+
+@pytest.mark.parametrize("cabecalho, esperado", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=95-200", (95, 99)),
+    # Sem suporte: o arquivo é servido inteiro
+    ("bytes=0-1,5-6", None),
+    ("itens=0-9", None),
+    ("bytes=9", None),
+    ("bytes=a-b", None),
+])
+def test_intervalo(cabecalho, esperado):
+    assert _intervalo(cabecalho, 100) == esperado
+
+
+@pytest.mark.parametrize("cabecalho", ["bytes=100-", "bytes=9-5", "bytes=-0"])
+def test_intervalo_invalido(cabecalho):
+    with pytest.raises(HTTPException) as erro:
+        _intervalo(cabecalho, 100)
+
+    assert erro.value.status_code == 416
+    assert erro.value.headers["Content-Range"] == "bytes */100"
+
+
+@pytest.fixture
+def cliente_imagens(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DIR", str(tmp_path / "media"))
+    app = FastAPI()
+    app.include_router(imagens.router, prefix="/api/v1/imagens")
+    with TestClient(app) as cliente:
+        yield cliente
+    encerrar_pool_imagens()
+
+
+@pytest.fixture
+def foto(cliente_imagens):
+    """Hash e conteúdo de uma foto PNG já armazenada."""
+    saida = io.BytesIO()
+    Image.new("RGB", (800, 400), (200, 120, 40)).save(saida, "PNG")
+    conteudo = saida.getvalue()
+    hash_imagem, _ = armazenar_original(io.BytesIO(conteudo))
+    return hash_imagem, conteudo
+
+
+def test_original_completo_e_condicional(cliente_imagens, foto):
+    hash_imagem, conteudo = foto
+
+    resposta = cliente_imagens.get(f"/api/v1/imagens/{hash_imagem}")
+    assert resposta.status_code == 200
+    assert resposta.content == conteudo
+    assert resposta.headers["content-type"] == "image/png"
+    assert resposta.headers["cache-control"] == CACHE_IMUTAVEL
+    assert resposta.headers["accept-ranges"] == "bytes"
+
+    resposta = cliente_imagens.get(f"/api/v1/imagens/{hash_imagem}", headers={"If-None-Match": f'"{hash_imagem}"'})
+    assert resposta.status_code == 304
+
+
+def test_original_por_intervalo(cliente_imagens, foto):
+    hash_imagem, conteudo = foto
+    url = f"/api/v1/imagens/{hash_imagem}"
+
+    resposta = cliente_imagens.get(url, headers={"Range": "bytes=10-19"})
+    assert resposta.status_code == 206
+    assert resposta.content == conteudo[10:20]
+    assert resposta.headers["content-range"] == f"bytes 10-19/{len(conteudo)}"
+
+    resposta = cliente_imagens.get(url, headers={"Range": f"bytes={len(conteudo)}-"})
+    assert resposta.status_code == 416
+    assert resposta.headers["content-range"] == f"bytes */{len(conteudo)}"
+
+
+def test_if_range(cliente_imagens, foto):
+    hash_imagem, conteudo = foto
+    url = f"/api/v1/imagens/{hash_imagem}"
+
+    resposta = cliente_imagens.get(url, headers={"Range": "bytes=0-3", "If-Range": f'"{hash_imagem}"'})
+    assert resposta.status_code == 206
+    assert resposta.content == conteudo[:4]
+
+    # Validador diferente: o arquivo mudou para o cliente, que recebe o conteúdo inteiro
+    resposta = cliente_imagens.get(url, headers={"Range": "bytes=0-3", "If-Range": '"outro"'})
+    assert resposta.status_code == 200
+    assert resposta.content == conteudo
+
+
+def test_variante_servida_pelo_original_ate_ser_gerada(cliente_imagens, foto):
+    hash_imagem, conteudo = foto
+    url = f"/api/v1/imagens/{hash_imagem}/miniatura"
+
+    resposta = cliente_imagens.get(url)
+    assert resposta.status_code == 200
+    assert resposta.content == conteudo
+    assert resposta.headers["cache-control"] == CACHE_PROVISORIO
+    assert resposta.headers["etag"] == f'"{hash_imagem}"'
+
+    caminho = caminho_variante(hash_imagem, "miniatura")
+    limite = time.monotonic() + 30
+    while not os.path.exists(caminho) and time.monotonic() < limite:
+        time.sleep(0.05)
+
+    resposta = cliente_imagens.get(url)
+    assert resposta.status_code == 200
+    assert resposta.headers["content-type"] == "image/jpeg"
+    assert resposta.headers["cache-control"] == CACHE_IMUTAVEL
+    assert resposta.headers["etag"] == f'"{hash_imagem}-miniatura"'
+    with Image.open(io.BytesIO(resposta.content)) as miniatura:
+        assert max(miniatura.size) == 160
+
+
+def test_imagem_inexistente(cliente_imagens, foto):
+    hash_imagem, _ = foto
+
+    assert cliente_imagens.get(f"/api/v1/imagens/{'0' * 64}").status_code == 404
+    assert cliente_imagens.get(f"/api/v1/imagens/{hash_imagem[:32]}").status_code == 404
+    assert cliente_imagens.get(f"/api/v1/imagens/{hash_imagem}/gigante").status_code == 404
@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.models.animal import Animal
+from app.models.organizacao import Organizacao
+from app.services.importacao import (
+    ImportacaoInvalidaError,
+    LimitePlanoExcedidoError,
+    importar_animais,
+    ler_registros,
+)
+
+# Filhos antes dos pais: a importação ordena os registros por geração
+CSV_FORA_DE_ORDEM = """codigo,nome,especie,sexo,pai,mae
+N3,Neto,Galinha,Macho,F1,F2
+F1,Filho,Galinha,Macho,P1,P2
+F2,Filha,Galinha,Fêmea,P1,P2
+P1,Pai,Galinha,Macho,,
+P2,Mãe,Galinha,Fêmea,,
+"""
+
+
+def _enviar(cliente, conteudo: str, nome: str = "animais.csv"):
+    return cliente.post(
+        "/api/v1/animais/importacao", files={"arquivo": (nome, io.BytesIO(conteudo.encode()), "text/plain")}
+    )
+
+
+def _jsonl(*registros) -> str:
+    return "\n".join(json.dumps(registro, ensure_ascii=False) for registro in registros) + "\n"
+
+
+def test_genitores_resolvidos_fora_de_ordem(cliente, db):
+    resposta = _enviar(cliente, CSV_FORA_DE_ORDEM)
+
+    assert resposta.status_code == 201
+    assert resposta.json() == {"total_importados": 5, "geracoes": 3}
+    animais = {animal.nome: animal for animal in db.execute(select(Animal)).scalars()}
+    assert animais["Neto"].pai_id == animais["Filho"].id
+    assert animais["Neto"].mae_id == animais["Filha"].id
+    assert animais["Filho"].pai_id == animais["Pai"].id
+    assert db.get(Organizacao, 1).total_animais == 5
+    # O índice de ancestralidade já inclui os animais importados
+    assert cliente.put(f"/api/v1/animais/{animais['Pai'].id}", json={"pai_id": animais["Neto"].id}).status_code == 400
+
+
+def test_jsonl_com_referencia_por_nome(cliente, db):
+    resposta = _enviar(cliente, _jsonl(
+        {"nome": "Pintinho", "especie": "Galinha", "pai": "Galo", "mae": "Galinha"},
+        {"nome": "Galo", "especie": "Galinha", "sexo": "Macho"},
+        {"nome": "Galinha", "especie": "Galinha", "sexo": "Fêmea"},
+    ), "animais.jsonl")
+
+    assert resposta.status_code == 201
+    assert resposta.json()["geracoes"] == 2
+
+
+@pytest.mark.parametrize("conteudo, mensagem", [
+    ("codigo,nome,especie\n1,Sem espécie,\n", "nome e espécie são obrigatórios"),
+    ("codigo,nome,especie,pai\n1,Órfão,Galinha,X9\n", "não encontrado no arquivo"),
+    ("codigo,nome,especie,data_nascimento\n1,Data,Galinha,31/12/2020\n", "data de nascimento inválida"),
+    ("codigo,nome,especie\n1,A,Galinha\n1,B,Galinha\n", "código '1' repetido"),
+    ("codigo,nome,especie,sexo,pai\n1,A,Galinha,Fêmea,\n2,B,Galinha,,1\n", "sexo incompatível para pai"),
+    ("codigo,nome,especie,pai,mae\n1,A,Galinha,,\n2,B,Galinha,1,1\n", "pai e mãe não podem ser o mesmo animal"),
+    ("codigo,nome,especie,pai\n1,A,Galinha,2\n2,B,Galinha,1\n", "ciclo"),
+])
+def test_arquivo_invalido_nao_importa_nada(cliente, db, conteudo, mensagem):
+    resposta = _enviar(cliente, conteudo)
+
+    assert resposta.status_code == 400
+    assert any(mensagem in erro for erro in resposta.json()["detail"])
+    assert db.execute(select(Animal.id)).first() is None
+    assert db.get(Organizacao, 1).total_animais == 0
+
+
+@pytest.mark.parametrize("linha, mensagem", [
+    ("{nao e json", "Linha 2: JSON inválido."),
+    ("[1, 2]", "Linha 2: o registro deve ser um objeto JSON."),
+])
+def test_jsonl_com_linha_invalida(linha, mensagem):
+    arquivo = io.BytesIO(('{"nome": "A", "especie": "Galinha"}\n' + linha + "\n").encode())
+
+    with pytest.raises(ImportacaoInvalidaError) as erro:
+        list(ler_registros(arquivo, "jsonl"))
+
+    assert erro.value.erros == [mensagem]
+
+
+def test_limite_do_plano(db):
+    db.get(Organizacao, 1).total_animais = 998
+    db.commit()
+
+    registros = [{"nome": f"A{numero}", "especie": "Galinha"} for numero in range(3)]
+    with pytest.raises(LimitePlanoExcedidoError, match="excede o limite do plano"):
+        importar_animais(db, 1, registros)
@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.api_v1.endpoints import animais
+from app.core.config import settings
+from app.core.instrumentacao import MiddlewareMetricas, instrumentar_engine
+from app.core.metricas import contador, exportar_prometheus, histograma
+from app.schemas.principal import OrganizacaoAutenticada
+
+ROTA = "/api/v1/animais/{animal_id}/descendentes"
+
+
+def _rotulos(status: int) -> dict:
+    return {"metodo": "GET", "rota": ROTA, "status": str(status)}
+
+
+@pytest.fixture
+def cliente_medido(fabrica_sessoes, monkeypatch):
+    """Rotas de animais atrás do middleware de métricas, com log de requisições lentas."""
+    monkeypatch.setattr(settings, "LOG_REQUISICOES_LENTAS_MS", 0.001)
+    app = FastAPI()
+    app.add_middleware(MiddlewareMetricas, rotas=lambda: app.routes)
+    app.include_router(animais.router, prefix="/api/v1/animais")
+    instrumentar_engine(fabrica_sessoes.kw["bind"])
+
+    def get_db():
+        sessao = fabrica_sessoes()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[deps.get_current_organizacao] = lambda: OrganizacaoAutenticada(
+        id=1, email="um@granja.com", plano_assinatura_id=1, status_assinatura="Ativa"
+    )
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def test_requisicoes_contadas_pela_rota_declarada(cliente_medido, plantel):
+    sucesso = contador("http_requisicoes_total", "", _rotulos(200)).valor()
+    nao_encontrado = contador("http_requisicoes_total", "", _rotulos(404)).valor()
+
+    assert cliente_medido.get("/api/v1/animais/1/descendentes").status_code == 200
+    assert cliente_medido.get("/api/v1/animais/3/descendentes").status_code == 200
+    assert cliente_medido.get("/api/v1/animais/999/descendentes").status_code == 404
+
+    assert contador("http_requisicoes_total", "", _rotulos(200)).valor() == sucesso + 2
+    assert contador("http_requisicoes_total", "", _rotulos(404)).valor() == nao_encontrado + 1
+
+
+def test_consultas_por_requisicao(cliente_medido, plantel):
+    rotulos = {"metodo": "GET", "rota": ROTA}
+    consultas = histograma("banco_consultas_por_requisicao", "", rotulos=rotulos)
+    somas = [consultas.valores()[1]]
+
+    for _ in range(2):
+        assert cliente_medido.get("/api/v1/animais/1/descendentes").status_code == 200
+        somas.append(consultas.valores()[1])
+
+    # Versão da genealogia e carga do grafo; depois, só a versão (grafo em memória)
+    assert [depois - antes for antes, depois in zip(somas, somas[1:])] == [2, 1]
+    assert histograma("banco_tempo_por_requisicao_segundos", "", rotulos=rotulos).valores()[2] >= 2
+
+
+def test_log_de_requisicao_lenta(cliente_medido, plantel, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.requisicoes_lentas"):
+        cliente_medido.get("/api/v1/animais/1/descendentes")
+
+    registro, = caplog.records
+    assert ROTA in registro.getMessage()
+    assert "SELECT" in registro.getMessage()
+
+
+def test_exportacao_prometheus():
+    contador("teste_eventos_total", "Eventos de teste", {"tipo": 'com "aspas"'}).incrementar(2)
+    histograma("teste_duracao_segundos", "Duração de teste", (0.1, 1.0)).observar(0.5)
+
+    texto = exportar_prometheus()
+
+    assert "# TYPE teste_eventos_total counter" in texto
+    assert 'teste_eventos_total{tipo="com \\"aspas\\""} 2' in texto
+    assert "# TYPE teste_duracao_segundos histogram" in texto
+    assert 'teste_duracao_segundos_bucket{le="0.1"} 0' in texto
+    assert 'teste_duracao_segundos_bucket{le="1"} 1' in texto
+    assert 'teste_duracao_segundos_bucket{le="+Inf"} 1' in texto
+    assert "teste_duracao_segundos_count 1" in texto
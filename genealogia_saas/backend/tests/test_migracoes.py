@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.base_class import Base
+
+DIRETORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def alembic(tmp_path, monkeypatch):
+    """Configuração do Alembic apontando para um SQLite temporário vazio."""
+    url = f"sqlite:///{tmp_path / 'migracoes.db'}"
+    monkeypatch.setattr(settings, "SQLALCHEMY_DATABASE_URI", url)
+    configuracao = Config(os.path.join(DIRETORIO, "alembic.ini"))
+    configuracao.set_main_option("script_location", os.path.join(DIRETORIO, "alembic"))
+    engine = create_engine(url)
+    yield configuracao, engine
+    engine.dispose()
+
+
+def test_revisoes_em_sequencia():
+    scripts = ScriptDirectory(os.path.join(DIRETORIO, "alembic"))
+    revisoes = list(reversed(list(scripts.walk_revisions())))
+
+    assert scripts.get_heads() == [revisoes[-1].revision]
+    for numero, revisao in enumerate(revisoes, start=1):
+        assert revisao.revision == f"{numero:04d}"
+        assert os.path.basename(revisao.path).startswith(revisao.revision + "_")
+
+
+def test_head_corresponde_aos_modelos(alembic):
+    configuracao, engine = alembic
+    command.upgrade(configuracao, "head")
+
+    with engine.connect() as conexao:
+        diferencas = compare_metadata(MigrationContext.configure(conexao), Base.metadata)
+
+    assert diferencas == []
+
+
+def test_atualiza_banco_existente(alembic):
+    configuracao, engine = alembic
+    command.upgrade(configuracao, "0001")
+    with engine.begin() as conexao:
+        conexao.execute(text(
+            "INSERT INTO planoassinatura (id, nome, preco, limite_animais) VALUES (1, 'Bronze', 99.9, 100)"
+        ))
+        conexao.execute(text(
+            "INSERT INTO organizacao (id, nome, email, plano_assinatura_id, status_assinatura) "
+            "VALUES (1, 'Granja', 'g@granja.com', 1, 'Ativa')"
+        ))
+        for animal_id, pai_id, mae_id in ((1, None, None), (2, None, None), (3, 1, 2), (4, 3, 2)):
+            conexao.execute(
+                text("INSERT INTO animal (id, organizacao_id, nome, especie, pai_id, mae_id) "
+                     "VALUES (:id, 1, :nome, 'Galinha', :pai, :mae)"),
+                {"id": animal_id, "nome": f"Animal {animal_id}", "pai": pai_id, "mae": mae_id},
+            )
+
+    command.upgrade(configuracao, "head")
+
+    with engine.connect() as conexao:
+        assert conexao.execute(text("SELECT total_animais FROM organizacao")).scalar() == 4
+        # Cada animal é registrado também como ancestral de si mesmo (distância 0)
+        assert conexao.execute(text("SELECT count(*) FROM ancestralidadeanimal")).scalar() == 9
+        # O particionamento é opcional e só existe no PostgreSQL
+        assert conexao.execute(text("SELECT count(*) FROM animal")).scalar() == 4
+
+    command.downgrade(configuracao, "base")
+    with engine.connect() as conexao:
+        assert conexao.execute(text("SELECT name FROM sqlite_master WHERE name = 'animal'")).first() is None
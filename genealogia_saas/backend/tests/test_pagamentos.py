@@ -0,0 +1,172 @@
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from app.api import deps
+from app.api.api_v1.endpoints import pagamentos as rotas_pagamentos
+from app.core.config import settings
+from app.models.evento_pagamento import EventoPagamento, EventoPagamentoFalho
+from app.models.organizacao import Organizacao
+from app.services.pagamentos import processar_lote, registrar_eventos
+
+SEGREDO = "segredo-de-teste"
+INICIO = datetime(2026, 1, 1, 12, 0)
+
+
+def _evento(evento_id: str, organizacao_id: int, tipo: str, minutos: int = 0) -> dict:
+    return {
+        "evento_id": evento_id,
+        "organizacao_id": organizacao_id,
+        "tipo": tipo,
+        "ocorrido_em": INICIO + timedelta(minutes=minutos),
+    }
+
+
+def _status(db, organizacao_id: int) -> str:
+    db.expire_all()
+    return db.get(Organizacao, organizacao_id).status_assinatura
+
+
+def _liberar_reagendados(db) -> None:
+    db.execute(update(EventoPagamento).values(proxima_tentativa_em=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+@pytest.fixture
+def cliente_webhook(fabrica_sessoes, monkeypatch):
+    monkeypatch.setattr(settings, "PAGAMENTOS_WEBHOOK_SEGREDO", SEGREDO)
+    app = FastAPI()
+    app.include_router(rotas_pagamentos.router, prefix="/api/v1/pagamentos")
+
+    def get_db():
+        sessao = fabrica_sessoes()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    app.dependency_overrides[deps.get_db] = get_db
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def _notificar(cliente, corpo, assinatura=None):
+    conteudo = json.dumps(corpo).encode()
+    if assinatura is None:
+        assinatura = hmac.new(SEGREDO.encode(), conteudo, hashlib.sha256).hexdigest()
+    return cliente.post(
+        "/api/v1/pagamentos/webhook",
+        content=conteudo,
+        headers={"X-Assinatura": assinatura, "Content-Type": "application/json"},
+    )
+
+
+def test_eventos_repetidos_sao_ignorados(db):
+    assert registrar_eventos(db, [_evento("a", 1, "pagamento_aprovado"), _evento("b", 2, "pagamento_aprovado")]) == 2
+    assert registrar_eventos(db, [_evento("a", 1, "pagamento_aprovado"), _evento("c", 1, "pagamento_pendente")]) == 1
+    assert registrar_eventos(db, []) == 0
+    db.commit()
+
+    assert db.execute(select(func.count(EventoPagamento.id))).scalar() == 3
+
+
+def test_lote_aplica_o_evento_mais_recente_de_cada_organizacao(db):
+    registrar_eventos(db, [
+        _evento("1", 1, "pagamento_pendente", minutos=5),
+        _evento("2", 1, "pagamento_aprovado", minutos=1),
+        _evento("3", 2, "pagamento_aprovado", minutos=1),
+        _evento("4", 2, "assinatura_cancelada", minutos=3),
+    ])
+    db.commit()
+
+    resultado = processar_lote(db, 100)
+    db.commit()
+
+    assert resultado.processados == 4
+    assert resultado.organizacoes_alteradas == [1, 2]
+    assert _status(db, 1) == "Pendente"
+    assert _status(db, 2) == "Inativa"
+    assert processar_lote(db, 100).processados == 0
+
+
+def test_lote_respeita_o_tamanho(db):
+    registrar_eventos(db, [_evento(str(numero), 1, "pagamento_aprovado", minutos=numero) for numero in range(5)])
+    db.commit()
+
+    processados = []
+    for _ in range(3):
+        processados.append(processar_lote(db, 2).processados)
+        db.commit()
+
+    assert processados == [2, 2, 1]
+
+
+def test_evento_atrasado_nao_sobrescreve_o_status(db):
+    registrar_eventos(db, [_evento("novo", 1, "assinatura_cancelada", minutos=10)])
+    db.commit()
+    processar_lote(db, 100)
+    db.commit()
+
+    registrar_eventos(db, [_evento("antigo", 1, "pagamento_aprovado", minutos=0)])
+    db.commit()
+    resultado = processar_lote(db, 100)
+    db.commit()
+
+    assert resultado.processados == 1
+    assert _status(db, 1) == "Inativa"
+
+
+def test_evento_invalido_e_reagendado_e_depois_descartado(db, monkeypatch):
+    monkeypatch.setattr(settings, "PAGAMENTOS_MAXIMO_TENTATIVAS", 3)
+    registrar_eventos(db, [_evento("orfao", 999, "pagamento_aprovado"), _evento("estranho", 1, "reembolso")])
+    db.commit()
+
+    resultado = processar_lote(db, 100)
+    db.commit()
+    assert (resultado.processados, resultado.reagendados, resultado.descartados) == (0, 2, 0)
+    # Reagendados para o futuro: não são lidos de novo imediatamente
+    assert processar_lote(db, 100).reagendados == 0
+    db.commit()
+
+    _liberar_reagendados(db)
+    assert processar_lote(db, 100).reagendados == 2
+    db.commit()
+    _liberar_reagendados(db)
+    resultado = processar_lote(db, 100)
+    db.commit()
+
+    assert resultado.descartados == 2
+    falhos = db.execute(select(EventoPagamentoFalho).order_by(EventoPagamentoFalho.evento_id)).scalars().all()
+    assert [(falho.evento_id, falho.tentativas) for falho in falhos] == [("estranho", 3), ("orfao", 3)]
+    assert "não encontrada" in falhos[1].erro
+    _liberar_reagendados(db)
+    assert processar_lote(db, 100) == (0, 0, 0, [])
+
+
+def test_webhook_enfileira_sem_repetir(cliente_webhook, db):
+    corpo = [
+        {"evento_id": "w1", "organizacao_id": 1, "tipo": "pagamento_recusado"},
+        {"evento_id": "w2", "organizacao_id": 2, "tipo": "pagamento_aprovado"},
+    ]
+
+    primeira = _notificar(cliente_webhook, corpo)
+    segunda = _notificar(cliente_webhook, corpo[0])
+
+    assert primeira.status_code == 202
+    assert primeira.json() == {"recebidos": 2, "novos": 2}
+    assert segunda.json() == {"recebidos": 1, "novos": 0}
+    # O status só muda quando o consumidor processa a fila
+    assert _status(db, 1) == "Ativa"
+
+
+def test_webhook_rejeita_assinatura_invalida(cliente_webhook, db):
+    resposta = _notificar(cliente_webhook, {"evento_id": "x", "organizacao_id": 1, "tipo": "pagamento_aprovado"}, "00")
+
+    assert resposta.status_code == 401
+    assert db.execute(select(func.count(EventoPagamento.id))).scalar() == 0
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import update
+
+from app.db.paginacao import CursorInvalidoError, codificar_cursor, decodificar_cursor
+from app.models.animal import Animal
+
+
+def _percorrer(cliente, consulta: str = ""):
+    """Lê todas as páginas da listagem; retorna os nomes por página."""
+    paginas = []
+    cursor = None
+    while True:
+        url = f"/api/v1/animais/?limite=2{consulta}" + (f"&cursor={cursor}" if cursor else "")
+        resposta = cliente.get(url)
+        assert resposta.status_code == 200
+        corpo = resposta.json()
+        paginas.append([item["nome"] for item in corpo["itens"]])
+        cursor = corpo["proximo_cursor"]
+        if cursor is None:
+            return paginas
+
+
+def test_paginas_seguem_o_cursor(cliente, plantel_duas_organizacoes):
+    assert _percorrer(cliente) == [["Aurora", "Brisa"], ["Cometa", "Duna"], ["Eclipse", "Faísca"]]
+
+
+def test_nomes_repetidos_desempatados_pelo_id(cliente, plantel):
+    plantel.add(Animal(id=7, organizacao_id=1, nome="Brisa", especie="Galinha", sexo="Fêmea"))
+    plantel.commit()
+
+    itens = []
+    cursor = ""
+    while cursor is not None:
+        corpo = cliente.get(f"/api/v1/animais/?limite=1&cursor={cursor}").json()
+        itens += [(item["nome"], item["id"]) for item in corpo["itens"]]
+        cursor = corpo["proximo_cursor"]
+
+    assert itens[:3] == [("Aurora", 1), ("Brisa", 2), ("Brisa", 7)]
+    assert len(itens) == 7
+
+
+def test_filtros_e_estimativa(cliente, plantel):
+    plantel.execute(update(Animal).where(Animal.id.in_([3, 5])).values(data_nascimento=date(2024, 3, 1)))
+    plantel.commit()
+
+    assert _percorrer(cliente, "&sexo=Fêmea") == [["Brisa", "Duna"], ["Faísca"]]
+    assert _percorrer(cliente, "&nascido_desde=2024-01-01") == [["Cometa", "Eclipse"]]
+    assert _percorrer(cliente, "&especie=Pato") == [[]]
+
+    corpo = cliente.get("/api/v1/animais/?limite=2&estimar=true").json()
+    assert corpo["total_estimado"] == 6
+
+
+@pytest.mark.parametrize("cursor", [
+    "nao-e-base64!",
+    codificar_cursor(["Brisa"]),
+    codificar_cursor(["Brisa", "2"]),
+    codificar_cursor([None, 2]),
+])
+def test_cursor_invalido(cliente, plantel, cursor):
+    resposta = cliente.get(f"/api/v1/animais/?cursor={cursor}")
+
+    assert resposta.status_code == 400
+    assert resposta.json()["detail"] == "Cursor de paginação inválido."
+
+
+def test_cursor_converte_datas():
+    chaves = [Animal.data_nascimento, Animal.id]
+
+    assert decodificar_cursor(codificar_cursor([date(2024, 3, 1), 5]), chaves) == [date(2024, 3, 1), 5]
+    with pytest.raises(CursorInvalidoError):
+        decodificar_cursor(codificar_cursor(["ontem", 5]), chaves)
@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.api_v1.endpoints import painel_admin
+from app.models.organizacao import Organizacao
+from app.schemas.principal import AdminAutenticado
+from app.services import painel
+from app.services.painel import AgendadorPainel, atualizar_resumos, obter_resumo
+
+
+@pytest.fixture
+def plataforma(plantel):
+    """Organização 1 ativa com o plantel e organização 2 inativa, assinadas em meses diferentes."""
+    plantel.get(Organizacao, 1).data_assinatura = date(2026, 1, 10)
+    organizacao = plantel.get(Organizacao, 2)
+    organizacao.data_assinatura = date(2026, 3, 5)
+    organizacao.status_assinatura = "Inativa"
+    plantel.commit()
+    return plantel
+
+
+@pytest.fixture
+def cliente_painel(fabrica_sessoes):
+    app = FastAPI()
+    app.include_router(painel_admin.router, prefix="/api/v1/painel")
+
+    def get_db():
+        sessao = fabrica_sessoes()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[deps.get_current_user_admin] = lambda: AdminAutenticado(
+        id=1, nome="Admin", email="admin@granja.com", permissoes=[]
+    )
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def test_resumos_calculados_pelo_agendador(plataforma, fabrica_sessoes):
+    assert AgendadorPainel(fabrica_sessoes).atualizar() is not None
+
+    resumo = obter_resumo(plataforma)
+    assert resumo["total_organizacoes"] == 2
+    assert resumo["total_animais"] == 6
+    assert resumo["organizacoes_por_status"] == {"Ativa": 1, "Inativa": 1}
+    assert resumo["receita_mensal"] == Decimal("99.90")
+    plano, = resumo["planos"]
+    assert (plano.organizacoes, plano.organizacoes_ativas, plano.animais) == (2, 1, 6)
+    novas = {mes.mes: mes.novas_organizacoes for mes in resumo["crescimento"]}
+    assert novas[date(2026, 1, 1)] == 1
+    assert novas[date(2026, 3, 1)] == 1
+
+
+def test_atualizacao_substitui_os_resumos(plataforma):
+    atualizar_resumos(plataforma)
+    plataforma.commit()
+
+    plataforma.get(Organizacao, 2).status_assinatura = "Ativa"
+    plataforma.commit()
+    atualizar_resumos(plataforma)
+    plataforma.commit()
+
+    resumo = obter_resumo(plataforma)
+    assert resumo["organizacoes_por_status"] == {"Ativa": 2}
+    assert resumo["planos"][0].organizacoes_ativas == 2
+
+
+def test_atualizacao_em_andamento_nao_recalcula(plataforma, fabrica_sessoes, monkeypatch):
+    atualizar_resumos(plataforma)
+    plataforma.commit()
+    anterior = obter_resumo(plataforma)["atualizado_em"]
+
+    # Outro processo detém o advisory lock
+    monkeypatch.setattr(painel, "_obter_bloqueio", lambda db: False)
+    assert AgendadorPainel(fabrica_sessoes).atualizar() is None
+
+    plataforma.expire_all()
+    assert obter_resumo(plataforma)["atualizado_em"] == anterior
+
+
+def test_rota_de_atualizacao(cliente_painel, plataforma, monkeypatch):
+    resposta = cliente_painel.post("/api/v1/painel/resumo/atualizacao")
+    assert resposta.status_code == 200
+    assert resposta.json()["total_organizacoes"] == 2
+    assert cliente_painel.get("/api/v1/painel/resumo").json()["total_animais"] == 6
+
+    monkeypatch.setattr(painel, "_obter_bloqueio", lambda db: False)
+    assert cliente_painel.post("/api/v1/painel/resumo/atualizacao").status_code == 409
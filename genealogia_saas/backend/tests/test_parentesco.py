@@ -0,0 +1,58 @@
+def _parentesco(cliente, animal_id: int, outro_id: int, consulta: str = ""):
+    return cliente.get(f"/api/v1/animais/{animal_id}/parentesco/{outro_id}{consulta}")
+
+
+def test_ancestrais_comuns_e_relacoes(cliente, plantel):
+    corpo = _parentesco(cliente, 6, 4).json()
+
+    assert corpo["aparentados"] is True
+    assert corpo["distancia"] == 2
+    assert [(comum["id"], comum["distancia_a"], comum["distancia_b"]) for comum in corpo["ancestrais_comuns"]] == [
+        (2, 1, 1),
+        (4, 2, 0),
+    ]
+    assert [relacao["grau"] for relacao in corpo["relacoes"]] == ["meio-irmãos por parte de mãe", "neta"]
+    assert corpo["relacoes"][1]["descricao"] == "Faísca é neta de Duna"
+    assert sorted(caminho["animais"] for caminho in corpo["caminhos"]) == [[6, 2, 4], [6, 5, 4]]
+
+
+def test_irmaos_completos(cliente, plantel):
+    corpo = _parentesco(cliente, 3, 4).json()
+
+    assert corpo["relacoes"] == [{
+        "grau": "irmãos",
+        "descricao": "Cometa e Duna são irmãos, via Aurora e Brisa",
+        "distancia_a": 1,
+        "distancia_b": 1,
+        "ancestrais_ids": [1, 2],
+    }]
+
+
+def test_relacao_descrita_do_ponto_de_vista_do_primeiro_animal(cliente, plantel):
+    assert _parentesco(cliente, 6, 2).json()["relacoes"][0]["descricao"] == "Faísca é filha de Brisa"
+    assert _parentesco(cliente, 5, 1).json()["relacoes"][0]["grau"] == "neto"
+
+
+def test_limites_de_geracoes_e_caminhos(cliente, plantel):
+    corpo = _parentesco(cliente, 6, 4, "?geracoes=1").json()
+    assert [comum["id"] for comum in corpo["ancestrais_comuns"]] == [2]
+
+    corpo = _parentesco(cliente, 5, 1, "?limite_caminhos=1").json()
+    assert corpo["distancia"] == 2
+    assert len(corpo["caminhos"]) == 1
+
+
+def test_animais_sem_parentesco(cliente, plantel):
+    corpo = _parentesco(cliente, 1, 2).json()
+
+    assert corpo["aparentados"] is False
+    assert corpo["distancia"] is None
+    assert corpo["ancestrais_comuns"] == corpo["relacoes"] == corpo["caminhos"] == []
+
+
+def test_animais_invalidos(cliente, plantel_duas_organizacoes):
+    assert _parentesco(cliente, 6, 6).status_code == 400
+    assert _parentesco(cliente, 6, 999).status_code == 404
+    assert _parentesco(cliente, 999, 6).status_code == 404
+    # Animais de outra organização não são encontrados
+    assert _parentesco(cliente, 6, 104).status_code == 404
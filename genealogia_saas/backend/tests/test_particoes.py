@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+
+from app.db.particoes import (
+    criar_particoes,
+    excluir_dados_organizacao,
+    nome_particao,
+    organizacoes_sem_particao,
+    particionamento_ativo,
+)
+from app.models.ancestralidade_animal import AncestralidadeAnimal
+from app.models.animal import Animal
+from app.services.grafo_genealogico import registro_grafos
+
+
+def _contar(db, modelo, organizacao_id: int) -> int:
+    return db.execute(select(func.count()).select_from(modelo).where(modelo.organizacao_id == organizacao_id)).scalar()
+
+
+def test_nome_particao():
+    assert nome_particao("animal", 42) == "animal_o42"
+    assert nome_particao("ancestralidadeanimal", "7") == "ancestralidadeanimal_o7"
+
+
+def test_sem_particionamento_fora_do_postgresql(db):
+    assert not particionamento_ativo(db)
+    assert not criar_particoes(db, 1)
+    assert organizacoes_sem_particao(db) == []
+
+
+def test_exclusao_dos_dados_da_organizacao(plantel_duas_organizacoes):
+    db = plantel_duas_organizacoes
+    assert len(registro_grafos.obter(db, 2)) == 6
+
+    excluir_dados_organizacao(db, 2)
+    db.commit()
+
+    assert _contar(db, Animal, 2) == 0
+    assert _contar(db, AncestralidadeAnimal, 2) == 0
+    assert _contar(db, Animal, 1) == 6
+    assert _contar(db, AncestralidadeAnimal, 1) > 0
+    # O grafo em memória da organização é descartado no commit
+    assert 2 not in registro_grafos._grafos
+    assert len(registro_grafos.obter(db, 2)) == 0
@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.metricas import histograma, medidores
+from app.db.session import PoolMedido, _opcoes_engine, _registrar_medidores
+
+
+def test_opcoes_do_pool(monkeypatch):
+    monkeypatch.setattr(settings, "BANCO_PGBOUNCER", False)
+    monkeypatch.setattr(settings, "BANCO_POOL_TAMANHO", 7)
+    monkeypatch.setattr(settings, "BANCO_POOL_EXCEDENTE", 3)
+
+    opcoes = _opcoes_engine(PoolMedido, {})
+
+    assert opcoes["poolclass"] is PoolMedido
+    assert (opcoes["pool_size"], opcoes["max_overflow"]) == (7, 3)
+    assert opcoes["pool_timeout"] == settings.BANCO_POOL_TIMEOUT_SEGUNDOS
+    assert opcoes["pool_pre_ping"] == settings.BANCO_POOL_PRE_PING
+
+
+def test_opcoes_com_pgbouncer(monkeypatch):
+    monkeypatch.setattr(settings, "BANCO_PGBOUNCER", True)
+    connect_args = {"statement_cache_size": 0}
+
+    assert _opcoes_engine(PoolMedido, connect_args) == {"poolclass": NullPool, "connect_args": connect_args}
+
+
+def test_pool_medido(arquivo_banco):
+    engine = create_engine(f"sqlite:///{arquivo_banco}", poolclass=PoolMedido, pool_size=2, max_overflow=1)
+    _registrar_medidores(engine, "teste_pool")
+    espera = histograma("banco_pool_espera_segundos", "Tempo de espera para obter uma conexão do pool")
+    checkouts = espera.valores()[2]
+    leituras = {}
+
+    with engine.connect() as conexao, engine.connect() as outra:
+        conexao.execute(text("SELECT 1"))
+        outra.execute(text("SELECT 1"))
+        with engine.connect():
+            leituras = {medidor.nome: medidor.valor() for medidor in medidores() if medidor.nome.startswith("teste_pool")}
+
+    assert espera.valores()[2] == checkouts + 3
+    assert leituras == {"teste_pool_em_uso": 3, "teste_pool_excedentes": 1, "teste_pool_ociosas": 0}
+    # A conexão excedente é fechada ao ser devolvida
+    assert {medidor.nome: medidor.valor() for medidor in medidores() if medidor.nome == "teste_pool_ociosas"} == {
+        "teste_pool_ociosas": 2
+    }
+    engine.dispose()
@@ -0,0 +1,46 @@
+from datetime import date
+
+from sqlalchemy import update
+
+from app.models.animal import Animal
+
+
+def test_fields_retorna_apenas_os_campos_pedidos(cliente, plantel):
+    plantel.execute(update(Animal).where(Animal.id == 1).values(data_nascimento=date(2023, 5, 2)))
+    plantel.commit()
+
+    corpo = cliente.get("/api/v1/animais/?limite=2&fields=id, data_nascimento,id").json()
+
+    assert corpo["itens"] == [{"id": 1, "data_nascimento": "2023-05-02"}, {"id": 2, "data_nascimento": None}]
+    assert corpo["proximo_cursor"] is not None
+
+
+def test_fields_pagina_pelas_chaves_nao_solicitadas(cliente, plantel):
+    ids = []
+    cursor = ""
+    while cursor is not None:
+        corpo = cliente.get(f"/api/v1/animais/?limite=4&fields=id&cursor={cursor}").json()
+        ids += [item["id"] for item in corpo["itens"]]
+        cursor = corpo["proximo_cursor"]
+
+    assert ids == [1, 2, 3, 4, 5, 6]
+
+
+def test_fields_com_filtros_e_estimativa(cliente, plantel):
+    corpo = cliente.get("/api/v1/animais/?sexo=Macho&fields=nome,pai_id&estimar=true").json()
+
+    assert corpo["itens"] == [
+        {"nome": "Aurora", "pai_id": None},
+        {"nome": "Cometa", "pai_id": 1},
+        {"nome": "Eclipse", "pai_id": 3},
+    ]
+    assert corpo["total_estimado"] == 3
+
+
+def test_fields_invalidos(cliente, plantel):
+    for consulta in ("fields=id,senha", "fields=,", "fields=coeficiente_consanguinidade"):
+        resposta = cliente.get(f"/api/v1/animais/?{consulta}")
+        assert resposta.status_code == 400, consulta
+        assert resposta.json()["detail"].startswith("Campos inválidos")
+
+    assert cliente.get("/api/v1/animais/exportacao?fields=id,senha").status_code == 400
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from app.api.respostas import etag_confere
+
+ARVORE = "/api/v1/animais/5/arvore"
+
+
+def test_arvore_revalidada_pela_etag(cliente, plantel):
+    primeira = cliente.get(ARVORE)
+    etag = primeira.headers["ETag"]
+
+    assert primeira.status_code == 200
+    assert primeira.json()["animal"]["pai"]["nome"] == "Cometa"
+    assert etag.startswith('W/"')
+    assert primeira.headers["Cache-Control"] == "private, no-cache"
+
+    revalidada = cliente.get(ARVORE, headers={"If-None-Match": etag})
+    assert revalidada.status_code == 304
+    assert revalidada.headers["ETag"] == etag
+    assert revalidada.content == b""
+
+    # Outra profundidade é outra representação
+    outra = cliente.get(f"{ARVORE}?geracoes=1", headers={"If-None-Match": etag})
+    assert outra.status_code == 200
+    assert outra.headers["ETag"] != etag
+
+
+def test_alteracao_muda_a_etag(cliente, plantel):
+    etag = cliente.get(ARVORE).headers["ETag"]
+
+    alterado = cliente.put("/api/v1/animais/3", json={"nome": "Cometa II"})
+    assert alterado.status_code == 200
+
+    resposta = cliente.get(ARVORE, headers={"If-None-Match": etag})
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+    assert resposta.json()["animal"]["pai"]["nome"] == "Cometa II"
+
+
+def test_if_modified_since(cliente, plantel):
+    cliente.put("/api/v1/animais/3", json={"nome": "Cometa II"})
+    resposta = cliente.get(ARVORE)
+    assert "Last-Modified" in resposta.headers
+
+    futuro = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+    passado = format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)
+
+    assert cliente.get(ARVORE, headers={"If-Modified-Since": futuro}).status_code == 304
+    assert cliente.get(ARVORE, headers={"If-Modified-Since": passado}).status_code == 200
+    assert cliente.get(ARVORE, headers={"If-Modified-Since": "ontem"}).status_code == 200
+    # If-None-Match tem precedência sobre If-Modified-Since
+    assert cliente.get(ARVORE, headers={"If-None-Match": '"outra"', "If-Modified-Since": futuro}).status_code == 200
+
+
+def test_animal_inexistente_nunca_recebe_304(cliente, plantel):
+    futuro = format_datetime(datetime.now(timezone.utc) + timedelta(days=1), usegmt=True)
+
+    assert cliente.get("/api/v1/animais/999/arvore", headers={"If-Modified-Since": futuro}).status_code == 404
+    assert cliente.get("/api/v1/animais/105/arvore", headers={"If-None-Match": "*"}).status_code == 404
+
+
+@pytest.mark.parametrize("cabecalho, esperado", [
+    ('W/"a-1"', True),
+    ('"a-1"', True),
+    ('"b", W/"a-1"', True),
+    ("*", True),
+    ('"a-2"', False),
+    ("", False),
+    (None, False),
+])
+def test_etag_confere(cabecalho, esperado):
+    assert etag_confere(cabecalho, 'W/"a-1"') is esperado
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import deps
+from app.api.api_v1.endpoints import planos_assinatura
+from app.core.config import Settings
+from app.models.plano_assinatura import PlanoAssinatura
+from app.services.genealogia import obter_arvore_genealogica, obter_arvore_genealogica_async
+
+
+@pytest.mark.parametrize("uri, esperada", [
+    ("postgresql://u:s@db/genealogia", "postgresql+asyncpg://u:s@db/genealogia"),
+    ("postgresql+psycopg2://u:s@db/genealogia", "postgresql+asyncpg://u:s@db/genealogia"),
+    ("postgres://u:s@db/genealogia", "postgresql+asyncpg://u:s@db/genealogia"),
+])
+def test_uri_assincrona_derivada_da_sincrona(uri, esperada):
+    assert Settings(SQLALCHEMY_DATABASE_URI=uri).SQLALCHEMY_ASYNC_DATABASE_URI == esperada
+
+
+def test_uri_assincrona_explicita():
+    configuracao = Settings(
+        SQLALCHEMY_DATABASE_URI="postgresql://u:s@db/genealogia",
+        SQLALCHEMY_ASYNC_DATABASE_URI="postgresql+asyncpg://u:s@replica/genealogia",
+    )
+    assert configuracao.SQLALCHEMY_ASYNC_DATABASE_URI == "postgresql+asyncpg://u:s@replica/genealogia"
+
+
+@pytest.fixture
+def fabrica_async(arquivo_banco):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{arquivo_banco}", poolclass=NullPool)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def cliente_planos(db, fabrica_async):
+    db.add(PlanoAssinatura(id=2, nome="Ouro", preco=49.9, limite_animais=100, funcionalidades=[]))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(planos_assinatura.router, prefix="/api/v1/planos-assinatura")
+
+    async def get_async_db():
+        async with fabrica_async() as sessao:
+            yield sessao
+
+    app.dependency_overrides[deps.get_async_db] = get_async_db
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def test_planos_ordenados_por_preco(cliente_planos):
+    resposta = cliente_planos.get("/api/v1/planos-assinatura/")
+
+    assert resposta.status_code == 200
+    assert [plano["nome"] for plano in resposta.json()] == ["Ouro", "Bronze"]
+
+
+def test_plano_por_id(cliente_planos):
+    resposta = cliente_planos.get("/api/v1/planos-assinatura/1")
+    assert resposta.status_code == 200
+    assert resposta.json()["limite_animais"] == 1000
+
+    assert cliente_planos.get("/api/v1/planos-assinatura/99").status_code == 404
+
+
+def test_arvore_assincrona_igual_a_sincrona(plantel, fabrica_async):
+    async def obter():
+        async with fabrica_async() as sessao:
+            return await obter_arvore_genealogica_async(sessao, 6, 1, 3)
+
+    assert asyncio.run(obter()) == obter_arvore_genealogica(plantel, 6, 1, 3)
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+
+from app.api import deps
+from app.api.api_v1.endpoints import auth
+from app.core import security
+from app.core.config import settings
+from app.models.usuario_admin_saas import UsuarioAdminSaaS
+
+SENHA = "senha-de-teste"
+
+
+@pytest.fixture
+def cliente_login(fabrica_sessoes):
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/v1/auth")
+
+    def get_db():
+        sessao = fabrica_sessoes()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    app.dependency_overrides[deps.get_db] = get_db
+    with TestClient(app) as cliente:
+        yield cliente
+    security.encerrar_pool_senhas()
+
+
+def _cadastrar_admin(db, senha_hash: str) -> None:
+    db.add(UsuarioAdminSaaS(id=1, nome="Admin", email="admin@granja.com", senha_hash=senha_hash, permissoes=[]))
+    db.commit()
+
+
+def _login(cliente, senha: str = SENHA):
+    return cliente.post("/api/v1/auth/login/admin", data={"username": "admin@granja.com", "password": senha})
+
+
+def _senha_hash(db) -> str:
+    db.expire_all()
+    return db.get(UsuarioAdminSaaS, 1).senha_hash
+
+
+def _execucoes_bcrypt() -> int:
+    return security._latencia_hash.valores()[2]
+
+
+def test_login_regrava_hash_com_custo_diferente(cliente_login, db):
+    antigo = bcrypt.using(rounds=4).hash(SENHA)
+    _cadastrar_admin(db, antigo)
+    execucoes = _execucoes_bcrypt()
+
+    assert _login(cliente_login).status_code == 200
+    assert _execucoes_bcrypt() == execucoes + 1
+    novo = _senha_hash(db)
+    assert novo != antigo
+    assert bcrypt.from_string(novo).rounds == settings.BCRYPT_ROUNDS
+
+    # Com o custo atual o hash é mantido
+    assert _login(cliente_login).status_code == 200
+    assert _senha_hash(db) == novo
+
+
+def test_senha_incorreta(cliente_login, db):
+    antigo = bcrypt.using(rounds=4).hash(SENHA)
+    _cadastrar_admin(db, antigo)
+
+    resposta = _login(cliente_login, "outra-senha")
+
+    assert resposta.status_code == 401
+    assert _senha_hash(db) == antigo
+
+
+def test_fila_cheia_recusa_com_503(cliente_login, db, monkeypatch):
+    _cadastrar_admin(db, bcrypt.using(rounds=4).hash(SENHA))
+    fila = threading.BoundedSemaphore(1)
+    fila.acquire()
+    monkeypatch.setattr(security, "_fila_senhas", fila)
+    execucoes = _execucoes_bcrypt()
+
+    resposta = _login(cliente_login)
+
+    assert resposta.status_code == 503
+    assert resposta.headers["Retry-After"] == "1"
+    assert _execucoes_bcrypt() == execucoes
+    # A vaga ocupada não foi consumida nem liberada pela requisição recusada
+    assert not fila.acquire(blocking=False)